@@ -216,6 +216,31 @@ async function runAllTests() {
         { id: 'status-pyodide-manager-17', desc: "1️⃣7️⃣ snapshot cache restore", func: () => PyodideManagerTests.testSnapshotCacheRestore().then(() => window.updateTestStatus('status-pyodide-manager-17', 'pass')) },
         { id: 'status-pyodide-manager-18', desc: "1️⃣8️⃣ input() in sync function (jspi)", func: () => PyodideManagerTests.testInputInSyncFunction(manager).then(() => window.updateTestStatus('status-pyodide-manager-18', 'pass')) },
         { id: 'status-pyodide-manager-19', desc: "1️⃣9️⃣ empty input answer", func: () => PyodideManagerTests.testEmptyInputAnswer(manager).then(() => window.updateTestStatus('status-pyodide-manager-19', 'pass')) },
+        { id: 'status-pyodide-manager-20', desc: "2️⃣0️⃣ streamed stdout chunks", func: () => PyodideManagerTests.testStreamingOutput(manager).then(() => window.updateTestStatus('status-pyodide-manager-20', 'pass')) },
+        { id: 'status-pyodide-manager-21', desc: "2️⃣1️⃣ bounded output capture", func: () => PyodideManagerTests.testBoundedOutput(manager).then(() => window.updateTestStatus('status-pyodide-manager-21', 'pass')) },
+        { id: 'status-pyodide-manager-22', desc: "2️⃣2️⃣ binary figure payloads", func: () => PyodideManagerTests.testBinaryFigures(manager).then(() => window.updateTestStatus('status-pyodide-manager-22', 'pass')) },
+        { id: 'status-pyodide-manager-23', desc: "2️⃣3️⃣ lazy figure handles", func: () => PyodideManagerTests.testLazyFigures(manager).then(() => window.updateTestStatus('status-pyodide-manager-23', 'pass')) },
+        { id: 'status-pyodide-manager-24', desc: "2️⃣4️⃣ Figure dedup", func: () => PyodideManagerTests.testFigureDedup(manager).then(() => window.updateTestStatus('status-pyodide-manager-24', 'pass')) },
+        { id: 'status-pyodide-manager-25', desc: "2️⃣5️⃣ Binary missive", func: () => PyodideManagerTests.testBinaryMissive(manager).then(() => window.updateTestStatus('status-pyodide-manager-25', 'pass')) },
+        { id: 'status-pyodide-manager-26', desc: "2️⃣6️⃣ emit() records", func: () => PyodideManagerTests.testEmitRecords(manager).then(() => window.updateTestStatus('status-pyodide-manager-26', 'pass')) },
+        { id: 'status-pyodide-manager-27', desc: "2️⃣7️⃣ Execution metrics", func: () => PyodideManagerTests.testExecutionMetrics(manager).then(() => window.updateTestStatus('status-pyodide-manager-27', 'pass')) },
+        { id: 'status-pyodide-manager-28', desc: "2️⃣8️⃣ Capture hooks", func: () => PyodideManagerTests.testCaptureHooks(manager).then(() => window.updateTestStatus('status-pyodide-manager-28', 'pass')) },
+        { id: 'status-pyodide-manager-29', desc: "2️⃣9️⃣ Rich display", func: () => PyodideManagerTests.testRichDisplay(manager).then(() => window.updateTestStatus('status-pyodide-manager-29', 'pass')) },
+        { id: 'status-pyodide-manager-30', desc: "3️⃣0️⃣ Raw capture backend", func: () => PyodideManagerTests.testRawCaptureBackend().then(() => window.updateTestStatus('status-pyodide-manager-30', 'pass')) },
+        { id: 'status-pyodide-manager-31', desc: "3️⃣1️⃣ input() traceback lines", func: () => PyodideManagerTests.testInputTracebackLines(manager).then(() => window.updateTestStatus('status-pyodide-manager-31', 'pass')) },
+        { id: 'status-pyodide-manager-32', desc: "3️⃣2️⃣ Compile cache", func: () => PyodideManagerTests.testCompileCache(manager).then(() => window.updateTestStatus('status-pyodide-manager-32', 'pass')) },
+        { id: 'status-pyodide-manager-33', desc: "3️⃣3️⃣ auto-load imports", func: () => PyodideManagerTests.testAutoLoadImports('').then(() => window.updateTestStatus('status-pyodide-manager-33', 'pass')) },
+        { id: 'status-pyodide-manager-34', desc: "3️⃣4️⃣ lazy import finder", func: () => PyodideManagerTests.testLazyImportFinder('').then(() => window.updateTestStatus('status-pyodide-manager-34', 'pass')) },
+        { id: 'status-pyodide-manager-35', desc: "3️⃣5️⃣ execution budget", func: () => PyodideManagerTests.testExecutionBudget(manager).then(() => window.updateTestStatus('status-pyodide-manager-35', 'pass')) },
+        { id: 'status-pyodide-manager-36', desc: "3️⃣6️⃣ abort signal", func: () => PyodideManagerTests.testAbortSignal(manager).then(() => window.updateTestStatus('status-pyodide-manager-36', 'pass')) },
+        { id: 'status-pyodide-manager-37', desc: "3️⃣7️⃣ syntax check", func: () => PyodideManagerTests.testSyntaxCheck(manager).then(() => window.updateTestStatus('status-pyodide-manager-37', 'pass')) },
+        { id: 'status-pyodide-manager-38', desc: "3️⃣8️⃣ worker pool", func: () => PyodideManagerTests.testWorkerPool().then(() => window.updateTestStatus('status-pyodide-manager-38', 'pass')) },
+        { id: 'status-pyodide-manager-39', desc: "3️⃣9️⃣ standby restart", func: () => PyodideManagerTests.testStandbyRestart().then(() => window.updateTestStatus('status-pyodide-manager-39', 'pass')) },
+        { id: 'status-pyodide-manager-40', desc: "4️⃣0️⃣ interpreter reset", func: () => PyodideManagerTests.testReset(manager).then(() => window.updateTestStatus('status-pyodide-manager-40', 'pass')) },
+        { id: 'status-pyodide-manager-41', desc: "4️⃣1️⃣ execute batch", func: () => PyodideManagerTests.testExecuteBatch(manager).then(() => window.updateTestStatus('status-pyodide-manager-41', 'pass')) },
+        { id: 'status-pyodide-manager-42', desc: "4️⃣2️⃣ execute many", func: () => PyodideManagerTests.testExecuteMany(manager).then(() => window.updateTestStatus('status-pyodide-manager-42', 'pass')) },
+        { id: 'status-pyodide-manager-43', desc: "4️⃣3️⃣ named namespaces", func: () => PyodideManagerTests.testNamedNamespaces(manager).then(() => window.updateTestStatus('status-pyodide-manager-43', 'pass')) },
+        { id: 'status-pyodide-manager-44', desc: "4️⃣4️⃣ priority lanes", func: () => PyodideManagerTests.testPriorityLanes(manager).then(() => window.updateTestStatus('status-pyodide-manager-44', 'pass')) },
 
         // FileLoader Tests
         { id: 'status-file-loader-1', desc: "1️⃣ PyodideFileLoader.loadFiles()", func: () => FileLoaderTests.test14LoadFilesAndImport(manager, filesToLoad).then(() => window.updateTestStatus('status-file-loader-1', 'pass')) },
@@ -219,6 +219,38 @@ async function tester() {
   }
 }
 
+// ---------------------------------------------------------------- vérification en direct
+
+// Pendant la frappe, manager.check() parse le code sans l'exécuter et la
+// ligne fautive est surlignée : pas besoin de lancer les tests pour voir
+// une parenthèse oubliée. Sans worker de réserve (config.standby), la
+// vérification attend la fin d'une série de tests qui calcule : le verdict
+// arrive alors après le run, et les erreurs de compilation ('return' hors
+// d'une fonction) ne s'affichent qu'à l'exécution
+let verifTimer = null;
+let ligneErreur = null;
+
+function planifierVerification() {
+  clearTimeout(verifTimer);
+  verifTimer = setTimeout(verifierSyntaxe, 300);
+}
+
+async function verifierSyntaxe() {
+  if (!manager || !manager.isReady) return;
+  let verdict;
+  try {
+    verdict = await manager.check(editor.getValue());
+  } catch (_) {
+    return; // la vérification n'est qu'une aide
+  }
+  if (ligneErreur !== null) editor.removeLineClass(ligneErreur, 'background', 'ligne-erreur');
+  ligneErreur = null;
+  if (!verdict.valid && verdict.error.line) {
+    ligneErreur = editor.getLineHandle(verdict.error.line - 1);
+    if (ligneErreur) editor.addLineClass(ligneErreur, 'background', 'ligne-erreur');
+  }
+}
+
 // ---------------------------------------------------------------- mode sprint
 
 const SPRINT_NB = 10;
@@ -355,6 +387,7 @@ async function boot() {
     scrollbarStyle: 'native',
     extraKeys: { 'Ctrl-Enter': tester, 'Cmd-Enter': tester },
   });
+  editor.on('change', planifierVerification);
 
   buildSidebar();
   selectDefi(current);
@@ -345,7 +345,7 @@ print("figure captured into result.figures")`,
      |                |
      v                v
 +------------------------------+
-| manager.executionChain       |
+| manager._executionQueue      |
 | serializes: A runs, then B   |
 | each run has its own id      |
 +------------------------------+
@@ -477,4 +477,848 @@ print("value:" + value)`);
             throw error;
         }
     }
+
+    static async testStreamingOutput(manager) {
+        const testName = "streamed stdout chunks";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const chunks = [];
+            let resolved = false;
+            const result = await manager.executeAsync("streaming.py",
+`import time
+for i in range(5):
+    print(f"tick {i}")
+    time.sleep(0.1)
+print("done", file=__import__("sys").stderr)`,
+                undefined, 30000,
+                { onOutput: (chunk) => chunks.push({ ...chunk, beforeResult: !resolved }), flushIntervalMs: 50 });
+            resolved = true;
+
+            assert(!result.error, "Streamed run should not error");
+            assert(chunks.length > 1, "Output should arrive in several chunks");
+            assert(chunks.every(c => c.beforeResult), "Chunks should arrive before the result resolves");
+            const out = chunks.filter(c => c.stream === "stdout").map(c => c.text).join("");
+            const err = chunks.filter(c => c.stream === "stderr").map(c => c.text).join("");
+            assertEquals(out, "tick 0\ntick 1\ntick 2\ntick 3\ntick 4\n", "Chunks should reassemble the full stdout");
+            assertEquals(err, "done\n", "stderr should be streamed too");
+            assertEquals(result.stdout, "", "Streamed output is drained, not repeated in the result");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testBoundedOutput(manager) {
+        const testName = "bounded output capture";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const result = await manager.executeAsync("bounded.py",
+`for i in range(100000):
+    print(f"line {i}")`,
+                undefined, 30000, { outputLimit: { head: 20, tail: 20 } });
+
+            assert(!result.error, "Bounded run should not error");
+            assert(result.truncated === true, "Result should be flagged as truncated");
+            assertEquals(result.stdout.length, 40, "Only head + tail characters should be kept");
+            assert(result.stdout.startsWith("line 0\nline 1\n"), "Head should hold the first lines");
+            assert(result.stdout.endsWith("line 99999\n"), "Tail should hold the last lines");
+            assert(result.dropped.stdout > 1000000, "Dropped count should account for the middle");
+            assertEquals(result.dropped.stderr, 0, "Nothing was dropped from stderr");
+
+            const plain = await manager.executeAsync("unbounded.py", "print('short')");
+            assert(plain.truncated === false, "An unbounded run should not be flagged");
+            assertEquals(plain.stdout, "short\n", "An unbounded run keeps its full output");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testBinaryFigures(manager) {
+        const testName = "binary figure payloads";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const plot = `import matplotlib.pyplot as plt
+plt.plot([1, 2, 3], [1, 4, 9])`;
+
+            const png = await manager.executeAsync("fig_png.py", plot, undefined, 30000,
+                { figureFormat: "png", figureDpi: 50 });
+            assert(!png.error, "PNG run should not error");
+            assertEquals(png.figureFormat, "png", "Result should report the figure format");
+            assertInstanceOf(png.figures[0], Uint8Array, "PNG figure should be a Uint8Array");
+            assertEquals([...png.figures[0].slice(0, 4)], [0x89, 0x50, 0x4e, 0x47], "Payload should start with the PNG signature");
+
+            const svg = await manager.executeAsync("fig_svg.py", plot, undefined, 30000, { figureFormat: "svg" });
+            assertInstanceOf(svg.figures[0], Uint8Array, "SVG figure should be a Uint8Array");
+            assertContains(new TextDecoder().decode(svg.figures[0]), "<svg", "Payload should be an SVG document");
+
+            const legacy = await manager.executeAsync("fig_b64.py", plot);
+            assert(typeof legacy.figures[0] === 'string', "Default format stays base64 strings");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testLazyFigures(manager) {
+        const testName = "lazy figure handles";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const result = await manager.executeAsync("lazy_figs.py",
+`import matplotlib.pyplot as plt
+plt.figure(figsize=(4, 3))
+plt.plot([0, 1], [0, 1])
+plt.figure(figsize=(6, 2))
+plt.bar([1, 2], [3, 4])`,
+                undefined, 30000, { lazyFigures: true });
+
+            assert(!result.error, "Lazy run should not error");
+            assertEquals(result.figureFormat, "handle", "Result should report handles");
+            assertEquals(result.figures.length, 2, "One handle per open figure");
+            const [first, second] = result.figures;
+            assertEquals([first.width, first.height], [4, 3], "Handle should carry the figure size");
+            assert(second.artists > 0, "Handle should count artists");
+
+            const thumb = await manager.renderFigure(second.num, { format: "png", width: 120, tight: false });
+            assertInstanceOf(thumb, Uint8Array, "Rendered figure should be PNG bytes");
+            const pngWidth = new DataView(thumb.buffer, thumb.byteOffset).getUint32(16);
+            assertEquals(pngWidth, 120, "Render should honour the requested width");
+
+            await manager.executeAsync("lazy_next.py", "print('next run')");
+            let gone = false;
+            try {
+                await manager.renderFigure(first.num);
+            } catch (error) {
+                gone = true;
+                assertContains(error.message, "not available", "Rejection should say the figure is gone");
+            }
+            assert(gone, "Figures should not outlive the next execution");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testFigureDedup(manager) {
+        const testName = "figure dedup";
+        logTestStart("PyodideManager", testName);
+
+        const plot = `import matplotlib.pyplot as plt
+plt.figure(figsize=(3, 2))
+plt.plot([0, 1, 2], [2, 0, 1])`;
+
+        try {
+            const first = await manager.executeAsync("dedup_a.py", plot, undefined, 30000,
+                { figureFormat: "png", dedupFigures: true });
+            assert(!first.error, "First run should not error");
+            assertEquals(first.figureKeys.length, 1, "One key per figure");
+            assertInstanceOf(first.figures[0], Uint8Array, "New figure should carry its bytes");
+
+            const second = await manager.executeAsync("dedup_b.py", plot, undefined, 30000,
+                { figureFormat: "png", dedupFigures: true });
+            assertEquals(second.figureKeys[0], first.figureKeys[0], "Identical plot should hash to the same key");
+            assertEquals(second.figures[0], null, "Unchanged figure should not be sent again");
+
+            const changed = await manager.executeAsync("dedup_c.py", plot + "\nplt.title('changed')", undefined, 30000,
+                { figureFormat: "png", dedupFigures: true });
+            assert(changed.figureKeys[0] !== first.figureKeys[0], "Changed plot should get a new key");
+            assertInstanceOf(changed.figures[0], Uint8Array, "Changed figure should carry its bytes");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testBinaryMissive(manager) {
+        const testName = "binary missive";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const result = await manager.executeAsync("binary_missive.py",
+`import numpy as np
+missive({
+    "samples": np.linspace(0.0, 1.0, 100000),
+    "counts": np.arange(6, dtype=np.int32).reshape(2, 3),
+    "raw": b"\\x01\\x02\\x03",
+    "label": "signal",
+})`,
+                undefined, 30000, { binaryMissive: true });
+
+            assert(!result.error, "Binary missive run should not error");
+            const { samples, counts, raw, label } = result.missive;
+            assertInstanceOf(samples, Float64Array, "float64 array should arrive as a Float64Array");
+            assertEquals(samples.length, 100000, "Every sample should arrive");
+            assertEquals(samples[samples.length - 1], 1, "Values should be exact");
+            assertInstanceOf(counts.data, Int32Array, "int32 array should arrive as an Int32Array");
+            assertEquals(counts.shape, [2, 3], "2-D arrays should carry their shape");
+            assertEquals(Array.from(raw), [1, 2, 3], "bytes should arrive as a Uint8Array");
+            assertEquals(label, "signal", "Plain values should stay in the skeleton");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testEmitRecords(manager) {
+        const testName = "emit records";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const batches = [];
+            const result = await manager.executeAsync("emit_records.py",
+`for step in range(10):
+    emit({"step": step, "progress": (step + 1) / 10})
+print("done")`,
+                undefined, 30000, { onEmit: (records) => batches.push(records), emitBatchSize: 4 });
+
+            assert(!result.error, "emit run should not error");
+            assertEquals(result.stdout.trim(), "done", "stdout should be captured as usual");
+            assert(batches.length >= 3, "Records should arrive in several batches");
+            assert(batches.every((batch) => batch.length <= 4), "Batches should respect emitBatchSize");
+            const steps = batches.flat().map((record) => record.step);
+            assertEquals(steps, [0, 1, 2, 3, 4, 5, 6, 7, 8, 9], "Every record should arrive once, in order");
+
+            const silent = await manager.executeAsync("emit_silent.py", "emit({'ignored': True})");
+            assert(!silent.error, "emit() without a listener should be a no-op");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testExecutionMetrics(manager) {
+        const testName = "execution metrics";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const result = await manager.executeAsync("metrics.py",
+`blocks = [bytearray(1_000_000) for _ in range(4)]
+total = sum(i * i for i in range(200_000))
+print("é" * 10)`,
+                undefined, 30000, { traceMemory: true });
+
+            assert(!result.error, "Metrics run should not error");
+            const { metrics } = result;
+            assert(metrics.cpuTimeMs > 0, "CPU time should be measured");
+            assert(metrics.peakMemoryBytes >= 4_000_000, "Traced peak should include the allocated blocks");
+            assertEquals(metrics.stdoutBytes, 21, "stdout should be counted in UTF-8 bytes");
+            assertEquals(metrics.figureCount, 0, "No figure was drawn");
+            assert(metrics.heapBytesAfter >= metrics.heapBytesBefore, "The wasm heap never shrinks");
+
+            const plain = await manager.executeAsync("metrics_plain.py", "x = 1");
+            assertEquals(plain.metrics.peakMemoryBytes, null, "Memory is only traced on request");
+            const last = manager.executionHistory[manager.executionHistory.length - 1];
+            assertEquals(last.metrics.stdoutBytes, 0, "History entries should keep their metrics");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testCaptureHooks(manager) {
+        const testName = "capture hooks";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            await manager.executeAsync("hooks_register.py",
+`import capture_system
+hook_calls = []
+capture_system.register_capture_hook("probe", "colorsys", reset=lambda lib: hook_calls.append(lib.__name__))`);
+
+            const idle = await manager.executeAsync("hooks_idle.py", "missive({'calls': len(hook_calls)})");
+            assertEquals(JSON.parse(idle.missive).calls, 0, "Hook should stay idle while its module is not imported");
+
+            await manager.executeAsync("hooks_import.py", "import colorsys");
+            const active = await manager.executeAsync("hooks_active.py", "missive({'calls': hook_calls})");
+            assertEquals(JSON.parse(active.missive).calls, ["colorsys"], "Hook should reset once its module is imported");
+
+            await manager.executeAsync("hooks_cleanup.py", "capture_system._capture_hooks.pop('probe')");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testRichDisplay(manager) {
+        const testName = "rich display";
+        logTestStart("PyodideManager", testName);
+
+        const table = `class Table:
+    def __init__(self, rows):
+        self.rows = rows
+    def __repr__(self):
+        return f"Table({len(self.rows)} rows)"
+    def _repr_html_(self):
+        return "<table>" + "".join(f"<tr><td>{r}</td></tr>" for r in self.rows) + "</table>"
+`;
+
+        try {
+            const rich = await manager.executeAsync("display_rich.py", table + "Table([1, 2, 3])",
+                undefined, 30000, { display: true });
+            assert(!rich.error, "Display run should not error");
+            assertEquals(rich.display.mime, "text/html", "_repr_html_ should win over plain text");
+            assertContains(rich.display.data, "<td>3</td>", "HTML should be rendered");
+            assertEquals(rich.display.text, "Table(3 rows)", "Plain repr should come along");
+            assertEquals(rich.stdout, "", "Display should not print");
+
+            const capped = await manager.executeAsync("display_capped.py", table + "Table(list(range(10_000)))",
+                undefined, 30000, { display: { maxBytes: 1000 } });
+            assertEquals(capped.display.mime, "text/plain", "Oversized HTML should fall back to text");
+
+            const none = await manager.executeAsync("display_none.py", "x = 42", undefined, 30000, { display: true });
+            assertEquals(none.display, null, "A statement has nothing to display");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testRawCaptureBackend() {
+        const testName = "raw capture backend";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const { Nagini } = await import('../../src/nagini.js');
+            const workerPath = new URL('../../src/pyodide/worker/worker-dist.js', import.meta.url).href;
+            const raw = await Nagini.createManager('pyodide', [], [], [], workerPath, { captureBackend: 'raw' });
+            await Nagini.waitForReady(raw, 120000);
+
+            const result = await raw.executeAsync("raw_capture.py",
+`import os, sys
+print("from print")
+os.write(1, b"from fd 1\\n")
+print("to stderr", file=sys.stderr)`);
+            assert(!result.error, "Raw capture run should not error");
+            assertContains(result.stdout, "from print", "print() should be captured");
+            assertContains(result.stdout, "from fd 1", "Writes below the Python layer should be captured");
+            assertContains(result.stderr, "to stderr", "stderr should be captured");
+
+            const bounded = await raw.executeAsync("raw_bounded.py", "print('x' * 10_000)",
+                undefined, 30000, { outputLimit: { head: 100, tail: 10 } });
+            assert(bounded.truncated, "Byte limits should apply to the raw backend");
+            assertEquals(bounded.stdout.length, 110, "Head and tail should be kept");
+            assertEquals(bounded.metrics.stdoutBytes, 10_001, "Every byte should be counted");
+
+            raw.destroy();
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testInputTracebackLines(manager) {
+        const testName = "input() traceback lines";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            manager.queueInput("7");
+            const result = await manager.executeAsync("input_lines.py",
+`# comment lines and blank lines are lost by an unparse
+
+count = int(input("count? "))
+
+
+total = count / 0  # line 6
+`);
+            assert(result.error, "Division by zero should fail");
+            assertContains(result.error.message, "line 6", `Traceback should point at the source line (input mode: ${manager.inputMode})`);
+
+            manager.queueInput("5");
+            const value = await manager.executeAsync("input_value.py", "n = int(input())\nn * 2",
+                undefined, 30000, { display: true });
+            assertEquals(value.display.text, "10", "Trailing expression value should survive the rewrite");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testCompileCache(manager) {
+        const testName = "compile cache";
+        logTestStart("PyodideManager", testName);
+
+        const snippet = `total = sum(range(${Date.now() % 1000}))\ntotal`;
+
+        try {
+            const first = await manager.executeAsync("cache_a.py", snippet);
+            const second = await manager.executeAsync("cache_b.py", snippet, { seed: 1 });
+            assert(!first.error && !second.error, "Cached runs should not error");
+            assertEquals(second.metrics.compileCacheMisses, first.metrics.compileCacheMisses,
+                "Same source should not be compiled again");
+            assertEquals(second.metrics.compileCacheHits, first.metrics.compileCacheHits + 1,
+                "Same source should hit the cache, even against another namespace");
+
+            const broken = await manager.executeAsync("cache_syntax.py", "def broken(:\n    pass");
+            assert(broken.error, "A syntax error should still be reported");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testAutoLoadImports() {
+        const testName = "auto-load imports";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const { Nagini } = await import('../../src/nagini.js');
+            const workerPath = new URL('../../src/pyodide/worker/worker-dist.js', import.meta.url).href;
+            const auto = await Nagini.createManager('pyodide', [], [], [], workerPath, { autoLoadImports: true });
+            await Nagini.waitForReady(auto, 120000);
+
+            const first = await auto.executeAsync("auto_import.py",
+`import numpy as np
+print(np.arange(4).sum())`);
+            assert(!first.error, `Imported package should be loaded before the run: ${first.error?.message}`);
+            assertContains(first.stdout, "6", "numpy should work without being listed upfront");
+            assert(first.metrics.packagesAutoLoaded.includes("numpy"), "numpy should be reported as auto-loaded");
+            assert(first.metrics.packageLoadMs > 0, "Load time should be reported separately");
+
+            const second = await auto.executeAsync("auto_import_again.py", "import numpy, os, json");
+            assertEquals(second.metrics.packagesAutoLoaded.length, 0, "Loaded packages should not load again");
+
+            auto.destroy();
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testLazyImportFinder() {
+        const testName = "lazy import finder";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const { Nagini } = await import('../../src/nagini.js');
+            const workerPath = new URL('../../src/pyodide/worker/worker-dist.js', import.meta.url).href;
+            const lazy = await Nagini.createManager('pyodide', [], [], [], workerPath, { autoLoadImports: true });
+            await Nagini.waitForReady(lazy, 120000);
+
+            // The module name is built at runtime: the pre-scan cannot see it
+            const result = await lazy.executeAsync("lazy_import.py",
+`import importlib
+name = "".join(["n", "u", "m", "p", "y"])
+module = importlib.import_module(name)
+print(module.arange(3).tolist())`);
+            if (lazy.inputMode === "jspi") {
+                assert(!result.error, `Dynamic import should load its package: ${result.error?.message}`);
+                assertContains(result.stdout, "[0, 1, 2]", "Lazily loaded numpy should work");
+            } else {
+                assert(result.error, "Without JSPI the dynamic import should fail as before");
+            }
+
+            lazy.destroy();
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testExecutionBudget(manager) {
+        const testName = "execution budget";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const runaway = await manager.executeAsync("budget_loop.py",
+`n = 0
+try:
+    while True: n += 1
+except Exception:
+    print("swallowed")`, undefined, 30000, { budget: 10_000 });
+            assert(runaway.error, "The runaway loop should end with an error");
+            assertEquals(runaway.error.name, "BudgetExceeded", "The error should be BudgetExceeded");
+            assert(!runaway.stdout.includes("swallowed"), "except Exception should not catch BudgetExceeded");
+            assertEquals(runaway.metrics.budgetUsed, 10_000, "The whole budget should be charged");
+
+            const again = await manager.executeAsync("budget_loop_again.py",
+                "n = 0\nwhile True: n += 1", undefined, 30000, { budget: 10_000 });
+            assertEquals(again.error?.name, "BudgetExceeded", "The worker should take a new budgeted run");
+
+            const fits = await manager.executeAsync("budget_fits.py", "total = sum(i for i in range(100))\nprint(total)",
+                undefined, 30000, { budget: 10_000 });
+            assert(!fits.error, "Code within its budget should run normally");
+            assertContains(fits.stdout, "4950", "The worker should still be usable");
+            assert(fits.metrics.budgetUsed < 10_000, "Usage should be reported");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testAbortSignal(manager) {
+        const testName = "abort signal";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const queued = new AbortController();
+            const first = manager.executeAsync("abort_first.py", "import time\ntime.sleep(0.2)");
+            const second = manager.executeAsync("abort_queued.py", "print('should not run')",
+                undefined, 30000, { signal: queued.signal });
+            queued.abort();
+            const [firstResult, secondResult] = await Promise.allSettled([first, second]);
+            assertEquals(firstResult.status, "fulfilled", "The running execution should complete");
+            assertEquals(secondResult.status, "rejected", "A queued execution should reject on abort");
+            assertEquals(secondResult.reason.name, "AbortError", "Rejection should carry the signal's reason");
+
+            if (manager._interruptBuffer) {
+                const running = new AbortController();
+                const loop = manager.executeAsync("abort_running.py", "while True:\n    pass",
+                    undefined, 30000, { signal: running.signal });
+                setTimeout(() => running.abort(), 200);
+                const started = Date.now();
+                const loopResult = await Promise.allSettled([loop]);
+                assertEquals(loopResult[0].status, "rejected", "A running execution should reject on abort");
+
+                const after = await manager.executeAsync("abort_after.py", "print('warm')");
+                assertContains(after.stdout, "warm", "The interpreter should stay usable");
+                assert(Date.now() - started < 5000, "The interrupted loop should not hold the worker");
+            }
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+    static async testSyntaxCheck(manager) {
+        const testName = "syntax check";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const valid = await manager.check("total = sum(range(10))\nprint(total)");
+            assert(valid.valid, "Valid code should pass the check");
+            assertEquals(valid.error, null, "Valid code should carry no error");
+
+            const broken = await manager.check("x = 1\ndef f(:\n    pass");
+            assert(!broken.valid, "Broken code should fail the check");
+            assertEquals(broken.error.type, "SyntaxError", "The error type should be reported");
+            assertEquals(broken.error.line, 2, "The error line should be reported");
+
+            const indent = await manager.check("if True:\nprint('x')");
+            assertEquals(indent.error.type, "IndentationError", "Indentation errors should be typed");
+
+            // The check is not queued behind executions: it is answered while
+            // the run awaits
+            let runDone = false;
+            const run = manager.executeAsync("check_slow.py", "import asyncio\nawait asyncio.sleep(1)")
+                .then(() => { runDone = true; });
+            await new Promise(resolve => setTimeout(resolve, 200));
+            const during = await manager.check("y = (");
+            assert(!during.valid, "The check should still report the error");
+            assert(!runDone, "The check should overtake the pending execution");
+            await run;
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+
+    static async testWorkerPool() {
+        const testName = "worker pool";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const { Nagini } = await import('../../src/nagini.js');
+            const workerPath = new URL('../../src/pyodide/worker/worker-dist.js', import.meta.url).href;
+            const pool = await Nagini.createPool(2, [], [], [], workerPath);
+            await Nagini.waitForReady(pool, 120000);
+            assertEquals(pool.size, 2, "The pool should boot two workers");
+
+            // Default-namespace state stays on one worker
+            await pool.executeAsync("pool_state.py", "counter = 41");
+            const state = await pool.executeAsync("pool_state_read.py", "print(counter + 1)");
+            assertContains(state.stdout, "42", "Default-namespace globals should persist across runs");
+
+            // Namespaced runs spread: two slow runs occupy both workers
+            const slow = "import asyncio\nawait asyncio.sleep(0.5)";
+            const runs = [
+                pool.executeAsync("pool_a.py", slow, {}),
+                pool.executeAsync("pool_b.py", slow, {}),
+            ];
+            assertEquals(JSON.stringify(pool.queueDepths), "[1,1]", "Least-loaded dispatch should use both workers");
+            await Promise.all(runs);
+            assertEquals(JSON.stringify(pool.queueDepths), "[0,0]", "Queues should drain");
+
+            // An affinity key pins its runs (and their globals) to one worker
+            await pool.executeAsync("pool_key.py", "owner = 'student-7'", undefined, 30000, { affinity: "student-7" });
+            const pinned = await pool.executeAsync("pool_key_read.py", "print(owner)", undefined, 30000, { affinity: "student-7" });
+            assertContains(pinned.stdout, "student-7", "Runs sharing a key should share a worker");
+
+            // Files written through the pool are visible on every worker
+            await pool.fs("writeFile", { path: "/pool_data.txt", content: "shared" });
+            const reads = await Promise.all(pool.managers.map(m => m.fs("readFile", { path: "/pool_data.txt" })));
+            assert(reads.every(content => content === "shared"), "writeFile should reach every worker");
+
+            pool.destroy();
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+
+    static async testStandbyRestart() {
+        const testName = "standby restart";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const { Nagini } = await import('../../src/nagini.js');
+            const workerPath = new URL('../../src/pyodide/worker/worker-dist.js', import.meta.url).href;
+            const hot = await Nagini.createManager('pyodide', [], [], [], workerPath, { standby: 1 });
+            await Nagini.waitForReady(hot, 120000);
+
+            // The spare boots once the first worker is ready
+            const deadline = Date.now() + 120000;
+            while (hot.standbyReady < 1 && Date.now() < deadline) {
+                await new Promise(resolve => setTimeout(resolve, 200));
+            }
+            assertEquals(hot.standbyReady, 1, "A standby worker should be booted");
+
+            await hot.executeAsync("standby_state.py", "leftover = 1");
+            const start = performance.now();
+            await hot.restart();
+            const swapMs = performance.now() - start;
+            assert(swapMs < 1000, `Swapping in the standby should not boot Pyodide (${Math.round(swapMs)} ms)`);
+
+            const fresh = await hot.executeAsync("standby_fresh.py", "print('leftover' in globals())");
+            assertContains(fresh.stdout, "False", "The restarted interpreter should be fresh");
+
+            hot.destroy();
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+
+    static async testReset(manager) {
+        const testName = "interpreter reset";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            await manager.fs("writeFile", { path: "/home/pyodide/reset_helper.py", content: "VALUE = 1" });
+            await manager.executeAsync("reset_dirty.py",
+`import os, builtins, reset_helper
+leftover = 42
+builtins.input = lambda prompt="": "patched"
+os.makedirs("/tmp/reset_scratch", exist_ok=True)
+open("/tmp/reset_scratch/out.txt", "w").write("x")`);
+
+            const result = await manager.reset({ scratchDir: "/tmp/reset_scratch" });
+            assert(result.globalsRemoved >= 1, "The added globals should be removed");
+            assert(result.modulesEvicted >= 1, "The user module should be evicted");
+
+            const clean = await manager.executeAsync("reset_clean.py",
+`import sys, os, builtins
+print('leftover' in globals(), 'reset_helper' in sys.modules, builtins.input.__name__, os.listdir("/tmp/reset_scratch"))`);
+            assertContains(clean.stdout, "False False input_handler []", "The interpreter should be back to its post-init state");
+
+            const missive = await manager.executeAsync("reset_missive.py", "missive({'ok': True})");
+            assertEquals(JSON.parse(missive.missive).ok, true, "Nagini builtins should still work after a reset");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+
+    static async testExecuteBatch(manager) {
+        const testName = "execute batch";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const items = Array.from({ length: 100 }, (_, i) => ({
+                filename: `batch_${i}.py`,
+                code: i === 50 ? "1 / 0" : `print(${i} * 2)`,
+                namespace: {},
+            }));
+            const chunks = [];
+            const results = await manager.executeBatch(items, 30000, {
+                resultBatchSize: 25,
+                onResults: (chunk, index) => chunks.push([index, chunk.length]),
+            });
+
+            assertEquals(results.length, 100, "Every item should have a result");
+            assertContains(results[7].stdout, "14", "Items should run their own code");
+            assert(results[50].error, "The failing item should carry its error");
+            assert(!results[51].error, "An error should not stop the next items");
+            assertContains(results[99].stdout, "198", "The last item should run");
+            assert(chunks.length >= 4 && chunks[0][0] === 0, "Results should arrive in batches");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+
+    static async testExecuteMany(manager) {
+        const testName = "execute many";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const code = `def square(v):
+    return v * v
+assert square(n) == expected, f"square({n}) != {expected}"
+print(n)`;
+
+            const rows = await manager.executeMany(code, [
+                { n: 2, expected: 4 },
+                { n: 3, expected: 10 },
+            ]);
+            assertEquals(rows.length, 2, "One result per row namespace");
+            assert(!rows[0].error, "The passing case should have no error");
+            assertContains(rows[1].error.message, "square(3) != 10", "The failing case should carry its own error");
+
+            const count = 1000;
+            const n = Float64Array.from({ length: count }, (_, i) => i);
+            const expected = Array.from({ length: count }, (_, i) => i * i);
+            const columns = await manager.executeMany(code, { n, expected });
+            assertEquals(columns.length, count, "One result per column entry");
+            assert(columns.every(result => !result.error), "Every columnar case should pass");
+            assertContains(columns[999].stdout, "999", "Cases should read their own values");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+
+
+    static async testNamedNamespaces(manager) {
+        const testName = "named namespaces";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            await manager.createNamespace("session", { values: [1, 2, 3], step: 1 });
+
+            const first = await manager.executeAsync("ns_first.py", "total = sum(values) * step\nprint(total)", undefined, 30000, { namespaceRef: "session" });
+            assertContains(first.stdout, "6", "Code should see the initial context");
+
+            const size = await manager.updateNamespace("session", { step: 10 }, ["values"]);
+            assert(size > 0, "The patch should report the namespace size");
+
+            const second = await manager.executeAsync("ns_second.py", "print(total * step, 'values' in globals())", undefined, 30000, { namespaceRef: "session" });
+            assertContains(second.stdout, "60 False", "Assigned names should persist and the patch should apply");
+
+            const { values, skipped } = await manager.readNamespace("session", ["total", "step"]);
+            assertEquals(values.total, 6, "readNamespace should return the requested values");
+            assertEquals(skipped.length, 0, "Plain values should not be skipped");
+
+            assert(await manager.deleteNamespace("session"), "deleteNamespace should report the namespace existed");
+            let rejected = false;
+            await manager.executeAsync("ns_gone.py", "print(1)", undefined, 30000, { namespaceRef: "session" })
+                .catch(() => { rejected = true; });
+            assert(rejected, "A deleted namespace should no longer be usable");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
+
+
+
+    static async testPriorityLanes(manager) {
+        const testName = "priority lanes";
+        logTestStart("PyodideManager", testName);
+
+        try {
+            const order = [];
+            const run = (name, options) => manager.executeAsync(`${name}.py`, `print("${name}")`, {}, 30000, options)
+                .then(result => { order.push(result.stdout.trim()); return result; });
+
+            // Keeps the worker busy while the next calls queue up
+            const busy = run("busy");
+            const superseded = manager.supersededCount;
+            const stale = run("preview_1", { priority: "background", coalesceKey: "preview" });
+            const prefetch = run("prefetch", { priority: "prefetch" });
+            const latest = run("preview_2", { priority: "background", coalesceKey: "preview" });
+            const click = run("click");
+
+            let error = null;
+            await stale.catch(e => { error = e; });
+            assertEquals(error?.name, "Superseded", "A queued run should be superseded by a newer one with its key");
+            assertEquals(manager.supersededCount, superseded + 1, "supersededCount should count the superseded run");
+            assertEquals(manager.queueLengths.background, 1, "Only the latest preview should wait in the background lane");
+
+            await Promise.all([busy, prefetch, latest, click]);
+            assertEquals(order.join(","), "busy,click,preview_2,prefetch", "Lanes should run interactive, then background, then prefetch");
+
+            logTestPass(testName);
+            return { testName };
+        } catch (error) {
+            logTestFail(testName, error);
+            throw error;
+        }
+    }
 }
@@ -8,7 +8,48 @@
 
 import { ValidationUtils } from './utils/validation.js';
 
+/**
+ * Enforce bundled worker usage for Pyodide (cross-origin compatibility)
+ * @param {string} workerPath - Worker path given by the caller
+ * @returns {string} Path to worker-dist.js
+ * @throws {Error} If the path names neither worker-dist.js nor worker.js
+ */
+function bundledWorkerPath(workerPath) {
+  if (workerPath.includes('worker-dist.js')) return workerPath;
+  // Auto-convert to bundled worker
+  if (workerPath.includes('worker.js')) {
+    const finalWorkerPath = workerPath.replace('worker.js', 'worker-dist.js');
+    console.warn(`🐍 [Nagini] Auto-converted to bundled worker: ${finalWorkerPath}`);
+    console.warn(`🐍 [Nagini] Only bundled workers are supported for cross-origin compatibility.`);
+    console.warn(`🐍 [Nagini] Please update your code to use worker-dist.js directly.`);
+    return finalWorkerPath;
+  }
+  throw new Error(`🐍 [Nagini] Only bundled workers are supported for Pyodide. Expected 'worker-dist.js', got: ${workerPath}. Please build the worker first with 'npm run build' in the worker directory.`);
+}
+
+/**
+ * Extract Pyodide-specific config options
+ * @param {Object} options - createManager / createPool options
+ * @returns {Object} PyodideManager config
+ */
+function pyodideConfigFrom(options) {
+  return {
+    pyodideCdnUrl: options.pyodideCdnUrl,
+    snapshotCache: options.snapshotCache,
+    outputLimit: options.outputLimit,
+    captureBackend: options.captureBackend,
+    autoLoadImports: options.autoLoadImports,
+    standby: options.standby,
+    standbyMemoryLimit: options.standbyMemoryLimit,
+    maxNamespaces: options.maxNamespaces
+  };
+}
+
 // Export Nagini as ES module
+/**
+ * Entry point of the runtime: manager and pool factories, readiness and
+ * convenience helpers
+ */
 export const Nagini = {
     /**
      * Create a new manager instance with specified backend
@@ -22,6 +63,12 @@ export const Nagini = {
      * @param {Object} [options={}] - Backend-specific options
      * @param {string} [options.pyodideCdnUrl] - Custom Pyodide CDN URL (for local/offline use, e.g., Capacitor apps)
      * @param {boolean} [options.snapshotCache] - Cache the bare interpreter as a memory snapshot in IndexedDB for near-instant later boots (Pyodide backend only)
+     * @param {Object} [options.outputLimit] - Default {head, tail} character caps on captured stdout/stderr (Pyodide backend only)
+     * @param {string} [options.captureBackend='python'] - 'raw' captures stdout/stderr bytes below the Python layer, C extensions included (Pyodide backend only)
+     * @param {boolean} [options.autoLoadImports] - Load the Pyodide packages each snippet imports before running it (Pyodide backend only)
+     * @param {number} [options.standby] - Initialized workers kept in reserve for restart() and crash recovery (Pyodide backend only)
+     * @param {number} [options.standbyMemoryLimit] - Cap in bytes on the WebAssembly heap held by standby workers (Pyodide backend only)
+     * @param {number} [options.maxNamespaces=32] - Named namespaces kept in the worker before the least recently used is dropped (Pyodide backend only)
      * @param {string} [options.brythonJsPath] - Path to Brython JS file (Brython backend only)
      * @param {string} [options.brythonStdlibPath] - Path to Brython stdlib (Brython backend only)
      * @returns {Manager} New manager instance
@@ -31,27 +78,9 @@ export const Nagini = {
       ValidationUtils.validateBackend(backend, 'Nagini');
 
       if (backend.toLowerCase() === 'pyodide') {
-        // Enforce bundled worker usage for Pyodide (cross-origin compatibility)
-        let finalWorkerPath = workerPath;
-        if (!workerPath.includes('worker-dist.js')) {
-          // Auto-convert to bundled worker
-          if (workerPath.includes('worker.js')) {
-            finalWorkerPath = workerPath.replace('worker.js', 'worker-dist.js');
-            console.warn(`🐍 [Nagini] Auto-converted to bundled worker: ${finalWorkerPath}`);
-            console.warn(`🐍 [Nagini] Only bundled workers are supported for cross-origin compatibility.`);
-            console.warn(`🐍 [Nagini] Please update your code to use worker-dist.js directly.`);
-          } else {
-            throw new Error(`🐍 [Nagini] Only bundled workers are supported for Pyodide. Expected 'worker-dist.js', got: ${workerPath}. Please build the worker first with 'npm run build' in the worker directory.`);
-          }
-        }
-        
+        const finalWorkerPath = bundledWorkerPath(workerPath);
         const { PyodideManager } = await import('./pyodide/manager/manager.js');
-        // Extract Pyodide-specific config options
-        const pyodideConfig = {
-          pyodideCdnUrl: options.pyodideCdnUrl,
-          snapshotCache: options.snapshotCache
-        };
-        return new PyodideManager(packages, micropipPackages, filesToLoad, finalWorkerPath, pyodideConfig);
+        return new PyodideManager(packages, micropipPackages, filesToLoad, finalWorkerPath, pyodideConfigFrom(options));
       } else if (backend.toLowerCase() === 'brython') {
         // Brython doesn't require bundled workers - use as-is
         const { BrythonManager } = await import('./brython/manager/manager.js');
@@ -61,6 +90,26 @@ export const Nagini = {
       }
     },
 
+    /**
+     * Create a pool of Pyodide workers behind the PyodideManager interface
+     * (executeAsync, check, fs, queueInput, ...). Executions go to the least
+     * loaded worker; options.affinity on executeAsync pins related runs to
+     * one worker, and default-namespace runs stay on one worker
+     *
+     * @param {number} size - Number of workers (e.g. navigator.hardwareConcurrency)
+     * @param {string[]} packages - Python packages to install in every worker
+     * @param {string[]} micropipPackages - Python packages to install with micropip
+     * @param {Array} filesToLoad - Custom files to load into every worker's filesystem
+     * @param {string} workerPath - Path to the bundled web worker file (must be worker-dist.js)
+     * @param {Object} [options={}] - Same Pyodide options as createManager
+     * @returns {Promise<PyodideManagerPool>} New pool (wait for it with waitForReady)
+     */
+    createPool: async (size, packages, micropipPackages, filesToLoad, workerPath, options = {}) => {
+      const finalWorkerPath = bundledWorkerPath(workerPath);
+      const { PyodideManagerPool } = await import('./pyodide/manager/manager-pool.js');
+      return new PyodideManagerPool(size, packages, micropipPackages, filesToLoad, finalWorkerPath, pyodideConfigFrom(options));
+    },
+
     /**
      * Wait for a manager to be ready for execution
      *
@@ -8,710 +8,465 @@
 	else
 		root["Nagini"] = factory();
 })(self, () => {
-return /******/ (() => { // webpackBootstrap
+return /******/ (() => { // bundle of ./nagini.js
 /******/ 	"use strict";
-/******/ 	var __webpack_modules__ = ({
-
-/***/ 586:
-/***/ ((__unused_webpack___webpack_module__, __webpack_exports__, __webpack_require__) => {
-
-// ESM COMPAT FLAG
-__webpack_require__.r(__webpack_exports__);
-
-// EXPORTS
-__webpack_require__.d(__webpack_exports__, {
-  PyodideManager: () => (/* binding */ PyodideManager)
+var __nagini_modules__ = ({
+/***/ "./nagini.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./nagini.js
+__nagini_define__(__nagini_exports__, {
+  Nagini: () => Nagini,
 });
-
-// EXTERNAL MODULE: ../../utils/validation.js
-var validation = __webpack_require__(800);
-;// ../manager/manager-static-execution.js
-function _typeof(o) { "@babel/helpers - typeof"; return _typeof = "function" == typeof Symbol && "symbol" == typeof Symbol.iterator ? function (o) { return typeof o; } : function (o) { return o && "function" == typeof Symbol && o.constructor === Symbol && o !== Symbol.prototype ? "symbol" : typeof o; }, _typeof(o); }
-function _classCallCheck(a, n) { if (!(a instanceof n)) throw new TypeError("Cannot call a class as a function"); }
-function _defineProperties(e, r) { for (var t = 0; t < r.length; t++) { var o = r[t]; o.enumerable = o.enumerable || !1, o.configurable = !0, "value" in o && (o.writable = !0), Object.defineProperty(e, _toPropertyKey(o.key), o); } }
-function _createClass(e, r, t) { return r && _defineProperties(e.prototype, r), t && _defineProperties(e, t), Object.defineProperty(e, "prototype", { writable: !1 }), e; }
-function _toPropertyKey(t) { var i = _toPrimitive(t, "string"); return "symbol" == _typeof(i) ? i : i + ""; }
-function _toPrimitive(t, r) { if ("object" != _typeof(t) || !t) return t; var e = t[Symbol.toPrimitive]; if (void 0 !== e) { var i = e.call(t, r || "default"); if ("object" != _typeof(i)) return i; throw new TypeError("@@toPrimitive must return a primitive value."); } return ("string" === r ? String : Number)(t); }
 /**
- * PyodideManagerStaticExecutor - Static utility class for Python execution logic
- *
- * 🎯 PURPOSE:
- * - Provides a pure, testable static method for fire-and-forget execution
- * - Manages namespace forwarding and parameter validation
+ * Nagini - Python-in-Browser Runtime Manager
  *
- * Promise-based execution lives in PyodideManager.executeAsync, built on
- * id-correlated worker messages (see PyodideManager._postRequest): every
- * request carries an id, the worker echoes it back, and a single permanent
- * onmessage handler settles the matching promise. No handler replacement.
+ * This file provides a higher-level API with useful convenience methods
+ * for managing Python execution in the browser using different backends
+ * (Pyodide, <?> etc.).
  */
 
-
-var PyodideManagerStaticExecutor = /*#__PURE__*/function () {
-  function PyodideManagerStaticExecutor() {
-    _classCallCheck(this, PyodideManagerStaticExecutor);
-  }
-  return _createClass(PyodideManagerStaticExecutor, null, [{
-    key: "executeFile",
-    value:
-    /**
-     * Execute Python code in the worker with optional namespace isolation
-     *
-     * TECHNICAL DETAILS FOR PYODIDE:
-     * - This method sends a message to the web worker containing the execution request
-     * - The worker receives: {type: 'execute', filename, code, namespace?}
-     * - Worker calls pyodide.runPythonAsync(code) or pyodide.runPythonAsync(code, {globals})
-     *
-     * NAMESPACE FLOW:
-     * 1. JavaScript object namespace -> sent to worker via postMessage
-     * 2. Worker receives it as JavaScript object
-     * 3. Worker passes it to pyodide.runPythonAsync() as execution globals
-     * 4. Pyodide converts JavaScript object to Python dict automatically
-     * 5. Python code executes with that dict as its namespace
-     *
-     * @param {Worker} worker - Web worker instance for executing Python code
-     * @param {boolean} isReady - Whether Pyodide is ready for execution
-     * @param {string} filename - Name for this execution (for tracking and debugging)
-     * @param {string} code - Python code to execute
-     * @param {Object|undefined} [namespace] - Optional namespace object for Python execution
-     * @returns {void} - No return value, sends message to worker
-     * @throws {Error} If parameters are invalid or worker is not ready
-     */
-    function executeFile(worker, isReady, filename, code) {
-      var namespace = arguments.length > 4 && arguments[4] !== undefined ? arguments[4] : undefined;
-      // Validate parameters using ValidationUtils
-      validation/* ValidationUtils */.n.validateWorker(worker, 'PyodideManagerStaticExecutor');
-      validation/* ValidationUtils */.n.validateBoolean(isReady, 'isReady', 'PyodideManagerStaticExecutor');
-      validation/* ValidationUtils */.n.validateExecutionParams(filename, code, namespace, 'PyodideManagerStaticExecutor');
-      if (!isReady) {
-        console.warn("Manager not ready, execution will be delayed until initialization completes");
-        return;
-      }
-
-      // Prepare message for worker
-      var message = {
-        type: "execute",
-        filename: filename,
-        code: code
-      };
-
-      // Only include namespace in message if it's provided
-      // This is crucial: we don't want to send undefined/null to the worker
-      if (namespace !== undefined) {
-        message.namespace = namespace;
-      }
-      try {
-        worker.postMessage(message);
-      } catch (error) {
-        console.error("Failed to dispatch execution: ".concat(error.message));
-      }
-    }
-  }]);
-}();
+const { ValidationUtils } = __nagini_require__("./utils/validation.js");
 
 /**
- * @typedef {Object} ExecutionResult
- * @property {string} filename - Name of the executed file
- * @property {number} time - Execution time in milliseconds
- * @property {string} stdout - Standard output from Python execution
- * @property {string} stderr - Standard error from Python execution
- * @property {string|null} missive - Missive as a JSON string (parse on the consumer side)
- * @property {string[]} figures - Base64 encoded matplotlib figures
- * @property {Object|null} error - JavaScript execution error object
- * @property {string} timestamp - ISO timestamp of execution
- * @property {boolean} [executedWithNamespace] - Whether execution used namespace
+ * Enforce bundled worker usage for Pyodide (cross-origin compatibility)
+ * @param {string} workerPath - Worker path given by the caller
+ * @returns {string} Path to worker-dist.js
+ * @throws {Error} If the path names neither worker-dist.js nor worker.js
  */
-;// ../manager/manager-input.js
-function manager_input_typeof(o) { "@babel/helpers - typeof"; return manager_input_typeof = "function" == typeof Symbol && "symbol" == typeof Symbol.iterator ? function (o) { return typeof o; } : function (o) { return o && "function" == typeof Symbol && o.constructor === Symbol && o !== Symbol.prototype ? "symbol" : typeof o; }, manager_input_typeof(o); }
-function manager_input_classCallCheck(a, n) { if (!(a instanceof n)) throw new TypeError("Cannot call a class as a function"); }
-function manager_input_defineProperties(e, r) { for (var t = 0; t < r.length; t++) { var o = r[t]; o.enumerable = o.enumerable || !1, o.configurable = !0, "value" in o && (o.writable = !0), Object.defineProperty(e, manager_input_toPropertyKey(o.key), o); } }
-function manager_input_createClass(e, r, t) { return r && manager_input_defineProperties(e.prototype, r), t && manager_input_defineProperties(e, t), Object.defineProperty(e, "prototype", { writable: !1 }), e; }
-function manager_input_toPropertyKey(t) { var i = manager_input_toPrimitive(t, "string"); return "symbol" == manager_input_typeof(i) ? i : i + ""; }
-function manager_input_toPrimitive(t, r) { if ("object" != manager_input_typeof(t) || !t) return t; var e = t[Symbol.toPrimitive]; if (void 0 !== e) { var i = e.call(t, r || "default"); if ("object" != manager_input_typeof(i)) return i; throw new TypeError("@@toPrimitive must return a primitive value."); } return ("string" === r ? String : Number)(t); }
+function bundledWorkerPath(workerPath) {
+  if (workerPath.includes('worker-dist.js')) return workerPath;
+  // Auto-convert to bundled worker
+  if (workerPath.includes('worker.js')) {
+    const finalWorkerPath = workerPath.replace('worker.js', 'worker-dist.js');
+    console.warn(`🐍 [Nagini] Auto-converted to bundled worker: ${finalWorkerPath}`);
+    console.warn(`🐍 [Nagini] Only bundled workers are supported for cross-origin compatibility.`);
+    console.warn(`🐍 [Nagini] Please update your code to use worker-dist.js directly.`);
+    return finalWorkerPath;
+  }
+  throw new Error(`🐍 [Nagini] Only bundled workers are supported for Pyodide. Expected 'worker-dist.js', got: ${workerPath}. Please build the worker first with 'npm run build' in the worker directory.`);
+}
+
 /**
- * PyodideManagerInput - Input handling functionality for PyodideManager
- *
- * Contains all input-related methods extracted from PyodideManager to improve
- * code organization and keep file sizes manageable.
- *
- * Features:
- * - Input queue management
- * - Callback system for interactive input
- * - Input state tracking
- * - Integration with Python input() function
+ * Extract Pyodide-specific config options
+ * @param {Object} options - createManager / createPool options
+ * @returns {Object} PyodideManager config
  */
+function pyodideConfigFrom(options) {
+  return {
+    pyodideCdnUrl: options.pyodideCdnUrl,
+    snapshotCache: options.snapshotCache,
+    outputLimit: options.outputLimit,
+    captureBackend: options.captureBackend,
+    autoLoadImports: options.autoLoadImports,
+    standby: options.standby,
+    standbyMemoryLimit: options.standbyMemoryLimit,
+    maxNamespaces: options.maxNamespaces
+  };
+}
 
-
-
+// Export Nagini as ES module
 /**
- * Static class containing input handling functionality for PyodideManager
+ * Entry point of the runtime: manager and pool factories, readiness and
+ * convenience helpers
  */
-var PyodideManagerInput = /*#__PURE__*/function () {
-  function PyodideManagerInput() {
-    manager_input_classCallCheck(this, PyodideManagerInput);
-  }
-  return manager_input_createClass(PyodideManagerInput, null, [{
-    key: "initializeInputState",
-    value:
+const Nagini = {
     /**
-     * Initialize input state for a PyodideManager instance
-     * @param {PyodideManager} manager - Manager instance to initialize
-     * @returns {void}
+     * Create a new manager instance with specified backend
+     * @param {string} [backend='pyodide'] - Backend to use ('pyodide' or 'brython')
+     * @param {string[]} packages - Python packages to install
+     * @param {string[]} micropipPackages - Python packages to install with micropip
+     * @param {Array} filesToLoad - Custom files to load into filesystem
+     *                              Array of objects with {url, path} properties
+     *                              Supports both local paths and remote URLs (S3, etc.)
+     * @param {string} workerPath - Path to the bundled web worker file (must be worker-dist.js)
+     * @param {Object} [options={}] - Backend-specific options
+     * @param {string} [options.pyodideCdnUrl] - Custom Pyodide CDN URL (for local/offline use, e.g., Capacitor apps)
+     * @param {boolean} [options.snapshotCache] - Cache the bare interpreter as a memory snapshot in IndexedDB for near-instant later boots (Pyodide backend only)
+     * @param {Object} [options.outputLimit] - Default {head, tail} character caps on captured stdout/stderr (Pyodide backend only)
+     * @param {string} [options.captureBackend='python'] - 'raw' captures stdout/stderr bytes below the Python layer, C extensions included (Pyodide backend only)
+     * @param {boolean} [options.autoLoadImports] - Load the Pyodide packages each snippet imports before running it (Pyodide backend only)
+     * @param {number} [options.standby] - Initialized workers kept in reserve for restart() and crash recovery (Pyodide backend only)
+     * @param {number} [options.standbyMemoryLimit] - Cap in bytes on the WebAssembly heap held by standby workers (Pyodide backend only)
+     * @param {number} [options.maxNamespaces=32] - Named namespaces kept in the worker before the least recently used is dropped (Pyodide backend only)
+     * @param {string} [options.brythonJsPath] - Path to Brython JS file (Brython backend only)
+     * @param {string} [options.brythonStdlibPath] - Path to Brython stdlib (Brython backend only)
+     * @returns {Manager} New manager instance
      */
-    function initializeInputState(manager) {
-      manager.inputState = {
-        isWaitingForInput: false,
-        currentPrompt: "",
-        inputCallback: null,
-        inputQueue: [] // For programmatic input provision
-      };
-    }
+    createManager: async (backend = 'pyodide', packages, micropipPackages, filesToLoad, workerPath, options = {}) => {
+      // Validate backend parameter
+      ValidationUtils.validateBackend(backend, 'Nagini');
+
+      if (backend.toLowerCase() === 'pyodide') {
+        const finalWorkerPath = bundledWorkerPath(workerPath);
+        const { PyodideManager } = await Promise.resolve(__nagini_require__("./pyodide/manager/manager.js"));
+        return new PyodideManager(packages, micropipPackages, filesToLoad, finalWorkerPath, pyodideConfigFrom(options));
+      } else if (backend.toLowerCase() === 'brython') {
+        // Brython doesn't require bundled workers - use as-is
+        const { BrythonManager } = await Promise.resolve(__nagini_require__("./brython/manager/manager.js"));
+        return new BrythonManager(packages, filesToLoad, '', workerPath, options);
+      } else {
+        throw new Error(`🐍 [Nagini] ${backend} backend not yet implemented`);
+      }
+    },
 
     /**
-     * Provide input to Python code that's waiting for input
+     * Create a pool of Pyodide workers behind the PyodideManager interface
+     * (executeAsync, check, fs, queueInput, ...). Executions go to the least
+     * loaded worker; options.affinity on executeAsync pins related runs to
+     * one worker, and default-namespace runs stay on one worker
      *
-     * The empty string is a valid answer: Python's input() returns "" when
-     * the user just presses Enter, so only the type is enforced here.
-     *
-     * @param {PyodideManager} manager - Manager instance
-     * @param {string} input - The input value to provide (may be empty)
-     * @returns {void}
+     * @param {number} size - Number of workers (e.g. navigator.hardwareConcurrency)
+     * @param {string[]} packages - Python packages to install in every worker
+     * @param {string[]} micropipPackages - Python packages to install with micropip
+     * @param {Array} filesToLoad - Custom files to load into every worker's filesystem
+     * @param {string} workerPath - Path to the bundled web worker file (must be worker-dist.js)
+     * @param {Object} [options={}] - Same Pyodide options as createManager
+     * @returns {Promise<PyodideManagerPool>} New pool (wait for it with waitForReady)
      */
-  }, {
-    key: "provideInput",
-    value: function provideInput(manager, input) {
-      validation/* ValidationUtils */.n.validateString(input, 'input', 'PyodideManagerInput', true);
-      if (!manager.isReady) {
-        console.error("Manager not ready");
-        return;
-      }
-      manager.worker.postMessage({
-        type: "input_response",
-        input: input
-      });
-      manager.inputState.isWaitingForInput = false;
-      manager.inputState.currentPrompt = "";
-    }
+    createPool: async (size, packages, micropipPackages, filesToLoad, workerPath, options = {}) => {
+      const finalWorkerPath = bundledWorkerPath(workerPath);
+      const { PyodideManagerPool } = await Promise.resolve(__nagini_require__("./pyodide/manager/manager-pool.js"));
+      return new PyodideManagerPool(size, packages, micropipPackages, filesToLoad, finalWorkerPath, pyodideConfigFrom(options));
+    },
 
     /**
-     * Queue input for later provision when Python code requests it
+     * Wait for a manager to be ready for execution
      *
-     * The empty string is a valid answer, same as in provideInput.
+     * Built-in managers expose a readyPromise that resolves on the worker
+     * "ready" message and rejects with the original cause when
+     * initialization fails (bad worker path, CDN failure, ...). Managers
+     * without a readyPromise fall back to polling isReady.
      *
-     * @param {PyodideManager} manager - Manager instance
-     * @param {string} input - The input value to queue (may be empty)
-     * @returns {void}
+     * @param {Manager} manager - Manager instance to wait for
+     * @param {number} [timeout] - Timeout in milliseconds (default: 30000)
+     * @returns {Promise<void>} Resolves when manager is ready
      */
-  }, {
-    key: "queueInput",
-    value: function queueInput(manager, input) {
-      validation/* ValidationUtils */.n.validateString(input, 'input', 'PyodideManagerInput', true);
-      manager.inputState.inputQueue.push(input);
-    }
+    waitForReady: async (manager, timeout = 30000) => {
+      if (manager.readyPromise) {
+        let timer;
+        try {
+          await Promise.race([
+            manager.readyPromise,
+            new Promise((_, reject) => {
+              timer = setTimeout(
+                () => reject(new Error(`🐍 [Nagini] Manager initialization timeout after ${timeout}ms`)),
+                timeout
+              );
+            }),
+          ]);
+        } finally {
+          clearTimeout(timer);
+        }
+        return;
+      }
 
-    /**
-     * Set a callback function to be called when input is required
-     *
-     * @param {PyodideManager} manager - Manager instance
-     * @param {Function} callback - Function to call when input is needed
-     * @returns {void}
-     */
-  }, {
-    key: "setInputCallback",
-    value: function setInputCallback(manager, callback) {
-      if (callback !== null) {
-        validation/* ValidationUtils */.n.validateFunction(callback, 'callback', 'PyodideManagerInput');
+      const startTime = Date.now();
+      while (!manager.isReady) {
+        if (Date.now() - startTime > timeout) {
+          throw new Error(`🐍 [Nagini] Manager initialization timeout after ${timeout}ms`);
+        }
+        await new Promise((resolve) => setTimeout(resolve, 100));
       }
-      manager.inputState.inputCallback = callback;
-    }
+    },
 
     /**
-     * Check if Python code is currently waiting for input
-     *
-     * @param {PyodideManager} manager - Manager instance
-     * @returns {boolean} True if waiting for input, false otherwise
+     * Execute Python code from a URL
+     * @param {string} url - URL to fetch Python code from
+     * @param {Manager} manager - Manager instance to use
+     * @param {Object} [namespace] - Optional namespace for execution
+     * @returns {Promise<Object>} Execution result
      */
-  }, {
-    key: "isWaitingForInput",
-    value: function isWaitingForInput(manager) {
-      return manager.inputState.isWaitingForInput;
-    }
+    executeFromUrl: async (url, manager, namespace = undefined) => {
+      if (!manager.isReady) {
+        throw new Error(
+          "🐍 [Nagini] Manager not ready. Call Nagini.waitForReady() first."
+        );
+      }
+
+      const response = await fetch(url);
+      if (!response.ok) {
+        throw new Error(`🐍 [Nagini] Failed to fetch ${url}: HTTP ${response.status}`);
+      }
+
+      const code = await response.text();
+      const filename = url.split("/").pop() || "unknown.py";
+
+      return manager.executeAsync(filename, code, namespace);
+    },
 
     /**
-     * Get the current input prompt if waiting for input
-     *
-     * @param {PyodideManager} manager - Manager instance
-     * @returns {string} Current input prompt or empty string
+     * Get list of supported backends
+     * @returns {string[]} Array of supported backend names
      */
-  }, {
-    key: "getCurrentPrompt",
-    value: function getCurrentPrompt(manager) {
-      return manager.inputState.currentPrompt;
-    }
+    getSupportedBackends: () => {
+      return ['pyodide', 'brython'];
+    },
 
     /**
-     * Handle input-related message from worker
-     *
-     * @param {PyodideManager} manager - Manager instance
-     * @param {Object} data - Message data from worker
-     * @returns {void}
+     * Check if a backend is supported
+     * @param {string} backend - Backend name to check
+     * @returns {boolean} True if backend is supported
      */
-  }, {
-    key: "handleInputMessage",
-    value: function handleInputMessage(manager, data) {
-      // Handle input request from worker
-      if (data.type === "input_required") {
-        manager.inputState.isWaitingForInput = true;
-        manager.inputState.currentPrompt = data.prompt;
-
-        // Check if we have queued input
-        if (manager.inputState.inputQueue.length > 0) {
-          var input = manager.inputState.inputQueue.shift(); // Dequeue the next input
-          this.provideInput(manager, input);
-        } else {
-          // Call the input callback if set
-          if (manager.inputState.inputCallback) {
-            manager.inputState.inputCallback(data.prompt || "");
-          } else {
-            console.warn("No input callback set and no queued input. " + "Use setInputCallback() or queueInput() to handle input requests.");
-          }
-        }
-      }
+    isBackendSupported: (backend) => {
+      return Nagini.getSupportedBackends().includes(backend.toLowerCase());
     }
+  };
+/***/ }),
 
-    /**
-     * Reset input state (called on execution completion)
-     *
-     * @param {PyodideManager} manager - Manager instance
-     * @returns {void}
-     */
-  }, {
-    key: "resetInputState",
-    value: function resetInputState(manager) {
-      manager.inputState.isWaitingForInput = false;
-      manager.inputState.currentPrompt = "";
-    }
-  }]);
-}();
-;// ../manager/manager-fs.js
-function manager_fs_typeof(o) { "@babel/helpers - typeof"; return manager_fs_typeof = "function" == typeof Symbol && "symbol" == typeof Symbol.iterator ? function (o) { return typeof o; } : function (o) { return o && "function" == typeof Symbol && o.constructor === Symbol && o !== Symbol.prototype ? "symbol" : typeof o; }, manager_fs_typeof(o); }
-function ownKeys(e, r) { var t = Object.keys(e); if (Object.getOwnPropertySymbols) { var o = Object.getOwnPropertySymbols(e); r && (o = o.filter(function (r) { return Object.getOwnPropertyDescriptor(e, r).enumerable; })), t.push.apply(t, o); } return t; }
-function _objectSpread(e) { for (var r = 1; r < arguments.length; r++) { var t = null != arguments[r] ? arguments[r] : {}; r % 2 ? ownKeys(Object(t), !0).forEach(function (r) { _defineProperty(e, r, t[r]); }) : Object.getOwnPropertyDescriptors ? Object.defineProperties(e, Object.getOwnPropertyDescriptors(t)) : ownKeys(Object(t)).forEach(function (r) { Object.defineProperty(e, r, Object.getOwnPropertyDescriptor(t, r)); }); } return e; }
-function _defineProperty(e, r, t) { return (r = manager_fs_toPropertyKey(r)) in e ? Object.defineProperty(e, r, { value: t, enumerable: !0, configurable: !0, writable: !0 }) : e[r] = t, e; }
-function _regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return _regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, _regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, _regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), _regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", _regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), _regeneratorDefine2(u), _regeneratorDefine2(u, o, "Generator"), _regeneratorDefine2(u, n, function () { return this; }), _regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function _regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } _regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { _regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, _regeneratorDefine2(e, r, n, t); }
-function asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function _asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
-function manager_fs_classCallCheck(a, n) { if (!(a instanceof n)) throw new TypeError("Cannot call a class as a function"); }
-function manager_fs_defineProperties(e, r) { for (var t = 0; t < r.length; t++) { var o = r[t]; o.enumerable = o.enumerable || !1, o.configurable = !0, "value" in o && (o.writable = !0), Object.defineProperty(e, manager_fs_toPropertyKey(o.key), o); } }
-function manager_fs_createClass(e, r, t) { return r && manager_fs_defineProperties(e.prototype, r), t && manager_fs_defineProperties(e, t), Object.defineProperty(e, "prototype", { writable: !1 }), e; }
-function manager_fs_toPropertyKey(t) { var i = manager_fs_toPrimitive(t, "string"); return "symbol" == manager_fs_typeof(i) ? i : i + ""; }
-function manager_fs_toPrimitive(t, r) { if ("object" != manager_fs_typeof(t) || !t) return t; var e = t[Symbol.toPrimitive]; if (void 0 !== e) { var i = e.call(t, r || "default"); if ("object" != manager_fs_typeof(i)) return i; throw new TypeError("@@toPrimitive must return a primitive value."); } return ("string" === r ? String : Number)(t); }
+/***/ "./utils/validation.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./utils/validation.js
+__nagini_define__(__nagini_exports__, {
+  ValidationUtils: () => ValidationUtils,
+});
 /**
- * PyodideManagerFS - Filesystem operations for PyodideManager
- *
- * Contains all filesystem-related methods extracted from PyodideManager to improve
- * code organization and keep file sizes manageable.
+ * Validation Utilities for Nagini
  *
- * Features:
- * - File operations (read, write, mkdir, exists, listdir)
- * - Promise-based async filesystem interface
- * - Error handling and timeout management
+ * Centralized parameter validation functions used across all components
+ * to ensure consistent error handling and type checking.
  *
- * Requests are id-correlated (see PyodideManager._postRequest): a filesystem
- * operation can run while an execution is in flight without any handler
- * clobbering.
+ * @module ValidationUtils
  */
 
-
-
 /**
- * Static class containing filesystem functionality for PyodideManager
+ * General validation utility class with static methods for parameter validation
  */
-var PyodideManagerFS = /*#__PURE__*/function () {
-  function PyodideManagerFS() {
-    manager_fs_classCallCheck(this, PyodideManagerFS);
+class ValidationUtils {
+  /**
+   * Validate that a value is an array
+   * @param {any} value - Value to validate
+   * @param {string} paramName - Parameter name for error messages
+   * @param {string} [component] - Component name for error context
+   * @throws {Error} If value is not an array
+   */
+  static validateArray(value, paramName, component = 'Component') {
+    if (!Array.isArray(value)) {
+      throw new Error(`🔧 [${component}] ${paramName} must be an array, got ${typeof value}`);
+    }
   }
-  return manager_fs_createClass(PyodideManagerFS, null, [{
-    key: "fs",
-    value: (
-    /**
-     * Filesystem operations proxy - main public interface
-     *
-     * @param {PyodideManager} manager - Manager instance
-     * @param {FSOperation} operation - FS operation: 'writeFile', 'readFile', 'mkdir', 'exists', 'listdir'
-     * @param {FSOperationParams} params - Operation parameters
-     * @returns {Promise<any>} Operation result
-     * @throws {Error} If operation fails or times out
-     */
-    function () {
-      var _fs = _asyncToGenerator(/*#__PURE__*/_regenerator().m(function _callee(manager, operation, params) {
-        var timeoutMs,
-          result,
-          _args = arguments,
-          _t;
-        return _regenerator().w(function (_context) {
-          while (1) switch (_context.n) {
-            case 0:
-              timeoutMs = _args.length > 3 && _args[3] !== undefined ? _args[3] : 10000;
-              validation/* ValidationUtils */.n.validateString(operation, 'operation', 'PyodideManagerFS');
-              validation/* ValidationUtils */.n.validateObject(params, 'params', 'PyodideManagerFS');
-              _context.n = 1;
-              return PyodideManagerFS._sendFSCommand(manager, operation, params, timeoutMs);
-            case 1:
-              result = _context.v;
-              _t = operation;
-              _context.n = _t === "readFile" ? 2 : _t === "exists" ? 3 : _t === "listdir" ? 4 : _t === "writeFile" ? 5 : _t === "mkdir" ? 5 : 5;
-              break;
-            case 2:
-              return _context.a(2, result.content);
-            case 3:
-              return _context.a(2, result.exists);
-            case 4:
-              return _context.a(2, result.files);
-            case 5:
-              return _context.a(2, result);
-            case 6:
-              return _context.a(2);
-          }
-        }, _callee);
-      }));
-      function fs(_x, _x2, _x3) {
-        return _fs.apply(this, arguments);
-      }
-      return fs;
-    }()
-    /**
-     * Write file to Pyodide filesystem
-     *
-     * @param {PyodideManager} manager - Manager instance
-     * @param {string} path - File path
-     * @param {string} content - File content
-     * @returns {Promise<Object>} Operation result
-     */
-    )
-  }, {
-    key: "writeFile",
-    value: (function () {
-      var _writeFile = _asyncToGenerator(/*#__PURE__*/_regenerator().m(function _callee2(manager, path, content) {
-        return _regenerator().w(function (_context2) {
-          while (1) switch (_context2.n) {
-            case 0:
-              validation/* ValidationUtils */.n.validateString(path, 'path', 'PyodideManagerFS');
-              validation/* ValidationUtils */.n.validateString(content, 'content', 'PyodideManagerFS');
-              return _context2.a(2, PyodideManagerFS.fs(manager, 'writeFile', {
-                path: path,
-                content: content
-              }));
-          }
-        }, _callee2);
-      }));
-      function writeFile(_x4, _x5, _x6) {
-        return _writeFile.apply(this, arguments);
-      }
-      return writeFile;
-    }()
-    /**
-     * Read file from Pyodide filesystem
-     *
-     * @param {PyodideManager} manager - Manager instance
-     * @param {string} path - File path
-     * @returns {Promise<string>} File content
-     */
-    )
-  }, {
-    key: "readFile",
-    value: (function () {
-      var _readFile = _asyncToGenerator(/*#__PURE__*/_regenerator().m(function _callee3(manager, path) {
-        return _regenerator().w(function (_context3) {
-          while (1) switch (_context3.n) {
-            case 0:
-              validation/* ValidationUtils */.n.validateString(path, 'path', 'PyodideManagerFS');
-              return _context3.a(2, PyodideManagerFS.fs(manager, 'readFile', {
-                path: path
-              }));
-          }
-        }, _callee3);
-      }));
-      function readFile(_x7, _x8) {
-        return _readFile.apply(this, arguments);
+
+  /**
+   * Validate that a value is a string
+   * @param {any} value - Value to validate
+   * @param {string} paramName - Parameter name for error messages
+   * @param {string} [component] - Component name for error context
+   * @param {boolean} [allowEmpty=false] - Whether to allow empty strings
+   * @throws {Error} If value is not a string or is empty when not allowed
+   */
+  static validateString(value, paramName, component = 'Component', allowEmpty = false) {
+    if (typeof value !== 'string') {
+      throw new Error(`🔧 [${component}] ${paramName} must be a string, got ${typeof value}`);
+    }
+    if (!allowEmpty && value.trim().length === 0) {
+      throw new Error(`🔧 [${component}] ${paramName} cannot be empty`);
+    }
+  }
+
+  /**
+   * Validate that a value is a boolean
+   * @param {any} value - Value to validate
+   * @param {string} paramName - Parameter name for error messages
+   * @param {string} [component] - Component name for error context
+   * @throws {Error} If value is not a boolean
+   */
+  static validateBoolean(value, paramName, component = 'Component') {
+    if (typeof value !== 'boolean') {
+      throw new Error(`🔧 [${component}] ${paramName} must be a boolean, got ${typeof value}`);
+    }
+  }
+
+  /**
+   * Validate that a value is a function
+   * @param {any} value - Value to validate
+   * @param {string} paramName - Parameter name for error messages
+   * @param {string} [component] - Component name for error context
+   * @throws {Error} If value is not a function
+   */
+  static validateFunction(value, paramName, component = 'Component') {
+    if (typeof value !== 'function') {
+      throw new Error(`🔧 [${component}] ${paramName} must be a function, got ${typeof value}`);
+    }
+  }
+
+  /**
+   * Validate that a value is an object (not null, not array)
+   * @param {any} value - Value to validate
+   * @param {string} paramName - Parameter name for error messages
+   * @param {string} [component] - Component name for error context
+   * @throws {Error} If value is not a plain object
+   */
+  static validateObject(value, paramName, component = 'Component') {
+    if (typeof value !== 'object' || value === null || Array.isArray(value)) {
+      throw new Error(`🔧 [${component}] ${paramName} must be a plain object, got ${typeof value}`);
+    }
+  }
+
+  /**
+   * Validate Worker instance
+   * @param {any} worker - Worker to validate
+   * @param {string} [component] - Component name for error context
+   * @throws {Error} If worker is not valid
+   */
+  static validateWorker(worker, component = 'Component') {
+    if (!worker || typeof worker.postMessage !== 'function') {
+      throw new Error(`🔧 [${component}] Invalid worker instance - missing postMessage method`);
+    }
+  }
+
+  /**
+   * Validate Pyodide instance
+   * @param {any} pyodide - Pyodide instance to validate
+   * @param {string} [component] - Component name for error context
+   * @throws {Error} If pyodide is not valid
+   */
+  static validatePyodide(pyodide, component = 'Component') {
+    if (!pyodide) {
+      throw new Error(`🔧 [${component}] Pyodide instance is required`);
+    }
+    if (!pyodide.FS) {
+      throw new Error(`🔧 [${component}] Invalid Pyodide instance - missing FS`);
+    }
+    if (typeof pyodide.runPython !== 'function') {
+      throw new Error(`🔧 [${component}] Invalid Pyodide instance - missing runPython`);
+    }
+  }
+
+  /**
+   * Validate file objects array for FileLoader
+   * @param {Array} filesToLoad - Array of file objects
+   * @param {string} [component] - Component name for error context
+   * @throws {Error} If any file object is invalid
+   */
+      static validateFilesToLoad(filesToLoad, component = 'PyodideFileLoader') {
+    this.validateArray(filesToLoad, 'filesToLoad', component);
+
+    for (const [index, file] of filesToLoad.entries()) {
+      if (!file || typeof file !== 'object') {
+        throw new Error(`🔧 [${component}] filesToLoad[${index}] must be an object`);
       }
-      return readFile;
-    }()
-    /**
-     * Create directory in Pyodide filesystem
-     *
-     * @param {PyodideManager} manager - Manager instance
-     * @param {string} path - Directory path
-     * @returns {Promise<Object>} Operation result
-     */
-    )
-  }, {
-    key: "mkdir",
-    value: (function () {
-      var _mkdir = _asyncToGenerator(/*#__PURE__*/_regenerator().m(function _callee4(manager, path) {
-        return _regenerator().w(function (_context4) {
-          while (1) switch (_context4.n) {
-            case 0:
-              validation/* ValidationUtils */.n.validateString(path, 'path', 'PyodideManagerFS');
-              return _context4.a(2, PyodideManagerFS.fs(manager, 'mkdir', {
-                path: path
-              }));
-          }
-        }, _callee4);
-      }));
-      function mkdir(_x9, _x0) {
-        return _mkdir.apply(this, arguments);
+      this.validateString(file.url, `filesToLoad[${index}].url`, component);
+      this.validateString(file.path, `filesToLoad[${index}].path`, component);
+    }
+  }
+
+  /**
+   * Validate packages array
+   * @param {Array} packages - Array of package names
+   * @param {string} [component] - Component name for error context
+   * @throws {Error} If packages array is invalid
+   */
+  static validatePackages(packages, component = 'Component') {
+    this.validateArray(packages, 'packages', component);
+
+    for (const [index, pkg] of packages.entries()) {
+      if (typeof pkg !== 'string') {
+        throw new Error(`🔧 [${component}] packages[${index}] must be a string, got ${typeof pkg}`);
       }
-      return mkdir;
-    }()
-    /**
-     * Check if path exists in Pyodide filesystem
-     *
-     * @param {PyodideManager} manager - Manager instance
-     * @param {string} path - Path to check
-     * @returns {Promise<boolean>} True if exists, false otherwise
-     */
-    )
-  }, {
-    key: "exists",
-    value: (function () {
-      var _exists = _asyncToGenerator(/*#__PURE__*/_regenerator().m(function _callee5(manager, path) {
-        return _regenerator().w(function (_context5) {
-          while (1) switch (_context5.n) {
-            case 0:
-              validation/* ValidationUtils */.n.validateString(path, 'path', 'PyodideManagerFS');
-              return _context5.a(2, PyodideManagerFS.fs(manager, 'exists', {
-                path: path
-              }));
-          }
-        }, _callee5);
-      }));
-      function exists(_x1, _x10) {
-        return _exists.apply(this, arguments);
+      if (pkg.trim().length === 0) {
+        throw new Error(`🔧 [${component}] packages[${index}] cannot be empty`);
       }
-      return exists;
-    }()
-    /**
-     * List directory contents in Pyodide filesystem
-     *
-     * @param {PyodideManager} manager - Manager instance
-     * @param {string} path - Directory path
-     * @returns {Promise<string[]>} Array of file/directory names
-     */
-    )
-  }, {
-    key: "listdir",
-    value: (function () {
-      var _listdir = _asyncToGenerator(/*#__PURE__*/_regenerator().m(function _callee6(manager, path) {
-        return _regenerator().w(function (_context6) {
-          while (1) switch (_context6.n) {
-            case 0:
-              validation/* ValidationUtils */.n.validateString(path, 'path', 'PyodideManagerFS');
-              return _context6.a(2, PyodideManagerFS.fs(manager, 'listdir', {
-                path: path
-              }));
-          }
-        }, _callee6);
-      }));
-      function listdir(_x11, _x12) {
-        return _listdir.apply(this, arguments);
+    }
+  }
+
+  /**
+   * Validate namespace object (optional parameter)
+   * @param {any} namespace - Namespace to validate
+   * @param {string} [component] - Component name for error context
+   * @throws {Error} If namespace is provided but invalid
+   */
+  static validateNamespace(namespace, component = 'Component') {
+    if (namespace !== undefined) {
+      this.validateObject(namespace, 'namespace', component);
+    }
+  }
+
+  /**
+   * Validate execution parameters
+   * @param {string} filename - Filename for execution
+   * @param {string} code - Python code to execute
+   * @param {any} [namespace] - Optional namespace
+   * @param {string} [component] - Component name for error context
+   * @throws {Error} If any parameter is invalid
+   */
+  static validateExecutionParams(filename, code, namespace, component = 'Component') {
+    this.validateString(filename, 'filename', component);
+    this.validateString(code, 'code', component);
+    this.validateNamespace(namespace, component);
+  }
+
+  /**
+   * Validate an output limit ({head, tail} caps: characters with the
+   * 'python' capture backend, bytes with 'raw')
+   * @param {any} limit - Limit to validate
+   * @param {string} [component] - Component name for error context
+   * @throws {Error} If limit is not an object with non-negative integer head/tail
+   */
+  static validateOutputLimit(limit, component = 'Component') {
+    this.validateObject(limit, 'outputLimit', component);
+    for (const key of ['head', 'tail']) {
+      const value = limit[key];
+      if (value === undefined && key === 'tail') continue;
+      if (!Number.isInteger(value) || value < 0) {
+        throw new Error(`🔧 [${component}] outputLimit.${key} must be a non-negative integer, got ${value}`);
       }
-      return listdir;
-    }()
-    /**
-     * Private helper method to send FS commands to the worker
-     *
-     * The request goes through PyodideManager._postRequest: it carries a
-     * correlation id, the worker echoes it back on fs_result/fs_error, and the
-     * manager's permanent onmessage handler settles this promise. Filesystem
-     * operations therefore work while an execution is in flight.
-     *
-     * @private
-     * @param {PyodideManager} manager - Manager instance
-     * @param {FSOperation} operation - FS operation name
-     * @param {FSOperationParams} params - Operation parameters
-     * @param {number} [timeoutMs=10000] - Timeout in milliseconds
-     * @returns {Promise<FSOperationResult>} Operation result
-     * @throws {Error} If operation fails or times out
-     */
-    )
-  }, {
-    key: "_sendFSCommand",
-    value: (function () {
-      var _sendFSCommand2 = _asyncToGenerator(/*#__PURE__*/_regenerator().m(function _callee7(manager, operation, params) {
-        var timeoutMs,
-          _args7 = arguments;
-        return _regenerator().w(function (_context7) {
-          while (1) switch (_context7.n) {
-            case 0:
-              timeoutMs = _args7.length > 3 && _args7[3] !== undefined ? _args7[3] : 10000;
-              if (manager.isReady) {
-                _context7.n = 1;
-                break;
-              }
-              throw new Error("🐍 [PyodideManagerFS] Manager not ready yet. Wait for initialization to complete.");
-            case 1:
-              return _context7.a(2, manager._postRequest(_objectSpread({
-                type: "fs_operation",
-                operation: operation
-              }, params), timeoutMs, "🐍 [PyodideManagerFS] Filesystem operation timeout"));
-          }
-        }, _callee7);
-      }));
-      function _sendFSCommand(_x13, _x14, _x15) {
-        return _sendFSCommand2.apply(this, arguments);
+    }
+  }
+
+  /**
+   * Check for potentially dangerous Python code patterns
+   * @param {string} code - Python code to check
+   * @returns {Array<string>} Array of dangerous patterns found
+   */
+  static checkDangerousPatterns(code) {
+    const dangerousPatterns = [
+      { pattern: /import\s+os\b/g, reason: 'OS module access' },
+      { pattern: /import\s+subprocess\b/g, reason: 'Subprocess execution' },
+      { pattern: /\beval\s*\(/g, reason: 'Dynamic code evaluation' },
+      { pattern: /\bexec\s*\(/g, reason: 'Dynamic code execution' },
+      { pattern: /\b__import__\s*\(/g, reason: 'Dynamic module import' },
+      { pattern: /\bopen\s*\(/g, reason: 'File system access' },
+      { pattern: /\bcompile\s*\(/g, reason: 'Code compilation' }
+    ];
+
+    const found = [];
+    for (const { pattern, reason } of dangerousPatterns) {
+      if (pattern.test(code)) {
+        found.push(reason);
       }
-      return _sendFSCommand;
-    }())
-  }]);
-}();
+    }
 
-/**
- * @typedef {'writeFile'|'readFile'|'mkdir'|'exists'|'listdir'} FSOperation
- */
+    return found;
+  }
 
-/**
- * @typedef {Object} FSOperationParams
- * @property {string} path - File or directory path
- * @property {string} [content] - File content (for writeFile operation)
- */
+  /**
+   * Validate backend parameter (must be 'pyodide' or <?>)
+   * @param {string} backend - Backend to validate
+   * @param {string} [component] - Component name for error context
+   * @throws {Error} If backend is not valid
+   */
+  static validateBackend(backend, component = 'Component') {
+    this.validateString(backend, 'backend', component);
+    const validBackends = ['pyodide', 'brython'];
+    if (!validBackends.includes(backend.toLowerCase())) {
+      throw new Error(
+        `🔧 [${component}] backend must be one of: ${validBackends.join(', ')}, got "${backend}"`
+      );
+    }
+  }
+}
 
 /**
- * @typedef {Object} FSOperationResult
- * @property {boolean} [success] - Whether operation succeeded
- * @property {string} [content] - File content (for readFile)
- * @property {boolean} [exists] - Whether file/directory exists
- * @property {string[]} [files] - Directory contents (for listdir)
- */
-;// ../../utils/createBlobWorker.js
-function createBlobWorker_regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return createBlobWorker_regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (createBlobWorker_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, createBlobWorker_regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, createBlobWorker_regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), createBlobWorker_regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", createBlobWorker_regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), createBlobWorker_regeneratorDefine2(u), createBlobWorker_regeneratorDefine2(u, o, "Generator"), createBlobWorker_regeneratorDefine2(u, n, function () { return this; }), createBlobWorker_regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (createBlobWorker_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function createBlobWorker_regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } createBlobWorker_regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { createBlobWorker_regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, createBlobWorker_regeneratorDefine2(e, r, n, t); }
-function createBlobWorker_asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function createBlobWorker_asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { createBlobWorker_asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { createBlobWorker_asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
-/**
- * Blob Worker Creation Utility
- * 
- * Creates web workers from blob URLs to handle cross-origin scenarios.
- * Essential for Flask apps and other frameworks where Nagini is served
- * from a different origin than the main application.
+ * @typedef {Object} ValidationError
+ * @property {string} message - Error message
+ * @property {string} component - Component that threw the error
+ * @property {string} parameter - Parameter that failed validation
  */
 
-/**
- * Create a blob worker URL from a bundled worker script
- * @param {string} workerUrl - URL to the bundled worker script (worker-dist.js)
- * @returns {Promise<string>} Blob URL that can be used to create a Worker
- * @throws {Error} If worker script cannot be fetched
- */
-function createBlobWorkerUrl(_x) {
-  return _createBlobWorkerUrl.apply(this, arguments);
-}
-
-/**
- * Create a Worker instance using blob URL pattern
- * @param {string} workerUrl - URL to the bundled worker script (worker-dist.js)
- * @returns {Promise<Worker>} Web Worker instance created from blob URL
- * @throws {Error} If worker creation fails
- */
-function _createBlobWorkerUrl() {
-  _createBlobWorkerUrl = createBlobWorker_asyncToGenerator(/*#__PURE__*/createBlobWorker_regenerator().m(function _callee(workerUrl) {
-    var response, workerScript, blob, blobUrl, _t;
-    return createBlobWorker_regenerator().w(function (_context) {
-      while (1) switch (_context.n) {
-        case 0:
-          _context.p = 0;
-          _context.n = 1;
-          return fetch(workerUrl);
-        case 1:
-          response = _context.v;
-          if (response.ok) {
-            _context.n = 2;
-            break;
-          }
-          throw new Error("Failed to fetch worker script: HTTP ".concat(response.status));
-        case 2:
-          _context.n = 3;
-          return response.text();
-        case 3:
-          workerScript = _context.v;
-          // Create a blob URL for the worker script
-          blob = new Blob([workerScript], {
-            type: 'application/javascript'
-          });
-          blobUrl = URL.createObjectURL(blob);
-          return _context.a(2, blobUrl);
-        case 4:
-          _context.p = 4;
-          _t = _context.v;
-          console.error('Failed to create blob worker:', _t);
-          throw new Error("Failed to create blob worker from ".concat(workerUrl, ": ").concat(_t.message));
-        case 5:
-          return _context.a(2);
-      }
-    }, _callee, null, [[0, 4]]);
-  }));
-  return _createBlobWorkerUrl.apply(this, arguments);
-}
-function createBlobWorker(_x2) {
-  return _createBlobWorker.apply(this, arguments);
-}
-
-/**
- * Cleanup blob URL to prevent memory leaks
- * @param {string} blobUrl - Blob URL to revoke
- */
-function _createBlobWorker() {
-  _createBlobWorker = createBlobWorker_asyncToGenerator(/*#__PURE__*/createBlobWorker_regenerator().m(function _callee2(workerUrl) {
-    var blobUrl, worker, _t2;
-    return createBlobWorker_regenerator().w(function (_context2) {
-      while (1) switch (_context2.n) {
-        case 0:
-          _context2.p = 0;
-          // Ensure we're using the bundled worker
-          if (!workerUrl.includes('worker-dist.js')) {
-            console.warn('Warning: Expected bundled worker (worker-dist.js), got:', workerUrl);
-          }
-          _context2.n = 1;
-          return createBlobWorkerUrl(workerUrl);
-        case 1:
-          blobUrl = _context2.v;
-          worker = new Worker(blobUrl);
-          return _context2.a(2, worker);
-        case 2:
-          _context2.p = 2;
-          _t2 = _context2.v;
-          console.error('Worker creation failed:', _t2);
-          throw _t2;
-        case 3:
-          return _context2.a(2);
-      }
-    }, _callee2, null, [[0, 2]]);
-  }));
-  return _createBlobWorker.apply(this, arguments);
-}
-function revokeBlobUrl(blobUrl) {
-  try {
-    URL.revokeObjectURL(blobUrl);
-  } catch (error) {
-    console.warn('Failed to revoke blob URL:', error);
-  }
-}
-;// ../manager/manager.js
-function manager_typeof(o) { "@babel/helpers - typeof"; return manager_typeof = "function" == typeof Symbol && "symbol" == typeof Symbol.iterator ? function (o) { return typeof o; } : function (o) { return o && "function" == typeof Symbol && o.constructor === Symbol && o !== Symbol.prototype ? "symbol" : typeof o; }, manager_typeof(o); }
-function _createForOfIteratorHelper(r, e) { var t = "undefined" != typeof Symbol && r[Symbol.iterator] || r["@@iterator"]; if (!t) { if (Array.isArray(r) || (t = _unsupportedIterableToArray(r)) || e && r && "number" == typeof r.length) { t && (r = t); var _n = 0, F = function F() {}; return { s: F, n: function n() { return _n >= r.length ? { done: !0 } : { done: !1, value: r[_n++] }; }, e: function e(r) { throw r; }, f: F }; } throw new TypeError("Invalid attempt to iterate non-iterable instance.\nIn order to be iterable, non-array objects must have a [Symbol.iterator]() method."); } var o, a = !0, u = !1; return { s: function s() { t = t.call(r); }, n: function n() { var r = t.next(); return a = r.done, r; }, e: function e(r) { u = !0, o = r; }, f: function f() { try { a || null == t.return || t.return(); } finally { if (u) throw o; } } }; }
-function _unsupportedIterableToArray(r, a) { if (r) { if ("string" == typeof r) return _arrayLikeToArray(r, a); var t = {}.toString.call(r).slice(8, -1); return "Object" === t && r.constructor && (t = r.constructor.name), "Map" === t || "Set" === t ? Array.from(r) : "Arguments" === t || /^(?:Ui|I)nt(?:8|16|32)(?:Clamped)?Array$/.test(t) ? _arrayLikeToArray(r, a) : void 0; } }
-function _arrayLikeToArray(r, a) { (null == a || a > r.length) && (a = r.length); for (var e = 0, n = Array(a); e < a; e++) n[e] = r[e]; return n; }
-function manager_ownKeys(e, r) { var t = Object.keys(e); if (Object.getOwnPropertySymbols) { var o = Object.getOwnPropertySymbols(e); r && (o = o.filter(function (r) { return Object.getOwnPropertyDescriptor(e, r).enumerable; })), t.push.apply(t, o); } return t; }
-function manager_objectSpread(e) { for (var r = 1; r < arguments.length; r++) { var t = null != arguments[r] ? arguments[r] : {}; r % 2 ? manager_ownKeys(Object(t), !0).forEach(function (r) { manager_defineProperty(e, r, t[r]); }) : Object.getOwnPropertyDescriptors ? Object.defineProperties(e, Object.getOwnPropertyDescriptors(t)) : manager_ownKeys(Object(t)).forEach(function (r) { Object.defineProperty(e, r, Object.getOwnPropertyDescriptor(t, r)); }); } return e; }
-function manager_defineProperty(e, r, t) { return (r = manager_toPropertyKey(r)) in e ? Object.defineProperty(e, r, { value: t, enumerable: !0, configurable: !0, writable: !0 }) : e[r] = t, e; }
-function manager_regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return manager_regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (manager_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, manager_regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, manager_regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), manager_regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", manager_regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), manager_regeneratorDefine2(u), manager_regeneratorDefine2(u, o, "Generator"), manager_regeneratorDefine2(u, n, function () { return this; }), manager_regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (manager_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function manager_regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } manager_regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { manager_regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, manager_regeneratorDefine2(e, r, n, t); }
-function manager_asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function manager_asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { manager_asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { manager_asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
-function manager_classCallCheck(a, n) { if (!(a instanceof n)) throw new TypeError("Cannot call a class as a function"); }
-function manager_defineProperties(e, r) { for (var t = 0; t < r.length; t++) { var o = r[t]; o.enumerable = o.enumerable || !1, o.configurable = !0, "value" in o && (o.writable = !0), Object.defineProperty(e, manager_toPropertyKey(o.key), o); } }
-function manager_createClass(e, r, t) { return r && manager_defineProperties(e.prototype, r), t && manager_defineProperties(e, t), Object.defineProperty(e, "prototype", { writable: !1 }), e; }
-function manager_toPropertyKey(t) { var i = manager_toPrimitive(t, "string"); return "symbol" == manager_typeof(i) ? i : i + ""; }
-function manager_toPrimitive(t, r) { if ("object" != manager_typeof(t) || !t) return t; var e = t[Symbol.toPrimitive]; if (void 0 !== e) { var i = e.call(t, r || "default"); if ("object" != manager_typeof(i)) return i; throw new TypeError("@@toPrimitive must return a primitive value."); } return ("string" === r ? String : Number)(t); }
+/***/ }),
+
+/***/ "./pyodide/manager/manager.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./pyodide/manager/manager.js
+__nagini_define__(__nagini_exports__, {
+  PyodideManager: () => PyodideManager,
+});
 /**
  * PyodideManager - Main thread interface for Pyodide execution
  *
@@ -741,15 +496,50 @@ function manager_toPrimitive(t, r) { if ("object" != manager_typeof(t) || !t) re
  * - With namespace: Variables isolated to that namespace object
  */
 
+const { PyodideManagerStaticExecutor } = __nagini_require__("./pyodide/manager/manager-static-execution.js");
+const { PyodideManagerInput } = __nagini_require__("./pyodide/manager/manager-input.js");
+const { PyodideManagerFS } = __nagini_require__("./pyodide/manager/manager-fs.js");
+const { PyodideManagerNamespaces } = __nagini_require__("./pyodide/manager/manager-namespaces.js");
+const { ValidationUtils } = __nagini_require__("./utils/validation.js");
+const { createBlobWorkerUrl } = __nagini_require__("./utils/createBlobWorker.js");
 
+/** Cap on executionHistory entries (ring buffer behaviour) */
+const MAX_EXECUTION_HISTORY = 50;
 
+/** Signal number written to the interrupt buffer (raises KeyboardInterrupt) */
+const SIGINT = 2;
 
+/** Figure payload formats understood by the worker */
+const FIGURE_FORMATS = ["base64", "png", "svg"];
 
+/** stdout/stderr capture backends understood by the worker */
+const CAPTURE_BACKENDS = ["python", "raw"];
 
+/** Content keys of delivered figures remembered for dedupFigures (LRU) */
+const FIGURE_KEY_CACHE_SIZE = 32;
 
-/** Cap on executionHistory entries (ring buffer behaviour) */
-var MAX_EXECUTION_HISTORY = 50;
-var PyodideManager = /*#__PURE__*/function () {
+/** Execution queue lanes, most urgent first: a queued execution starts
+ *  before those of every later lane, in call order within its lane */
+const EXECUTION_PRIORITIES = ["interactive", "background", "prefetch"];
+
+/**
+ * Buffers shared with one worker. Each worker gets its own: the emit
+ * counter is compared with that worker's batch count, and a SIGINT meant
+ * for the running worker must not reach a standby one still booting
+ *
+ * @returns {{emitAck: Int32Array|null, interruptBuffer: Uint8Array|null}}
+ */
+function createSharedBuffers() {
+  // Requires a cross-origin isolated page; otherwise emit batches are not
+  // throttled and an aborted run is only abandoned, its result discarded
+  const shared = typeof SharedArrayBuffer !== "undefined" && globalThis.crossOriginIsolated;
+  return {
+    emitAck: shared ? new Int32Array(new SharedArrayBuffer(4)) : null,
+    interruptBuffer: shared ? new Uint8Array(new SharedArrayBuffer(1)) : null,
+  };
+}
+
+class PyodideManager {
   /**
    * Create a new PyodideManager instance
    *
@@ -760,23 +550,26 @@ var PyodideManager = /*#__PURE__*/function () {
    * @param {Object} [config={}] - Optional configuration object
    * @param {string} [config.pyodideCdnUrl] - Custom Pyodide CDN URL (for local/offline use, e.g., Capacitor apps)
    * @param {boolean} [config.snapshotCache] - Cache the bare interpreter as a memory snapshot in IndexedDB for near-instant later boots
+   * @param {OutputLimit} [config.outputLimit] - Default per-stream head/tail caps for every execution (overridable per call), in characters ('python' backend) or bytes ('raw')
+   * @param {'python'|'raw'} [config.captureBackend='python'] - How the worker captures stdout/stderr
+   * @param {boolean} [config.autoLoadImports=false] - Load the packages each snippet imports before running it
+   * @param {number} [config.standby=0] - Initialized workers kept in reserve for restart()
+   * @param {number} [config.standbyMemoryLimit] - Cap in bytes on the WebAssembly heap held by standby workers
+   * @param {number} [config.maxNamespaces=32] - Named namespaces kept in the worker before the least recently used is dropped
    * @throws {Error} If any parameter has incorrect type or worker is not bundled
    */
-  function PyodideManager(packages, micropipPackages, filesToLoad, workerPath) {
-    var _this = this;
-    var config = arguments.length > 4 && arguments[4] !== undefined ? arguments[4] : {};
-    manager_classCallCheck(this, PyodideManager);
+  constructor(packages, micropipPackages, filesToLoad, workerPath, config = {}) {
     // Minimal logging - constructor called
 
     // Strict type validation using ValidationUtils
-    validation/* ValidationUtils */.n.validatePackages(packages, 'PyodideManager');
-    validation/* ValidationUtils */.n.validatePackages(micropipPackages, 'PyodideManager');
-    validation/* ValidationUtils */.n.validateFilesToLoad(filesToLoad, 'PyodideManager');
-    validation/* ValidationUtils */.n.validateString(workerPath, 'workerPath', 'PyodideManager');
+    ValidationUtils.validatePackages(packages, 'PyodideManager');
+    ValidationUtils.validatePackages(micropipPackages, 'PyodideManager');
+    ValidationUtils.validateFilesToLoad(filesToLoad, 'PyodideManager');
+    ValidationUtils.validateString(workerPath, 'workerPath', 'PyodideManager');
 
     // Enforce bundled worker requirement
     if (!workerPath.includes('worker-dist.js')) {
-      throw new Error("\uD83D\uDEA8 [PyodideManager] Only bundled workers are supported. Expected 'worker-dist.js', got: ".concat(workerPath));
+      throw new Error(`🚨 [PyodideManager] Only bundled workers are supported. Expected 'worker-dist.js', got: ${workerPath}`);
     }
 
     /** @type {Worker|null} Web worker instance */
@@ -808,6 +601,72 @@ var PyodideManager = /*#__PURE__*/function () {
      *  interpreter boot. Packages and files still load after the restore */
     this.snapshotCache = !!config.snapshotCache;
 
+    if (config.outputLimit !== undefined) {
+      ValidationUtils.validateOutputLimit(config.outputLimit, 'PyodideManager');
+    }
+
+    /** @type {OutputLimit|undefined} Default head/tail caps on captured
+     *  stdout/stderr: a runaway print loop keeps the first head and last
+     *  tail characters instead of growing until the wasm heap runs out */
+    this.outputLimit = config.outputLimit;
+
+    if (config.captureBackend !== undefined && !CAPTURE_BACKENDS.includes(config.captureBackend)) {
+      throw new Error(`🚨 [PyodideManager] captureBackend must be one of: ${CAPTURE_BACKENDS.join(", ")}, got "${config.captureBackend}"`);
+    }
+
+    /** @type {'python'|'raw'} stdout/stderr capture: 'python' swaps
+     *  sys.stdout/stderr for capture streams; 'raw' takes the bytes written
+     *  to fd 1/2 (pyodide.setStdout), which also catches C extensions and
+     *  os.write, at a lower cost per write. Output limits and streaming
+     *  chunk sizes then count bytes instead of characters */
+    this.captureBackend = config.captureBackend ?? "python";
+
+    /** @type {boolean} Scan each snippet's imports (from the AST, cached
+     *  with the compiled code) and load the Pyodide packages it needs that
+     *  are not loaded yet, in one parallel batch before the run. The time
+     *  spent is reported as metrics.packageLoadMs. In jspi mode, imports
+     *  the scan cannot see (importlib.import_module) load their package on
+     *  first import through a sys.meta_path finder */
+    this.autoLoadImports = !!config.autoLoadImports;
+
+    if (config.standby !== undefined && (!Number.isInteger(config.standby) || config.standby < 0)) {
+      throw new Error(`🚨 [PyodideManager] standby must be a non-negative integer, got ${config.standby}`);
+    }
+    if (config.standbyMemoryLimit !== undefined && !(config.standbyMemoryLimit > 0)) {
+      throw new Error(`🚨 [PyodideManager] standbyMemoryLimit must be a positive number of bytes, got ${config.standbyMemoryLimit}`);
+    }
+
+    /** @type {number} Workers booted with the same packages and files and
+     *  kept idle once the main worker is ready: restart() and crash
+     *  recovery swap one in instead of paying a full boot */
+    this.standby = config.standby ?? 0;
+
+    /** @type {number|undefined} Cap on the WebAssembly heap held by standby
+     *  workers, each counted at its size after boot. A spare that would
+     *  cross it is not started */
+    this.standbyMemoryLimit = config.standbyMemoryLimit;
+
+    if (config.maxNamespaces !== undefined && (!Number.isInteger(config.maxNamespaces) || config.maxNamespaces <= 0)) {
+      throw new Error(`🚨 [PyodideManager] maxNamespaces must be a positive integer, got ${config.maxNamespaces}`);
+    }
+
+    /** @type {number|undefined} Named namespaces (createNamespace) the
+     *  worker keeps: creating one more drops the least recently used */
+    this.maxNamespaces = config.maxNamespaces;
+
+    /** @type {WorkerSlot|null} Slot of the worker executions go to */
+    this._attachedSlot = null;
+
+    /** @type {Array<WorkerSlot>} Standby workers, booting or ready */
+    this._spares = [];
+
+    /** @type {number|null} WebAssembly heap of the worker after its boot
+     *  (set on the ready message), the size assumed for a spare still booting */
+    this._bootHeapBytes = null;
+
+    /** @type {boolean} Set by destroy(): no worker is started afterwards */
+    this._destroyed = false;
+
     /** @type {boolean} Whether this worker booted from a cached snapshot
      *  (set on the ready message) */
     this.snapshotRestored = false;
@@ -821,11 +680,36 @@ var PyodideManager = /*#__PURE__*/function () {
     /** @type {string|null} Blob URL for cleanup */
     this.blobUrl = null;
 
+    /** @type {Int32Array|null} Counter of emit batches consumed, shared with
+     *  the worker so emit() can block when the page falls behind (set when
+     *  the worker is attached) */
+    this._emitAck = null;
+
+    /** @type {Uint8Array|null} Pyodide interrupt buffer (setInterruptBuffer):
+     *  writing SIGINT makes the running Python code raise KeyboardInterrupt
+     *  (set when the worker is attached) */
+    this._interruptBuffer = null;
+
     // Initialize input state using the input module
     PyodideManagerInput.initializeInputState(this);
 
-    /** @type {Promise<any>} Serialization chain for executeAsync calls */
-    this.executionChain = Promise.resolve();
+    /** @type {Array<QueuedExecution>} executeAsync calls waiting for the
+     *  worker, by priority lane then call order: one Python interpreter,
+     *  one run at a time */
+    this._executionQueue = [];
+
+    /** @type {Map<string, true>} Content keys of the figures delivered to
+     *  the caller (dedupFigures), least recently seen first. Kept here and
+     *  not in the worker: only a result that actually arrived can make a
+     *  later run skip a payload */
+    this._sentFigureKeys = new Map();
+
+    /** @type {number} Queued executions rejected with a Superseded error
+     *  because a newer one shared their coalesceKey */
+    this.supersededCount = 0;
+
+    /** @type {QueuedExecution|null} Execution currently sent to the worker */
+    this._runningExecution = null;
 
     /** @type {Map<number, {resolve: Function, reject: Function, timeoutId: number}>}
      *  Pending id-correlated requests (execute, fs) awaiting a worker response */
@@ -834,30 +718,34 @@ var PyodideManager = /*#__PURE__*/function () {
     /** @type {number} Monotonic id for request correlation */
     this._nextRequestId = 1;
 
+    this._resetReadyPromise();
+
+    // Initialize worker asynchronously
+    this.initWorker().catch((error) => {
+      console.error("🚨 [PyodideManager] Worker initialization failed:", error);
+      this._readyReject(error);
+    });
+  }
+
+  /**
+   * Create readyPromise for the worker about to be attached
+   *
+   * @private
+   * @returns {void}
+   */
+  _resetReadyPromise() {
     /** @type {Promise<void>} Resolves on the worker "ready" message, rejects
      *  with the original cause if initialization fails */
-    this.readyPromise = new Promise(function (resolve, reject) {
-      _this._readySettled = false;
-      _this._readyResolve = function () {
-        _this._readySettled = true;
-        resolve();
-      };
-      _this._readyReject = function (error) {
-        if (!_this._readySettled) {
-          _this._readySettled = true;
-          reject(error);
-        }
+    this.readyPromise = new Promise((resolve, reject) => {
+      this._readySettled = false;
+      this._readyResolve = () => { this._readySettled = true; resolve(); };
+      this._readyReject = (error) => {
+        if (!this._readySettled) { this._readySettled = true; reject(error); }
       };
     });
     // Guard: an init failure must not surface as an unhandled rejection when
     // the consumer only polls isReady
-    this.readyPromise.catch(function () {});
-
-    // Initialize worker asynchronously
-    this.initWorker().catch(function (error) {
-      console.error("🚨 [PyodideManager] Worker initialization failed:", error);
-      _this._readyReject(error);
-    });
+    this.readyPromise.catch(() => {});
   }
 
   /**
@@ -866,904 +754,2044 @@ var PyodideManager = /*#__PURE__*/function () {
    * @param {string[]} packages - Array of package names to validate
    * @returns {string[]} Validated and filtered package names
    */
-  return manager_createClass(PyodideManager, [{
-    key: "validateAndFilterPackages",
-    value: function validateAndFilterPackages(packages) {
-      var validPackages = packages.filter(function (pkg) {
-        if (typeof pkg !== "string" || pkg.trim().length === 0) {
-          return false;
-        }
-        return true;
-      });
-      return validPackages;
-    }
-
-    /**
-     * Initialize the web worker using blob URL pattern and set up message handling
-     *
-     * @private
-     * @returns {Promise<void>}
-     * @throws {Error} If blob worker creation fails
-     */
-  }, {
-    key: "initWorker",
-    value: (function () {
-      var _initWorker = manager_asyncToGenerator(/*#__PURE__*/manager_regenerator().m(function _callee() {
-        var _this2 = this;
-        var _t;
-        return manager_regenerator().w(function (_context) {
-          while (1) switch (_context.n) {
-            case 0:
-              _context.p = 0;
-              _context.n = 1;
-              return createBlobWorkerUrl(this.workerPath);
-            case 1:
-              this.blobUrl = _context.v;
-              // Create worker from blob URL, as a module worker: the bundled worker
-              // loads Pyodide with a dynamic import (pyodide.mjs, ESM-only in
-              // Pyodide 314+), which importScripts-based classic workers cannot do
-              this.worker = new Worker(this.blobUrl, {
-                type: "module"
-              });
-
-              // Set up message handling: dispatch routes id-correlated responses to
-              // their pending promise, then hands the message to handleMessage
-              this.worker.onmessage = function (e) {
-                return _this2._dispatchMessage(e.data);
-              };
-
-              // Surface worker crashes (wasm trap, failed import, ...) as error
-              // messages so pending executions reject instead of hanging forever
-              this.worker.onerror = function (e) {
-                _this2._dispatchMessage({
-                  type: "error",
-                  message: "Worker crashed: ".concat(e.message || "unknown error")
-                });
-              };
-              this.worker.onmessageerror = function () {
-                _this2._dispatchMessage({
-                  type: "error",
-                  message: "Worker message could not be deserialized"
-                });
-              };
-
-              // Start initialization
-              this.worker.postMessage({
-                type: "init",
-                packages: this.packages,
-                micropipPackages: this.micropipPackages,
-                filesToLoad: this.filesToLoad,
-                pyodideCdnUrl: this.pyodideCdnUrl,
-                snapshotCache: this.snapshotCache
-              });
-              _context.n = 3;
-              break;
-            case 2:
-              _context.p = 2;
-              _t = _context.v;
-              console.error("🚨 [PyodideManager] Failed to initialize blob worker:", _t);
-              throw new Error("Failed to initialize blob worker: ".concat(_t.message));
-            case 3:
-              return _context.a(2);
-          }
-        }, _callee, this, [[0, 2]]);
-      }));
-      function initWorker() {
-        return _initWorker.apply(this, arguments);
-      }
-      return initWorker;
-    }()
-    /**
-     * Route a worker message: settle the matching pending request (by id) if
-     * any, then hand the message to handleMessage for normal processing
-     * (execution history, input state, logging)
-     *
-     * @private
-     * @param {WorkerMessage} data - Message from worker
-     * @returns {void}
-     */
-    )
-  }, {
-    key: "_dispatchMessage",
-    value: function _dispatchMessage(data) {
-      var pending = data && data.id !== undefined ? this._pendingRequests.get(data.id) : undefined;
-      if (pending) {
-        this._pendingRequests.delete(data.id);
-        clearTimeout(pending.timeoutId);
-      }
-
-      // Normal processing first: history push, input state reset, logs. A
-      // throwing handler must not leave the pending request unsettled
-      try {
-        this.handleMessage(data);
-      } catch (error) {
-        console.error("🚨 [PyodideManager] handleMessage failed:", error);
-      }
-      if (data && data.type === "ready") {
-        this._readyResolve();
-      }
-      if (data && data.type === "error" && data.id === undefined) {
-        // Id-less error: init failure or worker crash. Fail readiness (during
-        // init) and every in-flight request, none of them can complete
-        var error = new Error(data.message || data.error || "Worker error");
-        this._readyReject(error);
-        this._failAllPending(error);
+  validateAndFilterPackages(packages) {
+    const validPackages = packages.filter(pkg => {
+      if (typeof pkg !== "string" || pkg.trim().length === 0) {
+        return false;
       }
-      if (!pending) return;
-      if (data.type === "result") {
-        // Resolve with a result built from the worker payload, even when it
-        // contains a Python error: callers read stderr for the full traceback
-        pending.resolve({
-          filename: data.filename,
-          time: data.time,
-          stdout: data.stdout,
-          stderr: data.stderr,
-          missive: data.missive,
-          figures: data.figures,
-          error: data.error,
-          timestamp: new Date().toISOString()
-        });
-      } else if (data.type === "fs_result") {
-        pending.resolve(data.result);
-      } else if (data.type === "fs_error") {
-        pending.reject(new Error("\uD83C\uDF9B\uFE0F [PyodideManagerFS] Filesystem error: ".concat(data.error)));
-      } else if (data.type === "error") {
-        pending.reject(new Error("\u26A1 [PyodideManager] Execution error: ".concat(data.message || data.error || "Unknown error")));
-      } else {
-        pending.reject(new Error("\uD83D\uDEA8 [PyodideManager] Unexpected response type for request: ".concat(data.type)));
-      }
-    }
-
-    /**
-     * Send an id-correlated request to the worker and return a promise settled
-     * by the matching response (see _dispatchMessage)
-     *
-     * @private
-     * @param {Object} message - Message to post (id is added here)
-     * @param {number} timeoutMs - Timeout in milliseconds
-     * @param {string} timeoutLabel - Error message on timeout
-     * @returns {Promise<any>}
-     */
-  }, {
-    key: "_postRequest",
-    value: function _postRequest(message, timeoutMs, timeoutLabel) {
-      var _this3 = this;
-      return new Promise(function (resolve, reject) {
-        var id = _this3._nextRequestId++;
-        var timeoutId = setTimeout(function () {
-          // A response arriving later is simply discarded by _dispatchMessage
-          _this3._pendingRequests.delete(id);
-          reject(new Error(timeoutLabel));
-        }, timeoutMs);
-        _this3._pendingRequests.set(id, {
-          resolve: resolve,
-          reject: reject,
-          timeoutId: timeoutId
-        });
-        try {
-          _this3.worker.postMessage(manager_objectSpread(manager_objectSpread({}, message), {}, {
-            id: id
-          }));
-        } catch (error) {
-          clearTimeout(timeoutId);
-          _this3._pendingRequests.delete(id);
-          reject(new Error("\uD83D\uDEA8 [PyodideManager] Failed to send message to worker: ".concat(error.message)));
-        }
-      });
-    }
+      return true;
+    });
 
-    /**
-     * Reject every pending request (worker crash, destroy)
-     *
-     * @private
-     * @param {Error} error - Rejection cause
-     * @returns {void}
-     */
-  }, {
-    key: "_failAllPending",
-    value: function _failAllPending(error) {
-      var _iterator = _createForOfIteratorHelper(this._pendingRequests.values()),
-        _step;
-      try {
-        for (_iterator.s(); !(_step = _iterator.n()).done;) {
-          var pending = _step.value;
-          clearTimeout(pending.timeoutId);
-          pending.reject(error);
-        }
-      } catch (err) {
-        _iterator.e(err);
-      } finally {
-        _iterator.f();
-      }
-      this._pendingRequests.clear();
-    }
+    return validPackages;
+  }
 
-    /**
-     * Handle messages from the Pyodide worker
-     * Updates UI status and manages execution context
-     *
-     * @param {WorkerMessage} data - Message from worker
-     * @returns {void}
-     */
-  }, {
-    key: "handleMessage",
-    value: function handleMessage(data) {
-      // Pyodide initialization complete
-      if (data.type === "ready") {
-        this.isReady = true;
-        this.snapshotRestored = !!data.snapshotRestored;
-        this.inputMode = data.inputMode || "async";
-      }
+  /**
+   * Initialize the web worker using blob URL pattern and set up message handling
+   *
+   * @private
+   * @returns {Promise<void>}
+   * @throws {Error} If blob worker creation fails
+   */
+  async initWorker() {
+    const slot = { worker: null, blobUrl: null, ...createSharedBuffers(), readyData: null };
+    this._attachWorker(slot);
+    await this._startWorker(slot);
+  }
 
-      // Pyodide initialization or execution error
-      if (data.type === "error") {
-        console.error("🐍 [PyodideManager] Error:", data.message || data.error || data);
+  /**
+   * Create the worker of a slot and send it the init message. Its messages
+   * go through slot.onMessage / slot.onCrash, so the same worker can boot
+   * as a standby and be attached later
+   *
+   * @private
+   * @param {WorkerSlot} slot - Slot to start (buffers and handlers set)
+   * @returns {Promise<void>}
+   * @throws {Error} If blob worker creation fails
+   */
+  async _startWorker(slot) {
+    try {
+      // Create blob URL first for cleanup tracking
+      const blobUrl = await createBlobWorkerUrl(this.workerPath);
+      if (slot.discarded) {
+        URL.revokeObjectURL(blobUrl);
+        return;
       }
-
-      // Package installation warning (non-fatal)
-      if (data.type === "warning") {
-        console.warn("🐍 [PyodideManager] Warning:", data.message || "Unknown warning");
+      slot.blobUrl = blobUrl;
+
+      // Create worker from blob URL, as a module worker: the bundled worker
+      // loads Pyodide with a dynamic import (pyodide.mjs, ESM-only in
+      // Pyodide 314+), which importScripts-based classic workers cannot do
+      slot.worker = new Worker(blobUrl, { type: "module" });
+      if (slot === this._attachedSlot) {
+        this.worker = slot.worker;
+        this.blobUrl = blobUrl;
       }
 
-      // Package installation info (optimization messages) - minimized
-      // if (data.type === "info") { /* minimized */ }
-
-      // Handle input-related messages using input module
-      PyodideManagerInput.handleInputMessage(this, data);
+      slot.worker.onmessage = (e) => slot.onMessage(e.data);
 
-      // Python code execution completed
-      if (data.type === "result") {
-        PyodideManagerInput.resetInputState(this);
-
-        // 🐍 EXECUTION RESULTS (always logged with snake emoji)
-        console.log("🐍 Execution completed:", {
-          stdout: data.stdout ? data.stdout.length + " chars" : "empty",
-          stderr: data.stderr ? data.stderr.length + " chars" : "empty",
-          missive: data.missive,
-          figures: data.figures ? data.figures.length + " figures" : "none",
-          error: data.error
+      // Surface worker crashes (wasm trap, failed import, ...) so pending
+      // executions reject instead of hanging forever
+      slot.worker.onerror = (e) => slot.onCrash(`Worker crashed: ${e.message || "unknown error"}`);
+      slot.worker.onmessageerror = () => {
+        slot.onMessage({
+          type: "error",
+          message: "Worker message could not be deserialized",
         });
+      };
 
-        // Create execution entry: figures are kept out of the history (base64
-        // payloads accumulate into an effective memory leak in long sessions);
-        // they remain available on the result resolved by executeAsync
-        var entry = {
-          filename: data.filename,
-          time: data.time,
-          stdout: data.stdout,
-          stderr: data.stderr,
-          missive: data.missive,
-          error: data.error,
-          timestamp: new Date().toISOString()
-        };
-        this.executionHistory.push(entry);
-        if (this.executionHistory.length > MAX_EXECUTION_HISTORY) {
-          this.executionHistory.shift();
-        }
-      }
+      // Start initialization
+      slot.worker.postMessage({
+        type: "init",
+        packages: this.packages,
+        micropipPackages: this.micropipPackages,
+        filesToLoad: this.filesToLoad,
+        pyodideCdnUrl: this.pyodideCdnUrl,
+        snapshotCache: this.snapshotCache,
+        emitAck: slot.emitAck ?? undefined,
+        interruptBuffer: slot.interruptBuffer ?? undefined,
+        captureBackend: this.captureBackend,
+        autoLoadImports: this.autoLoadImports,
+        maxNamespaces: this.maxNamespaces,
+      });
+      
+    } catch (error) {
+      console.error("🚨 [PyodideManager] Failed to initialize blob worker:", error);
+      throw new Error(`Failed to initialize blob worker: ${error.message}`);
     }
+  }
 
-    // Input handling methods - delegate to input module
-  }, {
-    key: "provideInput",
-    value: function provideInput(input) {
-      return PyodideManagerInput.provideInput(this, input);
-    }
-  }, {
-    key: "queueInput",
-    value: function queueInput(input) {
-      return PyodideManagerInput.queueInput(this, input);
-    }
-  }, {
-    key: "setInputCallback",
-    value: function setInputCallback(callback) {
-      return PyodideManagerInput.setInputCallback(this, callback);
-    }
-  }, {
-    key: "isWaitingForInput",
-    value: function isWaitingForInput() {
-      return PyodideManagerInput.isWaitingForInput(this);
-    }
-  }, {
-    key: "getCurrentPrompt",
-    value: function getCurrentPrompt() {
-      return PyodideManagerInput.getCurrentPrompt(this);
-    }
-
-    // Filesystem operations - delegate to filesystem module
-  }, {
-    key: "fs",
-    value: function () {
-      var _fs = manager_asyncToGenerator(/*#__PURE__*/manager_regenerator().m(function _callee2(operation, params) {
-        var timeoutMs,
-          _args2 = arguments;
-        return manager_regenerator().w(function (_context2) {
-          while (1) switch (_context2.n) {
-            case 0:
-              timeoutMs = _args2.length > 2 && _args2[2] !== undefined ? _args2[2] : 10000;
-              return _context2.a(2, PyodideManagerFS.fs(this, operation, params, timeoutMs));
-          }
-        }, _callee2, this);
-      }));
-      function fs(_x, _x2) {
-        return _fs.apply(this, arguments);
+  /**
+   * Make a slot's worker the one executions go to. A standby that already
+   * booted replays its ready message
+   *
+   * @private
+   * @param {WorkerSlot} slot - Slot to attach
+   * @returns {void}
+   */
+  _attachWorker(slot) {
+    this._attachedSlot = slot;
+    this.worker = slot.worker;
+    this.blobUrl = slot.blobUrl;
+    this._emitAck = slot.emitAck;
+    this._interruptBuffer = slot.interruptBuffer;
+
+    // Dispatch routes id-correlated responses to their pending promise,
+    // then hands the message to handleMessage
+    slot.onMessage = (data) => this._dispatchMessage(data);
+    slot.onCrash = (message) => {
+      const wasReady = this.isReady;
+      this._dispatchMessage({ type: "error", message });
+      // A crash after init swaps a standby in, when one is configured
+      if (wasReady && this.standby > 0 && slot === this._attachedSlot) {
+        this.restart().catch((error) => {
+          console.error("🚨 [PyodideManager] Restart after crash failed:", error);
+        });
       }
-      return fs;
-    }()
-    /**
-     * Execute Python code in the worker with optional namespace isolation
-     *
-     * @param {string} filename - Name for this execution (for tracking and debugging)
-     * @param {string} code - Python code to execute
-     * @param {Object|undefined} [namespace] - Optional namespace object for Python execution
-     * @returns {void} - No return value, sends message to worker
-     */
-  }, {
-    key: "executeFile",
-    value: function executeFile(filename, code) {
-      var namespace = arguments.length > 2 && arguments[2] !== undefined ? arguments[2] : undefined;
-      return PyodideManagerStaticExecutor.executeFile(this.worker, this.isReady, filename, code, namespace);
+    };
+    if (slot.readyData) {
+      this._dispatchMessage(slot.readyData);
     }
+  }
 
-    /**
-     * Execute Python code asynchronously and return a Promise with the result
-     *
-     * @param {string} filename - Name for this execution (for tracking and debugging)
-     * @param {string} code - Python code to execute
-     * @param {Object|undefined} [namespace] - Optional namespace object for Python execution
-     * @param {number} [timeoutMs=30000] - Execution timeout in milliseconds (raise it for interactive input() code)
-     * @returns {Promise<ExecutionResult>} Promise that resolves with execution result
-     * @throws {Error} If manager is not ready or execution times out
-     */
-  }, {
-    key: "executeAsync",
-    value: (function () {
-      var _executeAsync = manager_asyncToGenerator(/*#__PURE__*/manager_regenerator().m(function _callee4(filename, code) {
-        var _this4 = this;
-        var namespace,
-          timeoutMs,
-          run,
-          result,
-          _args4 = arguments;
-        return manager_regenerator().w(function (_context4) {
-          while (1) switch (_context4.n) {
-            case 0:
-              namespace = _args4.length > 2 && _args4[2] !== undefined ? _args4[2] : undefined;
-              timeoutMs = _args4.length > 3 && _args4[3] !== undefined ? _args4[3] : 30000;
-              // Executions are serialized: one Python interpreter lives in the worker,
-              // so concurrent calls are queued rather than interleaved. Responses are
-              // correlated by request id, so a late result from a timed-out run can
-              // never be attributed to the next execution
-              run = /*#__PURE__*/function () {
-                var _ref = manager_asyncToGenerator(/*#__PURE__*/manager_regenerator().m(function _callee3() {
-                  var message;
-                  return manager_regenerator().w(function (_context3) {
-                    while (1) switch (_context3.n) {
-                      case 0:
-                        validation/* ValidationUtils */.n.validateExecutionParams(filename, code, namespace, 'PyodideManager');
-                        if (_this4.isReady) {
-                          _context3.n = 1;
-                          break;
-                        }
-                        throw new Error("⚡ [PyodideManager] Manager not ready yet. Wait for initialization to complete.");
-                      case 1:
-                        message = {
-                          type: "execute",
-                          filename: filename,
-                          code: code
-                        };
-                        if (namespace !== undefined) {
-                          message.namespace = namespace;
-                        }
-                        return _context3.a(2, _this4._postRequest(message, timeoutMs, "\u26A1 [PyodideManager] Execution timeout after ".concat(timeoutMs / 1000, " seconds")));
-                    }
-                  }, _callee3);
-                }));
-                return function run() {
-                  return _ref.apply(this, arguments);
-                };
-              }();
-              result = this.executionChain.then(run, run);
-              this.executionChain = result.catch(function () {});
-              return _context4.a(2, result);
-          }
-        }, _callee4, this);
-      }));
-      function executeAsync(_x3, _x4) {
-        return _executeAsync.apply(this, arguments);
+  /**
+   * Start standby workers up to config.standby, within standbyMemoryLimit.
+   * Runs once the attached worker is ready, so spares do not compete with
+   * its boot
+   *
+   * @private
+   * @returns {void}
+   */
+  _fillStandby() {
+    if (this._destroyed || !this.isReady) return;
+    while (this._spares.length < this.standby) {
+      if (this.standbyMemoryLimit !== undefined) {
+        const estimate = this._bootHeapBytes ?? 0;
+        const held = this._spares.reduce((sum, spare) => sum + (spare.readyData?.heapBytes ?? estimate), 0);
+        if (held + estimate > this.standbyMemoryLimit) break;
       }
-      return executeAsync;
-    }()
-    /**
-     * Clear execution history context
-     *
-     * @returns {void}
-     */
-    )
-  }, {
-    key: "clearExecutionHistory",
-    value: function clearExecutionHistory() {
-      this.executionHistory = [];
+      const slot = { worker: null, blobUrl: null, ...createSharedBuffers(), readyData: null };
+      slot.onMessage = (data) => {
+        if (data?.type === "ready") {
+          slot.readyData = data;
+        } else if (data?.type === "error" && data.id === undefined) {
+          this._discardSpare(slot, data.message || data.error);
+        } else if (data?.id !== undefined) {
+          // Response to a request it served (check): ids are unique per manager
+          this._dispatchMessage(data);
+        }
+      };
+      slot.onCrash = (message) => this._discardSpare(slot, message);
+      this._spares.push(slot);
+      this._startWorker(slot).catch((error) => this._discardSpare(slot, error.message));
     }
+  }
 
-    /**
-     * Cleanup resources and terminate worker
-     * Call this when the manager is no longer needed to prevent memory leaks
-     *
-     * @returns {void}
-     */
-  }, {
-    key: "destroy",
-    value: function destroy() {
-      // Terminate worker
-      if (this.worker) {
-        this.worker.terminate();
-        this.worker = null;
-      }
-
-      // Revoke blob URL to prevent memory leaks
-      if (this.blobUrl) {
-        URL.revokeObjectURL(this.blobUrl);
-        this.blobUrl = null;
-      }
-
-      // Settle everything still waiting on this manager
-      var error = new Error("🚨 [PyodideManager] Manager destroyed");
-      this._failAllPending(error);
-      this._readyReject(error);
-
-      // Reset state
-      this.isReady = false;
-      this.executionHistory = [];
+  /**
+   * Drop a standby worker (failed boot, crash, destroy). A failed spare is
+   * not replaced until the next restart, so a broken setup does not loop
+   *
+   * @private
+   * @param {WorkerSlot} slot - Standby slot
+   * @param {string} [reason] - Logged when the spare failed
+   * @returns {void}
+   */
+  _discardSpare(slot, reason = undefined) {
+    const index = this._spares.indexOf(slot);
+    if (index !== -1) this._spares.splice(index, 1);
+    slot.discarded = true;
+    slot.worker?.terminate();
+    if (slot.blobUrl) URL.revokeObjectURL(slot.blobUrl);
+    if (reason) {
+      console.warn("🐍 [PyodideManager] Standby worker dropped:", reason);
     }
-  }]);
-}(); // Add export at the end of the file
-
-
-/**
- * @typedef {Object} FileToLoad
- * @property {string} path - Path where file should be saved in filesystem
- * @property {string} content - File content to write
- * @property {string} [encoding] - File encoding (default: 'utf8')
- */
-
-/**
- * @typedef {Object} WorkerMessage
- * @property {'ready'|'error'|'warning'|'info'|'result'|'fs_result'|'fs_error'} type - Message type
- * @property {string} [message] - Message content
- * @property {string} [error] - Error message
- * @property {string} [filename] - Filename for execution results
- * @property {number} [time] - Execution time in milliseconds
- * @property {string} [stdout] - Standard output
- * @property {string} [stderr] - Standard error
- * @property {string|null} [missive] - Missive as a JSON string from Python
- * @property {Object|null} [error] - Execution error object
- * @property {any} [result] - Filesystem operation result
- */
-
-/**
- * @typedef {Object} ExecutionResult
- * @property {string} filename - Name of the executed file
- * @property {number} time - Execution time in milliseconds
- * @property {string} stdout - Standard output from Python execution
- * @property {string} stderr - Standard error from Python execution
- * @property {string|null} missive - Missive as a JSON string (parse on the consumer side)
- * @property {string[]} [figures] - Base64 encoded matplotlib figures (executeAsync result only, not stored in history)
- * @property {Object|null} error - JavaScript execution error object
- * @property {string} timestamp - ISO timestamp of execution
- * @property {boolean} [executedWithNamespace] - Whether execution used namespace
- */
-
-/***/ }),
-
-/***/ 800:
-/***/ ((__unused_webpack___webpack_module__, __webpack_exports__, __webpack_require__) => {
-
-/* harmony export */ __webpack_require__.d(__webpack_exports__, {
-/* harmony export */   n: () => (/* binding */ ValidationUtils)
-/* harmony export */ });
-function _slicedToArray(r, e) { return _arrayWithHoles(r) || _iterableToArrayLimit(r, e) || _unsupportedIterableToArray(r, e) || _nonIterableRest(); }
-function _nonIterableRest() { throw new TypeError("Invalid attempt to destructure non-iterable instance.\nIn order to be iterable, non-array objects must have a [Symbol.iterator]() method."); }
-function _iterableToArrayLimit(r, l) { var t = null == r ? null : "undefined" != typeof Symbol && r[Symbol.iterator] || r["@@iterator"]; if (null != t) { var e, n, i, u, a = [], f = !0, o = !1; try { if (i = (t = t.call(r)).next, 0 === l) { if (Object(t) !== t) return; f = !1; } else for (; !(f = (e = i.call(t)).done) && (a.push(e.value), a.length !== l); f = !0); } catch (r) { o = !0, n = r; } finally { try { if (!f && null != t.return && (u = t.return(), Object(u) !== u)) return; } finally { if (o) throw n; } } return a; } }
-function _arrayWithHoles(r) { if (Array.isArray(r)) return r; }
-function _createForOfIteratorHelper(r, e) { var t = "undefined" != typeof Symbol && r[Symbol.iterator] || r["@@iterator"]; if (!t) { if (Array.isArray(r) || (t = _unsupportedIterableToArray(r)) || e && r && "number" == typeof r.length) { t && (r = t); var _n = 0, F = function F() {}; return { s: F, n: function n() { return _n >= r.length ? { done: !0 } : { done: !1, value: r[_n++] }; }, e: function e(r) { throw r; }, f: F }; } throw new TypeError("Invalid attempt to iterate non-iterable instance.\nIn order to be iterable, non-array objects must have a [Symbol.iterator]() method."); } var o, a = !0, u = !1; return { s: function s() { t = t.call(r); }, n: function n() { var r = t.next(); return a = r.done, r; }, e: function e(r) { u = !0, o = r; }, f: function f() { try { a || null == t.return || t.return(); } finally { if (u) throw o; } } }; }
-function _unsupportedIterableToArray(r, a) { if (r) { if ("string" == typeof r) return _arrayLikeToArray(r, a); var t = {}.toString.call(r).slice(8, -1); return "Object" === t && r.constructor && (t = r.constructor.name), "Map" === t || "Set" === t ? Array.from(r) : "Arguments" === t || /^(?:Ui|I)nt(?:8|16|32)(?:Clamped)?Array$/.test(t) ? _arrayLikeToArray(r, a) : void 0; } }
-function _arrayLikeToArray(r, a) { (null == a || a > r.length) && (a = r.length); for (var e = 0, n = Array(a); e < a; e++) n[e] = r[e]; return n; }
-function _typeof(o) { "@babel/helpers - typeof"; return _typeof = "function" == typeof Symbol && "symbol" == typeof Symbol.iterator ? function (o) { return typeof o; } : function (o) { return o && "function" == typeof Symbol && o.constructor === Symbol && o !== Symbol.prototype ? "symbol" : typeof o; }, _typeof(o); }
-function _classCallCheck(a, n) { if (!(a instanceof n)) throw new TypeError("Cannot call a class as a function"); }
-function _defineProperties(e, r) { for (var t = 0; t < r.length; t++) { var o = r[t]; o.enumerable = o.enumerable || !1, o.configurable = !0, "value" in o && (o.writable = !0), Object.defineProperty(e, _toPropertyKey(o.key), o); } }
-function _createClass(e, r, t) { return r && _defineProperties(e.prototype, r), t && _defineProperties(e, t), Object.defineProperty(e, "prototype", { writable: !1 }), e; }
-function _toPropertyKey(t) { var i = _toPrimitive(t, "string"); return "symbol" == _typeof(i) ? i : i + ""; }
-function _toPrimitive(t, r) { if ("object" != _typeof(t) || !t) return t; var e = t[Symbol.toPrimitive]; if (void 0 !== e) { var i = e.call(t, r || "default"); if ("object" != _typeof(i)) return i; throw new TypeError("@@toPrimitive must return a primitive value."); } return ("string" === r ? String : Number)(t); }
-/**
- * Validation Utilities for Nagini
- *
- * Centralized parameter validation functions used across all components
- * to ensure consistent error handling and type checking.
- *
- * @module ValidationUtils
- */
+  }
 
-/**
- * General validation utility class with static methods for parameter validation
- */
-var ValidationUtils = /*#__PURE__*/function () {
-  function ValidationUtils() {
-    _classCallCheck(this, ValidationUtils);
+  /** @returns {number} Standby workers booted and ready to swap in */
+  get standbyReady() {
+    return this._spares.filter(spare => spare.readyData).length;
   }
-  return _createClass(ValidationUtils, null, [{
-    key: "validateArray",
-    value:
-    /**
-     * Validate that a value is an array
-     * @param {any} value - Value to validate
-     * @param {string} paramName - Parameter name for error messages
-     * @param {string} [component] - Component name for error context
-     * @throws {Error} If value is not an array
-     */
-    function validateArray(value, paramName) {
-      var component = arguments.length > 2 && arguments[2] !== undefined ? arguments[2] : 'Component';
-      if (!Array.isArray(value)) {
-        throw new Error("\uD83D\uDD27 [".concat(component, "] ").concat(paramName, " must be an array, got ").concat(_typeof(value)));
-      }
-    }
 
-    /**
-     * Validate that a value is a string
-     * @param {any} value - Value to validate
-     * @param {string} paramName - Parameter name for error messages
-     * @param {string} [component] - Component name for error context
-     * @param {boolean} [allowEmpty=false] - Whether to allow empty strings
-     * @throws {Error} If value is not a string or is empty when not allowed
-     */
-  }, {
-    key: "validateString",
-    value: function validateString(value, paramName) {
-      var component = arguments.length > 2 && arguments[2] !== undefined ? arguments[2] : 'Component';
-      var allowEmpty = arguments.length > 3 && arguments[3] !== undefined ? arguments[3] : false;
-      if (typeof value !== 'string') {
-        throw new Error("\uD83D\uDD27 [".concat(component, "] ").concat(paramName, " must be a string, got ").concat(_typeof(value)));
+  /**
+   * Route a worker message: settle the matching pending request (by id) if
+   * any, then hand the message to handleMessage for normal processing
+   * (execution history, input state, logging)
+   *
+   * @private
+   * @param {WorkerMessage} data - Message from worker
+   * @returns {void}
+   */
+  _dispatchMessage(data) {
+    // Progress messages for a request still in flight: hand them to its
+    // listener without settling anything
+    if (data && data.type === "output_chunk") {
+      this._notifyPending(data.id, "onOutput", { stream: data.stream, text: data.data });
+      return;
+    }
+    if (data && data.type === "batch_results") {
+      this._notifyPending(data.id, "onBatch", data);
+      return;
+    }
+    if (data && data.type === "emit_batch") {
+      if (this._pendingRequests.get(data.id)?.onEmit) {
+        this._notifyPending(data.id, "onEmit", JSON.parse(data.records));
       }
-      if (!allowEmpty && value.trim().length === 0) {
-        throw new Error("\uD83D\uDD27 [".concat(component, "] ").concat(paramName, " cannot be empty"));
+      // Acknowledge after the listener ran: a slow consumer holds emit() back
+      if (this._emitAck) {
+        Atomics.add(this._emitAck, 0, 1);
+        Atomics.notify(this._emitAck, 0);
       }
+      return;
     }
 
-    /**
-     * Validate that a value is a boolean
-     * @param {any} value - Value to validate
-     * @param {string} paramName - Parameter name for error messages
-     * @param {string} [component] - Component name for error context
-     * @throws {Error} If value is not a boolean
-     */
-  }, {
-    key: "validateBoolean",
-    value: function validateBoolean(value, paramName) {
-      var component = arguments.length > 2 && arguments[2] !== undefined ? arguments[2] : 'Component';
-      if (typeof value !== 'boolean') {
-        throw new Error("\uD83D\uDD27 [".concat(component, "] ").concat(paramName, " must be a boolean, got ").concat(_typeof(value)));
-      }
+    const pending = data && data.id !== undefined
+      ? this._pendingRequests.get(data.id)
+      : undefined;
+    if (pending) {
+      this._pendingRequests.delete(data.id);
+      clearTimeout(pending.timeoutId);
     }
 
-    /**
-     * Validate that a value is a function
-     * @param {any} value - Value to validate
-     * @param {string} paramName - Parameter name for error messages
-     * @param {string} [component] - Component name for error context
-     * @throws {Error} If value is not a function
-     */
-  }, {
-    key: "validateFunction",
-    value: function validateFunction(value, paramName) {
-      var component = arguments.length > 2 && arguments[2] !== undefined ? arguments[2] : 'Component';
-      if (typeof value !== 'function') {
-        throw new Error("\uD83D\uDD27 [".concat(component, "] ").concat(paramName, " must be a function, got ").concat(_typeof(value)));
-      }
+    // Normal processing first: history push, input state reset, logs. A
+    // throwing handler must not leave the pending request unsettled
+    try {
+      this.handleMessage(data);
+    } catch (error) {
+      console.error("🚨 [PyodideManager] handleMessage failed:", error);
     }
 
-    /**
-     * Validate that a value is an object (not null, not array)
-     * @param {any} value - Value to validate
-     * @param {string} paramName - Parameter name for error messages
-     * @param {string} [component] - Component name for error context
-     * @throws {Error} If value is not a plain object
-     */
-  }, {
-    key: "validateObject",
-    value: function validateObject(value, paramName) {
-      var component = arguments.length > 2 && arguments[2] !== undefined ? arguments[2] : 'Component';
-      if (_typeof(value) !== 'object' || value === null || Array.isArray(value)) {
-        throw new Error("\uD83D\uDD27 [".concat(component, "] ").concat(paramName, " must be a plain object, got ").concat(_typeof(value)));
-      }
+    if (data && data.type === "ready") {
+      this._readyResolve();
+      this._fillStandby();
     }
 
-    /**
-     * Validate Worker instance
-     * @param {any} worker - Worker to validate
-     * @param {string} [component] - Component name for error context
-     * @throws {Error} If worker is not valid
-     */
-  }, {
-    key: "validateWorker",
-    value: function validateWorker(worker) {
-      var component = arguments.length > 1 && arguments[1] !== undefined ? arguments[1] : 'Component';
-      if (!worker || typeof worker.postMessage !== 'function') {
-        throw new Error("\uD83D\uDD27 [".concat(component, "] Invalid worker instance - missing postMessage method"));
-      }
+    if (data && data.type === "error" && data.id === undefined) {
+      // Id-less error: init failure or worker crash. Fail readiness (during
+      // init) and every in-flight request, none of them can complete
+      const error = new Error(data.message || data.error || "Worker error");
+      this._readyReject(error);
+      this._failAllPending(error);
     }
 
-    /**
-     * Validate Pyodide instance
-     * @param {any} pyodide - Pyodide instance to validate
-     * @param {string} [component] - Component name for error context
-     * @throws {Error} If pyodide is not valid
-     */
-  }, {
-    key: "validatePyodide",
-    value: function validatePyodide(pyodide) {
-      var component = arguments.length > 1 && arguments[1] !== undefined ? arguments[1] : 'Component';
-      if (!pyodide) {
-        throw new Error("\uD83D\uDD27 [".concat(component, "] Pyodide instance is required"));
-      }
-      if (!pyodide.FS) {
-        throw new Error("\uD83D\uDD27 [".concat(component, "] Invalid Pyodide instance - missing FS"));
-      }
-      if (typeof pyodide.runPython !== 'function') {
-        throw new Error("\uD83D\uDD27 [".concat(component, "] Invalid Pyodide instance - missing runPython"));
-      }
+    if (!pending) return;
+
+    if (data.type === "result") {
+      // Resolve with a result built from the worker payload, even when it
+      // contains a Python error: callers read stderr for the full traceback
+      pending.resolve(toExecutionResult(data));
+    } else if (data.type === "many_result") {
+      pending.resolve(data.results);
+    } else if (data.type === "batch_done") {
+      pending.resolve({ completed: data.completed, time: data.time });
+    } else if (data.type === "figure_result") {
+      pending.resolve(data.figure);
+    } else if (data.type === "reset_result") {
+      pending.resolve({ globalsRemoved: data.globalsRemoved, modulesEvicted: data.modulesEvicted, time: data.time });
+    } else if (data.type === "check_result") {
+      pending.resolve({ valid: data.valid, error: data.error, time: data.time });
+    } else if (data.type === "fs_result") {
+      pending.resolve(data.result);
+    } else if (data.type === "fs_error") {
+      pending.reject(new Error(`🎛️ [PyodideManagerFS] Filesystem error: ${data.error}`));
+    } else if (data.type === "namespace_result") {
+      pending.resolve(data.result);
+    } else if (data.type === "namespace_error") {
+      pending.reject(new Error(`🎛️ [PyodideManagerNamespaces] Namespace error: ${data.error}`));
+    } else if (data.type === "error") {
+      pending.reject(new Error(`⚡ [PyodideManager] Execution error: ${data.message || data.error || "Unknown error"}`));
+    } else {
+      pending.reject(new Error(`🚨 [PyodideManager] Unexpected response type for request: ${data.type}`));
     }
+  }
 
-    /**
-     * Validate file objects array for FileLoader
-     * @param {Array} filesToLoad - Array of file objects
-     * @param {string} [component] - Component name for error context
-     * @throws {Error} If any file object is invalid
-     */
-  }, {
-    key: "validateFilesToLoad",
-    value: function validateFilesToLoad(filesToLoad) {
-      var component = arguments.length > 1 && arguments[1] !== undefined ? arguments[1] : 'PyodideFileLoader';
-      this.validateArray(filesToLoad, 'filesToLoad', component);
-      var _iterator = _createForOfIteratorHelper(filesToLoad.entries()),
-        _step;
-      try {
-        for (_iterator.s(); !(_step = _iterator.n()).done;) {
-          var _step$value = _slicedToArray(_step.value, 2),
-            index = _step$value[0],
-            file = _step$value[1];
-          if (!file || _typeof(file) !== 'object') {
-            throw new Error("\uD83D\uDD27 [".concat(component, "] filesToLoad[").concat(index, "] must be an object"));
-          }
-          this.validateString(file.url, "filesToLoad[".concat(index, "].url"), component);
-          this.validateString(file.path, "filesToLoad[".concat(index, "].path"), component);
-        }
-      } catch (err) {
-        _iterator.e(err);
-      } finally {
-        _iterator.f();
+  /**
+   * Call a listener registered on a pending request (progress messages).
+   * A throwing consumer callback must not break message dispatch
+   *
+   * @private
+   * @param {number} id - Request id echoed by the worker
+   * @param {string} listener - Listener name on the pending entry
+   * @param {any} payload - Value handed to the listener
+   * @returns {void}
+   */
+  _notifyPending(id, listener, payload) {
+    const pending = this._pendingRequests.get(id);
+    if (!pending || !pending[listener]) return;
+    try {
+      pending[listener](payload);
+    } catch (error) {
+      console.error(`🚨 [PyodideManager] ${listener} callback failed:`, error);
+    }
+  }
+
+  /**
+   * Send an id-correlated request to the worker and return a promise settled
+   * by the matching response (see _dispatchMessage)
+   *
+   * @private
+   * @param {Object} message - Message to post (id is added here)
+   * @param {number} timeoutMs - Timeout in milliseconds
+   * @param {string} timeoutLabel - Error message on timeout
+   * @param {Object} [listeners={}] - Progress callbacks kept on the pending entry (e.g. onOutput)
+   * @param {AbortSignal} [signal] - Rejects the request (with signal.reason) when aborted
+   * @param {Worker} [worker=this.worker] - Worker to send it to (a standby serving a check)
+   * @returns {Promise<any>}
+   */
+  _postRequest(message, timeoutMs, timeoutLabel, listeners = {}, signal = undefined, worker = this.worker) {
+    return new Promise((resolve, reject) => {
+      const id = this._nextRequestId++;
+      // A response arriving after a timeout or an abort is simply discarded
+      // by _dispatchMessage
+      const abandon = (error) => {
+        if (!this._pendingRequests.delete(id)) return;
+        clearTimeout(timeoutId);
+        signal?.removeEventListener("abort", onAbort);
+        reject(error);
+      };
+      const onAbort = () => abandon(abortReason(signal));
+      const timeoutId = setTimeout(() => {
+        listeners.onTimeout?.();
+        abandon(new Error(timeoutLabel));
+      }, timeoutMs);
+      const settle = (callback) => (value) => {
+        signal?.removeEventListener("abort", onAbort);
+        callback(value);
+      };
+
+      this._pendingRequests.set(id, { ...listeners, resolve: settle(resolve), reject: settle(reject), timeoutId });
+      signal?.addEventListener("abort", onAbort, { once: true });
+
+      try {
+        worker.postMessage({ ...message, id });
+      } catch (error) {
+        abandon(new Error(`🚨 [PyodideManager] Failed to send message to worker: ${error.message}`));
+      }
+    });
+  }
+
+  /**
+   * Queue an execution behind the ones already waiting in its lane and in
+   * more urgent lanes. A coalesceKey supersedes the queued executions with
+   * the same key: they reject with a Superseded error (the running one is
+   * left alone). An abort drops the execution from the queue if it has not
+   * started, and interrupts it if it runs.
+   *
+   * A barrier (namespace operation, reset) goes to the end of the queue,
+   * whatever its lane, and nothing queued after it overtakes it: it runs
+   * after every call submitted before it and before every call submitted
+   * after it
+   *
+   * @private
+   * @param {function(): Promise<ExecutionResult>} task - Sends the execution and settles with its result
+   * @param {AbortSignal} [signal] - Cancels the execution
+   * @param {QueueOptions} [queueOptions={}] - Lane and coalescing key
+   * @param {boolean} [queueOptions.barrier=false] - Run after everything queued before it
+   * @returns {Promise<ExecutionResult>}
+   */
+  _enqueueExecution(task, signal, { priority = "interactive", coalesceKey, barrier = false } = {}) {
+    return new Promise((resolve, reject) => {
+      if (!EXECUTION_PRIORITIES.includes(priority)) {
+        reject(new Error(`⚡ [PyodideManager] priority must be one of: ${EXECUTION_PRIORITIES.join(", ")}, got "${priority}"`));
+        return;
+      }
+      if (coalesceKey !== undefined && typeof coalesceKey !== "string") {
+        reject(new Error("⚡ [PyodideManager] coalesceKey must be a string"));
+        return;
+      }
+      if (signal?.aborted) {
+        reject(abortReason(signal));
+        return;
+      }
+      const entry = { task, signal, resolve, reject, onAbort: null, rank: EXECUTION_PRIORITIES.indexOf(priority), coalesceKey, barrier };
+      entry.onAbort = () => {
+        const index = this._executionQueue.indexOf(entry);
+        if (index !== -1) {
+          this._executionQueue.splice(index, 1);
+          reject(abortReason(signal));
+        } else if (this._runningExecution === entry) {
+          // The request itself is rejected by _postRequest
+          this._interruptExecution();
+        }
+      };
+      signal?.addEventListener("abort", entry.onAbort, { once: true });
+      if (coalesceKey !== undefined) {
+        this._supersede(coalesceKey);
+      }
+      // Lanes only reorder the calls queued after the last barrier
+      const start = this._executionQueue.findLastIndex(queued => queued.barrier) + 1;
+      const later = barrier ? -1 : this._executionQueue.findIndex((queued, i) => i >= start && queued.rank > entry.rank);
+      this._executionQueue.splice(later === -1 ? this._executionQueue.length : later, 0, entry);
+      this._runNextExecution();
+    });
+  }
+
+  /**
+   * Drop the queued executions carrying a coalescing key: a newer request
+   * replaces them (a live preview only needs the latest source)
+   *
+   * @private
+   * @param {string} coalesceKey - Coalescing key of the new request
+   * @returns {void}
+   */
+  _supersede(coalesceKey) {
+    const stale = this._executionQueue.filter(queued => queued.coalesceKey === coalesceKey);
+    for (const entry of stale) {
+      this._executionQueue.splice(this._executionQueue.indexOf(entry), 1);
+      entry.signal?.removeEventListener("abort", entry.onAbort);
+      this.supersededCount++;
+      entry.reject(supersededError(coalesceKey));
+    }
+  }
+
+  /**
+   * Remember the figure keys of a delivered dedupFigures result
+   *
+   * @private
+   * @param {ExecutionResult} result - Result received from the worker
+   * @returns {void}
+   */
+  _recordSentFigures(result) {
+    (result.figureKeys ?? []).forEach((key, i) => {
+      // A null figure only refreshes a key the caller already holds
+      if (result.figures[i] === null && !this._sentFigureKeys.has(key)) return;
+      this._sentFigureKeys.delete(key);
+      this._sentFigureKeys.set(key, true);
+    });
+    for (const oldest of this._sentFigureKeys.keys()) {
+      if (this._sentFigureKeys.size <= FIGURE_KEY_CACHE_SIZE) break;
+      this._sentFigureKeys.delete(oldest);
+    }
+  }
+
+  /**
+   * Start the next queued execution when none is running
+   *
+   * @private
+   * @returns {Promise<void>}
+   */
+  async _runNextExecution() {
+    if (this._runningExecution || this._executionQueue.length === 0) return;
+    const entry = this._executionQueue.shift();
+    this._runningExecution = entry;
+    try {
+      entry.resolve(await entry.task());
+    } catch (error) {
+      entry.reject(error);
+    } finally {
+      entry.signal?.removeEventListener("abort", entry.onAbort);
+      this._runningExecution = null;
+      this._runNextExecution();
+    }
+  }
+
+  /**
+   * Ask the running Python code to stop: it raises KeyboardInterrupt at
+   * its next bytecode check and the interpreter stays warm. No-op without
+   * a shared interrupt buffer (page not cross-origin isolated)
+   *
+   * @private
+   * @returns {void}
+   */
+  _interruptExecution() {
+    if (this._interruptBuffer) this._interruptBuffer[0] = SIGINT;
+  }
+
+  /**
+   * Reject every pending request (worker crash, destroy)
+   *
+   * @private
+   * @param {Error} error - Rejection cause
+   * @returns {void}
+   */
+  _failAllPending(error) {
+    for (const pending of this._pendingRequests.values()) {
+      clearTimeout(pending.timeoutId);
+      pending.reject(error);
+    }
+    this._pendingRequests.clear();
+  }
+
+  /**
+   * Handle messages from the Pyodide worker
+   * Updates UI status and manages execution context
+   *
+   * @param {WorkerMessage} data - Message from worker
+   * @returns {void}
+   */
+  handleMessage(data) {
+    // Pyodide initialization complete
+    if (data.type === "ready") {
+      this.isReady = true;
+      this.snapshotRestored = !!data.snapshotRestored;
+      this.inputMode = data.inputMode || "async";
+      this._bootHeapBytes = data.heapBytes ?? this._bootHeapBytes;
+    }
+
+    // Pyodide initialization or execution error
+    if (data.type === "error") {
+      console.error("🐍 [PyodideManager] Error:", data.message || data.error || data);
+    }
+
+    // Package installation warning (non-fatal)
+    if (data.type === "warning") {
+      console.warn("🐍 [PyodideManager] Warning:", data.message || "Unknown warning");
+    }
+
+    // Package installation info (optimization messages) - minimized
+    // if (data.type === "info") { /* minimized */ }
+
+    // Handle input-related messages using input module
+    PyodideManagerInput.handleInputMessage(this, data);
+
+    // Python code execution completed
+    if (data.type === "result") {
+      PyodideManagerInput.resetInputState(this);
+
+      // 🐍 EXECUTION RESULTS (always logged with snake emoji)
+      console.log("🐍 Execution completed:", {
+        stdout: data.stdout ? data.stdout.length + " chars" : "empty",
+        stderr: data.stderr ? data.stderr.length + " chars" : "empty",
+        missive: data.missive,
+        figures: data.figures ? data.figures.length + " figures" : "none",
+        error: data.error
+      });
+
+      // Create execution entry: figures are kept out of the history (base64
+      // payloads accumulate into an effective memory leak in long sessions);
+      // they remain available on the result resolved by executeAsync
+      const entry = {
+        filename: data.filename,
+        time: data.time,
+        stdout: data.stdout,
+        stderr: data.stderr,
+        missive: data.missive,
+        error: data.error,
+        truncated: data.truncated,
+        metrics: data.metrics,
+        timestamp: new Date().toISOString(),
+      };
+
+      this.executionHistory.push(entry);
+      if (this.executionHistory.length > MAX_EXECUTION_HISTORY) {
+        this.executionHistory.shift();
+      }
+    }
+  }
+
+  /** @returns {number} Executions queued or running on this worker */
+  get queueDepth() {
+    return this._executionQueue.length + (this._runningExecution ? 1 : 0);
+  }
+
+  /** @returns {Object<string, number>} Executions waiting (not running), per priority lane */
+  get queueLengths() {
+    const lengths = Object.fromEntries(EXECUTION_PRIORITIES.map(priority => [priority, 0]));
+    for (const entry of this._executionQueue) {
+      lengths[EXECUTION_PRIORITIES[entry.rank]]++;
+    }
+    return lengths;
+  }
+
+  // Input handling methods - delegate to input module
+  provideInput(input) { return PyodideManagerInput.provideInput(this, input); }
+  queueInput(input) { return PyodideManagerInput.queueInput(this, input); }
+  setInputCallback(callback) { return PyodideManagerInput.setInputCallback(this, callback); }
+  isWaitingForInput() { return PyodideManagerInput.isWaitingForInput(this); }
+  getCurrentPrompt() { return PyodideManagerInput.getCurrentPrompt(this); }
+
+  // Filesystem operations - delegate to filesystem module
+  async fs(operation, params, timeoutMs = 10000) { return PyodideManagerFS.fs(this, operation, params, timeoutMs); }
+
+  // Named namespaces - delegate to namespaces module
+  async createNamespace(name, initial = {}, timeoutMs = 10000) { return PyodideManagerNamespaces.create(this, name, initial, timeoutMs); }
+  async updateNamespace(name, patch, remove = [], timeoutMs = 10000) { return PyodideManagerNamespaces.update(this, name, patch, remove, timeoutMs); }
+  async readNamespace(name, keys = undefined, timeoutMs = 10000) { return PyodideManagerNamespaces.read(this, name, keys, timeoutMs); }
+  async deleteNamespace(name, timeoutMs = 10000) { return PyodideManagerNamespaces.delete(this, name, timeoutMs); }
+
+  /**
+   * Execute Python code in the worker with optional namespace isolation
+   *
+   * @param {string} filename - Name for this execution (for tracking and debugging)
+   * @param {string} code - Python code to execute
+   * @param {Object|undefined} [namespace] - Optional namespace object for Python execution
+   * @returns {void} - No return value, sends message to worker
+   */
+  executeFile(filename, code, namespace = undefined) {
+    return PyodideManagerStaticExecutor.executeFile(this.worker, this.isReady, filename, code, namespace);
+  }
+
+  /**
+   * Execute Python code asynchronously and return a Promise with the result
+   *
+   * @param {string} filename - Name for this execution (for tracking and debugging)
+   * @param {string} code - Python code to execute
+   * @param {Object|undefined} [namespace] - Optional namespace object for Python execution
+   * @param {number} [timeoutMs=30000] - Execution timeout in milliseconds (raise it for interactive input() code)
+   * @param {ExecuteOptions} [options={}] - Per-execution options
+   * @returns {Promise<ExecutionResult>} Promise that resolves with execution result
+   * @throws {Error} If manager is not ready or execution times out, signal.reason if aborted
+   */
+  async executeAsync(filename, code, namespace = undefined, timeoutMs = 30000, options = {}) {
+    // Executions are serialized: one Python interpreter lives in the worker,
+    // so concurrent calls are queued rather than interleaved (by priority
+    // lane, see _enqueueExecution). Responses are
+    // correlated by request id, so a late result from a timed-out or
+    // aborted run can never be attributed to the next execution
+    if (options.signal !== undefined && !(options.signal instanceof AbortSignal)) {
+      throw new Error("⚡ [PyodideManager] signal must be an AbortSignal");
+    }
+    const run = async () => {
+      ValidationUtils.validateExecutionParams(filename, code, namespace, 'PyodideManager');
+      if (options.onOutput !== undefined) {
+        ValidationUtils.validateFunction(options.onOutput, 'onOutput', 'PyodideManager');
+      }
+      if (options.onEmit !== undefined) {
+        ValidationUtils.validateFunction(options.onEmit, 'onEmit', 'PyodideManager');
+      }
+      if (options.outputLimit !== undefined) {
+        ValidationUtils.validateOutputLimit(options.outputLimit, 'PyodideManager');
+      }
+      if (options.budget !== undefined && (!Number.isInteger(options.budget) || options.budget <= 0)) {
+        throw new Error(`⚡ [PyodideManager] budget must be a positive integer, got ${options.budget}`);
+      }
+      if (options.namespaceRef !== undefined) {
+        ValidationUtils.validateString(options.namespaceRef, 'namespaceRef', 'PyodideManager');
+        if (namespace !== undefined) {
+          throw new Error("⚡ [PyodideManager] Pass either a namespace object or a namespaceRef, not both");
+        }
+      }
+      if (options.figureFormat !== undefined && !FIGURE_FORMATS.includes(options.figureFormat)) {
+        throw new Error(`⚡ [PyodideManager] figureFormat must be one of: ${FIGURE_FORMATS.join(", ")}, got "${options.figureFormat}"`);
+      }
+      if (!this.isReady) {
+        throw new Error("⚡ [PyodideManager] Manager not ready yet. Wait for initialization to complete.");
+      }
+      const message = { type: "execute", filename, code };
+      if (namespace !== undefined) {
+        message.namespace = namespace;
+      }
+      if (options.namespaceRef !== undefined) {
+        // Run in a namespace held by the worker: nothing is converted and
+        // what the code assigns stays there for the next run
+        message.namespaceRef = options.namespaceRef;
+      }
+      if (options.figureFormat !== undefined || options.figureDpi !== undefined || options.lazyFigures || options.dedupFigures) {
+        message.figureOptions = {
+          format: options.figureFormat,
+          dpi: options.figureDpi,
+          lazy: !!options.lazyFigures,
+          dedup: !!options.dedupFigures,
+          known: options.dedupFigures ? [...this._sentFigureKeys.keys()] : undefined,
+        };
+      }
+      if (options.binaryMissive) {
+        message.binaryMissive = true;
+      }
+      if (options.traceMemory) {
+        message.traceMemory = true;
+      }
+      if (options.budget) {
+        // Deterministic stop for runaway code: past this many lines the run
+        // ends with a BudgetExceeded error and the worker stays usable
+        message.budget = options.budget;
+      }
+      if (options.display) {
+        message.display = options.display === true ? {} : options.display;
+      }
+      const outputLimit = options.outputLimit ?? this.outputLimit;
+      if (outputLimit) {
+        message.outputLimit = outputLimit;
+      }
+      // A run that outlives its timeout is interrupted, not left behind the
+      // next executions
+      const listeners = { onTimeout: () => this._interruptExecution() };
+      if (options.onOutput) {
+        // Streaming mode: stdout/stderr reach onOutput in chunks while the
+        // code runs; the resolved result only carries what was not streamed
+        message.stream = { chunkSize: options.chunkSize, flushIntervalMs: options.flushIntervalMs };
+        listeners.onOutput = options.onOutput;
+      }
+      if (options.onEmit) {
+        // emit() records reach onEmit in batches while the code runs;
+        // without a listener emit() is a no-op in the worker
+        message.emit = {
+          batchSize: options.emitBatchSize,
+          flushIntervalMs: options.emitFlushIntervalMs,
+          maxInFlight: options.emitMaxInFlight,
+        };
+        listeners.onEmit = options.onEmit;
+      }
+      const request = this._postRequest(
+        message,
+        timeoutMs,
+        `⚡ [PyodideManager] Execution timeout after ${timeoutMs / 1000} seconds`,
+        listeners,
+        options.signal
+      );
+      if (!options.dedupFigures || options.lazyFigures) return request;
+      return request.then(
+        (result) => {
+          this._recordSentFigures(result);
+          return result;
+        },
+        (error) => {
+          // A timeout or an abort may have lost payloads the worker rendered:
+          // start over rather than trust what the caller holds
+          this._sentFigureKeys.clear();
+          throw error;
+        }
+      );
+    };
+    return this._enqueueExecution(run, options.signal, options);
+  }
+
+  /**
+   * Run many independent snippets in one round trip: the items travel in
+   * one message, run back to back in the worker and their results come
+   * back in batches. Each item has its own captures and error (a failing
+   * item does not stop the next one) and timeoutMs covers the whole batch.
+   * Items are not added to executionHistory
+   *
+   * @param {Array<BatchItem>} items - Snippets to run, in order
+   * @param {number} [timeoutMs=30000] - Timeout of the whole batch in milliseconds
+   * @param {BatchOptions} [options={}] - Batch options
+   * @returns {Promise<ExecutionResult[]>} One result per item, in item order
+   * @throws {Error} If manager is not ready or the batch times out, signal.reason if aborted
+   */
+  async executeBatch(items, timeoutMs = 30000, options = {}) {
+    ValidationUtils.validateArray(items, 'items', 'PyodideManager');
+    for (const item of items) {
+      ValidationUtils.validateObject(item, 'item', 'PyodideManager');
+      ValidationUtils.validateExecutionParams(item.filename, item.code, item.namespace, 'PyodideManager');
+    }
+    if (options.signal !== undefined && !(options.signal instanceof AbortSignal)) {
+      throw new Error("⚡ [PyodideManager] signal must be an AbortSignal");
+    }
+    if (options.onResults !== undefined) {
+      ValidationUtils.validateFunction(options.onResults, 'onResults', 'PyodideManager');
+    }
+    if (options.outputLimit !== undefined) {
+      ValidationUtils.validateOutputLimit(options.outputLimit, 'PyodideManager');
+    }
+    if (options.budget !== undefined && (!Number.isInteger(options.budget) || options.budget <= 0)) {
+      throw new Error(`⚡ [PyodideManager] budget must be a positive integer, got ${options.budget}`);
+    }
+    if (items.length === 0) return [];
+
+    const run = async () => {
+      if (!this.isReady) {
+        throw new Error("⚡ [PyodideManager] Manager not ready yet. Wait for initialization to complete.");
+      }
+      const message = {
+        type: "execute_batch",
+        items: items.map(({ filename, code, namespace }) => ({ filename, code, namespace })),
+        resultBatchSize: options.resultBatchSize,
+        flushIntervalMs: options.flushIntervalMs,
+      };
+      if (options.budget) {
+        message.budget = options.budget;
+      }
+      const outputLimit = options.outputLimit ?? this.outputLimit;
+      if (outputLimit) {
+        message.outputLimit = outputLimit;
+      }
+      const results = [];
+      const listeners = {
+        onTimeout: () => this._interruptExecution(),
+        onBatch: ({ index, results: chunk }) => {
+          const converted = chunk.map(toExecutionResult);
+          results.push(...converted);
+          options.onResults?.(converted, index);
+        },
+      };
+      await this._postRequest(
+        message,
+        timeoutMs,
+        `⚡ [PyodideManager] Batch timeout after ${timeoutMs / 1000} seconds`,
+        listeners,
+        options.signal
+      );
+      return results;
+    };
+    return this._enqueueExecution(run, options.signal, options);
+  }
+
+  /**
+   * Run the same code against many namespaces (test cases): compiled once,
+   * run once per namespace in the worker, results returned as one vector.
+   * Namespaces are an array of objects, or a columnar table: one array
+   * (or typed array) per variable, case i reading element i of each, which
+   * crosses into Python in a single conversion however many cases there
+   * are. Each case has its own output and error; timeoutMs covers all of
+   * them. Cases are not added to executionHistory
+   *
+   * @param {string} code - Python code to run for each case
+   * @param {Array<Object>|Object<string, Array|TypedArray>} namespaces - Case namespaces, as rows or columns
+   * @param {number} [timeoutMs=30000] - Timeout of the whole fan-out in milliseconds
+   * @param {ManyOptions} [options={}] - Fan-out options
+   * @returns {Promise<CaseResult[]>} One result per case, in case order
+   * @throws {Error} If manager is not ready, columns differ in length or the fan-out times out
+   */
+  async executeMany(code, namespaces, timeoutMs = 30000, options = {}) {
+    ValidationUtils.validateString(code, 'code', 'PyodideManager');
+    const message = { type: "execute_many", code };
+    if (Array.isArray(namespaces)) {
+      namespaces.forEach(namespace => ValidationUtils.validateObject(namespace, 'namespace', 'PyodideManager'));
+      message.rows = namespaces;
+    } else {
+      ValidationUtils.validateObject(namespaces, 'namespaces', 'PyodideManager');
+      const lengths = new Set(Object.values(namespaces).map(column => {
+        if (!Array.isArray(column) && !ArrayBuffer.isView(column)) {
+          throw new Error("⚡ [PyodideManager] Columnar namespaces must map each variable to an array or typed array");
+        }
+        return column.length;
+      }));
+      if (lengths.size > 1) {
+        throw new Error(`⚡ [PyodideManager] Columnar namespaces must have columns of equal length, got ${[...lengths].join(", ")}`);
+      }
+      message.columns = namespaces;
+    }
+    if (options.signal !== undefined && !(options.signal instanceof AbortSignal)) {
+      throw new Error("⚡ [PyodideManager] signal must be an AbortSignal");
+    }
+    if (options.outputLimit !== undefined) {
+      ValidationUtils.validateOutputLimit(options.outputLimit, 'PyodideManager');
+    }
+    if (options.budget !== undefined && (!Number.isInteger(options.budget) || options.budget <= 0)) {
+      throw new Error(`⚡ [PyodideManager] budget must be a positive integer, got ${options.budget}`);
+    }
+    if (options.budget) {
+      message.budget = options.budget;
+    }
+    const outputLimit = options.outputLimit ?? this.outputLimit;
+    if (outputLimit) {
+      message.outputLimit = outputLimit;
+    }
+
+    const run = async () => {
+      if (!this.isReady) {
+        throw new Error("⚡ [PyodideManager] Manager not ready yet. Wait for initialization to complete.");
+      }
+      return this._postRequest(
+        message,
+        timeoutMs,
+        `⚡ [PyodideManager] Fan-out timeout after ${timeoutMs / 1000} seconds`,
+        { onTimeout: () => this._interruptExecution() },
+        options.signal
+      );
+    };
+    return this._enqueueExecution(run, options.signal, options);
+  }
+
+  /**
+   * Check that code parses, without running it (live editor linting). Not
+   * queued behind executions. While an execution runs, a ready standby
+   * worker (config.standby) answers it, in milliseconds even if the run is
+   * busy in pure computation. Without one, the attached worker answers as
+   * soon as its event loop is free: at once while the run awaits
+   * (input(), asyncio), only when it ends if it computes
+   *
+   * @param {string} code - Python code to parse
+   * @param {number} [timeoutMs=5000] - Timeout in milliseconds
+   * @returns {Promise<CheckResult>} Whether the code parses, and where it does not
+   * @throws {Error} If manager is not ready or the check times out
+   */
+  async check(code, timeoutMs = 5000) {
+    ValidationUtils.validateString(code, 'code', 'PyodideManager', true);
+    if (!this.isReady) {
+      throw new Error("⚡ [PyodideManager] Manager not ready yet. Wait for initialization to complete.");
+    }
+    const spare = this._runningExecution ? this._spares.find(slot => slot.readyData) : undefined;
+    return this._postRequest(
+      { type: "check", code },
+      timeoutMs,
+      `⚡ [PyodideManager] Syntax check timeout after ${timeoutMs / 1000} seconds`,
+      {},
+      undefined,
+      spare?.worker ?? this.worker
+    );
+  }
+
+  /**
+   * Put the interpreter back in its state right after initialization,
+   * without restarting the worker: globals and builtins added or rebound
+   * since then, user modules in sys.modules, sys.path, the working
+   * directory and open figures. Packages stay loaded. Queued as a barrier:
+   * it runs after every call already submitted, background and prefetch
+   * ones included, and before every later call
+   *
+   * @param {ResetOptions} [options={}] - Reset options
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<ResetResult>} What the reset removed
+   * @throws {Error} If manager is not ready or the reset fails
+   */
+  async reset(options = {}, timeoutMs = 10000) {
+    if (options.scratchDir !== undefined) {
+      ValidationUtils.validateString(options.scratchDir, 'scratchDir', 'PyodideManager');
+    }
+    const run = async () => {
+      if (!this.isReady) {
+        throw new Error("⚡ [PyodideManager] Manager not ready yet. Wait for initialization to complete.");
+      }
+      const message = { type: "reset" };
+      if (options.scratchDir !== undefined) {
+        message.scratchDir = options.scratchDir;
+      }
+      return this._postRequest(
+        message,
+        timeoutMs,
+        `⚡ [PyodideManager] Reset timeout after ${timeoutMs / 1000} seconds`
+      );
+    };
+    return this._enqueueExecution(run, undefined, { barrier: true });
+  }
+
+  /**
+   * Render one figure left open by a lazyFigures execution. Figures live
+   * in the worker until the next execution resets the capture layer; a
+   * request for a figure that is gone rejects
+   *
+   * @param {number} num - Figure number from a handle of result.figures
+   * @param {RenderFigureOptions} [options={}] - Format and size of the render
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<string|Uint8Array>} base64 string or PNG/SVG bytes
+   * @throws {Error} If the manager is not ready, the figure is gone or the render fails
+   */
+  async renderFigure(num, options = {}, timeoutMs = 10000) {
+    if (!Number.isInteger(num)) {
+      throw new Error(`⚡ [PyodideManager] num must be an integer figure number, got ${num}`);
+    }
+    if (options.format !== undefined && !FIGURE_FORMATS.includes(options.format)) {
+      throw new Error(`⚡ [PyodideManager] format must be one of: ${FIGURE_FORMATS.join(", ")}, got "${options.format}"`);
+    }
+    if (!this.isReady) {
+      throw new Error("⚡ [PyodideManager] Manager not ready yet. Wait for initialization to complete.");
+    }
+    return this._postRequest(
+      { type: "render_figure", num, ...options },
+      timeoutMs,
+      `⚡ [PyodideManager] Figure render timeout after ${timeoutMs / 1000} seconds`
+    );
+  }
+
+  /**
+   * Clear execution history context
+   *
+   * @returns {void}
+   */
+  clearExecutionHistory() {
+    this.executionHistory = [];
+  }
+
+  /**
+   * Cleanup resources and terminate worker
+   * Call this when the manager is no longer needed to prevent memory leaks
+   *
+   * @returns {void}
+   */
+  destroy() {
+    this._destroyed = true;
+    this._retireWorker(new Error("🚨 [PyodideManager] Manager destroyed"));
+    for (const spare of [...this._spares]) {
+      this._discardSpare(spare);
+    }
+    this.executionHistory = [];
+  }
+
+  /**
+   * Replace the worker with a fresh interpreter: a standby worker when one
+   * is configured (swapped in within milliseconds once booted), a full boot
+   * otherwise. The running and queued executions reject; globals, files
+   * and packages loaded at run time are gone with the old worker. The
+   * standby pool is replenished in the background
+   *
+   * @returns {Promise<void>} Resolves when the new worker is ready
+   * @throws {Error} If the manager was destroyed or the new worker fails to boot
+   */
+  async restart() {
+    if (this._destroyed) {
+      throw new Error("🚨 [PyodideManager] Manager destroyed");
+    }
+    this._retireWorker(new Error("🚨 [PyodideManager] Manager restarted"));
+    this._resetReadyPromise();
+
+    // A spare that finished booting first, then one still booting
+    const spare = this._spares.find(s => s.readyData) ?? this._spares.find(s => s.worker);
+    if (spare) {
+      this._spares.splice(this._spares.indexOf(spare), 1);
+      this._attachWorker(spare);
+    } else {
+      this.initWorker().catch((error) => {
+        console.error("🚨 [PyodideManager] Worker initialization failed:", error);
+        this._readyReject(error);
+      });
+    }
+    return this.readyPromise;
+  }
+
+  /**
+   * Terminate the attached worker and settle everything waiting on it
+   *
+   * @private
+   * @param {Error} error - Rejection cause for queued and pending requests
+   * @returns {void}
+   */
+  _retireWorker(error) {
+    // Terminate worker
+    if (this.worker) {
+      this.worker.terminate();
+      this.worker = null;
+    }
+    if (this._attachedSlot) {
+      // A worker still fetching its script must not start afterwards
+      this._attachedSlot.discarded = true;
+      this._attachedSlot = null;
+    }
+
+    // Revoke blob URL to prevent memory leaks
+    if (this.blobUrl) {
+      URL.revokeObjectURL(this.blobUrl);
+      this.blobUrl = null;
+    }
+
+    // Settle everything still waiting on this worker
+    for (const entry of this._executionQueue.splice(0)) {
+      entry.signal?.removeEventListener("abort", entry.onAbort);
+      entry.reject(error);
+    }
+    this._failAllPending(error);
+    this._readyReject(error);
+
+    // Reset state
+    this.isReady = false;
+    this.inputMode = null;
+    PyodideManagerInput.resetInputState(this);
+  }
+}
+
+/**
+ * Execution result built from a worker result payload (single execution or
+ * one item of a batch)
+ *
+ * @param {Object} data - Result payload from the worker
+ * @returns {ExecutionResult}
+ */
+function toExecutionResult(data) {
+  return {
+    filename: data.filename,
+    time: data.time,
+    stdout: data.stdout,
+    stderr: data.stderr,
+    missive: data.missive,
+    figures: data.figures,
+    figureFormat: data.figureFormat,
+    figureKeys: data.figureKeys,
+    error: data.error,
+    truncated: data.truncated,
+    dropped: data.dropped,
+    metrics: data.metrics,
+    display: data.display,
+    timestamp: new Date().toISOString(),
+  };
+}
+
+/**
+ * Rejection value of an aborted request: the signal's reason, as fetch does
+ *
+ * @param {AbortSignal} signal - Aborted signal
+ * @returns {any} signal.reason, or an AbortError when the runtime sets none
+ */
+function abortReason(signal) {
+  return signal.reason ?? new DOMException("⚡ [PyodideManager] Execution aborted", "AbortError");
+}
+
+/**
+ * Rejection of a queued execution replaced by a newer one with its key
+ *
+ * @param {string} coalesceKey - Shared coalescing key
+ * @returns {Error} Error named "Superseded"
+ */
+function supersededError(coalesceKey) {
+  const error = new Error(`⚡ [PyodideManager] Superseded by a newer execution with coalesceKey "${coalesceKey}"`);
+  error.name = "Superseded";
+  return error;
+}
+
+// Add export at the end of the file
+
+
+/**
+ * @typedef {Object} FileToLoad
+ * @property {string} path - Path where file should be saved in filesystem
+ * @property {string} content - File content to write
+ * @property {string} [encoding] - File encoding (default: 'utf8')
+ */
+
+/**
+ * @typedef {Object} WorkerMessage
+ * @property {'ready'|'error'|'warning'|'info'|'result'|'output_chunk'|'emit_batch'|'batch_results'|'batch_done'|'many_result'|'figure_result'|'check_result'|'reset_result'|'fs_result'|'fs_error'|'namespace_result'|'namespace_error'} type - Message type
+ * @property {string} [message] - Message content
+ * @property {string} [error] - Error message
+ * @property {string} [filename] - Filename for execution results
+ * @property {number} [time] - Execution time in milliseconds
+ * @property {string} [stdout] - Standard output
+ * @property {string} [stderr] - Standard error
+ * @property {string|Object|null} [missive] - Missive as a JSON string from Python (an object with typed arrays when binaryMissive)
+ * @property {Object|null} [error] - Execution error object
+ * @property {any} [result] - Filesystem operation result
+ */
+
+/**
+ * @typedef {Object} ExecutionResult
+ * @property {string} filename - Name of the executed file
+ * @property {number} time - Execution time in milliseconds
+ * @property {string} stdout - Standard output from Python execution
+ * @property {string} stderr - Standard error from Python execution
+ * @property {string|Object|null} missive - Missive as a JSON string (parse on the consumer side), already an object when binaryMissive
+ * @property {Array<string|Uint8Array|FigureHandle|null>} [figures] - Matplotlib figures, base64 strings, PNG/SVG bytes or lazy handles per figureFormat (executeAsync result only, not stored in history)
+ * @property {'base64'|'png'|'svg'|'handle'} [figureFormat] - Format of the figures payloads
+ * @property {string[]} [figureKeys] - Content key per figure (dedupFigures only); figures[i] is null when that key was already sent
+ * @property {Object|null} error - JavaScript execution error object
+ * @property {boolean} [truncated] - Whether an output limit dropped characters from stdout/stderr
+ * @property {{stdout: number, stderr: number}} [dropped] - Characters dropped per stream (executeAsync result only)
+ * @property {ExecutionMetrics} [metrics] - Resources used by the user code (kept in executionHistory)
+ * @property {DisplayEntry|null} [display] - Rich display of the trailing expression value (display option, executeAsync result only)
+ * @property {string} timestamp - ISO timestamp of execution
+ * @property {boolean} [executedWithNamespace] - Whether execution used namespace
+ */
+
+/**
+ * @typedef {Object} ExecutionMetrics
+ * @property {number} cpuTimeMs - CPU time of the user code (time.process_time delta)
+ * @property {number|null} peakMemoryBytes - Peak of traced Python allocations, null unless traceMemory
+ * @property {number} gcCollections - Garbage collections run during the execution
+ * @property {number} stdoutBytes - UTF-8 bytes written to stdout (including dropped or streamed ones)
+ * @property {number} stderrBytes - UTF-8 bytes written to stderr
+ * @property {number|null} heapBytesBefore - WebAssembly memory size before the run
+ * @property {number|null} heapBytesAfter - WebAssembly memory size after the run
+ * @property {number} figureCount - Figures captured
+ * @property {number} compileCacheHits - Executions served by the compiled-code cache (worker lifetime)
+ * @property {number} compileCacheMisses - Executions that had to parse and compile (worker lifetime)
+ * @property {number} packageLoadMs - Time spent loading imported packages before the run (autoLoadImports)
+ * @property {string[]} packagesAutoLoaded - Packages loaded for this execution's imports
+ * @property {number|null} budgetUsed - Lines charged to the execution's budget, null without one
+ */
+
+/**
+ * @typedef {Object} DisplayOptions
+ * @property {number} [maxBytes=1000000] - Representations larger than this many UTF-8 bytes are skipped (plain text is cut to fit)
+ * @property {number} [maxRows=60] - Row window for pandas DataFrame/Series
+ */
+
+/**
+ * @typedef {Object} DisplayEntry
+ * @property {string} mime - text/html, image/svg+xml, image/png, text/latex, text/markdown or text/plain
+ * @property {string|Uint8Array} data - The representation (transferred bytes for image/png)
+ * @property {string} text - Plain repr() of the value, as a fallback
+ */
+
+/**
+ * @typedef {Object} CheckResult
+ * @property {boolean} valid - Whether the code parses
+ * @property {SyntaxErrorInfo|null} error - The first syntax error, null when valid
+ * @property {number} time - Time spent in the worker in milliseconds
+ */
+
+/**
+ * @typedef {Object} SyntaxErrorInfo
+ * @property {string} type - SyntaxError, IndentationError or TabError
+ * @property {string} message - Error message without the position
+ * @property {number|null} line - 1-based line
+ * @property {number|null} column - 1-based column
+ * @property {number|null} endLine - 1-based end line
+ * @property {number|null} endColumn - 1-based end column (exclusive)
+ * @property {string|null} text - Source line the error is on
+ */
+
+/**
+ * @typedef {Object} BatchItem
+ * @property {string} filename - Name for this execution
+ * @property {string} code - Python code to execute
+ * @property {Object} [namespace] - Namespace object, as for executeAsync
+ */
+
+/**
+ * @typedef {Object} BatchOptions
+ * @property {function(ExecutionResult[], number): void} [onResults] - Receives each batch of results as it arrives, with the index of its first item
+ * @property {number} [resultBatchSize=32] - Results per message from the worker
+ * @property {number} [flushIntervalMs=50] - Longest wait before pending results are sent
+ * @property {number} [budget] - Line budget of each item
+ * @property {OutputLimit} [outputLimit] - Per-stream caps of each item (defaults to the manager's)
+ * @property {AbortSignal} [signal] - Cancels the batch (items not run yet are skipped)
+ * @property {'interactive'|'background'|'prefetch'} [priority='interactive'] - Queue lane of the batch (see QueueOptions)
+ * @property {string} [coalesceKey] - Replace queued calls with the same key (see QueueOptions)
+ */
+
+/**
+ * @typedef {Object} ManyOptions
+ * @property {number} [budget] - Line budget of each case
+ * @property {OutputLimit} [outputLimit] - Per-stream caps of each case (defaults to the manager's)
+ * @property {AbortSignal} [signal] - Cancels the fan-out (cases not run yet are skipped)
+ * @property {'interactive'|'background'|'prefetch'} [priority='interactive'] - Queue lane of the fan-out (see QueueOptions)
+ * @property {string} [coalesceKey] - Replace queued calls with the same key (see QueueOptions)
+ */
+
+/**
+ * @typedef {Object} CaseResult
+ * @property {string} stdout - Standard output of the case
+ * @property {string} stderr - Standard error of the case
+ * @property {string|null} missive - Missive as a JSON string, null when the case sent none
+ * @property {Object|null} error - Error of the case ({name, message}), null when it succeeded
+ * @property {boolean} truncated - Whether an output limit dropped characters
+ */
+
+/**
+ * @typedef {Object} ResetOptions
+ * @property {string} [scratchDir] - Directory of the virtual filesystem to empty (created when missing); must be strictly inside the working directory or /tmp
+ */
+
+/**
+ * @typedef {Object} ResetResult
+ * @property {number} globalsRemoved - Globals the reset deleted
+ * @property {number} modulesEvicted - User modules removed from sys.modules
+ * @property {number} time - Time spent in the worker in milliseconds
+ */
+
+/**
+ * @typedef {Object} WorkerSlot
+ * @property {Worker|null} worker - The worker, null while its script is fetched
+ * @property {string|null} blobUrl - Blob URL the worker was created from
+ * @property {Int32Array|null} emitAck - emit() backpressure counter shared with this worker
+ * @property {Uint8Array|null} interruptBuffer - Interrupt buffer shared with this worker
+ * @property {WorkerMessage|null} readyData - Ready message of a standby worker that finished booting
+ * @property {function(WorkerMessage): void} onMessage - Receives the worker's messages
+ * @property {function(string): void} onCrash - Receives worker crashes
+ * @property {boolean} [discarded] - Set once the slot is dropped
+ */
+
+/**
+ * @typedef {Object} QueuedExecution
+ * @property {function(): Promise<ExecutionResult>} task - Sends the execution and settles with its result
+ * @property {AbortSignal} [signal] - Cancellation signal of the call
+ * @property {Function} resolve - Settles the executeAsync promise
+ * @property {Function} reject - Rejects the executeAsync promise
+ * @property {function(): void} onAbort - Abort listener registered on signal
+ * @property {number} rank - Index of its lane in EXECUTION_PRIORITIES
+ * @property {string} [coalesceKey] - Coalescing key of the call
+ */
+
+/**
+ * @typedef {Object} QueueOptions
+ * @property {'interactive'|'background'|'prefetch'} [priority='interactive'] - Queue lane: a queued execution starts before those of every later lane (a steady stream of interactive runs delays the other lanes)
+ * @property {string} [coalesceKey] - A newer call with the same key replaces this one while it is still queued; it then rejects with an error named "Superseded"
+ */
+
+/**
+ * @typedef {Object} ExecuteOptions
+ * @property {function(OutputChunk): void} [onOutput] - Stream stdout/stderr while the code runs; the result's stdout/stderr are then empty
+ * @property {number} [chunkSize=8192] - Streaming: flush once this many characters are pending
+ * @property {number} [flushIntervalMs=50] - Streaming: flush when this long has passed since the last chunk
+ * @property {function(Array<any>): void} [onEmit] - Receive emit() records in batches while the code runs (one array per batch, in emit order)
+ * @property {number} [emitBatchSize=64] - emit(): send a batch once this many records are queued
+ * @property {number} [emitFlushIntervalMs=50] - emit(): send a batch when this long has passed since the last one
+ * @property {number} [emitMaxInFlight=8] - emit(): batches not yet handled by onEmit before emit() blocks the Python code (cross-origin isolated pages only). The block ends on an interrupt, or after 5 s without progress: the rest of the run then sends without flow control
+ * @property {OutputLimit} [outputLimit] - Per-stream head/tail caps for this execution (defaults to the manager's)
+ * @property {'base64'|'png'|'svg'} [figureFormat='base64'] - base64 PNG strings, or raw PNG/SVG bytes as Uint8Arrays transferred without copy
+ * @property {number} [figureDpi=100] - Raster resolution of captured figures
+ * @property {boolean} [lazyFigures=false] - Return FigureHandles without rendering; draw them later with renderFigure
+ * @property {boolean} [dedupFigures=false] - Fingerprint rendered figures: a figure identical to one delivered by an earlier call (last 32 keys, forgotten after a timeout or an abort) comes back as null with its figureKeys entry, so the page can keep the element it already shows
+ * @property {boolean|DisplayOptions} [display=false] - Capture the value of a trailing expression like a notebook cell, through its richest _repr_*_ under maxBytes (DataFrames cut to maxRows)
+ * @property {boolean} [traceMemory=false] - Record metrics.peakMemoryBytes with tracemalloc (slows allocation-heavy code)
+ * @property {boolean} [binaryMissive=false] - Resolve the missive as an object: NumPy arrays, bytes and memoryviews in it arrive as transferred typed arrays (1-D) or {data, dtype, shape} instead of JSON text
+ * @property {AbortSignal} [signal] - Cancels the execution: dropped from the queue if it has not started, interrupted with KeyboardInterrupt if it runs (cross-origin isolated pages; elsewhere only abandoned). The promise rejects with signal.reason
+ * @property {number} [budget] - Lines the code may execute (loop iterations count as lines): past it the result carries a BudgetExceeded error and the worker stays warm. Deterministic, unlike timeoutMs
+ * @property {string} [namespaceRef] - Run in a named namespace created with createNamespace instead of a namespace object (exclusive with the namespace argument)
+ * @property {'interactive'|'background'|'prefetch'} [priority='interactive'] - Queue lane (see QueueOptions)
+ * @property {string} [coalesceKey] - Replace queued executions with the same key (see QueueOptions)
+ */
+
+/**
+ * @typedef {Object} FigureHandle
+ * @property {number} num - Figure number (pass to renderFigure)
+ * @property {number} width - Width in inches
+ * @property {number} height - Height in inches
+ * @property {number} dpi - Figure dpi
+ * @property {number} artists - Artists across the figure's axes
+ */
+
+/**
+ * @typedef {Object} RenderFigureOptions
+ * @property {'base64'|'png'|'svg'} [format='png'] - Output format
+ * @property {number} [dpi=100] - Raster resolution (ignored when width is set)
+ * @property {number} [width] - Target raster width in pixels
+ * @property {boolean} [tight=true] - Crop to the drawn area; false skips the extra draw pass
+ */
+
+/**
+ * @typedef {Object} OutputLimit
+ * @property {number} head - Kept from the start of each stream
+ * @property {number} [tail=0] - Kept from the end once head is full; the middle is dropped and counted
+ *
+ * Both caps are in characters with the 'python' capture backend and in
+ * bytes with 'raw' (fd 1/2 carry bytes): size them in bytes for UTF-8
+ * safety, a character being 1 to 4 bytes
+ */
+
+/**
+ * @typedef {Object} OutputChunk
+ * @property {'stdout'|'stderr'} stream - Stream the text was written to
+ * @property {string} text - Chunk content
+ */
+
+/***/ }),
+
+/***/ "./pyodide/manager/manager-static-execution.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./pyodide/manager/manager-static-execution.js
+__nagini_define__(__nagini_exports__, {
+  PyodideManagerStaticExecutor: () => PyodideManagerStaticExecutor,
+});
+/**
+ * PyodideManagerStaticExecutor - Static utility class for Python execution logic
+ *
+ * 🎯 PURPOSE:
+ * - Provides a pure, testable static method for fire-and-forget execution
+ * - Manages namespace forwarding and parameter validation
+ *
+ * Promise-based execution lives in PyodideManager.executeAsync, built on
+ * id-correlated worker messages (see PyodideManager._postRequest): every
+ * request carries an id, the worker echoes it back, and a single permanent
+ * onmessage handler settles the matching promise. No handler replacement.
+ */
+
+const { ValidationUtils } = __nagini_require__("./utils/validation.js");
+
+class PyodideManagerStaticExecutor {
+  /**
+   * Execute Python code in the worker with optional namespace isolation
+   *
+   * TECHNICAL DETAILS FOR PYODIDE:
+   * - This method sends a message to the web worker containing the execution request
+   * - The worker receives: {type: 'execute', filename, code, namespace?}
+   * - Worker calls pyodide.runPythonAsync(code) or pyodide.runPythonAsync(code, {globals})
+   *
+   * NAMESPACE FLOW:
+   * 1. JavaScript object namespace -> sent to worker via postMessage
+   * 2. Worker receives it as JavaScript object
+   * 3. Worker passes it to pyodide.runPythonAsync() as execution globals
+   * 4. Pyodide converts JavaScript object to Python dict automatically
+   * 5. Python code executes with that dict as its namespace
+   *
+   * @param {Worker} worker - Web worker instance for executing Python code
+   * @param {boolean} isReady - Whether Pyodide is ready for execution
+   * @param {string} filename - Name for this execution (for tracking and debugging)
+   * @param {string} code - Python code to execute
+   * @param {Object|undefined} [namespace] - Optional namespace object for Python execution
+   * @returns {void} - No return value, sends message to worker
+   * @throws {Error} If parameters are invalid or worker is not ready
+   */
+  static executeFile(worker, isReady, filename, code, namespace = undefined) {
+    // Validate parameters using ValidationUtils
+    ValidationUtils.validateWorker(worker, 'PyodideManagerStaticExecutor');
+    ValidationUtils.validateBoolean(isReady, 'isReady', 'PyodideManagerStaticExecutor');
+    ValidationUtils.validateExecutionParams(filename, code, namespace, 'PyodideManagerStaticExecutor');
+
+    if (!isReady) {
+      console.warn("Manager not ready, execution will be delayed until initialization completes");
+      return;
+    }
+
+    // Prepare message for worker
+    const message = {
+      type: "execute",
+      filename,
+      code,
+    };
+
+    // Only include namespace in message if it's provided
+    // This is crucial: we don't want to send undefined/null to the worker
+    if (namespace !== undefined) {
+      message.namespace = namespace;
+    }
+
+    try {
+      worker.postMessage(message);
+    } catch (error) {
+      console.error(`Failed to dispatch execution: ${error.message}`);
+    }
+  }
+}
+
+/**
+ * @typedef {Object} ExecutionResult
+ * @property {string} filename - Name of the executed file
+ * @property {number} time - Execution time in milliseconds
+ * @property {string} stdout - Standard output from Python execution
+ * @property {string} stderr - Standard error from Python execution
+ * @property {string|null} missive - Missive as a JSON string (parse on the consumer side)
+ * @property {string[]} figures - Base64 encoded matplotlib figures
+ * @property {Object|null} error - JavaScript execution error object
+ * @property {string} timestamp - ISO timestamp of execution
+ * @property {boolean} [executedWithNamespace] - Whether execution used namespace
+ */
+
+/***/ }),
+
+/***/ "./pyodide/manager/manager-input.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./pyodide/manager/manager-input.js
+__nagini_define__(__nagini_exports__, {
+  PyodideManagerInput: () => PyodideManagerInput,
+});
+/**
+ * PyodideManagerInput - Input handling functionality for PyodideManager
+ *
+ * Contains all input-related methods extracted from PyodideManager to improve
+ * code organization and keep file sizes manageable.
+ *
+ * Features:
+ * - Input queue management
+ * - Callback system for interactive input
+ * - Input state tracking
+ * - Integration with Python input() function
+ */
+
+const { ValidationUtils } = __nagini_require__("./utils/validation.js");
+
+/**
+ * Static class containing input handling functionality for PyodideManager
+ */
+class PyodideManagerInput {
+  /**
+   * Initialize input state for a PyodideManager instance
+   * @param {PyodideManager} manager - Manager instance to initialize
+   * @returns {void}
+   */
+  static initializeInputState(manager) {
+    manager.inputState = {
+      isWaitingForInput: false,
+      currentPrompt: "",
+      inputCallback: null,
+      inputQueue: [] // For programmatic input provision
+    };
+  }
+
+  /**
+   * Provide input to Python code that's waiting for input
+   *
+   * The empty string is a valid answer: Python's input() returns "" when
+   * the user just presses Enter, so only the type is enforced here.
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} input - The input value to provide (may be empty)
+   * @returns {void}
+   */
+  static provideInput(manager, input) {
+    ValidationUtils.validateString(input, 'input', 'PyodideManagerInput', true);
+
+    if (!manager.isReady) {
+      console.error("Manager not ready");
+      return;
+    }
+
+    manager.worker.postMessage({
+      type: "input_response",
+      input: input
+    });
+
+    manager.inputState.isWaitingForInput = false;
+    manager.inputState.currentPrompt = "";
+  }
+
+  /**
+   * Queue input for later provision when Python code requests it
+   *
+   * The empty string is a valid answer, same as in provideInput.
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} input - The input value to queue (may be empty)
+   * @returns {void}
+   */
+  static queueInput(manager, input) {
+    ValidationUtils.validateString(input, 'input', 'PyodideManagerInput', true);
+
+    manager.inputState.inputQueue.push(input);
+  }
+
+  /**
+   * Set a callback function to be called when input is required
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {Function} callback - Function to call when input is needed
+   * @returns {void}
+   */
+  static setInputCallback(manager, callback) {
+    if (callback !== null) {
+      ValidationUtils.validateFunction(callback, 'callback', 'PyodideManagerInput');
+    }
+
+    manager.inputState.inputCallback = callback;
+  }
+
+  /**
+   * Check if Python code is currently waiting for input
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @returns {boolean} True if waiting for input, false otherwise
+   */
+  static isWaitingForInput(manager) {
+    return manager.inputState.isWaitingForInput;
+  }
+
+  /**
+   * Get the current input prompt if waiting for input
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @returns {string} Current input prompt or empty string
+   */
+  static getCurrentPrompt(manager) {
+    return manager.inputState.currentPrompt;
+  }
+
+  /**
+   * Handle input-related message from worker
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {Object} data - Message data from worker
+   * @returns {void}
+   */
+  static handleInputMessage(manager, data) {
+    // Handle input request from worker
+    if (data.type === "input_required") {
+      manager.inputState.isWaitingForInput = true;
+      manager.inputState.currentPrompt = data.prompt;
+
+      // Check if we have queued input
+      if (manager.inputState.inputQueue.length > 0) {
+        const input = manager.inputState.inputQueue.shift(); // Dequeue the next input
+        this.provideInput(manager, input);
+      } else {
+        // Call the input callback if set
+        if (manager.inputState.inputCallback) {
+          manager.inputState.inputCallback(data.prompt || "");
+        } else {
+          console.warn(
+            "No input callback set and no queued input. " +
+            "Use setInputCallback() or queueInput() to handle input requests."
+          );
+        }
+      }
+    }
+  }
+
+  /**
+   * Reset input state (called on execution completion)
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @returns {void}
+   */
+  static resetInputState(manager) {
+    manager.inputState.isWaitingForInput = false;
+    manager.inputState.currentPrompt = "";
+  }
+}
+
+/***/ }),
+
+/***/ "./pyodide/manager/manager-fs.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./pyodide/manager/manager-fs.js
+__nagini_define__(__nagini_exports__, {
+  PyodideManagerFS: () => PyodideManagerFS,
+});
+/**
+ * PyodideManagerFS - Filesystem operations for PyodideManager
+ *
+ * Contains all filesystem-related methods extracted from PyodideManager to improve
+ * code organization and keep file sizes manageable.
+ *
+ * Features:
+ * - File operations (read, write, mkdir, exists, listdir)
+ * - Promise-based async filesystem interface
+ * - Error handling and timeout management
+ *
+ * Requests are id-correlated (see PyodideManager._postRequest): a filesystem
+ * operation can run while an execution is in flight without any handler
+ * clobbering.
+ */
+
+const { ValidationUtils } = __nagini_require__("./utils/validation.js");
+
+/**
+ * Static class containing filesystem functionality for PyodideManager
+ */
+class PyodideManagerFS {
+  /**
+   * Filesystem operations proxy - main public interface
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {FSOperation} operation - FS operation: 'writeFile', 'readFile', 'mkdir', 'exists', 'listdir'
+   * @param {FSOperationParams} params - Operation parameters
+   * @returns {Promise<any>} Operation result
+   * @throws {Error} If operation fails or times out
+   */
+  static async fs(manager, operation, params, timeoutMs = 10000) {
+    ValidationUtils.validateString(operation, 'operation', 'PyodideManagerFS');
+    ValidationUtils.validateObject(params, 'params', 'PyodideManagerFS');
+
+    const result = await PyodideManagerFS._sendFSCommand(manager, operation, params, timeoutMs);
+
+    // Return appropriate result based on operation type
+    switch(operation) {
+      case "readFile":
+        return result.content;
+      case "exists":
+        return result.exists;
+      case "listdir":
+        return result.files;
+      case "writeFile":
+      case "mkdir":
+      default:
+        return result;
+    }
+  }
+
+  /**
+   * Write file to Pyodide filesystem
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} path - File path
+   * @param {string} content - File content
+   * @returns {Promise<Object>} Operation result
+   */
+  static async writeFile(manager, path, content) {
+    ValidationUtils.validateString(path, 'path', 'PyodideManagerFS');
+    ValidationUtils.validateString(content, 'content', 'PyodideManagerFS');
+
+    return PyodideManagerFS.fs(manager, 'writeFile', { path, content });
+  }
+
+  /**
+   * Read file from Pyodide filesystem
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} path - File path
+   * @returns {Promise<string>} File content
+   */
+  static async readFile(manager, path) {
+    ValidationUtils.validateString(path, 'path', 'PyodideManagerFS');
+
+    return PyodideManagerFS.fs(manager, 'readFile', { path });
+  }
+
+  /**
+   * Create directory in Pyodide filesystem
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} path - Directory path
+   * @returns {Promise<Object>} Operation result
+   */
+  static async mkdir(manager, path) {
+    ValidationUtils.validateString(path, 'path', 'PyodideManagerFS');
+
+    return PyodideManagerFS.fs(manager, 'mkdir', { path });
+  }
+
+  /**
+   * Check if path exists in Pyodide filesystem
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} path - Path to check
+   * @returns {Promise<boolean>} True if exists, false otherwise
+   */
+  static async exists(manager, path) {
+    ValidationUtils.validateString(path, 'path', 'PyodideManagerFS');
+
+    return PyodideManagerFS.fs(manager, 'exists', { path });
+  }
+
+  /**
+   * List directory contents in Pyodide filesystem
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} path - Directory path
+   * @returns {Promise<string[]>} Array of file/directory names
+   */
+  static async listdir(manager, path) {
+    ValidationUtils.validateString(path, 'path', 'PyodideManagerFS');
+
+    return PyodideManagerFS.fs(manager, 'listdir', { path });
+  }
+
+  /**
+   * Private helper method to send FS commands to the worker
+   *
+   * The request goes through PyodideManager._postRequest: it carries a
+   * correlation id, the worker echoes it back on fs_result/fs_error, and the
+   * manager's permanent onmessage handler settles this promise. Filesystem
+   * operations therefore work while an execution is in flight.
+   *
+   * @private
+   * @param {PyodideManager} manager - Manager instance
+   * @param {FSOperation} operation - FS operation name
+   * @param {FSOperationParams} params - Operation parameters
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<FSOperationResult>} Operation result
+   * @throws {Error} If operation fails or times out
+   */
+  static async _sendFSCommand(manager, operation, params, timeoutMs = 10000) {
+    if (!manager.isReady) {
+      throw new Error("🐍 [PyodideManagerFS] Manager not ready yet. Wait for initialization to complete.");
+    }
+
+    return manager._postRequest(
+      { type: "fs_operation", operation, ...params },
+      timeoutMs,
+      "🐍 [PyodideManagerFS] Filesystem operation timeout"
+    );
+  }
+}
+
+/**
+ * @typedef {'writeFile'|'readFile'|'mkdir'|'exists'|'listdir'} FSOperation
+ */
+
+/**
+ * @typedef {Object} FSOperationParams
+ * @property {string} path - File or directory path
+ * @property {string} [content] - File content (for writeFile operation)
+ */
+
+/**
+ * @typedef {Object} FSOperationResult
+ * @property {boolean} [success] - Whether operation succeeded
+ * @property {string} [content] - File content (for readFile)
+ * @property {boolean} [exists] - Whether file/directory exists
+ * @property {string[]} [files] - Directory contents (for listdir)
+ */
+
+/***/ }),
+
+/***/ "./pyodide/manager/manager-namespaces.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./pyodide/manager/manager-namespaces.js
+__nagini_define__(__nagini_exports__, {
+  PyodideManagerNamespaces: () => PyodideManagerNamespaces,
+});
+/**
+ * PyodideManagerNamespaces - Named namespaces for PyodideManager
+ *
+ * A named namespace is a globals dict living in the worker: created once
+ * from an initial object, patched with deltas, run against with
+ * executeAsync(..., { namespaceRef: name }) and read back key by key.
+ * Unlike a namespace object passed to executeAsync, it is not converted on
+ * every run and keeps what the code assigns.
+ *
+ * Operations are queued as barriers (see PyodideManager._enqueueExecution):
+ * they run after every call already submitted, in any priority lane, and
+ * before every later call. A patch sent after an execution never reaches
+ * the worker before it, and an execution sent after a patch sees it.
+ */
+
+const { ValidationUtils } = __nagini_require__("./utils/validation.js");
+
+/**
+ * Static class containing named namespace functionality for PyodideManager
+ */
+class PyodideManagerNamespaces {
+  /**
+   * Create (or replace) a named namespace
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} name - Namespace name
+   * @param {Object} [initial={}] - Initial variables
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<string[]>} Namespaces evicted by the maxNamespaces cap
+   */
+  static async create(manager, name, initial = {}, timeoutMs = 10000) {
+    ValidationUtils.validateString(name, 'name', 'PyodideManagerNamespaces');
+    ValidationUtils.validateNamespace(initial, 'PyodideManagerNamespaces');
+
+    const result = await PyodideManagerNamespaces._send(manager, 'create', { name, values: initial }, timeoutMs);
+    return result.evicted;
+  }
+
+  /**
+   * Patch a named namespace: only the patch crosses to the worker
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} name - Namespace name
+   * @param {Object} patch - Variables to set
+   * @param {string[]} [remove=[]] - Variables to delete
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<number>} Number of names in the namespace afterwards
+   */
+  static async update(manager, name, patch, remove = [], timeoutMs = 10000) {
+    ValidationUtils.validateString(name, 'name', 'PyodideManagerNamespaces');
+    ValidationUtils.validateObject(patch, 'patch', 'PyodideManagerNamespaces');
+    ValidationUtils.validateArray(remove, 'remove', 'PyodideManagerNamespaces');
+
+    const result = await PyodideManagerNamespaces._send(manager, 'update', { name, values: patch, remove }, timeoutMs);
+    return result.size;
+  }
+
+  /**
+   * Read variables of a named namespace
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} name - Namespace name
+   * @param {string[]} [keys] - Variables to read (default: all names not starting with "__")
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<NamespaceValues>} Converted values, and the names that could not be converted
+   */
+  static async read(manager, name, keys = undefined, timeoutMs = 10000) {
+    ValidationUtils.validateString(name, 'name', 'PyodideManagerNamespaces');
+    if (keys !== undefined) {
+      ValidationUtils.validateArray(keys, 'keys', 'PyodideManagerNamespaces');
+    }
+
+    return PyodideManagerNamespaces._send(manager, 'read', { name, keys }, timeoutMs);
+  }
+
+  /**
+   * Delete a named namespace
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} name - Namespace name
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<boolean>} Whether the namespace existed
+   */
+  static async delete(manager, name, timeoutMs = 10000) {
+    ValidationUtils.validateString(name, 'name', 'PyodideManagerNamespaces');
+
+    const result = await PyodideManagerNamespaces._send(manager, 'delete', { name }, timeoutMs);
+    return result.deleted;
+  }
+
+  /**
+   * Private helper method to queue a namespace operation for the worker
+   *
+   * @private
+   * @param {PyodideManager} manager - Manager instance
+   * @param {'create'|'update'|'read'|'delete'} operation - Operation name
+   * @param {Object} params - Operation parameters
+   * @param {number} timeoutMs - Timeout in milliseconds
+   * @returns {Promise<Object>} Operation result
+   * @throws {Error} If the manager is not ready, the operation fails or times out
+   */
+  static async _send(manager, operation, params, timeoutMs) {
+    return manager._enqueueExecution(async () => {
+      if (!manager.isReady) {
+        throw new Error("🐍 [PyodideManagerNamespaces] Manager not ready yet. Wait for initialization to complete.");
       }
+      return manager._postRequest(
+        { type: "namespace_operation", operation, ...params },
+        timeoutMs,
+        "🎛️ [PyodideManagerNamespaces] Namespace operation timeout"
+      );
+    }, undefined, { barrier: true });
+  }
+}
+
+/**
+ * @typedef {Object} NamespaceValues
+ * @property {Object} values - Converted variables by name
+ * @property {string[]} skipped - Variables with no JavaScript equivalent (functions, modules, instances)
+ */
+
+/***/ }),
+
+/***/ "./utils/createBlobWorker.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./utils/createBlobWorker.js
+__nagini_define__(__nagini_exports__, {
+  createBlobWorkerUrl: () => createBlobWorkerUrl,
+  createBlobWorker: () => createBlobWorker,
+  revokeBlobUrl: () => revokeBlobUrl,
+});
+/**
+ * Blob Worker Creation Utility
+ * 
+ * Creates web workers from blob URLs to handle cross-origin scenarios.
+ * Essential for Flask apps and other frameworks where Nagini is served
+ * from a different origin than the main application.
+ */
+
+/**
+ * Create a blob worker URL from a bundled worker script
+ * @param {string} workerUrl - URL to the bundled worker script (worker-dist.js)
+ * @returns {Promise<string>} Blob URL that can be used to create a Worker
+ * @throws {Error} If worker script cannot be fetched
+ */
+async function createBlobWorkerUrl(workerUrl) {
+  try {
+    // Fetch the bundled worker script
+    const response = await fetch(workerUrl);
+    if (!response.ok) {
+      throw new Error(`Failed to fetch worker script: HTTP ${response.status}`);
+    }
+    
+    const workerScript = await response.text();
+    
+    // Create a blob URL for the worker script
+    const blob = new Blob([workerScript], { type: 'application/javascript' });
+    const blobUrl = URL.createObjectURL(blob);
+    
+    return blobUrl;
+    
+  } catch (error) {
+    console.error('Failed to create blob worker:', error);
+    throw new Error(`Failed to create blob worker from ${workerUrl}: ${error.message}`);
+  }
+}
+
+/**
+ * Create a Worker instance using blob URL pattern
+ * @param {string} workerUrl - URL to the bundled worker script (worker-dist.js)
+ * @returns {Promise<Worker>} Web Worker instance created from blob URL
+ * @throws {Error} If worker creation fails
+ */
+async function createBlobWorker(workerUrl) {
+  try {
+    // Ensure we're using the bundled worker
+    if (!workerUrl.includes('worker-dist.js')) {
+      console.warn('Warning: Expected bundled worker (worker-dist.js), got:', workerUrl);
     }
+    
+    const blobUrl = await createBlobWorkerUrl(workerUrl);
+    const worker = new Worker(blobUrl);
+    
+    return worker;
+    
+  } catch (error) {
+    console.error('Worker creation failed:', error);
+    throw error;
+  }
+}
+
+/**
+ * Cleanup blob URL to prevent memory leaks
+ * @param {string} blobUrl - Blob URL to revoke
+ */
+function revokeBlobUrl(blobUrl) {
+  try {
+    URL.revokeObjectURL(blobUrl);
+  } catch (error) {
+    console.warn('Failed to revoke blob URL:', error);
+  }
+} 
+/***/ }),
+
+/***/ "./brython/manager/manager.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./brython/manager/manager.js
+__nagini_define__(__nagini_exports__, {
+  BrythonManager: () => BrythonManager,
+});
+const { ValidationUtils } = __nagini_require__("./utils/validation.js");
+const { executeAsync: _executeAsync } = __nagini_require__("./brython/manager/executor.js");
+const { loadBrython } = __nagini_require__("./brython/manager/loader.js");
+
+/**
+ * BrythonManager – Minimal backend for Nagini focused on turtle graphics.
+ * Provides the same public surface as PyodideManager but runs directly in
+ * the main thread with Brython.  Input(), packages, and filesystem are NOT
+ * supported for now.
+ */
+class BrythonManager {
+  constructor(packages = [], filesToLoad = [], initPath = '', workerPath = '', brythonOptions = {}) {
+    console.log('🐍 [BrythonManager] constructor');
+
+    // Same validation contract as PyodideManager: invalid input throws
+    ValidationUtils.validateArray(packages, 'packages', 'BrythonManager');
+    ValidationUtils.validateArray(filesToLoad, 'filesToLoad', 'BrythonManager');
+    
+    this.packages = packages;
+    this.filesToLoad = filesToLoad;  // Store filesToLoad for API parity
+    
+    console.log('🐍 [BrythonManager] filesToLoad set to:', this.filesToLoad);
+    console.log('🐍 [BrythonManager] packages set to:', this.packages);
 
-    /**
-     * Validate packages array
-     * @param {Array} packages - Array of package names
-     * @param {string} [component] - Component name for error context
-     * @throws {Error} If packages array is invalid
-     */
-  }, {
-    key: "validatePackages",
-    value: function validatePackages(packages) {
-      var component = arguments.length > 1 && arguments[1] !== undefined ? arguments[1] : 'Component';
-      this.validateArray(packages, 'packages', component);
-      var _iterator2 = _createForOfIteratorHelper(packages.entries()),
-        _step2;
-      try {
-        for (_iterator2.s(); !(_step2 = _iterator2.n()).done;) {
-          var _step2$value = _slicedToArray(_step2.value, 2),
-            index = _step2$value[0],
-            pkg = _step2$value[1];
-          if (typeof pkg !== 'string') {
-            throw new Error("\uD83D\uDD27 [".concat(component, "] packages[").concat(index, "] must be a string, got ").concat(_typeof(pkg)));
-          }
-          if (pkg.trim().length === 0) {
-            throw new Error("\uD83D\uDD27 [".concat(component, "] packages[").concat(index, "] cannot be empty"));
-          }
-        }
-      } catch (err) {
-        _iterator2.e(err);
-      } finally {
-        _iterator2.f();
-      }
-    }
+    this.executionHistory = [];
+    this.isReady = false;
 
-    /**
-     * Validate namespace object (optional parameter)
-     * @param {any} namespace - Namespace to validate
-     * @param {string} [component] - Component name for error context
-     * @throws {Error} If namespace is provided but invalid
-     */
-  }, {
-    key: "validateNamespace",
-    value: function validateNamespace(namespace) {
-      var component = arguments.length > 1 && arguments[1] !== undefined ? arguments[1] : 'Component';
-      if (namespace !== undefined) {
-        this.validateObject(namespace, 'namespace', component);
-      }
-    }
+    // Begin loading Brython runtime immediately with optional configuration
+    this._readyPromise = loadBrython(brythonOptions).then(() => {
+      this.isReady = true;
+      console.log('🐍 [BrythonManager] ready');
+    });
 
-    /**
-     * Validate execution parameters
-     * @param {string} filename - Filename for execution
-     * @param {string} code - Python code to execute
-     * @param {any} [namespace] - Optional namespace
-     * @param {string} [component] - Component name for error context
-     * @throws {Error} If any parameter is invalid
-     */
-  }, {
-    key: "validateExecutionParams",
-    value: function validateExecutionParams(filename, code, namespace) {
-      var component = arguments.length > 3 && arguments[3] !== undefined ? arguments[3] : 'Component';
-      this.validateString(filename, 'filename', component);
-      this.validateString(code, 'code', component);
-      this.validateNamespace(namespace, component);
-    }
+    // Same readiness surface as PyodideManager (used by Nagini.waitForReady)
+    this.readyPromise = this._readyPromise;
+    this.readyPromise.catch(() => {});
+  }
 
-    /**
-     * Check for potentially dangerous Python code patterns
-     * @param {string} code - Python code to check
-     * @returns {Array<string>} Array of dangerous patterns found
-     */
-  }, {
-    key: "checkDangerousPatterns",
-    value: function checkDangerousPatterns(code) {
-      var dangerousPatterns = [{
-        pattern: /import\s+os\b/g,
-        reason: 'OS module access'
-      }, {
-        pattern: /import\s+subprocess\b/g,
-        reason: 'Subprocess execution'
-      }, {
-        pattern: /\beval\s*\(/g,
-        reason: 'Dynamic code evaluation'
-      }, {
-        pattern: /\bexec\s*\(/g,
-        reason: 'Dynamic code execution'
-      }, {
-        pattern: /\b__import__\s*\(/g,
-        reason: 'Dynamic module import'
-      }, {
-        pattern: /\bopen\s*\(/g,
-        reason: 'File system access'
-      }, {
-        pattern: /\bcompile\s*\(/g,
-        reason: 'Code compilation'
-      }];
-      var found = [];
-      for (var _i = 0, _dangerousPatterns = dangerousPatterns; _i < _dangerousPatterns.length; _i++) {
-        var _dangerousPatterns$_i = _dangerousPatterns[_i],
-          pattern = _dangerousPatterns$_i.pattern,
-          reason = _dangerousPatterns$_i.reason;
-        if (pattern.test(code)) {
-          found.push(reason);
-        }
-      }
-      return found;
+  // ------------------ Execution APIs ------------------
+  async executeAsync(filename, code, namespace = undefined, timeoutMs = 30000) {
+    if (!this.isReady) {
+      await this._readyPromise;
     }
 
-    /**
-     * Validate backend parameter (must be 'pyodide' or <?>)
-     * @param {string} backend - Backend to validate
-     * @param {string} [component] - Component name for error context
-     * @throws {Error} If backend is not valid
-     */
-  }, {
-    key: "validateBackend",
-    value: function validateBackend(backend) {
-      var component = arguments.length > 1 && arguments[1] !== undefined ? arguments[1] : 'Component';
-      this.validateString(backend, 'backend', component);
-      var validBackends = ['pyodide', 'brython'];
-      if (!validBackends.includes(backend.toLowerCase())) {
-        throw new Error("\uD83D\uDD27 [".concat(component, "] backend must be one of: ").concat(validBackends.join(', '), ", got \"").concat(backend, "\""));
-      }
-    }
-  }]);
-}();
+    ValidationUtils.validateExecutionParams(filename, code, undefined, 'BrythonManager');
 
-/**
- * @typedef {Object} ValidationError
- * @property {string} message - Error message
- * @property {string} component - Component that threw the error
- * @property {string} parameter - Parameter that failed validation
- */
+    const raw = await _executeAsync(code, filename, timeoutMs);
 
-/***/ }),
+    const result = {
+      filename,
+      time: raw.time,
+      stdout: raw.stdout || '',
+      stderr: raw.stderr || '',
+      missive: raw.missive ?? null,
+      figures: [], // turtle draws directly to canvas
+      error: raw.error ?? null,
+      timestamp: new Date().toISOString()
+    };
 
-/***/ 973:
-/***/ ((__unused_webpack___webpack_module__, __webpack_exports__, __webpack_require__) => {
+    this.executionHistory.push(result);
+    return result;
+  }
 
-// ESM COMPAT FLAG
-__webpack_require__.r(__webpack_exports__);
+  executeFile(filename, code, namespace = undefined) {
+    this.executeAsync(filename, code, namespace).catch(console.error);
+  }
 
-// EXPORTS
-__webpack_require__.d(__webpack_exports__, {
-  BrythonManager: () => (/* binding */ BrythonManager)
-});
+  // ------------------ Unsupported stubs ------------------
+  async fs() {
+    throw new Error('Brython backend does not support filesystem operations');
+  }
 
-// EXTERNAL MODULE: ../../utils/validation.js
-var validation = __webpack_require__(800);
-;// ../../brython/manager/loader.js
-function _regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return _regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, _regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, _regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), _regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", _regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), _regeneratorDefine2(u), _regeneratorDefine2(u, o, "Generator"), _regeneratorDefine2(u, n, function () { return this; }), _regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function _regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } _regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { _regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, _regeneratorDefine2(e, r, n, t); }
-function asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function _asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
-/* Loader for Brython runtime – renamed from brython-loader.js */
+  queueInput() { console.warn('Brython backend: input() not supported'); }
+  provideInput() { console.warn('Brython backend: input() not supported'); }
+  setInputCallback() { console.warn('Brython backend: input() not supported'); }
+  isWaitingForInput() { return false; }
+  getCurrentPrompt() { return null; }
 
-var _loadPromise = null;
-function loadBrython() {
-  var _ref = arguments.length > 0 && arguments[0] !== undefined ? arguments[0] : {},
-    _ref$brythonJsPath = _ref.brythonJsPath,
-    brythonJsPath = _ref$brythonJsPath === void 0 ? '/src/brython/lib/brython.js' : _ref$brythonJsPath,
-    _ref$brythonStdlibPat = _ref.brythonStdlibPath,
-    brythonStdlibPath = _ref$brythonStdlibPat === void 0 ? '/src/brython/lib/brython_stdlib.js' : _ref$brythonStdlibPat;
-  if (typeof window === 'undefined') {
-    throw new Error('Brython backend requires a browser environment');
-  }
-  if (_loadPromise) return _loadPromise;
-  var inject = function inject(src) {
-    return new Promise(function (resolve, reject) {
-      if (document.querySelector("script[src=\"".concat(src, "\"]"))) {
-        resolve();
-        return;
-      }
-      var s = document.createElement('script');
-      s.src = src;
-      s.onload = function () {
-        return resolve();
-      };
-      s.onerror = function () {
-        return reject(new Error("Failed to load ".concat(src)));
-      };
-      document.head.appendChild(s);
-    });
-  };
-  _loadPromise = _asyncToGenerator(/*#__PURE__*/_regenerator().m(function _callee() {
-    return _regenerator().w(function (_context) {
-      while (1) switch (_context.n) {
-        case 0:
-          if (!(typeof window.__BRYTHON__ === 'undefined')) {
-            _context.n = 2;
-            break;
-          }
-          _context.n = 1;
-          return inject(brythonJsPath);
-        case 1:
-          _context.n = 2;
-          return inject(brythonStdlibPath);
-        case 2:
-          if (typeof window.brython === 'function') {
-            window.brython({
-              debug: 0
-            });
-          }
-          return _context.a(2, window.__BRYTHON__);
-      }
-    }, _callee);
-  }))();
-  return _loadPromise;
+  clearExecutionHistory() { this.executionHistory = []; }
 }
-;// ../../brython/manager/executor.js
-function _typeof(o) { "@babel/helpers - typeof"; return _typeof = "function" == typeof Symbol && "symbol" == typeof Symbol.iterator ? function (o) { return typeof o; } : function (o) { return o && "function" == typeof Symbol && o.constructor === Symbol && o !== Symbol.prototype ? "symbol" : typeof o; }, _typeof(o); }
-function executor_regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return executor_regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (executor_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, executor_regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, executor_regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), executor_regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", executor_regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), executor_regeneratorDefine2(u), executor_regeneratorDefine2(u, o, "Generator"), executor_regeneratorDefine2(u, n, function () { return this; }), executor_regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (executor_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function executor_regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } executor_regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { executor_regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, executor_regeneratorDefine2(e, r, n, t); }
-function ownKeys(e, r) { var t = Object.keys(e); if (Object.getOwnPropertySymbols) { var o = Object.getOwnPropertySymbols(e); r && (o = o.filter(function (r) { return Object.getOwnPropertyDescriptor(e, r).enumerable; })), t.push.apply(t, o); } return t; }
-function _objectSpread(e) { for (var r = 1; r < arguments.length; r++) { var t = null != arguments[r] ? arguments[r] : {}; r % 2 ? ownKeys(Object(t), !0).forEach(function (r) { _defineProperty(e, r, t[r]); }) : Object.getOwnPropertyDescriptors ? Object.defineProperties(e, Object.getOwnPropertyDescriptors(t)) : ownKeys(Object(t)).forEach(function (r) { Object.defineProperty(e, r, Object.getOwnPropertyDescriptor(t, r)); }); } return e; }
-function _defineProperty(e, r, t) { return (r = _toPropertyKey(r)) in e ? Object.defineProperty(e, r, { value: t, enumerable: !0, configurable: !0, writable: !0 }) : e[r] = t, e; }
-function _toPropertyKey(t) { var i = _toPrimitive(t, "string"); return "symbol" == _typeof(i) ? i : i + ""; }
-function _toPrimitive(t, r) { if ("object" != _typeof(t) || !t) return t; var e = t[Symbol.toPrimitive]; if (void 0 !== e) { var i = e.call(t, r || "default"); if ("object" != _typeof(i)) return i; throw new TypeError("@@toPrimitive must return a primitive value."); } return ("string" === r ? String : Number)(t); }
-function executor_asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function executor_asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { executor_asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { executor_asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
 
 
+/***/ }),
+
+/***/ "./brython/manager/executor.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./brython/manager/executor.js
+__nagini_define__(__nagini_exports__, {
+  executeAsync: () => executeAsync,
+});
+const { loadBrython } = __nagini_require__("./brython/manager/loader.js");
+
 /**
  * Execute Python code with Brython, capturing stdout, stderr, missive and errors.
  *
@@ -1772,543 +2800,627 @@ function executor_asyncToGenerator(n) { return function () { var t = this, e = a
  * whether the code succeeds or raises. The callback is keyed by execution id,
  * so overlapping executions cannot clobber each other.
  */
-function executor_executeAsync(_x) {
-  return _executeAsync.apply(this, arguments);
-}
-function _executeAsync() {
-  _executeAsync = executor_asyncToGenerator(/*#__PURE__*/executor_regenerator().m(function _callee(code) {
-    var filename,
-      timeoutMs,
-      _args = arguments;
-    return executor_regenerator().w(function (_context) {
-      while (1) switch (_context.n) {
-        case 0:
-          filename = _args.length > 1 && _args[1] !== undefined ? _args[1] : 'script.py';
-          timeoutMs = _args.length > 2 && _args[2] !== undefined ? _args[2] : 30000;
-          _context.n = 1;
-          return loadBrython();
-        case 1:
-          return _context.a(2, new Promise(function (resolve, reject) {
-            var start = performance.now();
-            var suffix = "".concat(Date.now(), "_").concat(Math.random().toString(36).slice(2));
-            var id = "__brython_exec_".concat(suffix);
-            var cbName = "__brython_cb_".concat(suffix);
-            var cleanup = function cleanup() {
-              clearTimeout(timeoutId);
-              var el = document.getElementById(id);
-              if (el) el.remove();
-              delete window[cbName];
-            };
-            var timeoutId = setTimeout(function () {
-              cleanup();
-              reject(new Error("\uD83D\uDC0D [BrythonManager] Execution timeout after ".concat(timeoutMs / 1000, " seconds")));
-            }, timeoutMs);
-            window[cbName] = function (payload) {
-              var end = performance.now();
-              cleanup();
-              resolve(_objectSpread({
-                filename: filename,
-                time: end - start
-              }, payload));
-            };
-
-            // JSON string literals are valid Python string literals
-            var codeJson = JSON.stringify(code);
-            var filenameJson = JSON.stringify(filename);
-            var wrapped = "\nimport sys\nimport traceback\nfrom browser import window\n\n_stdout_buf, _stderr_buf = [], []\n\nclass _Stdout:\n    def write(self, data):\n        _stdout_buf.append(str(data))\n    def flush(self):\n        pass\n\nclass _Stderr:\n    def write(self, data):\n        _stderr_buf.append(str(data))\n    def flush(self):\n        pass\n\nsys.stdout = _Stdout()\nsys.stderr = _Stderr()\n\n_missive_value = None\n\ndef missive(obj):\n    global _missive_value\n    if _missive_value is not None:\n        raise ValueError('missive() can only be called once')\n    _missive_value = obj\n\n_error = None\ntry:\n    exec(compile(".concat(codeJson, ", ").concat(filenameJson, ", 'exec'), globals())\nexcept BaseException as _exc:\n    _error = {\n        'type': type(_exc).__name__,\n        'message': str(_exc),\n        'traceback': traceback.format_exc()\n    }\n    _stderr_buf.append(traceback.format_exc())\n\nwindow.").concat(cbName, "({\n    'stdout': ''.join(_stdout_buf),\n    'stderr': ''.join(_stderr_buf),\n    'missive': _missive_value,\n    'error': _error\n})\n");
-            var script = document.createElement('script');
-            script.type = 'text/python3';
-            script.id = id;
-            script.textContent = wrapped;
-            document.body.appendChild(script);
-            if (typeof window.brython === 'function') {
-              window.brython();
-            } else {
-              cleanup();
-              reject(new Error('Brython runtime not initialised'));
-            }
-          }));
-      }
-    }, _callee);
-  }));
-  return _executeAsync.apply(this, arguments);
+async function executeAsync(code, filename = 'script.py', timeoutMs = 30000) {
+  await loadBrython();
+  return new Promise((resolve, reject) => {
+    const start = performance.now();
+    const suffix = `${Date.now()}_${Math.random().toString(36).slice(2)}`;
+    const id = `__brython_exec_${suffix}`;
+    const cbName = `__brython_cb_${suffix}`;
+
+    const cleanup = () => {
+      clearTimeout(timeoutId);
+      const el = document.getElementById(id);
+      if (el) el.remove();
+      delete window[cbName];
+    };
+
+    const timeoutId = setTimeout(() => {
+      cleanup();
+      reject(new Error(`🐍 [BrythonManager] Execution timeout after ${timeoutMs / 1000} seconds`));
+    }, timeoutMs);
+
+    window[cbName] = (payload) => {
+      const end = performance.now();
+      cleanup();
+      resolve({ filename, time: end - start, ...payload });
+    };
+
+    // JSON string literals are valid Python string literals
+    const codeJson = JSON.stringify(code);
+    const filenameJson = JSON.stringify(filename);
+
+    const wrapped = `
+import sys
+import traceback
+from browser import window
+
+_stdout_buf, _stderr_buf = [], []
+
+class _Stdout:
+    def write(self, data):
+        _stdout_buf.append(str(data))
+    def flush(self):
+        pass
+
+class _Stderr:
+    def write(self, data):
+        _stderr_buf.append(str(data))
+    def flush(self):
+        pass
+
+sys.stdout = _Stdout()
+sys.stderr = _Stderr()
+
+_missive_value = None
+
+def missive(obj):
+    global _missive_value
+    if _missive_value is not None:
+        raise ValueError('missive() can only be called once')
+    _missive_value = obj
+
+_error = None
+try:
+    exec(compile(${codeJson}, ${filenameJson}, 'exec'), globals())
+except BaseException as _exc:
+    _error = {
+        'type': type(_exc).__name__,
+        'message': str(_exc),
+        'traceback': traceback.format_exc()
+    }
+    _stderr_buf.append(traceback.format_exc())
+
+window.${cbName}({
+    'stdout': ''.join(_stdout_buf),
+    'stderr': ''.join(_stderr_buf),
+    'missive': _missive_value,
+    'error': _error
+})
+`;
+
+    const script = document.createElement('script');
+    script.type = 'text/python3';
+    script.id = id;
+    script.textContent = wrapped;
+    document.body.appendChild(script);
+
+    if (typeof window.brython === 'function') {
+      window.brython();
+    } else {
+      cleanup();
+      reject(new Error('Brython runtime not initialised'));
+    }
+  });
 }
-;// ../../brython/manager/manager.js
-function manager_typeof(o) { "@babel/helpers - typeof"; return manager_typeof = "function" == typeof Symbol && "symbol" == typeof Symbol.iterator ? function (o) { return typeof o; } : function (o) { return o && "function" == typeof Symbol && o.constructor === Symbol && o !== Symbol.prototype ? "symbol" : typeof o; }, manager_typeof(o); }
-function manager_regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return manager_regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (manager_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, manager_regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, manager_regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), manager_regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", manager_regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), manager_regeneratorDefine2(u), manager_regeneratorDefine2(u, o, "Generator"), manager_regeneratorDefine2(u, n, function () { return this; }), manager_regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (manager_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function manager_regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } manager_regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { manager_regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, manager_regeneratorDefine2(e, r, n, t); }
-function manager_asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function manager_asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { manager_asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { manager_asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
-function _classCallCheck(a, n) { if (!(a instanceof n)) throw new TypeError("Cannot call a class as a function"); }
-function _defineProperties(e, r) { for (var t = 0; t < r.length; t++) { var o = r[t]; o.enumerable = o.enumerable || !1, o.configurable = !0, "value" in o && (o.writable = !0), Object.defineProperty(e, manager_toPropertyKey(o.key), o); } }
-function _createClass(e, r, t) { return r && _defineProperties(e.prototype, r), t && _defineProperties(e, t), Object.defineProperty(e, "prototype", { writable: !1 }), e; }
-function manager_toPropertyKey(t) { var i = manager_toPrimitive(t, "string"); return "symbol" == manager_typeof(i) ? i : i + ""; }
-function manager_toPrimitive(t, r) { if ("object" != manager_typeof(t) || !t) return t; var e = t[Symbol.toPrimitive]; if (void 0 !== e) { var i = e.call(t, r || "default"); if ("object" != manager_typeof(i)) return i; throw new TypeError("@@toPrimitive must return a primitive value."); } return ("string" === r ? String : Number)(t); }
 
+/***/ }),
+
+/***/ "./brython/manager/loader.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./brython/manager/loader.js
+__nagini_define__(__nagini_exports__, {
+  loadBrython: () => loadBrython,
+});
+/* Loader for Brython runtime – renamed from brython-loader.js */
+
+let _loadPromise = null;
+
+function loadBrython({
+  brythonJsPath = '/src/brython/lib/brython.js',
+  brythonStdlibPath = '/src/brython/lib/brython_stdlib.js'
+} = {}) {
+  if (typeof window === 'undefined') {
+    throw new Error('Brython backend requires a browser environment');
+  }
+  if (_loadPromise) return _loadPromise;
 
+  const inject = (src) => new Promise((resolve, reject) => {
+    if (document.querySelector(`script[src="${src}"]`)) {
+      resolve();
+      return;
+    }
+    const s = document.createElement('script');
+    s.src = src;
+    s.onload = () => resolve();
+    s.onerror = () => reject(new Error(`Failed to load ${src}`));
+    document.head.appendChild(s);
+  });
+
+  _loadPromise = (async () => {
+    if (typeof window.__BRYTHON__ === 'undefined') {
+      await inject(brythonJsPath);
+      await inject(brythonStdlibPath);
+    }
+    if (typeof window.brython === 'function') {
+      window.brython({ debug: 0 });
+    }
+    return window.__BRYTHON__;
+  })();
 
+  return _loadPromise;
+} 
+/***/ }),
 
+/***/ "./pyodide/manager/manager-pool.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./pyodide/manager/manager-pool.js
+__nagini_define__(__nagini_exports__, {
+  PyodideManagerPool: () => PyodideManagerPool,
+});
 /**
- * BrythonManager – Minimal backend for Nagini focused on turtle graphics.
- * Provides the same public surface as PyodideManager but runs directly in
- * the main thread with Brython.  Input(), packages, and filesystem are NOT
- * supported for now.
+ * PyodideManagerPool - Several Pyodide workers behind one manager interface
+ *
+ * Boots N PyodideManagers from the same worker-dist.js and configuration and
+ * spreads executions across them, so a grading page uses as many cores as it
+ * has workers. Each worker keeps its own interpreter, globals and virtual
+ * filesystem.
+ *
+ * Dispatch:
+ * - An execution with an affinity key always runs on the worker that key
+ *   was first assigned to (least loaded at that time)
+ * - An execution without a namespace and without a key uses the implicit
+ *   default key: default-namespace state persists between runs as with a
+ *   single manager, so all such runs share one worker. Pass a namespace
+ *   ({}) to spread stateless runs across the pool
+ * - An execution with a namespace and without a key goes to the least
+ *   loaded worker (fewest queued + running executions)
+ * - A named namespace lives on the worker its name was first pinned to:
+ *   executions with options.namespaceRef follow it, whatever their key
+ * - A namespaced execution with a coalesceKey and without a key is pinned
+ *   by its coalesceKey, so a newer call meets the queued one it replaces.
+ *   The pin is dropped once no call with that key is pending, and a
+ *   namespace pin once the namespace is deleted or evicted
+ *
+ * USAGE EXAMPLE:
+ * const pool = await Nagini.createPool(4, ['numpy'], [], [], workerPath);
+ * await Nagini.waitForReady(pool, 120000);
+ * const results = await Promise.all(submissions.map((code, i) =>
+ *   pool.executeAsync(`submission_${i}.py`, code, {})
+ * ));
  */
-var BrythonManager = /*#__PURE__*/function () {
-  function BrythonManager() {
-    var _this = this;
-    var packages = arguments.length > 0 && arguments[0] !== undefined ? arguments[0] : [];
-    var filesToLoad = arguments.length > 1 && arguments[1] !== undefined ? arguments[1] : [];
-    var initPath = arguments.length > 2 && arguments[2] !== undefined ? arguments[2] : '';
-    var workerPath = arguments.length > 3 && arguments[3] !== undefined ? arguments[3] : '';
-    var brythonOptions = arguments.length > 4 && arguments[4] !== undefined ? arguments[4] : {};
-    _classCallCheck(this, BrythonManager);
-    console.log('🐍 [BrythonManager] constructor');
 
-    // Same validation contract as PyodideManager: invalid input throws
-    validation/* ValidationUtils */.n.validateArray(packages, 'packages', 'BrythonManager');
-    validation/* ValidationUtils */.n.validateArray(filesToLoad, 'filesToLoad', 'BrythonManager');
-    this.packages = packages;
-    this.filesToLoad = filesToLoad; // Store filesToLoad for API parity
+const { PyodideManager } = __nagini_require__("./pyodide/manager/manager.js");
 
-    console.log('🐍 [BrythonManager] filesToLoad set to:', this.filesToLoad);
-    console.log('🐍 [BrythonManager] packages set to:', this.packages);
-    this.executionHistory = [];
-    this.isReady = false;
+/** Affinity key of executions that use the default namespace */
+const DEFAULT_AFFINITY = Symbol("default");
 
-    // Begin loading Brython runtime immediately with optional configuration
-    this._readyPromise = loadBrython(brythonOptions).then(function () {
-      _this.isReady = true;
-      console.log('🐍 [BrythonManager] ready');
-    });
+/** Filesystem operations that change the filesystem: applied on every worker */
+const FS_WRITE_OPERATIONS = ["writeFile", "mkdir"];
 
-    // Same readiness surface as PyodideManager (used by Nagini.waitForReady)
-    this.readyPromise = this._readyPromise;
-    this.readyPromise.catch(function () {});
+class PyodideManagerPool {
+  /**
+   * Create a pool of PyodideManagers sharing one configuration
+   *
+   * @param {number} size - Number of workers
+   * @param {string[]} packages - Python packages to install in every worker
+   * @param {string[]} micropipPackages - Python packages to install with micropip
+   * @param {Array<FileToLoad>} filesToLoad - Files to load into every worker's filesystem
+   * @param {string} workerPath - Path to the bundled web worker file (must be worker-dist.js)
+   * @param {Object} [config={}] - PyodideManager configuration, shared by every worker
+   * @throws {Error} If size is not a positive integer, or any manager parameter is invalid
+   */
+  constructor(size, packages, micropipPackages, filesToLoad, workerPath, config = {}) {
+    if (!Number.isInteger(size) || size < 1) {
+      throw new Error(`🚨 [PyodideManagerPool] size must be a positive integer, got ${size}`);
+    }
+
+    /** @type {PyodideManager[]} One manager (and worker) per slot */
+    this.managers = Array.from(
+      { length: size },
+      () => new PyodideManager(packages, micropipPackages, filesToLoad, workerPath, config)
+    );
+
+    /** @type {Map<string|symbol, number>} Caller affinity key → manager index */
+    this._affinity = new Map();
+
+    // Internal pins live in their own maps: no caller affinity string can
+    // collide with them, and pruning them never drops a caller's pin
+
+    /** @type {Map<string, number>} Named namespace → manager index */
+    this._namespacePins = new Map();
+
+    /** @type {Map<string, number>} coalesceKey → manager index, while calls with it are pending */
+    this._coalescePins = new Map();
+
+    /** @type {Map<string, number>} coalesceKey → calls not settled yet */
+    this._coalescePending = new Map();
+
+    /** @type {WeakMap<FigureHandle, PyodideManager>} Lazy figure handle → worker holding the figure */
+    this._figureOwners = new WeakMap();
+
+    /** @type {PyodideManager|null} Worker of the latest execution that returned lazy figures */
+    this._lastFigureManager = null;
+
+    /** @type {Promise<void>} Resolves once every worker is ready, rejects on
+     *  the first initialization failure */
+    this.readyPromise = Promise.all(this.managers.map(m => m.readyPromise)).then(() => {});
+    this.readyPromise.catch(() => {});
   }
 
-  // ------------------ Execution APIs ------------------
-  return _createClass(BrythonManager, [{
-    key: "executeAsync",
-    value: function () {
-      var _executeAsync2 = manager_asyncToGenerator(/*#__PURE__*/manager_regenerator().m(function _callee(filename, code) {
-        var _raw$missive, _raw$error;
-        var namespace,
-          timeoutMs,
-          raw,
-          result,
-          _args = arguments;
-        return manager_regenerator().w(function (_context) {
-          while (1) switch (_context.n) {
-            case 0:
-              namespace = _args.length > 2 && _args[2] !== undefined ? _args[2] : undefined;
-              timeoutMs = _args.length > 3 && _args[3] !== undefined ? _args[3] : 30000;
-              if (this.isReady) {
-                _context.n = 1;
-                break;
-              }
-              _context.n = 1;
-              return this._readyPromise;
-            case 1:
-              validation/* ValidationUtils */.n.validateExecutionParams(filename, code, undefined, 'BrythonManager');
-              _context.n = 2;
-              return executor_executeAsync(code, filename, timeoutMs);
-            case 2:
-              raw = _context.v;
-              result = {
-                filename: filename,
-                time: raw.time,
-                stdout: raw.stdout || '',
-                stderr: raw.stderr || '',
-                missive: (_raw$missive = raw.missive) !== null && _raw$missive !== void 0 ? _raw$missive : null,
-                figures: [],
-                // turtle draws directly to canvas
-                error: (_raw$error = raw.error) !== null && _raw$error !== void 0 ? _raw$error : null,
-                timestamp: new Date().toISOString()
-              };
-              this.executionHistory.push(result);
-              return _context.a(2, result);
-          }
-        }, _callee, this);
-      }));
-      function executeAsync(_x, _x2) {
-        return _executeAsync2.apply(this, arguments);
+  /** @returns {number} Number of workers */
+  get size() {
+    return this.managers.length;
+  }
+
+  /** @returns {boolean} Whether every worker is ready */
+  get isReady() {
+    return this.managers.every(m => m.isReady);
+  }
+
+  /** @returns {'jspi'|'async'|null} Input mode of the workers (same browser, same mode) */
+  get inputMode() {
+    return this.managers[0].inputMode;
+  }
+
+  /** @returns {number[]} Executions queued or running, per worker */
+  get queueDepths() {
+    return this.managers.map(m => m.queueDepth);
+  }
+
+  /** @returns {Array<Object<string, number>>} Executions waiting, per priority lane, per worker */
+  get queueLengths() {
+    return this.managers.map(m => m.queueLengths);
+  }
+
+  /** @returns {number} Queued executions superseded by a newer one, on all workers */
+  get supersededCount() {
+    return this.managers.reduce((total, m) => total + m.supersededCount, 0);
+  }
+
+  /**
+   * Dispatch a call pinned by its coalesceKey, so it reaches the worker
+   * where the calls it replaces are queued, and drop the pin once no call
+   * with that key is pending: a later call is free to go to the least
+   * loaded worker, and the map does not grow with every key ever used
+   *
+   * @private
+   * @param {string} key - coalesceKey of the call
+   * @param {function(PyodideManager): Promise<any>} call - Call to make on the pinned worker
+   * @returns {Promise<any>}
+   */
+  _coalesced(key, call) {
+    const promise = call(this._pinned(key, this._coalescePins));
+    this._coalescePending.set(key, (this._coalescePending.get(key) ?? 0) + 1);
+    const settle = () => {
+      const left = this._coalescePending.get(key) - 1;
+      if (left > 0) {
+        this._coalescePending.set(key, left);
+      } else {
+        this._coalescePending.delete(key);
+        this._coalescePins.delete(key);
       }
-      return executeAsync;
-    }()
-  }, {
-    key: "executeFile",
-    value: function executeFile(filename, code) {
-      var namespace = arguments.length > 2 && arguments[2] !== undefined ? arguments[2] : undefined;
-      this.executeAsync(filename, code, namespace).catch(console.error);
-    }
-
-    // ------------------ Unsupported stubs ------------------
-  }, {
-    key: "fs",
-    value: function () {
-      var _fs = manager_asyncToGenerator(/*#__PURE__*/manager_regenerator().m(function _callee2() {
-        return manager_regenerator().w(function (_context2) {
-          while (1) switch (_context2.n) {
-            case 0:
-              throw new Error('Brython backend does not support filesystem operations');
-            case 1:
-              return _context2.a(2);
-          }
-        }, _callee2);
-      }));
-      function fs() {
-        return _fs.apply(this, arguments);
+    };
+    promise.then(settle, settle);
+    return promise;
+  }
+
+  /**
+   * Index of the least loaded worker (lowest index on ties)
+   *
+   * @private
+   * @returns {number}
+   */
+  _leastLoaded() {
+    let best = 0;
+    for (let i = 1; i < this.managers.length; i++) {
+      if (this.managers[i].queueDepth < this.managers[best].queueDepth) best = i;
+    }
+    return best;
+  }
+
+  /**
+   * Manager for a key, pinning the key to the least loaded worker on first
+   * use
+   *
+   * @private
+   * @param {string|symbol} key - Affinity key, namespace name or coalesceKey
+   * @param {Map<string|symbol, number>} [pins=this._affinity] - Pin map the key belongs to
+   * @returns {PyodideManager}
+   */
+  _pinned(key, pins = this._affinity) {
+    let index = pins.get(key);
+    if (index === undefined) {
+      index = this._leastLoaded();
+      pins.set(key, index);
+    }
+    return this.managers[index];
+  }
+
+  /**
+   * Manager holding a named namespace (pinned on first use)
+   *
+   * @private
+   * @param {string} name - Namespace name
+   * @returns {PyodideManager}
+   */
+  _namespaceManager(name) {
+    return this._pinned(name, this._namespacePins);
+  }
+
+  /**
+   * Manager an execution is dispatched to (see the module header)
+   *
+   * @param {Object|undefined} [namespace] - Namespace of the execution
+   * @param {string} [affinity] - Affinity key of the execution
+   * @returns {PyodideManager}
+   */
+  managerFor(namespace = undefined, affinity = undefined) {
+    if (affinity !== undefined) return this._pinned(affinity);
+    if (namespace === undefined) return this._pinned(DEFAULT_AFFINITY);
+    return this.managers[this._leastLoaded()];
+  }
+
+  /**
+   * Execute Python code on one of the workers. Same contract as
+   * PyodideManager.executeAsync, plus options.affinity
+   *
+   * @param {string} filename - Name for this execution
+   * @param {string} code - Python code to execute
+   * @param {Object|undefined} [namespace] - Optional namespace object for Python execution
+   * @param {number} [timeoutMs=30000] - Execution timeout in milliseconds
+   * @param {ExecuteOptions} [options={}] - Per-execution options
+   * @param {string} [options.affinity] - Executions sharing a key run on the same worker (and share its default-namespace globals)
+   * @returns {Promise<ExecutionResult>} Execution result
+   */
+  async executeAsync(filename, code, namespace = undefined, timeoutMs = 30000, options = {}) {
+    if (options.affinity !== undefined && typeof options.affinity !== "string") {
+      throw new Error("🚨 [PyodideManagerPool] affinity must be a string");
+    }
+    const { affinity, ...managerOptions } = options;
+    const run = async (manager) => {
+      const result = await manager.executeAsync(filename, code, namespace, timeoutMs, managerOptions);
+      if (result.figureFormat === "handle" && result.figures?.length) {
+        result.figures.forEach(handle => handle && this._figureOwners.set(handle, manager));
+        this._lastFigureManager = manager;
       }
-      return fs;
-    }()
-  }, {
-    key: "queueInput",
-    value: function queueInput() {
-      console.warn('Brython backend: input() not supported');
-    }
-  }, {
-    key: "provideInput",
-    value: function provideInput() {
-      console.warn('Brython backend: input() not supported');
-    }
-  }, {
-    key: "setInputCallback",
-    value: function setInputCallback() {
-      console.warn('Brython backend: input() not supported');
-    }
-  }, {
-    key: "isWaitingForInput",
-    value: function isWaitingForInput() {
-      return false;
-    }
-  }, {
-    key: "getCurrentPrompt",
-    value: function getCurrentPrompt() {
-      return null;
-    }
-  }, {
-    key: "clearExecutionHistory",
-    value: function clearExecutionHistory() {
-      this.executionHistory = [];
-    }
-  }]);
-}();
-
-
-/***/ })
-
-/******/ 	});
-/************************************************************************/
-/******/ 	// The module cache
-/******/ 	var __webpack_module_cache__ = {};
-/******/ 	
-/******/ 	// The require function
-/******/ 	function __webpack_require__(moduleId) {
-/******/ 		// Check if module is in cache
-/******/ 		var cachedModule = __webpack_module_cache__[moduleId];
-/******/ 		if (cachedModule !== undefined) {
-/******/ 			return cachedModule.exports;
-/******/ 		}
-/******/ 		// Create a new module (and put it into the cache)
-/******/ 		var module = __webpack_module_cache__[moduleId] = {
-/******/ 			// no module.id needed
-/******/ 			// no module.loaded needed
-/******/ 			exports: {}
-/******/ 		};
-/******/ 	
-/******/ 		// Execute the module function
-/******/ 		__webpack_modules__[moduleId](module, module.exports, __webpack_require__);
-/******/ 	
-/******/ 		// Return the exports of the module
-/******/ 		return module.exports;
-/******/ 	}
-/******/ 	
-/************************************************************************/
-/******/ 	/* webpack/runtime/define property getters */
-/******/ 	(() => {
-/******/ 		// define getter functions for harmony exports
-/******/ 		__webpack_require__.d = (exports, definition) => {
-/******/ 			for(var key in definition) {
-/******/ 				if(__webpack_require__.o(definition, key) && !__webpack_require__.o(exports, key)) {
-/******/ 					Object.defineProperty(exports, key, { enumerable: true, get: definition[key] });
-/******/ 				}
-/******/ 			}
-/******/ 		};
-/******/ 	})();
-/******/ 	
-/******/ 	/* webpack/runtime/hasOwnProperty shorthand */
-/******/ 	(() => {
-/******/ 		__webpack_require__.o = (obj, prop) => (Object.prototype.hasOwnProperty.call(obj, prop))
-/******/ 	})();
-/******/ 	
-/******/ 	/* webpack/runtime/make namespace object */
-/******/ 	(() => {
-/******/ 		// define __esModule on exports
-/******/ 		__webpack_require__.r = (exports) => {
-/******/ 			if(typeof Symbol !== 'undefined' && Symbol.toStringTag) {
-/******/ 				Object.defineProperty(exports, Symbol.toStringTag, { value: 'Module' });
-/******/ 			}
-/******/ 			Object.defineProperty(exports, '__esModule', { value: true });
-/******/ 		};
-/******/ 	})();
-/******/ 	
-/************************************************************************/
-var __webpack_exports__ = {};
-/* harmony export */ __webpack_require__.d(__webpack_exports__, {
-/* harmony export */   Nagini: () => (/* binding */ Nagini)
-/* harmony export */ });
-/* harmony import */ var _utils_validation_js__WEBPACK_IMPORTED_MODULE_0__ = __webpack_require__(800);
-function _regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return _regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, _regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, _regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), _regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", _regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), _regeneratorDefine2(u), _regeneratorDefine2(u, o, "Generator"), _regeneratorDefine2(u, n, function () { return this; }), _regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function _regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } _regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { _regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, _regeneratorDefine2(e, r, n, t); }
-function asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function _asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
-/**
- * Nagini - Python-in-Browser Runtime Manager
- *
- * This file provides a higher-level API with useful convenience methods
- * for managing Python execution in the browser using different backends
- * (Pyodide, <?> etc.).
- */
+      return result;
+    };
+    if (options.namespaceRef !== undefined) {
+      return run(this._namespaceManager(options.namespaceRef));
+    }
+    const coalesce = affinity === undefined && namespace !== undefined ? options.coalesceKey : undefined;
+    if (coalesce !== undefined) {
+      return this._coalesced(coalesce, run);
+    }
+    return run(this.managerFor(namespace, affinity));
+  }
 
+  /**
+   * Run a batch of snippets on one worker (PyodideManager.executeBatch):
+   * the worker of options.affinity, the default-namespace worker when an
+   * item has no namespace, the least loaded one otherwise
+   *
+   * @param {Array<BatchItem>} items - Snippets to run, in order
+   * @param {number} [timeoutMs=30000] - Timeout of the whole batch in milliseconds
+   * @param {BatchOptions} [options={}] - Batch options
+   * @param {string} [options.affinity] - Executions sharing a key run on the same worker (and share its default-namespace globals)
+   * @returns {Promise<ExecutionResult[]>} One result per item, in item order
+   */
+  async executeBatch(items, timeoutMs = 30000, options = {}) {
+    if (options.affinity !== undefined && typeof options.affinity !== "string") {
+      throw new Error("🚨 [PyodideManagerPool] affinity must be a string");
+    }
+    const { affinity, ...managerOptions } = options;
+    // Items without a namespace use the default-namespace globals
+    const key = affinity ?? (items.some(item => item.namespace === undefined) ? DEFAULT_AFFINITY : undefined);
+    const coalesce = key === undefined ? options.coalesceKey : undefined;
+    if (coalesce !== undefined) {
+      return this._coalesced(coalesce, manager => manager.executeBatch(items, timeoutMs, managerOptions));
+    }
+    const manager = key !== undefined ? this._pinned(key) : this.managers[this._leastLoaded()];
+    return manager.executeBatch(items, timeoutMs, managerOptions);
+  }
 
+  /**
+   * Run code against many namespaces on one worker
+   * (PyodideManager.executeMany): the least loaded one, or the worker of
+   * options.affinity
+   *
+   * @param {string} code - Python code to run for each case
+   * @param {Array<Object>|Object<string, Array|TypedArray>} namespaces - Case namespaces, as rows or columns
+   * @param {number} [timeoutMs=30000] - Timeout of the whole fan-out in milliseconds
+   * @param {ManyOptions} [options={}] - Fan-out options
+   * @param {string} [options.affinity] - Executions sharing a key run on the same worker (and share its default-namespace globals)
+   * @returns {Promise<CaseResult[]>} One result per case, in case order
+   */
+  async executeMany(code, namespaces, timeoutMs = 30000, options = {}) {
+    if (options.affinity !== undefined && typeof options.affinity !== "string") {
+      throw new Error("🚨 [PyodideManagerPool] affinity must be a string");
+    }
+    const { affinity, ...managerOptions } = options;
+    const coalesce = affinity === undefined ? options.coalesceKey : undefined;
+    if (coalesce !== undefined) {
+      return this._coalesced(coalesce, manager => manager.executeMany(code, namespaces, timeoutMs, managerOptions));
+    }
+    const manager = affinity !== undefined ? this._pinned(affinity) : this.managers[this._leastLoaded()];
+    return manager.executeMany(code, namespaces, timeoutMs, managerOptions);
+  }
 
-// Export Nagini as ES module
-var Nagini = {
   /**
-   * Create a new manager instance with specified backend
-   * @param {string} [backend='pyodide'] - Backend to use ('pyodide' or 'brython')
-   * @param {string[]} packages - Python packages to install
-   * @param {string[]} micropipPackages - Python packages to install with micropip
-   * @param {Array} filesToLoad - Custom files to load into filesystem
-   *                              Array of objects with {url, path} properties
-   *                              Supports both local paths and remote URLs (S3, etc.)
-   * @param {string} workerPath - Path to the bundled web worker file (must be worker-dist.js)
-   * @param {Object} [options={}] - Backend-specific options
-   * @param {string} [options.pyodideCdnUrl] - Custom Pyodide CDN URL (for local/offline use, e.g., Capacitor apps)
-   * @param {boolean} [options.snapshotCache] - Cache the bare interpreter as a memory snapshot in IndexedDB for near-instant later boots (Pyodide backend only)
-   * @param {string} [options.brythonJsPath] - Path to Brython JS file (Brython backend only)
-   * @param {string} [options.brythonStdlibPath] - Path to Brython stdlib (Brython backend only)
-   * @returns {Manager} New manager instance
-   */
-  createManager: function () {
-    var _createManager = _asyncToGenerator(/*#__PURE__*/_regenerator().m(function _callee() {
-      var backend,
-        packages,
-        micropipPackages,
-        filesToLoad,
-        workerPath,
-        options,
-        finalWorkerPath,
-        _yield$import,
-        PyodideManager,
-        pyodideConfig,
-        _yield$import2,
-        BrythonManager,
-        _args = arguments;
-      return _regenerator().w(function (_context) {
-        while (1) switch (_context.n) {
-          case 0:
-            backend = _args.length > 0 && _args[0] !== undefined ? _args[0] : 'pyodide';
-            packages = _args.length > 1 ? _args[1] : undefined;
-            micropipPackages = _args.length > 2 ? _args[2] : undefined;
-            filesToLoad = _args.length > 3 ? _args[3] : undefined;
-            workerPath = _args.length > 4 ? _args[4] : undefined;
-            options = _args.length > 5 && _args[5] !== undefined ? _args[5] : {};
-            // Validate backend parameter
-            _utils_validation_js__WEBPACK_IMPORTED_MODULE_0__/* .ValidationUtils */ .n.validateBackend(backend, 'Nagini');
-            if (!(backend.toLowerCase() === 'pyodide')) {
-              _context.n = 4;
-              break;
-            }
-            // Enforce bundled worker usage for Pyodide (cross-origin compatibility)
-            finalWorkerPath = workerPath;
-            if (workerPath.includes('worker-dist.js')) {
-              _context.n = 2;
-              break;
-            }
-            if (!workerPath.includes('worker.js')) {
-              _context.n = 1;
-              break;
-            }
-            finalWorkerPath = workerPath.replace('worker.js', 'worker-dist.js');
-            console.warn("\uD83D\uDC0D [Nagini] Auto-converted to bundled worker: ".concat(finalWorkerPath));
-            console.warn("\uD83D\uDC0D [Nagini] Only bundled workers are supported for cross-origin compatibility.");
-            console.warn("\uD83D\uDC0D [Nagini] Please update your code to use worker-dist.js directly.");
-            _context.n = 2;
-            break;
-          case 1:
-            throw new Error("\uD83D\uDC0D [Nagini] Only bundled workers are supported for Pyodide. Expected 'worker-dist.js', got: ".concat(workerPath, ". Please build the worker first with 'npm run build' in the worker directory."));
-          case 2:
-            _context.n = 3;
-            return Promise.resolve(/* import() */).then(__webpack_require__.bind(__webpack_require__, 586));
-          case 3:
-            _yield$import = _context.v;
-            PyodideManager = _yield$import.PyodideManager;
-            // Extract Pyodide-specific config options
-            pyodideConfig = {
-              pyodideCdnUrl: options.pyodideCdnUrl,
-              snapshotCache: options.snapshotCache
-            };
-            return _context.a(2, new PyodideManager(packages, micropipPackages, filesToLoad, finalWorkerPath, pyodideConfig));
-          case 4:
-            if (!(backend.toLowerCase() === 'brython')) {
-              _context.n = 6;
-              break;
-            }
-            _context.n = 5;
-            return Promise.resolve(/* import() */).then(__webpack_require__.bind(__webpack_require__, 973));
-          case 5:
-            _yield$import2 = _context.v;
-            BrythonManager = _yield$import2.BrythonManager;
-            return _context.a(2, new BrythonManager(packages, filesToLoad, '', workerPath, options));
-          case 6:
-            throw new Error("\uD83D\uDC0D [Nagini] ".concat(backend, " backend not yet implemented"));
-          case 7:
-            return _context.a(2);
-        }
-      }, _callee);
-    }));
-    function createManager() {
-      return _createManager.apply(this, arguments);
-    }
-    return createManager;
-  }(),
-  /**
-   * Wait for a manager to be ready for execution
-   *
-   * Built-in managers expose a readyPromise that resolves on the worker
-   * "ready" message and rejects with the original cause when
-   * initialization fails (bad worker path, CDN failure, ...). Managers
-   * without a readyPromise fall back to polling isReady.
-   *
-   * @param {Manager} manager - Manager instance to wait for
-   * @param {number} [timeout] - Timeout in milliseconds (default: 30000)
-   * @returns {Promise<void>} Resolves when manager is ready
-   */
-  waitForReady: function () {
-    var _waitForReady = _asyncToGenerator(/*#__PURE__*/_regenerator().m(function _callee2(manager) {
-      var timeout,
-        timer,
-        startTime,
-        _args2 = arguments;
-      return _regenerator().w(function (_context2) {
-        while (1) switch (_context2.n) {
-          case 0:
-            timeout = _args2.length > 1 && _args2[1] !== undefined ? _args2[1] : 30000;
-            if (!manager.readyPromise) {
-              _context2.n = 4;
-              break;
-            }
-            _context2.p = 1;
-            _context2.n = 2;
-            return Promise.race([manager.readyPromise, new Promise(function (_, reject) {
-              timer = setTimeout(function () {
-                return reject(new Error("\uD83D\uDC0D [Nagini] Manager initialization timeout after ".concat(timeout, "ms")));
-              }, timeout);
-            })]);
-          case 2:
-            _context2.p = 2;
-            clearTimeout(timer);
-            return _context2.f(2);
-          case 3:
-            return _context2.a(2);
-          case 4:
-            startTime = Date.now();
-          case 5:
-            if (manager.isReady) {
-              _context2.n = 8;
-              break;
-            }
-            if (!(Date.now() - startTime > timeout)) {
-              _context2.n = 6;
-              break;
-            }
-            throw new Error("\uD83D\uDC0D [Nagini] Manager initialization timeout after ".concat(timeout, "ms"));
-          case 6:
-            _context2.n = 7;
-            return new Promise(function (resolve) {
-              return setTimeout(resolve, 100);
-            });
-          case 7:
-            _context2.n = 5;
-            break;
-          case 8:
-            return _context2.a(2);
-        }
-      }, _callee2, null, [[1,, 2, 3]]);
-    }));
-    function waitForReady(_x) {
-      return _waitForReady.apply(this, arguments);
-    }
-    return waitForReady;
-  }(),
-  /**
-   * Execute Python code from a URL
-   * @param {string} url - URL to fetch Python code from
-   * @param {Manager} manager - Manager instance to use
-   * @param {Object} [namespace] - Optional namespace for execution
-   * @returns {Promise<Object>} Execution result
-   */
-  executeFromUrl: function () {
-    var _executeFromUrl = _asyncToGenerator(/*#__PURE__*/_regenerator().m(function _callee3(url, manager) {
-      var namespace,
-        response,
-        code,
-        filename,
-        _args3 = arguments;
-      return _regenerator().w(function (_context3) {
-        while (1) switch (_context3.n) {
-          case 0:
-            namespace = _args3.length > 2 && _args3[2] !== undefined ? _args3[2] : undefined;
-            if (manager.isReady) {
-              _context3.n = 1;
-              break;
-            }
-            throw new Error("🐍 [Nagini] Manager not ready. Call Nagini.waitForReady() first.");
-          case 1:
-            _context3.n = 2;
-            return fetch(url);
-          case 2:
-            response = _context3.v;
-            if (response.ok) {
-              _context3.n = 3;
-              break;
-            }
-            throw new Error("\uD83D\uDC0D [Nagini] Failed to fetch ".concat(url, ": HTTP ").concat(response.status));
-          case 3:
-            _context3.n = 4;
-            return response.text();
-          case 4:
-            code = _context3.v;
-            filename = url.split("/").pop() || "unknown.py";
-            return _context3.a(2, manager.executeAsync(filename, code, namespace));
-        }
-      }, _callee3);
-    }));
-    function executeFromUrl(_x2, _x3) {
-      return _executeFromUrl.apply(this, arguments);
+   * Check that code parses, on the least loaded worker
+   *
+   * @param {string} code - Python code to parse
+   * @param {number} [timeoutMs=5000] - Timeout in milliseconds
+   * @returns {Promise<CheckResult>}
+   */
+  async check(code, timeoutMs = 5000) {
+    return this.managers[this._leastLoaded()].check(code, timeoutMs);
+  }
+
+  /**
+   * Render a figure left open by a lazyFigures execution, on the worker
+   * that produced it. Pass the handle from result.figures; a bare figure
+   * number goes to the worker of the latest execution that returned lazy
+   * figures
+   *
+   * @param {FigureHandle|number} figure - Handle from result.figures, or its figure number
+   * @param {RenderFigureOptions} [options={}] - Format and size of the render
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<string|Uint8Array>} base64 string or PNG/SVG bytes
+   * @throws {Error} If no worker holds the figure, or the render fails
+   */
+  async renderFigure(figure, options = {}, timeoutMs = 10000) {
+    const isHandle = figure !== null && typeof figure === "object";
+    const manager = isHandle ? this._figureOwners.get(figure) : this._lastFigureManager;
+    if (!manager) {
+      throw new Error("🚨 [PyodideManagerPool] No worker holds this figure: pass a handle from a lazyFigures result of this pool");
+    }
+    return manager.renderFigure(isHandle ? figure.num : figure, options, timeoutMs);
+  }
+
+  /**
+   * Reset the interpreter of every worker (PyodideManager.reset)
+   *
+   * @param {ResetOptions} [options={}] - Reset options
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<ResetResult[]>} One result per worker
+   */
+  async reset(options = {}, timeoutMs = 10000) {
+    return Promise.all(this.managers.map(m => m.reset(options, timeoutMs)));
+  }
+
+  /**
+   * Filesystem operation. writeFile and mkdir are applied on every worker
+   * so that any execution sees the file; reads are served by the worker
+   * of the default namespace. Files written by Python code stay on the
+   * worker that ran it
+   *
+   * @param {FSOperation} operation - 'writeFile', 'readFile', 'mkdir', 'exists', 'listdir'
+   * @param {FSOperationParams} params - Operation parameters
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<any>} Operation result (the default worker's for writes)
+   */
+  async fs(operation, params, timeoutMs = 10000) {
+    if (FS_WRITE_OPERATIONS.includes(operation)) {
+      const results = await Promise.all(this.managers.map(m => m.fs(operation, params, timeoutMs)));
+      return results[this._affinity.get(DEFAULT_AFFINITY) ?? 0];
     }
-    return executeFromUrl;
-  }(),
+    return this._pinned(DEFAULT_AFFINITY).fs(operation, params, timeoutMs);
+  }
+
+  // Named namespaces - served by the worker the name is pinned to. A pin
+  // goes away with its namespace (deleted, or evicted by maxNamespaces)
+
+  /**
+   * Create (or replace) a named namespace on the worker it is pinned to
+   *
+   * @param {string} name - Namespace name
+   * @param {Object} [initial={}] - Initial variables
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<string[]>} Namespaces evicted by the maxNamespaces cap on that worker
+   */
+  async createNamespace(name, initial = {}, timeoutMs = 10000) {
+    const evicted = await this._namespaceManager(name).createNamespace(name, initial, timeoutMs);
+    evicted.forEach(other => this._namespacePins.delete(other));
+    return evicted;
+  }
+
+  /**
+   * Patch a named namespace (PyodideManager.updateNamespace)
+   *
+   * @param {string} name - Namespace name
+   * @param {Object} patch - Variables to set
+   * @param {string[]} [remove=[]] - Variables to delete
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<number>} Number of names in the namespace afterwards
+   */
+  async updateNamespace(name, patch, remove = [], timeoutMs = 10000) { return this._namespaceManager(name).updateNamespace(name, patch, remove, timeoutMs); }
+
+  /**
+   * Read variables of a named namespace (PyodideManager.readNamespace)
+   *
+   * @param {string} name - Namespace name
+   * @param {string[]} [keys] - Variables to read (default: all names not starting with "__")
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<NamespaceValues>} Converted values, and the names that could not be converted
+   */
+  async readNamespace(name, keys = undefined, timeoutMs = 10000) { return this._namespaceManager(name).readNamespace(name, keys, timeoutMs); }
+
   /**
-   * Get list of supported backends
-   * @returns {string[]} Array of supported backend names
+   * Delete a named namespace and drop its pin
+   *
+   * @param {string} name - Namespace name
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<boolean>} Whether the namespace existed
+   */
+  async deleteNamespace(name, timeoutMs = 10000) {
+    const deleted = await this._namespaceManager(name).deleteNamespace(name, timeoutMs);
+    this._namespacePins.delete(name);
+    return deleted;
+  }
+
+  /**
+   * Queue input for the worker of an affinity key (default namespace when
+   * omitted): the next input() there consumes it
+   *
+   * @param {string} input - The input value to queue (may be empty)
+   * @param {string} [affinity] - Affinity key of the execution that reads it
+   * @returns {void}
+   */
+  queueInput(input, affinity = undefined) {
+    return this._pinned(affinity ?? DEFAULT_AFFINITY).queueInput(input);
+  }
+
+  /**
+   * Answer the worker currently waiting for input (the first one, if several)
+   *
+   * @param {string} input - The input value to provide (may be empty)
+   * @returns {void}
+   */
+  provideInput(input) {
+    const waiting = this.managers.find(m => m.isWaitingForInput()) ?? this._pinned(DEFAULT_AFFINITY);
+    return waiting.provideInput(input);
+  }
+
+  /**
+   * Set the input callback on every worker
+   *
+   * @param {Function|null} callback - Function to call when input is needed
+   * @returns {void}
    */
-  getSupportedBackends: function getSupportedBackends() {
-    return ['pyodide', 'brython'];
-  },
+  setInputCallback(callback) {
+    this.managers.forEach(m => m.setInputCallback(callback));
+  }
+
+  /** @returns {boolean} Whether any worker is waiting for input */
+  isWaitingForInput() {
+    return this.managers.some(m => m.isWaitingForInput());
+  }
+
+  /** @returns {string} Prompt of the first worker waiting for input, or empty string */
+  getCurrentPrompt() {
+    return this.managers.find(m => m.isWaitingForInput())?.getCurrentPrompt() ?? "";
+  }
+
   /**
-   * Check if a backend is supported
-   * @param {string} backend - Backend name to check
-   * @returns {boolean} True if backend is supported
+   * Terminate every worker and reject everything still pending
+   *
+   * @returns {void}
    */
-  isBackendSupported: function isBackendSupported(backend) {
-    return Nagini.getSupportedBackends().includes(backend.toLowerCase());
+  destroy() {
+    this.managers.forEach(m => m.destroy());
+    this._affinity.clear();
+    this._namespacePins.clear();
+    this._coalescePins.clear();
+    this._coalescePending.clear();
+    this._lastFigureManager = null;
   }
-};
-__webpack_exports__ = __webpack_exports__.Nagini;
-/******/ 	return __webpack_exports__;
+}
+
+
+
+/***/ }),
+});
+var __nagini_cache__ = {};
+function __nagini_define__(exports, getters) {
+  for (const key in getters) Object.defineProperty(exports, key, { enumerable: true, get: getters[key] });
+}
+function __nagini_require__(moduleId) {
+  if (__nagini_cache__[moduleId]) return __nagini_cache__[moduleId];
+  const exports = __nagini_cache__[moduleId] = {};
+  __nagini_modules__[moduleId](exports, __nagini_require__);
+  return exports;
+}
+return __nagini_require__("./nagini.js").Nagini;
 /******/ })()
 ;
-});
\ No newline at end of file
+});
@@ -0,0 +1,120 @@
+/**
+ * PyodideManagerNamespaces - Named namespaces for PyodideManager
+ *
+ * A named namespace is a globals dict living in the worker: created once
+ * from an initial object, patched with deltas, run against with
+ * executeAsync(..., { namespaceRef: name }) and read back key by key.
+ * Unlike a namespace object passed to executeAsync, it is not converted on
+ * every run and keeps what the code assigns.
+ *
+ * Operations are queued as barriers (see PyodideManager._enqueueExecution):
+ * they run after every call already submitted, in any priority lane, and
+ * before every later call. A patch sent after an execution never reaches
+ * the worker before it, and an execution sent after a patch sees it.
+ */
+
+import { ValidationUtils } from '../../utils/validation.js';
+
+/**
+ * Static class containing named namespace functionality for PyodideManager
+ */
+export class PyodideManagerNamespaces {
+  /**
+   * Create (or replace) a named namespace
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} name - Namespace name
+   * @param {Object} [initial={}] - Initial variables
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<string[]>} Namespaces evicted by the maxNamespaces cap
+   */
+  static async create(manager, name, initial = {}, timeoutMs = 10000) {
+    ValidationUtils.validateString(name, 'name', 'PyodideManagerNamespaces');
+    ValidationUtils.validateNamespace(initial, 'PyodideManagerNamespaces');
+
+    const result = await PyodideManagerNamespaces._send(manager, 'create', { name, values: initial }, timeoutMs);
+    return result.evicted;
+  }
+
+  /**
+   * Patch a named namespace: only the patch crosses to the worker
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} name - Namespace name
+   * @param {Object} patch - Variables to set
+   * @param {string[]} [remove=[]] - Variables to delete
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<number>} Number of names in the namespace afterwards
+   */
+  static async update(manager, name, patch, remove = [], timeoutMs = 10000) {
+    ValidationUtils.validateString(name, 'name', 'PyodideManagerNamespaces');
+    ValidationUtils.validateObject(patch, 'patch', 'PyodideManagerNamespaces');
+    ValidationUtils.validateArray(remove, 'remove', 'PyodideManagerNamespaces');
+
+    const result = await PyodideManagerNamespaces._send(manager, 'update', { name, values: patch, remove }, timeoutMs);
+    return result.size;
+  }
+
+  /**
+   * Read variables of a named namespace
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} name - Namespace name
+   * @param {string[]} [keys] - Variables to read (default: all names not starting with "__")
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<NamespaceValues>} Converted values, and the names that could not be converted
+   */
+  static async read(manager, name, keys = undefined, timeoutMs = 10000) {
+    ValidationUtils.validateString(name, 'name', 'PyodideManagerNamespaces');
+    if (keys !== undefined) {
+      ValidationUtils.validateArray(keys, 'keys', 'PyodideManagerNamespaces');
+    }
+
+    return PyodideManagerNamespaces._send(manager, 'read', { name, keys }, timeoutMs);
+  }
+
+  /**
+   * Delete a named namespace
+   *
+   * @param {PyodideManager} manager - Manager instance
+   * @param {string} name - Namespace name
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<boolean>} Whether the namespace existed
+   */
+  static async delete(manager, name, timeoutMs = 10000) {
+    ValidationUtils.validateString(name, 'name', 'PyodideManagerNamespaces');
+
+    const result = await PyodideManagerNamespaces._send(manager, 'delete', { name }, timeoutMs);
+    return result.deleted;
+  }
+
+  /**
+   * Private helper method to queue a namespace operation for the worker
+   *
+   * @private
+   * @param {PyodideManager} manager - Manager instance
+   * @param {'create'|'update'|'read'|'delete'} operation - Operation name
+   * @param {Object} params - Operation parameters
+   * @param {number} timeoutMs - Timeout in milliseconds
+   * @returns {Promise<Object>} Operation result
+   * @throws {Error} If the manager is not ready, the operation fails or times out
+   */
+  static async _send(manager, operation, params, timeoutMs) {
+    return manager._enqueueExecution(async () => {
+      if (!manager.isReady) {
+        throw new Error("🐍 [PyodideManagerNamespaces] Manager not ready yet. Wait for initialization to complete.");
+      }
+      return manager._postRequest(
+        { type: "namespace_operation", operation, ...params },
+        timeoutMs,
+        "🎛️ [PyodideManagerNamespaces] Namespace operation timeout"
+      );
+    }, undefined, { barrier: true });
+  }
+}
+
+/**
+ * @typedef {Object} NamespaceValues
+ * @property {Object} values - Converted variables by name
+ * @property {string[]} skipped - Variables with no JavaScript equivalent (functions, modules, instances)
+ */
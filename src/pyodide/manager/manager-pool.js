@@ -0,0 +1,461 @@
+/**
+ * PyodideManagerPool - Several Pyodide workers behind one manager interface
+ *
+ * Boots N PyodideManagers from the same worker-dist.js and configuration and
+ * spreads executions across them, so a grading page uses as many cores as it
+ * has workers. Each worker keeps its own interpreter, globals and virtual
+ * filesystem.
+ *
+ * Dispatch:
+ * - An execution with an affinity key always runs on the worker that key
+ *   was first assigned to (least loaded at that time)
+ * - An execution without a namespace and without a key uses the implicit
+ *   default key: default-namespace state persists between runs as with a
+ *   single manager, so all such runs share one worker. Pass a namespace
+ *   ({}) to spread stateless runs across the pool
+ * - An execution with a namespace and without a key goes to the least
+ *   loaded worker (fewest queued + running executions)
+ * - A named namespace lives on the worker its name was first pinned to:
+ *   executions with options.namespaceRef follow it, whatever their key
+ * - A namespaced execution with a coalesceKey and without a key is pinned
+ *   by its coalesceKey, so a newer call meets the queued one it replaces.
+ *   The pin is dropped once no call with that key is pending, and a
+ *   namespace pin once the namespace is deleted or evicted
+ *
+ * USAGE EXAMPLE:
+ * const pool = await Nagini.createPool(4, ['numpy'], [], [], workerPath);
+ * await Nagini.waitForReady(pool, 120000);
+ * const results = await Promise.all(submissions.map((code, i) =>
+ *   pool.executeAsync(`submission_${i}.py`, code, {})
+ * ));
+ */
+
+import { PyodideManager } from './manager.js';
+
+/** Affinity key of executions that use the default namespace */
+const DEFAULT_AFFINITY = Symbol("default");
+
+/** Filesystem operations that change the filesystem: applied on every worker */
+const FS_WRITE_OPERATIONS = ["writeFile", "mkdir"];
+
+class PyodideManagerPool {
+  /**
+   * Create a pool of PyodideManagers sharing one configuration
+   *
+   * @param {number} size - Number of workers
+   * @param {string[]} packages - Python packages to install in every worker
+   * @param {string[]} micropipPackages - Python packages to install with micropip
+   * @param {Array<FileToLoad>} filesToLoad - Files to load into every worker's filesystem
+   * @param {string} workerPath - Path to the bundled web worker file (must be worker-dist.js)
+   * @param {Object} [config={}] - PyodideManager configuration, shared by every worker
+   * @throws {Error} If size is not a positive integer, or any manager parameter is invalid
+   */
+  constructor(size, packages, micropipPackages, filesToLoad, workerPath, config = {}) {
+    if (!Number.isInteger(size) || size < 1) {
+      throw new Error(`🚨 [PyodideManagerPool] size must be a positive integer, got ${size}`);
+    }
+
+    /** @type {PyodideManager[]} One manager (and worker) per slot */
+    this.managers = Array.from(
+      { length: size },
+      () => new PyodideManager(packages, micropipPackages, filesToLoad, workerPath, config)
+    );
+
+    /** @type {Map<string|symbol, number>} Caller affinity key → manager index */
+    this._affinity = new Map();
+
+    // Internal pins live in their own maps: no caller affinity string can
+    // collide with them, and pruning them never drops a caller's pin
+
+    /** @type {Map<string, number>} Named namespace → manager index */
+    this._namespacePins = new Map();
+
+    /** @type {Map<string, number>} coalesceKey → manager index, while calls with it are pending */
+    this._coalescePins = new Map();
+
+    /** @type {Map<string, number>} coalesceKey → calls not settled yet */
+    this._coalescePending = new Map();
+
+    /** @type {WeakMap<FigureHandle, PyodideManager>} Lazy figure handle → worker holding the figure */
+    this._figureOwners = new WeakMap();
+
+    /** @type {PyodideManager|null} Worker of the latest execution that returned lazy figures */
+    this._lastFigureManager = null;
+
+    /** @type {Promise<void>} Resolves once every worker is ready, rejects on
+     *  the first initialization failure */
+    this.readyPromise = Promise.all(this.managers.map(m => m.readyPromise)).then(() => {});
+    this.readyPromise.catch(() => {});
+  }
+
+  /** @returns {number} Number of workers */
+  get size() {
+    return this.managers.length;
+  }
+
+  /** @returns {boolean} Whether every worker is ready */
+  get isReady() {
+    return this.managers.every(m => m.isReady);
+  }
+
+  /** @returns {'jspi'|'async'|null} Input mode of the workers (same browser, same mode) */
+  get inputMode() {
+    return this.managers[0].inputMode;
+  }
+
+  /** @returns {number[]} Executions queued or running, per worker */
+  get queueDepths() {
+    return this.managers.map(m => m.queueDepth);
+  }
+
+  /** @returns {Array<Object<string, number>>} Executions waiting, per priority lane, per worker */
+  get queueLengths() {
+    return this.managers.map(m => m.queueLengths);
+  }
+
+  /** @returns {number} Queued executions superseded by a newer one, on all workers */
+  get supersededCount() {
+    return this.managers.reduce((total, m) => total + m.supersededCount, 0);
+  }
+
+  /**
+   * Dispatch a call pinned by its coalesceKey, so it reaches the worker
+   * where the calls it replaces are queued, and drop the pin once no call
+   * with that key is pending: a later call is free to go to the least
+   * loaded worker, and the map does not grow with every key ever used
+   *
+   * @private
+   * @param {string} key - coalesceKey of the call
+   * @param {function(PyodideManager): Promise<any>} call - Call to make on the pinned worker
+   * @returns {Promise<any>}
+   */
+  _coalesced(key, call) {
+    const promise = call(this._pinned(key, this._coalescePins));
+    this._coalescePending.set(key, (this._coalescePending.get(key) ?? 0) + 1);
+    const settle = () => {
+      const left = this._coalescePending.get(key) - 1;
+      if (left > 0) {
+        this._coalescePending.set(key, left);
+      } else {
+        this._coalescePending.delete(key);
+        this._coalescePins.delete(key);
+      }
+    };
+    promise.then(settle, settle);
+    return promise;
+  }
+
+  /**
+   * Index of the least loaded worker (lowest index on ties)
+   *
+   * @private
+   * @returns {number}
+   */
+  _leastLoaded() {
+    let best = 0;
+    for (let i = 1; i < this.managers.length; i++) {
+      if (this.managers[i].queueDepth < this.managers[best].queueDepth) best = i;
+    }
+    return best;
+  }
+
+  /**
+   * Manager for a key, pinning the key to the least loaded worker on first
+   * use
+   *
+   * @private
+   * @param {string|symbol} key - Affinity key, namespace name or coalesceKey
+   * @param {Map<string|symbol, number>} [pins=this._affinity] - Pin map the key belongs to
+   * @returns {PyodideManager}
+   */
+  _pinned(key, pins = this._affinity) {
+    let index = pins.get(key);
+    if (index === undefined) {
+      index = this._leastLoaded();
+      pins.set(key, index);
+    }
+    return this.managers[index];
+  }
+
+  /**
+   * Manager holding a named namespace (pinned on first use)
+   *
+   * @private
+   * @param {string} name - Namespace name
+   * @returns {PyodideManager}
+   */
+  _namespaceManager(name) {
+    return this._pinned(name, this._namespacePins);
+  }
+
+  /**
+   * Manager an execution is dispatched to (see the module header)
+   *
+   * @param {Object|undefined} [namespace] - Namespace of the execution
+   * @param {string} [affinity] - Affinity key of the execution
+   * @returns {PyodideManager}
+   */
+  managerFor(namespace = undefined, affinity = undefined) {
+    if (affinity !== undefined) return this._pinned(affinity);
+    if (namespace === undefined) return this._pinned(DEFAULT_AFFINITY);
+    return this.managers[this._leastLoaded()];
+  }
+
+  /**
+   * Execute Python code on one of the workers. Same contract as
+   * PyodideManager.executeAsync, plus options.affinity
+   *
+   * @param {string} filename - Name for this execution
+   * @param {string} code - Python code to execute
+   * @param {Object|undefined} [namespace] - Optional namespace object for Python execution
+   * @param {number} [timeoutMs=30000] - Execution timeout in milliseconds
+   * @param {ExecuteOptions} [options={}] - Per-execution options
+   * @param {string} [options.affinity] - Executions sharing a key run on the same worker (and share its default-namespace globals)
+   * @returns {Promise<ExecutionResult>} Execution result
+   */
+  async executeAsync(filename, code, namespace = undefined, timeoutMs = 30000, options = {}) {
+    if (options.affinity !== undefined && typeof options.affinity !== "string") {
+      throw new Error("🚨 [PyodideManagerPool] affinity must be a string");
+    }
+    const { affinity, ...managerOptions } = options;
+    const run = async (manager) => {
+      const result = await manager.executeAsync(filename, code, namespace, timeoutMs, managerOptions);
+      if (result.figureFormat === "handle" && result.figures?.length) {
+        result.figures.forEach(handle => handle && this._figureOwners.set(handle, manager));
+        this._lastFigureManager = manager;
+      }
+      return result;
+    };
+    if (options.namespaceRef !== undefined) {
+      return run(this._namespaceManager(options.namespaceRef));
+    }
+    const coalesce = affinity === undefined && namespace !== undefined ? options.coalesceKey : undefined;
+    if (coalesce !== undefined) {
+      return this._coalesced(coalesce, run);
+    }
+    return run(this.managerFor(namespace, affinity));
+  }
+
+  /**
+   * Run a batch of snippets on one worker (PyodideManager.executeBatch):
+   * the worker of options.affinity, the default-namespace worker when an
+   * item has no namespace, the least loaded one otherwise
+   *
+   * @param {Array<BatchItem>} items - Snippets to run, in order
+   * @param {number} [timeoutMs=30000] - Timeout of the whole batch in milliseconds
+   * @param {BatchOptions} [options={}] - Batch options
+   * @param {string} [options.affinity] - Executions sharing a key run on the same worker (and share its default-namespace globals)
+   * @returns {Promise<ExecutionResult[]>} One result per item, in item order
+   */
+  async executeBatch(items, timeoutMs = 30000, options = {}) {
+    if (options.affinity !== undefined && typeof options.affinity !== "string") {
+      throw new Error("🚨 [PyodideManagerPool] affinity must be a string");
+    }
+    const { affinity, ...managerOptions } = options;
+    // Items without a namespace use the default-namespace globals
+    const key = affinity ?? (items.some(item => item.namespace === undefined) ? DEFAULT_AFFINITY : undefined);
+    const coalesce = key === undefined ? options.coalesceKey : undefined;
+    if (coalesce !== undefined) {
+      return this._coalesced(coalesce, manager => manager.executeBatch(items, timeoutMs, managerOptions));
+    }
+    const manager = key !== undefined ? this._pinned(key) : this.managers[this._leastLoaded()];
+    return manager.executeBatch(items, timeoutMs, managerOptions);
+  }
+
+  /**
+   * Run code against many namespaces on one worker
+   * (PyodideManager.executeMany): the least loaded one, or the worker of
+   * options.affinity
+   *
+   * @param {string} code - Python code to run for each case
+   * @param {Array<Object>|Object<string, Array|TypedArray>} namespaces - Case namespaces, as rows or columns
+   * @param {number} [timeoutMs=30000] - Timeout of the whole fan-out in milliseconds
+   * @param {ManyOptions} [options={}] - Fan-out options
+   * @param {string} [options.affinity] - Executions sharing a key run on the same worker (and share its default-namespace globals)
+   * @returns {Promise<CaseResult[]>} One result per case, in case order
+   */
+  async executeMany(code, namespaces, timeoutMs = 30000, options = {}) {
+    if (options.affinity !== undefined && typeof options.affinity !== "string") {
+      throw new Error("🚨 [PyodideManagerPool] affinity must be a string");
+    }
+    const { affinity, ...managerOptions } = options;
+    const coalesce = affinity === undefined ? options.coalesceKey : undefined;
+    if (coalesce !== undefined) {
+      return this._coalesced(coalesce, manager => manager.executeMany(code, namespaces, timeoutMs, managerOptions));
+    }
+    const manager = affinity !== undefined ? this._pinned(affinity) : this.managers[this._leastLoaded()];
+    return manager.executeMany(code, namespaces, timeoutMs, managerOptions);
+  }
+
+  /**
+   * Check that code parses, on the least loaded worker
+   *
+   * @param {string} code - Python code to parse
+   * @param {number} [timeoutMs=5000] - Timeout in milliseconds
+   * @returns {Promise<CheckResult>}
+   */
+  async check(code, timeoutMs = 5000) {
+    return this.managers[this._leastLoaded()].check(code, timeoutMs);
+  }
+
+  /**
+   * Render a figure left open by a lazyFigures execution, on the worker
+   * that produced it. Pass the handle from result.figures; a bare figure
+   * number goes to the worker of the latest execution that returned lazy
+   * figures
+   *
+   * @param {FigureHandle|number} figure - Handle from result.figures, or its figure number
+   * @param {RenderFigureOptions} [options={}] - Format and size of the render
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<string|Uint8Array>} base64 string or PNG/SVG bytes
+   * @throws {Error} If no worker holds the figure, or the render fails
+   */
+  async renderFigure(figure, options = {}, timeoutMs = 10000) {
+    const isHandle = figure !== null && typeof figure === "object";
+    const manager = isHandle ? this._figureOwners.get(figure) : this._lastFigureManager;
+    if (!manager) {
+      throw new Error("🚨 [PyodideManagerPool] No worker holds this figure: pass a handle from a lazyFigures result of this pool");
+    }
+    return manager.renderFigure(isHandle ? figure.num : figure, options, timeoutMs);
+  }
+
+  /**
+   * Reset the interpreter of every worker (PyodideManager.reset)
+   *
+   * @param {ResetOptions} [options={}] - Reset options
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<ResetResult[]>} One result per worker
+   */
+  async reset(options = {}, timeoutMs = 10000) {
+    return Promise.all(this.managers.map(m => m.reset(options, timeoutMs)));
+  }
+
+  /**
+   * Filesystem operation. writeFile and mkdir are applied on every worker
+   * so that any execution sees the file; reads are served by the worker
+   * of the default namespace. Files written by Python code stay on the
+   * worker that ran it
+   *
+   * @param {FSOperation} operation - 'writeFile', 'readFile', 'mkdir', 'exists', 'listdir'
+   * @param {FSOperationParams} params - Operation parameters
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<any>} Operation result (the default worker's for writes)
+   */
+  async fs(operation, params, timeoutMs = 10000) {
+    if (FS_WRITE_OPERATIONS.includes(operation)) {
+      const results = await Promise.all(this.managers.map(m => m.fs(operation, params, timeoutMs)));
+      return results[this._affinity.get(DEFAULT_AFFINITY) ?? 0];
+    }
+    return this._pinned(DEFAULT_AFFINITY).fs(operation, params, timeoutMs);
+  }
+
+  // Named namespaces - served by the worker the name is pinned to. A pin
+  // goes away with its namespace (deleted, or evicted by maxNamespaces)
+
+  /**
+   * Create (or replace) a named namespace on the worker it is pinned to
+   *
+   * @param {string} name - Namespace name
+   * @param {Object} [initial={}] - Initial variables
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<string[]>} Namespaces evicted by the maxNamespaces cap on that worker
+   */
+  async createNamespace(name, initial = {}, timeoutMs = 10000) {
+    const evicted = await this._namespaceManager(name).createNamespace(name, initial, timeoutMs);
+    evicted.forEach(other => this._namespacePins.delete(other));
+    return evicted;
+  }
+
+  /**
+   * Patch a named namespace (PyodideManager.updateNamespace)
+   *
+   * @param {string} name - Namespace name
+   * @param {Object} patch - Variables to set
+   * @param {string[]} [remove=[]] - Variables to delete
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<number>} Number of names in the namespace afterwards
+   */
+  async updateNamespace(name, patch, remove = [], timeoutMs = 10000) { return this._namespaceManager(name).updateNamespace(name, patch, remove, timeoutMs); }
+
+  /**
+   * Read variables of a named namespace (PyodideManager.readNamespace)
+   *
+   * @param {string} name - Namespace name
+   * @param {string[]} [keys] - Variables to read (default: all names not starting with "__")
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<NamespaceValues>} Converted values, and the names that could not be converted
+   */
+  async readNamespace(name, keys = undefined, timeoutMs = 10000) { return this._namespaceManager(name).readNamespace(name, keys, timeoutMs); }
+
+  /**
+   * Delete a named namespace and drop its pin
+   *
+   * @param {string} name - Namespace name
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<boolean>} Whether the namespace existed
+   */
+  async deleteNamespace(name, timeoutMs = 10000) {
+    const deleted = await this._namespaceManager(name).deleteNamespace(name, timeoutMs);
+    this._namespacePins.delete(name);
+    return deleted;
+  }
+
+  /**
+   * Queue input for the worker of an affinity key (default namespace when
+   * omitted): the next input() there consumes it
+   *
+   * @param {string} input - The input value to queue (may be empty)
+   * @param {string} [affinity] - Affinity key of the execution that reads it
+   * @returns {void}
+   */
+  queueInput(input, affinity = undefined) {
+    return this._pinned(affinity ?? DEFAULT_AFFINITY).queueInput(input);
+  }
+
+  /**
+   * Answer the worker currently waiting for input (the first one, if several)
+   *
+   * @param {string} input - The input value to provide (may be empty)
+   * @returns {void}
+   */
+  provideInput(input) {
+    const waiting = this.managers.find(m => m.isWaitingForInput()) ?? this._pinned(DEFAULT_AFFINITY);
+    return waiting.provideInput(input);
+  }
+
+  /**
+   * Set the input callback on every worker
+   *
+   * @param {Function|null} callback - Function to call when input is needed
+   * @returns {void}
+   */
+  setInputCallback(callback) {
+    this.managers.forEach(m => m.setInputCallback(callback));
+  }
+
+  /** @returns {boolean} Whether any worker is waiting for input */
+  isWaitingForInput() {
+    return this.managers.some(m => m.isWaitingForInput());
+  }
+
+  /** @returns {string} Prompt of the first worker waiting for input, or empty string */
+  getCurrentPrompt() {
+    return this.managers.find(m => m.isWaitingForInput())?.getCurrentPrompt() ?? "";
+  }
+
+  /**
+   * Terminate every worker and reject everything still pending
+   *
+   * @returns {void}
+   */
+  destroy() {
+    this.managers.forEach(m => m.destroy());
+    this._affinity.clear();
+    this._namespacePins.clear();
+    this._coalescePins.clear();
+    this._coalescePending.clear();
+    this._lastFigureManager = null;
+  }
+}
+
+export { PyodideManagerPool };
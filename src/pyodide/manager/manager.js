@@ -30,12 +30,46 @@
 import { PyodideManagerStaticExecutor } from './manager-static-execution.js';
 import { PyodideManagerInput } from './manager-input.js';
 import { PyodideManagerFS } from './manager-fs.js';
+import { PyodideManagerNamespaces } from './manager-namespaces.js';
 import { ValidationUtils } from '../../utils/validation.js';
 import { createBlobWorkerUrl } from '../../utils/createBlobWorker.js';
 
 /** Cap on executionHistory entries (ring buffer behaviour) */
 const MAX_EXECUTION_HISTORY = 50;
 
+/** Signal number written to the interrupt buffer (raises KeyboardInterrupt) */
+const SIGINT = 2;
+
+/** Figure payload formats understood by the worker */
+const FIGURE_FORMATS = ["base64", "png", "svg"];
+
+/** stdout/stderr capture backends understood by the worker */
+const CAPTURE_BACKENDS = ["python", "raw"];
+
+/** Content keys of delivered figures remembered for dedupFigures (LRU) */
+const FIGURE_KEY_CACHE_SIZE = 32;
+
+/** Execution queue lanes, most urgent first: a queued execution starts
+ *  before those of every later lane, in call order within its lane */
+const EXECUTION_PRIORITIES = ["interactive", "background", "prefetch"];
+
+/**
+ * Buffers shared with one worker. Each worker gets its own: the emit
+ * counter is compared with that worker's batch count, and a SIGINT meant
+ * for the running worker must not reach a standby one still booting
+ *
+ * @returns {{emitAck: Int32Array|null, interruptBuffer: Uint8Array|null}}
+ */
+function createSharedBuffers() {
+  // Requires a cross-origin isolated page; otherwise emit batches are not
+  // throttled and an aborted run is only abandoned, its result discarded
+  const shared = typeof SharedArrayBuffer !== "undefined" && globalThis.crossOriginIsolated;
+  return {
+    emitAck: shared ? new Int32Array(new SharedArrayBuffer(4)) : null,
+    interruptBuffer: shared ? new Uint8Array(new SharedArrayBuffer(1)) : null,
+  };
+}
+
 class PyodideManager {
   /**
    * Create a new PyodideManager instance
@@ -47,6 +81,12 @@ class PyodideManager {
    * @param {Object} [config={}] - Optional configuration object
    * @param {string} [config.pyodideCdnUrl] - Custom Pyodide CDN URL (for local/offline use, e.g., Capacitor apps)
    * @param {boolean} [config.snapshotCache] - Cache the bare interpreter as a memory snapshot in IndexedDB for near-instant later boots
+   * @param {OutputLimit} [config.outputLimit] - Default per-stream head/tail caps for every execution (overridable per call), in characters ('python' backend) or bytes ('raw')
+   * @param {'python'|'raw'} [config.captureBackend='python'] - How the worker captures stdout/stderr
+   * @param {boolean} [config.autoLoadImports=false] - Load the packages each snippet imports before running it
+   * @param {number} [config.standby=0] - Initialized workers kept in reserve for restart()
+   * @param {number} [config.standbyMemoryLimit] - Cap in bytes on the WebAssembly heap held by standby workers
+   * @param {number} [config.maxNamespaces=32] - Named namespaces kept in the worker before the least recently used is dropped
    * @throws {Error} If any parameter has incorrect type or worker is not bundled
    */
   constructor(packages, micropipPackages, filesToLoad, workerPath, config = {}) {
@@ -92,6 +132,72 @@ class PyodideManager {
      *  interpreter boot. Packages and files still load after the restore */
     this.snapshotCache = !!config.snapshotCache;
 
+    if (config.outputLimit !== undefined) {
+      ValidationUtils.validateOutputLimit(config.outputLimit, 'PyodideManager');
+    }
+
+    /** @type {OutputLimit|undefined} Default head/tail caps on captured
+     *  stdout/stderr: a runaway print loop keeps the first head and last
+     *  tail characters instead of growing until the wasm heap runs out */
+    this.outputLimit = config.outputLimit;
+
+    if (config.captureBackend !== undefined && !CAPTURE_BACKENDS.includes(config.captureBackend)) {
+      throw new Error(`🚨 [PyodideManager] captureBackend must be one of: ${CAPTURE_BACKENDS.join(", ")}, got "${config.captureBackend}"`);
+    }
+
+    /** @type {'python'|'raw'} stdout/stderr capture: 'python' swaps
+     *  sys.stdout/stderr for capture streams; 'raw' takes the bytes written
+     *  to fd 1/2 (pyodide.setStdout), which also catches C extensions and
+     *  os.write, at a lower cost per write. Output limits and streaming
+     *  chunk sizes then count bytes instead of characters */
+    this.captureBackend = config.captureBackend ?? "python";
+
+    /** @type {boolean} Scan each snippet's imports (from the AST, cached
+     *  with the compiled code) and load the Pyodide packages it needs that
+     *  are not loaded yet, in one parallel batch before the run. The time
+     *  spent is reported as metrics.packageLoadMs. In jspi mode, imports
+     *  the scan cannot see (importlib.import_module) load their package on
+     *  first import through a sys.meta_path finder */
+    this.autoLoadImports = !!config.autoLoadImports;
+
+    if (config.standby !== undefined && (!Number.isInteger(config.standby) || config.standby < 0)) {
+      throw new Error(`🚨 [PyodideManager] standby must be a non-negative integer, got ${config.standby}`);
+    }
+    if (config.standbyMemoryLimit !== undefined && !(config.standbyMemoryLimit > 0)) {
+      throw new Error(`🚨 [PyodideManager] standbyMemoryLimit must be a positive number of bytes, got ${config.standbyMemoryLimit}`);
+    }
+
+    /** @type {number} Workers booted with the same packages and files and
+     *  kept idle once the main worker is ready: restart() and crash
+     *  recovery swap one in instead of paying a full boot */
+    this.standby = config.standby ?? 0;
+
+    /** @type {number|undefined} Cap on the WebAssembly heap held by standby
+     *  workers, each counted at its size after boot. A spare that would
+     *  cross it is not started */
+    this.standbyMemoryLimit = config.standbyMemoryLimit;
+
+    if (config.maxNamespaces !== undefined && (!Number.isInteger(config.maxNamespaces) || config.maxNamespaces <= 0)) {
+      throw new Error(`🚨 [PyodideManager] maxNamespaces must be a positive integer, got ${config.maxNamespaces}`);
+    }
+
+    /** @type {number|undefined} Named namespaces (createNamespace) the
+     *  worker keeps: creating one more drops the least recently used */
+    this.maxNamespaces = config.maxNamespaces;
+
+    /** @type {WorkerSlot|null} Slot of the worker executions go to */
+    this._attachedSlot = null;
+
+    /** @type {Array<WorkerSlot>} Standby workers, booting or ready */
+    this._spares = [];
+
+    /** @type {number|null} WebAssembly heap of the worker after its boot
+     *  (set on the ready message), the size assumed for a spare still booting */
+    this._bootHeapBytes = null;
+
+    /** @type {boolean} Set by destroy(): no worker is started afterwards */
+    this._destroyed = false;
+
     /** @type {boolean} Whether this worker booted from a cached snapshot
      *  (set on the ready message) */
     this.snapshotRestored = false;
@@ -105,11 +211,36 @@ class PyodideManager {
     /** @type {string|null} Blob URL for cleanup */
     this.blobUrl = null;
 
+    /** @type {Int32Array|null} Counter of emit batches consumed, shared with
+     *  the worker so emit() can block when the page falls behind (set when
+     *  the worker is attached) */
+    this._emitAck = null;
+
+    /** @type {Uint8Array|null} Pyodide interrupt buffer (setInterruptBuffer):
+     *  writing SIGINT makes the running Python code raise KeyboardInterrupt
+     *  (set when the worker is attached) */
+    this._interruptBuffer = null;
+
     // Initialize input state using the input module
     PyodideManagerInput.initializeInputState(this);
 
-    /** @type {Promise<any>} Serialization chain for executeAsync calls */
-    this.executionChain = Promise.resolve();
+    /** @type {Array<QueuedExecution>} executeAsync calls waiting for the
+     *  worker, by priority lane then call order: one Python interpreter,
+     *  one run at a time */
+    this._executionQueue = [];
+
+    /** @type {Map<string, true>} Content keys of the figures delivered to
+     *  the caller (dedupFigures), least recently seen first. Kept here and
+     *  not in the worker: only a result that actually arrived can make a
+     *  later run skip a payload */
+    this._sentFigureKeys = new Map();
+
+    /** @type {number} Queued executions rejected with a Superseded error
+     *  because a newer one shared their coalesceKey */
+    this.supersededCount = 0;
+
+    /** @type {QueuedExecution|null} Execution currently sent to the worker */
+    this._runningExecution = null;
 
     /** @type {Map<number, {resolve: Function, reject: Function, timeoutId: number}>}
      *  Pending id-correlated requests (execute, fs) awaiting a worker response */
@@ -118,6 +249,22 @@ class PyodideManager {
     /** @type {number} Monotonic id for request correlation */
     this._nextRequestId = 1;
 
+    this._resetReadyPromise();
+
+    // Initialize worker asynchronously
+    this.initWorker().catch((error) => {
+      console.error("🚨 [PyodideManager] Worker initialization failed:", error);
+      this._readyReject(error);
+    });
+  }
+
+  /**
+   * Create readyPromise for the worker about to be attached
+   *
+   * @private
+   * @returns {void}
+   */
+  _resetReadyPromise() {
     /** @type {Promise<void>} Resolves on the worker "ready" message, rejects
      *  with the original cause if initialization fails */
     this.readyPromise = new Promise((resolve, reject) => {
@@ -130,12 +277,6 @@ class PyodideManager {
     // Guard: an init failure must not surface as an unhandled rejection when
     // the consumer only polls isReady
     this.readyPromise.catch(() => {});
-
-    // Initialize worker asynchronously
-    this.initWorker().catch((error) => {
-      console.error("🚨 [PyodideManager] Worker initialization failed:", error);
-      this._readyReject(error);
-    });
   }
 
   /**
@@ -163,42 +304,65 @@ class PyodideManager {
    * @throws {Error} If blob worker creation fails
    */
   async initWorker() {
+    const slot = { worker: null, blobUrl: null, ...createSharedBuffers(), readyData: null };
+    this._attachWorker(slot);
+    await this._startWorker(slot);
+  }
+
+  /**
+   * Create the worker of a slot and send it the init message. Its messages
+   * go through slot.onMessage / slot.onCrash, so the same worker can boot
+   * as a standby and be attached later
+   *
+   * @private
+   * @param {WorkerSlot} slot - Slot to start (buffers and handlers set)
+   * @returns {Promise<void>}
+   * @throws {Error} If blob worker creation fails
+   */
+  async _startWorker(slot) {
     try {
       // Create blob URL first for cleanup tracking
-      this.blobUrl = await createBlobWorkerUrl(this.workerPath);
-      
+      const blobUrl = await createBlobWorkerUrl(this.workerPath);
+      if (slot.discarded) {
+        URL.revokeObjectURL(blobUrl);
+        return;
+      }
+      slot.blobUrl = blobUrl;
+
       // Create worker from blob URL, as a module worker: the bundled worker
       // loads Pyodide with a dynamic import (pyodide.mjs, ESM-only in
       // Pyodide 314+), which importScripts-based classic workers cannot do
-      this.worker = new Worker(this.blobUrl, { type: "module" });
+      slot.worker = new Worker(blobUrl, { type: "module" });
+      if (slot === this._attachedSlot) {
+        this.worker = slot.worker;
+        this.blobUrl = blobUrl;
+      }
 
-      // Set up message handling: dispatch routes id-correlated responses to
-      // their pending promise, then hands the message to handleMessage
-      this.worker.onmessage = (e) => this._dispatchMessage(e.data);
+      slot.worker.onmessage = (e) => slot.onMessage(e.data);
 
-      // Surface worker crashes (wasm trap, failed import, ...) as error
-      // messages so pending executions reject instead of hanging forever
-      this.worker.onerror = (e) => {
-        this._dispatchMessage({
-          type: "error",
-          message: `Worker crashed: ${e.message || "unknown error"}`,
-        });
-      };
-      this.worker.onmessageerror = () => {
-        this._dispatchMessage({
+      // Surface worker crashes (wasm trap, failed import, ...) so pending
+      // executions reject instead of hanging forever
+      slot.worker.onerror = (e) => slot.onCrash(`Worker crashed: ${e.message || "unknown error"}`);
+      slot.worker.onmessageerror = () => {
+        slot.onMessage({
           type: "error",
           message: "Worker message could not be deserialized",
         });
       };
 
       // Start initialization
-      this.worker.postMessage({
+      slot.worker.postMessage({
         type: "init",
         packages: this.packages,
         micropipPackages: this.micropipPackages,
         filesToLoad: this.filesToLoad,
         pyodideCdnUrl: this.pyodideCdnUrl,
         snapshotCache: this.snapshotCache,
+        emitAck: slot.emitAck ?? undefined,
+        interruptBuffer: slot.interruptBuffer ?? undefined,
+        captureBackend: this.captureBackend,
+        autoLoadImports: this.autoLoadImports,
+        maxNamespaces: this.maxNamespaces,
       });
       
     } catch (error) {
@@ -207,6 +371,97 @@ class PyodideManager {
     }
   }
 
+  /**
+   * Make a slot's worker the one executions go to. A standby that already
+   * booted replays its ready message
+   *
+   * @private
+   * @param {WorkerSlot} slot - Slot to attach
+   * @returns {void}
+   */
+  _attachWorker(slot) {
+    this._attachedSlot = slot;
+    this.worker = slot.worker;
+    this.blobUrl = slot.blobUrl;
+    this._emitAck = slot.emitAck;
+    this._interruptBuffer = slot.interruptBuffer;
+
+    // Dispatch routes id-correlated responses to their pending promise,
+    // then hands the message to handleMessage
+    slot.onMessage = (data) => this._dispatchMessage(data);
+    slot.onCrash = (message) => {
+      const wasReady = this.isReady;
+      this._dispatchMessage({ type: "error", message });
+      // A crash after init swaps a standby in, when one is configured
+      if (wasReady && this.standby > 0 && slot === this._attachedSlot) {
+        this.restart().catch((error) => {
+          console.error("🚨 [PyodideManager] Restart after crash failed:", error);
+        });
+      }
+    };
+    if (slot.readyData) {
+      this._dispatchMessage(slot.readyData);
+    }
+  }
+
+  /**
+   * Start standby workers up to config.standby, within standbyMemoryLimit.
+   * Runs once the attached worker is ready, so spares do not compete with
+   * its boot
+   *
+   * @private
+   * @returns {void}
+   */
+  _fillStandby() {
+    if (this._destroyed || !this.isReady) return;
+    while (this._spares.length < this.standby) {
+      if (this.standbyMemoryLimit !== undefined) {
+        const estimate = this._bootHeapBytes ?? 0;
+        const held = this._spares.reduce((sum, spare) => sum + (spare.readyData?.heapBytes ?? estimate), 0);
+        if (held + estimate > this.standbyMemoryLimit) break;
+      }
+      const slot = { worker: null, blobUrl: null, ...createSharedBuffers(), readyData: null };
+      slot.onMessage = (data) => {
+        if (data?.type === "ready") {
+          slot.readyData = data;
+        } else if (data?.type === "error" && data.id === undefined) {
+          this._discardSpare(slot, data.message || data.error);
+        } else if (data?.id !== undefined) {
+          // Response to a request it served (check): ids are unique per manager
+          this._dispatchMessage(data);
+        }
+      };
+      slot.onCrash = (message) => this._discardSpare(slot, message);
+      this._spares.push(slot);
+      this._startWorker(slot).catch((error) => this._discardSpare(slot, error.message));
+    }
+  }
+
+  /**
+   * Drop a standby worker (failed boot, crash, destroy). A failed spare is
+   * not replaced until the next restart, so a broken setup does not loop
+   *
+   * @private
+   * @param {WorkerSlot} slot - Standby slot
+   * @param {string} [reason] - Logged when the spare failed
+   * @returns {void}
+   */
+  _discardSpare(slot, reason = undefined) {
+    const index = this._spares.indexOf(slot);
+    if (index !== -1) this._spares.splice(index, 1);
+    slot.discarded = true;
+    slot.worker?.terminate();
+    if (slot.blobUrl) URL.revokeObjectURL(slot.blobUrl);
+    if (reason) {
+      console.warn("🐍 [PyodideManager] Standby worker dropped:", reason);
+    }
+  }
+
+  /** @returns {number} Standby workers booted and ready to swap in */
+  get standbyReady() {
+    return this._spares.filter(spare => spare.readyData).length;
+  }
+
   /**
    * Route a worker message: settle the matching pending request (by id) if
    * any, then hand the message to handleMessage for normal processing
@@ -217,6 +472,28 @@ class PyodideManager {
    * @returns {void}
    */
   _dispatchMessage(data) {
+    // Progress messages for a request still in flight: hand them to its
+    // listener without settling anything
+    if (data && data.type === "output_chunk") {
+      this._notifyPending(data.id, "onOutput", { stream: data.stream, text: data.data });
+      return;
+    }
+    if (data && data.type === "batch_results") {
+      this._notifyPending(data.id, "onBatch", data);
+      return;
+    }
+    if (data && data.type === "emit_batch") {
+      if (this._pendingRequests.get(data.id)?.onEmit) {
+        this._notifyPending(data.id, "onEmit", JSON.parse(data.records));
+      }
+      // Acknowledge after the listener ran: a slow consumer holds emit() back
+      if (this._emitAck) {
+        Atomics.add(this._emitAck, 0, 1);
+        Atomics.notify(this._emitAck, 0);
+      }
+      return;
+    }
+
     const pending = data && data.id !== undefined
       ? this._pendingRequests.get(data.id)
       : undefined;
@@ -235,6 +512,7 @@ class PyodideManager {
 
     if (data && data.type === "ready") {
       this._readyResolve();
+      this._fillStandby();
     }
 
     if (data && data.type === "error" && data.id === undefined) {
@@ -250,20 +528,25 @@ class PyodideManager {
     if (data.type === "result") {
       // Resolve with a result built from the worker payload, even when it
       // contains a Python error: callers read stderr for the full traceback
-      pending.resolve({
-        filename: data.filename,
-        time: data.time,
-        stdout: data.stdout,
-        stderr: data.stderr,
-        missive: data.missive,
-        figures: data.figures,
-        error: data.error,
-        timestamp: new Date().toISOString(),
-      });
+      pending.resolve(toExecutionResult(data));
+    } else if (data.type === "many_result") {
+      pending.resolve(data.results);
+    } else if (data.type === "batch_done") {
+      pending.resolve({ completed: data.completed, time: data.time });
+    } else if (data.type === "figure_result") {
+      pending.resolve(data.figure);
+    } else if (data.type === "reset_result") {
+      pending.resolve({ globalsRemoved: data.globalsRemoved, modulesEvicted: data.modulesEvicted, time: data.time });
+    } else if (data.type === "check_result") {
+      pending.resolve({ valid: data.valid, error: data.error, time: data.time });
     } else if (data.type === "fs_result") {
       pending.resolve(data.result);
     } else if (data.type === "fs_error") {
       pending.reject(new Error(`🎛️ [PyodideManagerFS] Filesystem error: ${data.error}`));
+    } else if (data.type === "namespace_result") {
+      pending.resolve(data.result);
+    } else if (data.type === "namespace_error") {
+      pending.reject(new Error(`🎛️ [PyodideManagerNamespaces] Namespace error: ${data.error}`));
     } else if (data.type === "error") {
       pending.reject(new Error(`⚡ [PyodideManager] Execution error: ${data.message || data.error || "Unknown error"}`));
     } else {
@@ -271,6 +554,26 @@ class PyodideManager {
     }
   }
 
+  /**
+   * Call a listener registered on a pending request (progress messages).
+   * A throwing consumer callback must not break message dispatch
+   *
+   * @private
+   * @param {number} id - Request id echoed by the worker
+   * @param {string} listener - Listener name on the pending entry
+   * @param {any} payload - Value handed to the listener
+   * @returns {void}
+   */
+  _notifyPending(id, listener, payload) {
+    const pending = this._pendingRequests.get(id);
+    if (!pending || !pending[listener]) return;
+    try {
+      pending[listener](payload);
+    } catch (error) {
+      console.error(`🚨 [PyodideManager] ${listener} callback failed:`, error);
+    }
+  }
+
   /**
    * Send an id-correlated request to the worker and return a promise settled
    * by the matching response (see _dispatchMessage)
@@ -279,29 +582,170 @@ class PyodideManager {
    * @param {Object} message - Message to post (id is added here)
    * @param {number} timeoutMs - Timeout in milliseconds
    * @param {string} timeoutLabel - Error message on timeout
+   * @param {Object} [listeners={}] - Progress callbacks kept on the pending entry (e.g. onOutput)
+   * @param {AbortSignal} [signal] - Rejects the request (with signal.reason) when aborted
+   * @param {Worker} [worker=this.worker] - Worker to send it to (a standby serving a check)
    * @returns {Promise<any>}
    */
-  _postRequest(message, timeoutMs, timeoutLabel) {
+  _postRequest(message, timeoutMs, timeoutLabel, listeners = {}, signal = undefined, worker = this.worker) {
     return new Promise((resolve, reject) => {
       const id = this._nextRequestId++;
+      // A response arriving after a timeout or an abort is simply discarded
+      // by _dispatchMessage
+      const abandon = (error) => {
+        if (!this._pendingRequests.delete(id)) return;
+        clearTimeout(timeoutId);
+        signal?.removeEventListener("abort", onAbort);
+        reject(error);
+      };
+      const onAbort = () => abandon(abortReason(signal));
       const timeoutId = setTimeout(() => {
-        // A response arriving later is simply discarded by _dispatchMessage
-        this._pendingRequests.delete(id);
-        reject(new Error(timeoutLabel));
+        listeners.onTimeout?.();
+        abandon(new Error(timeoutLabel));
       }, timeoutMs);
+      const settle = (callback) => (value) => {
+        signal?.removeEventListener("abort", onAbort);
+        callback(value);
+      };
 
-      this._pendingRequests.set(id, { resolve, reject, timeoutId });
+      this._pendingRequests.set(id, { ...listeners, resolve: settle(resolve), reject: settle(reject), timeoutId });
+      signal?.addEventListener("abort", onAbort, { once: true });
 
       try {
-        this.worker.postMessage({ ...message, id });
+        worker.postMessage({ ...message, id });
       } catch (error) {
-        clearTimeout(timeoutId);
-        this._pendingRequests.delete(id);
-        reject(new Error(`🚨 [PyodideManager] Failed to send message to worker: ${error.message}`));
+        abandon(new Error(`🚨 [PyodideManager] Failed to send message to worker: ${error.message}`));
       }
     });
   }
 
+  /**
+   * Queue an execution behind the ones already waiting in its lane and in
+   * more urgent lanes. A coalesceKey supersedes the queued executions with
+   * the same key: they reject with a Superseded error (the running one is
+   * left alone). An abort drops the execution from the queue if it has not
+   * started, and interrupts it if it runs.
+   *
+   * A barrier (namespace operation, reset) goes to the end of the queue,
+   * whatever its lane, and nothing queued after it overtakes it: it runs
+   * after every call submitted before it and before every call submitted
+   * after it
+   *
+   * @private
+   * @param {function(): Promise<ExecutionResult>} task - Sends the execution and settles with its result
+   * @param {AbortSignal} [signal] - Cancels the execution
+   * @param {QueueOptions} [queueOptions={}] - Lane and coalescing key
+   * @param {boolean} [queueOptions.barrier=false] - Run after everything queued before it
+   * @returns {Promise<ExecutionResult>}
+   */
+  _enqueueExecution(task, signal, { priority = "interactive", coalesceKey, barrier = false } = {}) {
+    return new Promise((resolve, reject) => {
+      if (!EXECUTION_PRIORITIES.includes(priority)) {
+        reject(new Error(`⚡ [PyodideManager] priority must be one of: ${EXECUTION_PRIORITIES.join(", ")}, got "${priority}"`));
+        return;
+      }
+      if (coalesceKey !== undefined && typeof coalesceKey !== "string") {
+        reject(new Error("⚡ [PyodideManager] coalesceKey must be a string"));
+        return;
+      }
+      if (signal?.aborted) {
+        reject(abortReason(signal));
+        return;
+      }
+      const entry = { task, signal, resolve, reject, onAbort: null, rank: EXECUTION_PRIORITIES.indexOf(priority), coalesceKey, barrier };
+      entry.onAbort = () => {
+        const index = this._executionQueue.indexOf(entry);
+        if (index !== -1) {
+          this._executionQueue.splice(index, 1);
+          reject(abortReason(signal));
+        } else if (this._runningExecution === entry) {
+          // The request itself is rejected by _postRequest
+          this._interruptExecution();
+        }
+      };
+      signal?.addEventListener("abort", entry.onAbort, { once: true });
+      if (coalesceKey !== undefined) {
+        this._supersede(coalesceKey);
+      }
+      // Lanes only reorder the calls queued after the last barrier
+      const start = this._executionQueue.findLastIndex(queued => queued.barrier) + 1;
+      const later = barrier ? -1 : this._executionQueue.findIndex((queued, i) => i >= start && queued.rank > entry.rank);
+      this._executionQueue.splice(later === -1 ? this._executionQueue.length : later, 0, entry);
+      this._runNextExecution();
+    });
+  }
+
+  /**
+   * Drop the queued executions carrying a coalescing key: a newer request
+   * replaces them (a live preview only needs the latest source)
+   *
+   * @private
+   * @param {string} coalesceKey - Coalescing key of the new request
+   * @returns {void}
+   */
+  _supersede(coalesceKey) {
+    const stale = this._executionQueue.filter(queued => queued.coalesceKey === coalesceKey);
+    for (const entry of stale) {
+      this._executionQueue.splice(this._executionQueue.indexOf(entry), 1);
+      entry.signal?.removeEventListener("abort", entry.onAbort);
+      this.supersededCount++;
+      entry.reject(supersededError(coalesceKey));
+    }
+  }
+
+  /**
+   * Remember the figure keys of a delivered dedupFigures result
+   *
+   * @private
+   * @param {ExecutionResult} result - Result received from the worker
+   * @returns {void}
+   */
+  _recordSentFigures(result) {
+    (result.figureKeys ?? []).forEach((key, i) => {
+      // A null figure only refreshes a key the caller already holds
+      if (result.figures[i] === null && !this._sentFigureKeys.has(key)) return;
+      this._sentFigureKeys.delete(key);
+      this._sentFigureKeys.set(key, true);
+    });
+    for (const oldest of this._sentFigureKeys.keys()) {
+      if (this._sentFigureKeys.size <= FIGURE_KEY_CACHE_SIZE) break;
+      this._sentFigureKeys.delete(oldest);
+    }
+  }
+
+  /**
+   * Start the next queued execution when none is running
+   *
+   * @private
+   * @returns {Promise<void>}
+   */
+  async _runNextExecution() {
+    if (this._runningExecution || this._executionQueue.length === 0) return;
+    const entry = this._executionQueue.shift();
+    this._runningExecution = entry;
+    try {
+      entry.resolve(await entry.task());
+    } catch (error) {
+      entry.reject(error);
+    } finally {
+      entry.signal?.removeEventListener("abort", entry.onAbort);
+      this._runningExecution = null;
+      this._runNextExecution();
+    }
+  }
+
+  /**
+   * Ask the running Python code to stop: it raises KeyboardInterrupt at
+   * its next bytecode check and the interpreter stays warm. No-op without
+   * a shared interrupt buffer (page not cross-origin isolated)
+   *
+   * @private
+   * @returns {void}
+   */
+  _interruptExecution() {
+    if (this._interruptBuffer) this._interruptBuffer[0] = SIGINT;
+  }
+
   /**
    * Reject every pending request (worker crash, destroy)
    *
@@ -330,6 +774,7 @@ class PyodideManager {
       this.isReady = true;
       this.snapshotRestored = !!data.snapshotRestored;
       this.inputMode = data.inputMode || "async";
+      this._bootHeapBytes = data.heapBytes ?? this._bootHeapBytes;
     }
 
     // Pyodide initialization or execution error
@@ -371,6 +816,8 @@ class PyodideManager {
         stderr: data.stderr,
         missive: data.missive,
         error: data.error,
+        truncated: data.truncated,
+        metrics: data.metrics,
         timestamp: new Date().toISOString(),
       };
 
@@ -381,6 +828,20 @@ class PyodideManager {
     }
   }
 
+  /** @returns {number} Executions queued or running on this worker */
+  get queueDepth() {
+    return this._executionQueue.length + (this._runningExecution ? 1 : 0);
+  }
+
+  /** @returns {Object<string, number>} Executions waiting (not running), per priority lane */
+  get queueLengths() {
+    const lengths = Object.fromEntries(EXECUTION_PRIORITIES.map(priority => [priority, 0]));
+    for (const entry of this._executionQueue) {
+      lengths[EXECUTION_PRIORITIES[entry.rank]]++;
+    }
+    return lengths;
+  }
+
   // Input handling methods - delegate to input module
   provideInput(input) { return PyodideManagerInput.provideInput(this, input); }
   queueInput(input) { return PyodideManagerInput.queueInput(this, input); }
@@ -391,6 +852,12 @@ class PyodideManager {
   // Filesystem operations - delegate to filesystem module
   async fs(operation, params, timeoutMs = 10000) { return PyodideManagerFS.fs(this, operation, params, timeoutMs); }
 
+  // Named namespaces - delegate to namespaces module
+  async createNamespace(name, initial = {}, timeoutMs = 10000) { return PyodideManagerNamespaces.create(this, name, initial, timeoutMs); }
+  async updateNamespace(name, patch, remove = [], timeoutMs = 10000) { return PyodideManagerNamespaces.update(this, name, patch, remove, timeoutMs); }
+  async readNamespace(name, keys = undefined, timeoutMs = 10000) { return PyodideManagerNamespaces.read(this, name, keys, timeoutMs); }
+  async deleteNamespace(name, timeoutMs = 10000) { return PyodideManagerNamespaces.delete(this, name, timeoutMs); }
+
   /**
    * Execute Python code in the worker with optional namespace isolation
    *
@@ -410,16 +877,42 @@ class PyodideManager {
    * @param {string} code - Python code to execute
    * @param {Object|undefined} [namespace] - Optional namespace object for Python execution
    * @param {number} [timeoutMs=30000] - Execution timeout in milliseconds (raise it for interactive input() code)
+   * @param {ExecuteOptions} [options={}] - Per-execution options
    * @returns {Promise<ExecutionResult>} Promise that resolves with execution result
-   * @throws {Error} If manager is not ready or execution times out
+   * @throws {Error} If manager is not ready or execution times out, signal.reason if aborted
    */
-  async executeAsync(filename, code, namespace = undefined, timeoutMs = 30000) {
+  async executeAsync(filename, code, namespace = undefined, timeoutMs = 30000, options = {}) {
     // Executions are serialized: one Python interpreter lives in the worker,
-    // so concurrent calls are queued rather than interleaved. Responses are
-    // correlated by request id, so a late result from a timed-out run can
-    // never be attributed to the next execution
+    // so concurrent calls are queued rather than interleaved (by priority
+    // lane, see _enqueueExecution). Responses are
+    // correlated by request id, so a late result from a timed-out or
+    // aborted run can never be attributed to the next execution
+    if (options.signal !== undefined && !(options.signal instanceof AbortSignal)) {
+      throw new Error("⚡ [PyodideManager] signal must be an AbortSignal");
+    }
     const run = async () => {
       ValidationUtils.validateExecutionParams(filename, code, namespace, 'PyodideManager');
+      if (options.onOutput !== undefined) {
+        ValidationUtils.validateFunction(options.onOutput, 'onOutput', 'PyodideManager');
+      }
+      if (options.onEmit !== undefined) {
+        ValidationUtils.validateFunction(options.onEmit, 'onEmit', 'PyodideManager');
+      }
+      if (options.outputLimit !== undefined) {
+        ValidationUtils.validateOutputLimit(options.outputLimit, 'PyodideManager');
+      }
+      if (options.budget !== undefined && (!Number.isInteger(options.budget) || options.budget <= 0)) {
+        throw new Error(`⚡ [PyodideManager] budget must be a positive integer, got ${options.budget}`);
+      }
+      if (options.namespaceRef !== undefined) {
+        ValidationUtils.validateString(options.namespaceRef, 'namespaceRef', 'PyodideManager');
+        if (namespace !== undefined) {
+          throw new Error("⚡ [PyodideManager] Pass either a namespace object or a namespaceRef, not both");
+        }
+      }
+      if (options.figureFormat !== undefined && !FIGURE_FORMATS.includes(options.figureFormat)) {
+        throw new Error(`⚡ [PyodideManager] figureFormat must be one of: ${FIGURE_FORMATS.join(", ")}, got "${options.figureFormat}"`);
+      }
       if (!this.isReady) {
         throw new Error("⚡ [PyodideManager] Manager not ready yet. Wait for initialization to complete.");
       }
@@ -427,15 +920,308 @@ class PyodideManager {
       if (namespace !== undefined) {
         message.namespace = namespace;
       }
+      if (options.namespaceRef !== undefined) {
+        // Run in a namespace held by the worker: nothing is converted and
+        // what the code assigns stays there for the next run
+        message.namespaceRef = options.namespaceRef;
+      }
+      if (options.figureFormat !== undefined || options.figureDpi !== undefined || options.lazyFigures || options.dedupFigures) {
+        message.figureOptions = {
+          format: options.figureFormat,
+          dpi: options.figureDpi,
+          lazy: !!options.lazyFigures,
+          dedup: !!options.dedupFigures,
+          known: options.dedupFigures ? [...this._sentFigureKeys.keys()] : undefined,
+        };
+      }
+      if (options.binaryMissive) {
+        message.binaryMissive = true;
+      }
+      if (options.traceMemory) {
+        message.traceMemory = true;
+      }
+      if (options.budget) {
+        // Deterministic stop for runaway code: past this many lines the run
+        // ends with a BudgetExceeded error and the worker stays usable
+        message.budget = options.budget;
+      }
+      if (options.display) {
+        message.display = options.display === true ? {} : options.display;
+      }
+      const outputLimit = options.outputLimit ?? this.outputLimit;
+      if (outputLimit) {
+        message.outputLimit = outputLimit;
+      }
+      // A run that outlives its timeout is interrupted, not left behind the
+      // next executions
+      const listeners = { onTimeout: () => this._interruptExecution() };
+      if (options.onOutput) {
+        // Streaming mode: stdout/stderr reach onOutput in chunks while the
+        // code runs; the resolved result only carries what was not streamed
+        message.stream = { chunkSize: options.chunkSize, flushIntervalMs: options.flushIntervalMs };
+        listeners.onOutput = options.onOutput;
+      }
+      if (options.onEmit) {
+        // emit() records reach onEmit in batches while the code runs;
+        // without a listener emit() is a no-op in the worker
+        message.emit = {
+          batchSize: options.emitBatchSize,
+          flushIntervalMs: options.emitFlushIntervalMs,
+          maxInFlight: options.emitMaxInFlight,
+        };
+        listeners.onEmit = options.onEmit;
+      }
+      const request = this._postRequest(
+        message,
+        timeoutMs,
+        `⚡ [PyodideManager] Execution timeout after ${timeoutMs / 1000} seconds`,
+        listeners,
+        options.signal
+      );
+      if (!options.dedupFigures || options.lazyFigures) return request;
+      return request.then(
+        (result) => {
+          this._recordSentFigures(result);
+          return result;
+        },
+        (error) => {
+          // A timeout or an abort may have lost payloads the worker rendered:
+          // start over rather than trust what the caller holds
+          this._sentFigureKeys.clear();
+          throw error;
+        }
+      );
+    };
+    return this._enqueueExecution(run, options.signal, options);
+  }
+
+  /**
+   * Run many independent snippets in one round trip: the items travel in
+   * one message, run back to back in the worker and their results come
+   * back in batches. Each item has its own captures and error (a failing
+   * item does not stop the next one) and timeoutMs covers the whole batch.
+   * Items are not added to executionHistory
+   *
+   * @param {Array<BatchItem>} items - Snippets to run, in order
+   * @param {number} [timeoutMs=30000] - Timeout of the whole batch in milliseconds
+   * @param {BatchOptions} [options={}] - Batch options
+   * @returns {Promise<ExecutionResult[]>} One result per item, in item order
+   * @throws {Error} If manager is not ready or the batch times out, signal.reason if aborted
+   */
+  async executeBatch(items, timeoutMs = 30000, options = {}) {
+    ValidationUtils.validateArray(items, 'items', 'PyodideManager');
+    for (const item of items) {
+      ValidationUtils.validateObject(item, 'item', 'PyodideManager');
+      ValidationUtils.validateExecutionParams(item.filename, item.code, item.namespace, 'PyodideManager');
+    }
+    if (options.signal !== undefined && !(options.signal instanceof AbortSignal)) {
+      throw new Error("⚡ [PyodideManager] signal must be an AbortSignal");
+    }
+    if (options.onResults !== undefined) {
+      ValidationUtils.validateFunction(options.onResults, 'onResults', 'PyodideManager');
+    }
+    if (options.outputLimit !== undefined) {
+      ValidationUtils.validateOutputLimit(options.outputLimit, 'PyodideManager');
+    }
+    if (options.budget !== undefined && (!Number.isInteger(options.budget) || options.budget <= 0)) {
+      throw new Error(`⚡ [PyodideManager] budget must be a positive integer, got ${options.budget}`);
+    }
+    if (items.length === 0) return [];
+
+    const run = async () => {
+      if (!this.isReady) {
+        throw new Error("⚡ [PyodideManager] Manager not ready yet. Wait for initialization to complete.");
+      }
+      const message = {
+        type: "execute_batch",
+        items: items.map(({ filename, code, namespace }) => ({ filename, code, namespace })),
+        resultBatchSize: options.resultBatchSize,
+        flushIntervalMs: options.flushIntervalMs,
+      };
+      if (options.budget) {
+        message.budget = options.budget;
+      }
+      const outputLimit = options.outputLimit ?? this.outputLimit;
+      if (outputLimit) {
+        message.outputLimit = outputLimit;
+      }
+      const results = [];
+      const listeners = {
+        onTimeout: () => this._interruptExecution(),
+        onBatch: ({ index, results: chunk }) => {
+          const converted = chunk.map(toExecutionResult);
+          results.push(...converted);
+          options.onResults?.(converted, index);
+        },
+      };
+      await this._postRequest(
+        message,
+        timeoutMs,
+        `⚡ [PyodideManager] Batch timeout after ${timeoutMs / 1000} seconds`,
+        listeners,
+        options.signal
+      );
+      return results;
+    };
+    return this._enqueueExecution(run, options.signal, options);
+  }
+
+  /**
+   * Run the same code against many namespaces (test cases): compiled once,
+   * run once per namespace in the worker, results returned as one vector.
+   * Namespaces are an array of objects, or a columnar table: one array
+   * (or typed array) per variable, case i reading element i of each, which
+   * crosses into Python in a single conversion however many cases there
+   * are. Each case has its own output and error; timeoutMs covers all of
+   * them. Cases are not added to executionHistory
+   *
+   * @param {string} code - Python code to run for each case
+   * @param {Array<Object>|Object<string, Array|TypedArray>} namespaces - Case namespaces, as rows or columns
+   * @param {number} [timeoutMs=30000] - Timeout of the whole fan-out in milliseconds
+   * @param {ManyOptions} [options={}] - Fan-out options
+   * @returns {Promise<CaseResult[]>} One result per case, in case order
+   * @throws {Error} If manager is not ready, columns differ in length or the fan-out times out
+   */
+  async executeMany(code, namespaces, timeoutMs = 30000, options = {}) {
+    ValidationUtils.validateString(code, 'code', 'PyodideManager');
+    const message = { type: "execute_many", code };
+    if (Array.isArray(namespaces)) {
+      namespaces.forEach(namespace => ValidationUtils.validateObject(namespace, 'namespace', 'PyodideManager'));
+      message.rows = namespaces;
+    } else {
+      ValidationUtils.validateObject(namespaces, 'namespaces', 'PyodideManager');
+      const lengths = new Set(Object.values(namespaces).map(column => {
+        if (!Array.isArray(column) && !ArrayBuffer.isView(column)) {
+          throw new Error("⚡ [PyodideManager] Columnar namespaces must map each variable to an array or typed array");
+        }
+        return column.length;
+      }));
+      if (lengths.size > 1) {
+        throw new Error(`⚡ [PyodideManager] Columnar namespaces must have columns of equal length, got ${[...lengths].join(", ")}`);
+      }
+      message.columns = namespaces;
+    }
+    if (options.signal !== undefined && !(options.signal instanceof AbortSignal)) {
+      throw new Error("⚡ [PyodideManager] signal must be an AbortSignal");
+    }
+    if (options.outputLimit !== undefined) {
+      ValidationUtils.validateOutputLimit(options.outputLimit, 'PyodideManager');
+    }
+    if (options.budget !== undefined && (!Number.isInteger(options.budget) || options.budget <= 0)) {
+      throw new Error(`⚡ [PyodideManager] budget must be a positive integer, got ${options.budget}`);
+    }
+    if (options.budget) {
+      message.budget = options.budget;
+    }
+    const outputLimit = options.outputLimit ?? this.outputLimit;
+    if (outputLimit) {
+      message.outputLimit = outputLimit;
+    }
+
+    const run = async () => {
+      if (!this.isReady) {
+        throw new Error("⚡ [PyodideManager] Manager not ready yet. Wait for initialization to complete.");
+      }
+      return this._postRequest(
+        message,
+        timeoutMs,
+        `⚡ [PyodideManager] Fan-out timeout after ${timeoutMs / 1000} seconds`,
+        { onTimeout: () => this._interruptExecution() },
+        options.signal
+      );
+    };
+    return this._enqueueExecution(run, options.signal, options);
+  }
+
+  /**
+   * Check that code parses, without running it (live editor linting). Not
+   * queued behind executions. While an execution runs, a ready standby
+   * worker (config.standby) answers it, in milliseconds even if the run is
+   * busy in pure computation. Without one, the attached worker answers as
+   * soon as its event loop is free: at once while the run awaits
+   * (input(), asyncio), only when it ends if it computes
+   *
+   * @param {string} code - Python code to parse
+   * @param {number} [timeoutMs=5000] - Timeout in milliseconds
+   * @returns {Promise<CheckResult>} Whether the code parses, and where it does not
+   * @throws {Error} If manager is not ready or the check times out
+   */
+  async check(code, timeoutMs = 5000) {
+    ValidationUtils.validateString(code, 'code', 'PyodideManager', true);
+    if (!this.isReady) {
+      throw new Error("⚡ [PyodideManager] Manager not ready yet. Wait for initialization to complete.");
+    }
+    const spare = this._runningExecution ? this._spares.find(slot => slot.readyData) : undefined;
+    return this._postRequest(
+      { type: "check", code },
+      timeoutMs,
+      `⚡ [PyodideManager] Syntax check timeout after ${timeoutMs / 1000} seconds`,
+      {},
+      undefined,
+      spare?.worker ?? this.worker
+    );
+  }
+
+  /**
+   * Put the interpreter back in its state right after initialization,
+   * without restarting the worker: globals and builtins added or rebound
+   * since then, user modules in sys.modules, sys.path, the working
+   * directory and open figures. Packages stay loaded. Queued as a barrier:
+   * it runs after every call already submitted, background and prefetch
+   * ones included, and before every later call
+   *
+   * @param {ResetOptions} [options={}] - Reset options
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<ResetResult>} What the reset removed
+   * @throws {Error} If manager is not ready or the reset fails
+   */
+  async reset(options = {}, timeoutMs = 10000) {
+    if (options.scratchDir !== undefined) {
+      ValidationUtils.validateString(options.scratchDir, 'scratchDir', 'PyodideManager');
+    }
+    const run = async () => {
+      if (!this.isReady) {
+        throw new Error("⚡ [PyodideManager] Manager not ready yet. Wait for initialization to complete.");
+      }
+      const message = { type: "reset" };
+      if (options.scratchDir !== undefined) {
+        message.scratchDir = options.scratchDir;
+      }
       return this._postRequest(
         message,
         timeoutMs,
-        `⚡ [PyodideManager] Execution timeout after ${timeoutMs / 1000} seconds`
+        `⚡ [PyodideManager] Reset timeout after ${timeoutMs / 1000} seconds`
       );
     };
-    const result = this.executionChain.then(run, run);
-    this.executionChain = result.catch(() => {});
-    return result;
+    return this._enqueueExecution(run, undefined, { barrier: true });
+  }
+
+  /**
+   * Render one figure left open by a lazyFigures execution. Figures live
+   * in the worker until the next execution resets the capture layer; a
+   * request for a figure that is gone rejects
+   *
+   * @param {number} num - Figure number from a handle of result.figures
+   * @param {RenderFigureOptions} [options={}] - Format and size of the render
+   * @param {number} [timeoutMs=10000] - Timeout in milliseconds
+   * @returns {Promise<string|Uint8Array>} base64 string or PNG/SVG bytes
+   * @throws {Error} If the manager is not ready, the figure is gone or the render fails
+   */
+  async renderFigure(num, options = {}, timeoutMs = 10000) {
+    if (!Number.isInteger(num)) {
+      throw new Error(`⚡ [PyodideManager] num must be an integer figure number, got ${num}`);
+    }
+    if (options.format !== undefined && !FIGURE_FORMATS.includes(options.format)) {
+      throw new Error(`⚡ [PyodideManager] format must be one of: ${FIGURE_FORMATS.join(", ")}, got "${options.format}"`);
+    }
+    if (!this.isReady) {
+      throw new Error("⚡ [PyodideManager] Manager not ready yet. Wait for initialization to complete.");
+    }
+    return this._postRequest(
+      { type: "render_figure", num, ...options },
+      timeoutMs,
+      `⚡ [PyodideManager] Figure render timeout after ${timeoutMs / 1000} seconds`
+    );
   }
 
   /**
@@ -454,11 +1240,63 @@ class PyodideManager {
    * @returns {void}
    */
   destroy() {
+    this._destroyed = true;
+    this._retireWorker(new Error("🚨 [PyodideManager] Manager destroyed"));
+    for (const spare of [...this._spares]) {
+      this._discardSpare(spare);
+    }
+    this.executionHistory = [];
+  }
+
+  /**
+   * Replace the worker with a fresh interpreter: a standby worker when one
+   * is configured (swapped in within milliseconds once booted), a full boot
+   * otherwise. The running and queued executions reject; globals, files
+   * and packages loaded at run time are gone with the old worker. The
+   * standby pool is replenished in the background
+   *
+   * @returns {Promise<void>} Resolves when the new worker is ready
+   * @throws {Error} If the manager was destroyed or the new worker fails to boot
+   */
+  async restart() {
+    if (this._destroyed) {
+      throw new Error("🚨 [PyodideManager] Manager destroyed");
+    }
+    this._retireWorker(new Error("🚨 [PyodideManager] Manager restarted"));
+    this._resetReadyPromise();
+
+    // A spare that finished booting first, then one still booting
+    const spare = this._spares.find(s => s.readyData) ?? this._spares.find(s => s.worker);
+    if (spare) {
+      this._spares.splice(this._spares.indexOf(spare), 1);
+      this._attachWorker(spare);
+    } else {
+      this.initWorker().catch((error) => {
+        console.error("🚨 [PyodideManager] Worker initialization failed:", error);
+        this._readyReject(error);
+      });
+    }
+    return this.readyPromise;
+  }
+
+  /**
+   * Terminate the attached worker and settle everything waiting on it
+   *
+   * @private
+   * @param {Error} error - Rejection cause for queued and pending requests
+   * @returns {void}
+   */
+  _retireWorker(error) {
     // Terminate worker
     if (this.worker) {
       this.worker.terminate();
       this.worker = null;
     }
+    if (this._attachedSlot) {
+      // A worker still fetching its script must not start afterwards
+      this._attachedSlot.discarded = true;
+      this._attachedSlot = null;
+    }
 
     // Revoke blob URL to prevent memory leaks
     if (this.blobUrl) {
@@ -466,17 +1304,69 @@ class PyodideManager {
       this.blobUrl = null;
     }
 
-    // Settle everything still waiting on this manager
-    const error = new Error("🚨 [PyodideManager] Manager destroyed");
+    // Settle everything still waiting on this worker
+    for (const entry of this._executionQueue.splice(0)) {
+      entry.signal?.removeEventListener("abort", entry.onAbort);
+      entry.reject(error);
+    }
     this._failAllPending(error);
     this._readyReject(error);
 
     // Reset state
     this.isReady = false;
-    this.executionHistory = [];
+    this.inputMode = null;
+    PyodideManagerInput.resetInputState(this);
   }
 }
 
+/**
+ * Execution result built from a worker result payload (single execution or
+ * one item of a batch)
+ *
+ * @param {Object} data - Result payload from the worker
+ * @returns {ExecutionResult}
+ */
+function toExecutionResult(data) {
+  return {
+    filename: data.filename,
+    time: data.time,
+    stdout: data.stdout,
+    stderr: data.stderr,
+    missive: data.missive,
+    figures: data.figures,
+    figureFormat: data.figureFormat,
+    figureKeys: data.figureKeys,
+    error: data.error,
+    truncated: data.truncated,
+    dropped: data.dropped,
+    metrics: data.metrics,
+    display: data.display,
+    timestamp: new Date().toISOString(),
+  };
+}
+
+/**
+ * Rejection value of an aborted request: the signal's reason, as fetch does
+ *
+ * @param {AbortSignal} signal - Aborted signal
+ * @returns {any} signal.reason, or an AbortError when the runtime sets none
+ */
+function abortReason(signal) {
+  return signal.reason ?? new DOMException("⚡ [PyodideManager] Execution aborted", "AbortError");
+}
+
+/**
+ * Rejection of a queued execution replaced by a newer one with its key
+ *
+ * @param {string} coalesceKey - Shared coalescing key
+ * @returns {Error} Error named "Superseded"
+ */
+function supersededError(coalesceKey) {
+  const error = new Error(`⚡ [PyodideManager] Superseded by a newer execution with coalesceKey "${coalesceKey}"`);
+  error.name = "Superseded";
+  return error;
+}
+
 // Add export at the end of the file
 export { PyodideManager };
 
@@ -489,14 +1379,14 @@ export { PyodideManager };
 
 /**
  * @typedef {Object} WorkerMessage
- * @property {'ready'|'error'|'warning'|'info'|'result'|'fs_result'|'fs_error'} type - Message type
+ * @property {'ready'|'error'|'warning'|'info'|'result'|'output_chunk'|'emit_batch'|'batch_results'|'batch_done'|'many_result'|'figure_result'|'check_result'|'reset_result'|'fs_result'|'fs_error'|'namespace_result'|'namespace_error'} type - Message type
  * @property {string} [message] - Message content
  * @property {string} [error] - Error message
  * @property {string} [filename] - Filename for execution results
  * @property {number} [time] - Execution time in milliseconds
  * @property {string} [stdout] - Standard output
  * @property {string} [stderr] - Standard error
- * @property {string|null} [missive] - Missive as a JSON string from Python
+ * @property {string|Object|null} [missive] - Missive as a JSON string from Python (an object with typed arrays when binaryMissive)
  * @property {Object|null} [error] - Execution error object
  * @property {any} [result] - Filesystem operation result
  */
@@ -507,9 +1397,198 @@ export { PyodideManager };
  * @property {number} time - Execution time in milliseconds
  * @property {string} stdout - Standard output from Python execution
  * @property {string} stderr - Standard error from Python execution
- * @property {string|null} missive - Missive as a JSON string (parse on the consumer side)
- * @property {string[]} [figures] - Base64 encoded matplotlib figures (executeAsync result only, not stored in history)
+ * @property {string|Object|null} missive - Missive as a JSON string (parse on the consumer side), already an object when binaryMissive
+ * @property {Array<string|Uint8Array|FigureHandle|null>} [figures] - Matplotlib figures, base64 strings, PNG/SVG bytes or lazy handles per figureFormat (executeAsync result only, not stored in history)
+ * @property {'base64'|'png'|'svg'|'handle'} [figureFormat] - Format of the figures payloads
+ * @property {string[]} [figureKeys] - Content key per figure (dedupFigures only); figures[i] is null when that key was already sent
  * @property {Object|null} error - JavaScript execution error object
+ * @property {boolean} [truncated] - Whether an output limit dropped characters from stdout/stderr
+ * @property {{stdout: number, stderr: number}} [dropped] - Characters dropped per stream (executeAsync result only)
+ * @property {ExecutionMetrics} [metrics] - Resources used by the user code (kept in executionHistory)
+ * @property {DisplayEntry|null} [display] - Rich display of the trailing expression value (display option, executeAsync result only)
  * @property {string} timestamp - ISO timestamp of execution
  * @property {boolean} [executedWithNamespace] - Whether execution used namespace
  */
+
+/**
+ * @typedef {Object} ExecutionMetrics
+ * @property {number} cpuTimeMs - CPU time of the user code (time.process_time delta)
+ * @property {number|null} peakMemoryBytes - Peak of traced Python allocations, null unless traceMemory
+ * @property {number} gcCollections - Garbage collections run during the execution
+ * @property {number} stdoutBytes - UTF-8 bytes written to stdout (including dropped or streamed ones)
+ * @property {number} stderrBytes - UTF-8 bytes written to stderr
+ * @property {number|null} heapBytesBefore - WebAssembly memory size before the run
+ * @property {number|null} heapBytesAfter - WebAssembly memory size after the run
+ * @property {number} figureCount - Figures captured
+ * @property {number} compileCacheHits - Executions served by the compiled-code cache (worker lifetime)
+ * @property {number} compileCacheMisses - Executions that had to parse and compile (worker lifetime)
+ * @property {number} packageLoadMs - Time spent loading imported packages before the run (autoLoadImports)
+ * @property {string[]} packagesAutoLoaded - Packages loaded for this execution's imports
+ * @property {number|null} budgetUsed - Lines charged to the execution's budget, null without one
+ */
+
+/**
+ * @typedef {Object} DisplayOptions
+ * @property {number} [maxBytes=1000000] - Representations larger than this many UTF-8 bytes are skipped (plain text is cut to fit)
+ * @property {number} [maxRows=60] - Row window for pandas DataFrame/Series
+ */
+
+/**
+ * @typedef {Object} DisplayEntry
+ * @property {string} mime - text/html, image/svg+xml, image/png, text/latex, text/markdown or text/plain
+ * @property {string|Uint8Array} data - The representation (transferred bytes for image/png)
+ * @property {string} text - Plain repr() of the value, as a fallback
+ */
+
+/**
+ * @typedef {Object} CheckResult
+ * @property {boolean} valid - Whether the code parses
+ * @property {SyntaxErrorInfo|null} error - The first syntax error, null when valid
+ * @property {number} time - Time spent in the worker in milliseconds
+ */
+
+/**
+ * @typedef {Object} SyntaxErrorInfo
+ * @property {string} type - SyntaxError, IndentationError or TabError
+ * @property {string} message - Error message without the position
+ * @property {number|null} line - 1-based line
+ * @property {number|null} column - 1-based column
+ * @property {number|null} endLine - 1-based end line
+ * @property {number|null} endColumn - 1-based end column (exclusive)
+ * @property {string|null} text - Source line the error is on
+ */
+
+/**
+ * @typedef {Object} BatchItem
+ * @property {string} filename - Name for this execution
+ * @property {string} code - Python code to execute
+ * @property {Object} [namespace] - Namespace object, as for executeAsync
+ */
+
+/**
+ * @typedef {Object} BatchOptions
+ * @property {function(ExecutionResult[], number): void} [onResults] - Receives each batch of results as it arrives, with the index of its first item
+ * @property {number} [resultBatchSize=32] - Results per message from the worker
+ * @property {number} [flushIntervalMs=50] - Longest wait before pending results are sent
+ * @property {number} [budget] - Line budget of each item
+ * @property {OutputLimit} [outputLimit] - Per-stream caps of each item (defaults to the manager's)
+ * @property {AbortSignal} [signal] - Cancels the batch (items not run yet are skipped)
+ * @property {'interactive'|'background'|'prefetch'} [priority='interactive'] - Queue lane of the batch (see QueueOptions)
+ * @property {string} [coalesceKey] - Replace queued calls with the same key (see QueueOptions)
+ */
+
+/**
+ * @typedef {Object} ManyOptions
+ * @property {number} [budget] - Line budget of each case
+ * @property {OutputLimit} [outputLimit] - Per-stream caps of each case (defaults to the manager's)
+ * @property {AbortSignal} [signal] - Cancels the fan-out (cases not run yet are skipped)
+ * @property {'interactive'|'background'|'prefetch'} [priority='interactive'] - Queue lane of the fan-out (see QueueOptions)
+ * @property {string} [coalesceKey] - Replace queued calls with the same key (see QueueOptions)
+ */
+
+/**
+ * @typedef {Object} CaseResult
+ * @property {string} stdout - Standard output of the case
+ * @property {string} stderr - Standard error of the case
+ * @property {string|null} missive - Missive as a JSON string, null when the case sent none
+ * @property {Object|null} error - Error of the case ({name, message}), null when it succeeded
+ * @property {boolean} truncated - Whether an output limit dropped characters
+ */
+
+/**
+ * @typedef {Object} ResetOptions
+ * @property {string} [scratchDir] - Directory of the virtual filesystem to empty (created when missing); must be strictly inside the working directory or /tmp
+ */
+
+/**
+ * @typedef {Object} ResetResult
+ * @property {number} globalsRemoved - Globals the reset deleted
+ * @property {number} modulesEvicted - User modules removed from sys.modules
+ * @property {number} time - Time spent in the worker in milliseconds
+ */
+
+/**
+ * @typedef {Object} WorkerSlot
+ * @property {Worker|null} worker - The worker, null while its script is fetched
+ * @property {string|null} blobUrl - Blob URL the worker was created from
+ * @property {Int32Array|null} emitAck - emit() backpressure counter shared with this worker
+ * @property {Uint8Array|null} interruptBuffer - Interrupt buffer shared with this worker
+ * @property {WorkerMessage|null} readyData - Ready message of a standby worker that finished booting
+ * @property {function(WorkerMessage): void} onMessage - Receives the worker's messages
+ * @property {function(string): void} onCrash - Receives worker crashes
+ * @property {boolean} [discarded] - Set once the slot is dropped
+ */
+
+/**
+ * @typedef {Object} QueuedExecution
+ * @property {function(): Promise<ExecutionResult>} task - Sends the execution and settles with its result
+ * @property {AbortSignal} [signal] - Cancellation signal of the call
+ * @property {Function} resolve - Settles the executeAsync promise
+ * @property {Function} reject - Rejects the executeAsync promise
+ * @property {function(): void} onAbort - Abort listener registered on signal
+ * @property {number} rank - Index of its lane in EXECUTION_PRIORITIES
+ * @property {string} [coalesceKey] - Coalescing key of the call
+ */
+
+/**
+ * @typedef {Object} QueueOptions
+ * @property {'interactive'|'background'|'prefetch'} [priority='interactive'] - Queue lane: a queued execution starts before those of every later lane (a steady stream of interactive runs delays the other lanes)
+ * @property {string} [coalesceKey] - A newer call with the same key replaces this one while it is still queued; it then rejects with an error named "Superseded"
+ */
+
+/**
+ * @typedef {Object} ExecuteOptions
+ * @property {function(OutputChunk): void} [onOutput] - Stream stdout/stderr while the code runs; the result's stdout/stderr are then empty
+ * @property {number} [chunkSize=8192] - Streaming: flush once this many characters are pending
+ * @property {number} [flushIntervalMs=50] - Streaming: flush when this long has passed since the last chunk
+ * @property {function(Array<any>): void} [onEmit] - Receive emit() records in batches while the code runs (one array per batch, in emit order)
+ * @property {number} [emitBatchSize=64] - emit(): send a batch once this many records are queued
+ * @property {number} [emitFlushIntervalMs=50] - emit(): send a batch when this long has passed since the last one
+ * @property {number} [emitMaxInFlight=8] - emit(): batches not yet handled by onEmit before emit() blocks the Python code (cross-origin isolated pages only). The block ends on an interrupt, or after 5 s without progress: the rest of the run then sends without flow control
+ * @property {OutputLimit} [outputLimit] - Per-stream head/tail caps for this execution (defaults to the manager's)
+ * @property {'base64'|'png'|'svg'} [figureFormat='base64'] - base64 PNG strings, or raw PNG/SVG bytes as Uint8Arrays transferred without copy
+ * @property {number} [figureDpi=100] - Raster resolution of captured figures
+ * @property {boolean} [lazyFigures=false] - Return FigureHandles without rendering; draw them later with renderFigure
+ * @property {boolean} [dedupFigures=false] - Fingerprint rendered figures: a figure identical to one delivered by an earlier call (last 32 keys, forgotten after a timeout or an abort) comes back as null with its figureKeys entry, so the page can keep the element it already shows
+ * @property {boolean|DisplayOptions} [display=false] - Capture the value of a trailing expression like a notebook cell, through its richest _repr_*_ under maxBytes (DataFrames cut to maxRows)
+ * @property {boolean} [traceMemory=false] - Record metrics.peakMemoryBytes with tracemalloc (slows allocation-heavy code)
+ * @property {boolean} [binaryMissive=false] - Resolve the missive as an object: NumPy arrays, bytes and memoryviews in it arrive as transferred typed arrays (1-D) or {data, dtype, shape} instead of JSON text
+ * @property {AbortSignal} [signal] - Cancels the execution: dropped from the queue if it has not started, interrupted with KeyboardInterrupt if it runs (cross-origin isolated pages; elsewhere only abandoned). The promise rejects with signal.reason
+ * @property {number} [budget] - Lines the code may execute (loop iterations count as lines): past it the result carries a BudgetExceeded error and the worker stays warm. Deterministic, unlike timeoutMs
+ * @property {string} [namespaceRef] - Run in a named namespace created with createNamespace instead of a namespace object (exclusive with the namespace argument)
+ * @property {'interactive'|'background'|'prefetch'} [priority='interactive'] - Queue lane (see QueueOptions)
+ * @property {string} [coalesceKey] - Replace queued executions with the same key (see QueueOptions)
+ */
+
+/**
+ * @typedef {Object} FigureHandle
+ * @property {number} num - Figure number (pass to renderFigure)
+ * @property {number} width - Width in inches
+ * @property {number} height - Height in inches
+ * @property {number} dpi - Figure dpi
+ * @property {number} artists - Artists across the figure's axes
+ */
+
+/**
+ * @typedef {Object} RenderFigureOptions
+ * @property {'base64'|'png'|'svg'} [format='png'] - Output format
+ * @property {number} [dpi=100] - Raster resolution (ignored when width is set)
+ * @property {number} [width] - Target raster width in pixels
+ * @property {boolean} [tight=true] - Crop to the drawn area; false skips the extra draw pass
+ */
+
+/**
+ * @typedef {Object} OutputLimit
+ * @property {number} head - Kept from the start of each stream
+ * @property {number} [tail=0] - Kept from the end once head is full; the middle is dropped and counted
+ *
+ * Both caps are in characters with the 'python' capture backend and in
+ * bytes with 'raw' (fd 1/2 carry bytes): size them in bytes for UTF-8
+ * safety, a character being 1 to 4 bytes
+ */
+
+/**
+ * @typedef {Object} OutputChunk
+ * @property {'stdout'|'stderr'} stream - Stream the text was written to
+ * @property {string} text - Chunk content
+ */
@@ -4,18 +4,113 @@
 # This module handles stdout/stderr capture and the missive system
 # Uses direct sys.stdout/stderr replacement for reliable capture in WebAssembly
 
+import gc
 import json
 import io
 import sys
+import time
+import hashlib
 import builtins
+from collections import deque
+from contextlib import nullcontext
 
 # Store original stdout/stderr so we can restore them if needed
 _original_stdout = sys.stdout
 _original_stderr = sys.stderr
 
+
+class OutputBuffer:
+    """In-memory capture buffer, optionally bounded to a head and a tail.
+
+    Unbounded by default. With a head_limit, the first head_limit characters
+    are kept, then only the last tail_limit ones: the tail is a deque of the
+    written chunks trimmed from the left (a skip offset into the oldest chunk
+    instead of slicing it), so a write past the cap is O(1) amortized and
+    never copies the text it receives. Characters falling between head and
+    tail are only counted in `dropped`.
+    """
+
+    def __init__(self):
+        self.configure()
+
+    def configure(self, head_limit=None, tail_limit=0) -> None:
+        """Set the bounds (None = unbounded) and clear the buffer"""
+        self.head_limit = head_limit
+        self.tail_limit = tail_limit
+        self.clear()
+
+    def clear(self) -> None:
+        self._head = []
+        self._head_size = 0  # characters ever accepted into the head
+        self._tail = deque()
+        self._tail_size = 0  # total length of the chunks in _tail
+        self._tail_skip = 0  # characters already dropped from _tail[0]
+        self.written = 0
+        self.written_bytes = 0  # UTF-8 size of everything written
+        self.dropped = 0
+
+    def write(self, text) -> None:
+        self.written += len(text)
+        self.written_bytes += len(text) if text.isascii() else len(text.encode("utf-8", "surrogatepass"))
+        if self.head_limit is None:
+            self._head.append(text)
+            return
+
+        room = self.head_limit - self._head_size
+        if room > 0:
+            if len(text) <= room:
+                self._head.append(text)
+                self._head_size += len(text)
+                return
+            # Crossing the head limit: the only slice, once per execution
+            self._head.append(text[:room])
+            self._head_size = self.head_limit
+            text = text[room:]
+
+        self._tail.append(text)
+        self._tail_size += len(text)
+        excess = self._tail_size - self._tail_skip - self.tail_limit
+        while excess > 0:
+            oldest = len(self._tail[0]) - self._tail_skip
+            if oldest <= excess:
+                self._tail_size -= len(self._tail.popleft())
+                self._tail_skip = 0
+                self.dropped += oldest
+                excess -= oldest
+            else:
+                self._tail_skip += excess
+                self.dropped += excess
+                excess = 0
+
+    def _tail_text(self) -> str:
+        if not self._tail:
+            return ""
+        text = "".join(self._tail)
+        return text[self._tail_skip:] if self._tail_skip else text
+
+    def getvalue(self) -> str:
+        return "".join(self._head) + self._tail_text()
+
+    def drain(self, final=False) -> str:
+        """Remove and return the pending head text (streaming). The tail is
+        only released with final=True, once nothing can push it out anymore.
+        Counters are kept: the limits stay per execution."""
+        text = "".join(self._head)
+        self._head.clear()
+        if final:
+            text += self._tail_text()
+            self._tail.clear()
+            self._tail_size = 0
+            self._tail_skip = 0
+        return text
+
+    def flush(self) -> None:
+        pass
+
+
 # Create capture buffers
-_stdout_buffer = io.StringIO()
-_stderr_buffer = io.StringIO()
+_stdout_buffer = OutputBuffer()
+_stderr_buffer = OutputBuffer()
 
 # Storage for missive system - using builtins to ensure global availability
 if not hasattr(builtins, "_nagini_current_missive"):
@@ -24,16 +119,45 @@ if not hasattr(builtins, "_nagini_missive_already_called"):
     builtins._nagini_missive_already_called = False
 
 
+# Streaming mode: the worker installs a sink once (set_output_sink) and each
+# execution opts in through reset_captures(streaming=True). Pending text is
+# handed to the sink when a size or time threshold is crossed, then dropped
+# from the buffer, so a long run never accumulates its whole output here
+_output_sink = None
+_streaming = False
+_redirect = True  # False: raw backend, the worker captures fd 1/2 itself
+_stream_chunk_size = 8192
+_stream_flush_interval = 0.05
+
+
 class CaptureStream:
     """Custom stream that captures all write operations"""
 
-    def __init__(self, buffer):
+    def __init__(self, buffer, name="stdout"):
         self.buffer = buffer
+        self.name = name
+        self._pending = 0
+        self._last_flush = 0.0
 
     def write(self, text):
         self.buffer.write(text)
+        if _streaming:
+            self._pending += len(text)
+            if (
+                self._pending >= _stream_chunk_size
+                or time.monotonic() - self._last_flush >= _stream_flush_interval
+            ):
+                self.send_chunk()
         return len(text)
 
+    def send_chunk(self, final=False):
+        """Hand the pending text to the sink and drain the buffer"""
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        text = self.buffer.drain(final)
+        if text:
+            _output_sink(self.name, text)
+
     def flush(self):
         self.buffer.flush()
 
@@ -42,35 +166,214 @@ class CaptureStream:
 
 
 # Create capture streams
-_stdout_capturer = CaptureStream(_stdout_buffer)
-_stderr_capturer = CaptureStream(_stderr_buffer)
+_stdout_capturer = CaptureStream(_stdout_buffer, "stdout")
+_stderr_capturer = CaptureStream(_stderr_buffer, "stderr")
+
+
+# emit() records: the worker installs a sink once (set_emit_sink) and each
+# execution opts in through reset_captures(emitting=True). Records are
+# serialized when emitted, queued, and handed to the sink as one JSON array
+# per batch_size records or flush_interval seconds. Without a listener for
+# the execution, emit() discards its record
+_emit_sink = None
+_emitting = False
+_emit_batch_size = 64
+_emit_flush_interval = 0.05
+_emit_queue = []
+_emit_last_flush = 0.0
+
+
+class CaptureHook:
+    """Capture support for one library (figures, images, rich output, ...)
+
+    The hook is active only while its module is in sys.modules: nothing is
+    imported on its behalf, so a worker pays per execution for the libraries
+    user code actually uses, not for the ones installed.
+
+    Attributes:
+        name: Registry key, passed to collect_capture
+        module: Module whose presence in sys.modules activates the hook
+        reset: Callable(module) run by reset_captures, or None
+        collect: Callable(module, **options) -> list returning the captured
+            items after the run, or None
+    """
 
+    def __init__(self, name, module, reset=None, collect=None):
+        self.name = name
+        self.module = module
+        self.reset = reset
+        self.collect = collect
+
+
+_capture_hooks = {}
+
+
+def register_capture_hook(name, module, reset=None, collect=None) -> CaptureHook:
+    """Register (or replace) the capture hook called name, see CaptureHook"""
+    hook = CaptureHook(name, module, reset, collect)
+    _capture_hooks[name] = hook
+    return hook
+
+
+def _reset_hooks() -> None:
+    """Run the reset step of every hook whose module is imported. A failing
+    hook must not prevent the execution from starting"""
+    for hook in _capture_hooks.values():
+        lib = sys.modules.get(hook.module)
+        if lib is None or hook.reset is None:
+            continue
+        try:
+            hook.reset(lib)
+        except Exception:
+            pass
+
+
+def collect_capture(name, **options) -> list:
+    """Run the collect step of one hook; [] while its module is not imported"""
+    hook = _capture_hooks[name]
+    lib = sys.modules.get(hook.module)
+    if lib is None or hook.collect is None:
+        return []
+    return hook.collect(lib, **options)
+
+
+# Per-execution resource counters: started at the end of reset_captures,
+# read by get_metrics before the outputs are collected
+_metrics_start = {"cpu": 0.0, "gc": 0}
+_tracing_memory = False  # tracemalloc was started by reset_captures
+
+
+def _gc_collections() -> int:
+    return sum(generation["collections"] for generation in gc.get_stats())
+
+
+def set_output_sink(sink) -> None:
+    """Install the callable (stream_name, text) that receives streamed chunks.
+    The worker calls this once after init; it holds a JS reference, so it
+    cannot be part of the interpreter snapshot."""
+    global _output_sink
+    _output_sink = sink
+
+
+def set_emit_sink(sink) -> None:
+    """Install the callable (json_array_text) that receives emit() batches.
+    Like the output sink it holds a JS reference: installed after init. The
+    sink may block (backpressure) until the main thread catches up."""
+    global _emit_sink
+    _emit_sink = sink
+
+
+def reset_captures(
+    streaming=False,
+    chunk_size=8192,
+    flush_interval=0.05,
+    head_limit=None,
+    tail_limit=0,
+    emitting=False,
+    emit_batch_size=64,
+    emit_flush_interval=0.05,
+    trace_memory=False,
+    redirect=True,
+) -> None:
+    """Reset capture buffers and activate capturing by replacing sys.stdout/stderr
+
+    With streaming=True (requires an output sink), output is flushed to the
+    sink in chunks of about chunk_size characters or every flush_interval
+    seconds, whichever comes first; call flush_streams() after the run to
+    send the remainder.
+
+    head_limit/tail_limit bound each stream for this execution: past
+    head_limit characters only the last tail_limit are kept (see
+    OutputBuffer), the rest is counted as dropped.
+
+    emitting=True (requires an emit sink) delivers emit() records in
+    batches of emit_batch_size or every emit_flush_interval seconds.
+
+    trace_memory=True records the peak of Python allocations with
+    tracemalloc until get_metrics (slows allocation-heavy code down).
+
+    redirect=False selects the raw backend: sys.stdout/stderr stay the
+    interpreter's own streams, whose bytes the worker captures below the
+    Python layer (pyodide.setStdout), along with C-level writes. Streaming
+    and limits are then applied by the worker; streaming only switches the
+    streams to line buffering.
+    """
+    global _streaming, _stream_chunk_size, _stream_flush_interval, _redirect
+    global _emitting, _emit_batch_size, _emit_flush_interval, _emit_last_flush
+    global _tracing_memory
+    _redirect = bool(redirect)
+    _streaming = bool(streaming) and _output_sink is not None and _redirect
+    _stream_chunk_size = chunk_size
+    _stream_flush_interval = flush_interval
+    now = time.monotonic()
+    for capturer in (_stdout_capturer, _stderr_capturer):
+        capturer._pending = 0
+        capturer._last_flush = now
+
+    _emitting = bool(emitting) and _emit_sink is not None
+    _emit_batch_size = emit_batch_size
+    _emit_flush_interval = emit_flush_interval
+    _emit_last_flush = now
+    _emit_queue.clear()
 
-def reset_captures() -> None:
-    """Reset capture buffers and activate capturing by replacing sys.stdout/stderr"""
     # Clear buffers
-    _stdout_buffer.truncate(0)
-    _stdout_buffer.seek(0)
-    _stderr_buffer.truncate(0)
-    _stderr_buffer.seek(0)
+    _stdout_buffer.configure(head_limit, tail_limit)
+    _stderr_buffer.configure(head_limit, tail_limit)
 
     # Clear missive data using builtins for global access
     builtins._nagini_current_missive = None
     builtins._nagini_missive_already_called = False
 
-    # Close any existing matplotlib figures (if matplotlib is available)
-    try:
-        import matplotlib.pyplot as plt
-
-        plt.close("all")
-    except ImportError:
-        pass  # matplotlib not available, skip
-    except Exception:
-        pass  # Ignore other errors
-
-    # Activate capturing by replacing sys.stdout/stderr
-    sys.stdout = _stdout_capturer
-    sys.stderr = _stderr_capturer
+    # Per-library cleanup (matplotlib figures, ...), only for the libraries
+    # user code has already imported
+    _reset_hooks()
+
+    if trace_memory:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_memory = True
+        tracemalloc.reset_peak()
+
+    if _redirect:
+        # Activate capturing by replacing sys.stdout/stderr
+        sys.stdout = _stdout_capturer
+        sys.stderr = _stderr_capturer
+    else:
+        sys.stdout = _original_stdout
+        sys.stderr = _original_stderr
+        for stream in (_original_stdout, _original_stderr):
+            if hasattr(stream, "reconfigure"):
+                stream.reconfigure(line_buffering=bool(streaming))
+
+    _metrics_start["cpu"] = time.process_time()
+    _metrics_start["gc"] = _gc_collections()
+
+
+def flush_streams() -> None:
+    """Send whatever is still pending to the sink (end of a streamed run).
+    Raw backend: push the interpreter's buffered text down to the worker.
+    No-op otherwise."""
+    if not _redirect:
+        _original_stdout.flush()
+        _original_stderr.flush()
+        return
+    if not _streaming:
+        return
+    _stdout_capturer.send_chunk(final=True)
+    _stderr_capturer.send_chunk(final=True)
+
+
+def flush_emits() -> None:
+    """Send the queued emit() records as one batch (end of an execution)"""
+    global _emit_last_flush
+    _emit_last_flush = time.monotonic()
+    if not _emit_queue:
+        return
+    batch = "[" + ",".join(_emit_queue) + "]"
+    _emit_queue.clear()
+    _emit_sink(batch)
 
 
 def get_stdout() -> str:
@@ -83,6 +386,39 @@ def get_stderr() -> str:
     return _stderr_buffer.getvalue()
 
 
+def get_capture_stats() -> dict:
+    """Characters written to and dropped from each stream this execution"""
+    return {
+        "stdout": {"written": _stdout_buffer.written, "dropped": _stdout_buffer.dropped},
+        "stderr": {"written": _stderr_buffer.written, "dropped": _stderr_buffer.dropped},
+    }
+
+
+def get_metrics() -> dict:
+    """Resources used since reset_captures: CPU seconds, garbage collections,
+    UTF-8 bytes written per stream, and the peak of traced Python memory
+    (None unless reset_captures(trace_memory=True))"""
+    global _tracing_memory
+    cpu_time = time.process_time() - _metrics_start["cpu"]
+    gc_collections = _gc_collections() - _metrics_start["gc"]
+
+    peak_memory = None
+    tracemalloc = sys.modules.get("tracemalloc")
+    if tracemalloc is not None and tracemalloc.is_tracing():
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        if _tracing_memory:
+            tracemalloc.stop()
+            _tracing_memory = False
+
+    return {
+        "cpu_time": cpu_time,
+        "gc_collections": gc_collections,
+        "peak_memory": peak_memory,
+        "stdout_bytes": _stdout_buffer.written_bytes,
+        "stderr_bytes": _stderr_buffer.written_bytes,
+    }
+
+
 def restore_original_streams() -> None:
     """Restore original stdout/stderr (for debugging if needed)"""
     sys.stdout = _original_stdout
@@ -109,40 +445,267 @@ def get_missive() -> str | None:
     return json.dumps(builtins._nagini_current_missive)  # Convert Python dict to JSON string
 
 
-def get_figures() -> list:
+# Placeholder key of the binary missive skeleton: {"__nagini_buffer__": i,
+# "dtype", "shape"} stands for the i-th buffer sent out of band
+MISSIVE_BUFFER_KEY = "__nagini_buffer__"
+
+
+def _extract_buffers(value, buffers: list):
+    """Copy of a missive value with binary leaves replaced by placeholders,
+    the leaves (C-contiguous buffer objects) appended to buffers"""
+    if isinstance(value, dict):
+        return {key: _extract_buffers(item, buffers) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_extract_buffers(item, buffers) for item in value]
+
+    # NumPy is only looked up, never imported: a missive without arrays
+    # must not pay for it
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(value, np.generic):
+        return value.item()
+    if np is not None and isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise TypeError("missive() cannot send NumPy arrays of Python objects")
+        array = np.ascontiguousarray(value)
+        buffers.append(array)
+        return {MISSIVE_BUFFER_KEY: len(buffers) - 1, "dtype": array.dtype.name, "shape": list(array.shape)}
+
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        view = memoryview(value)
+        if not view.c_contiguous:
+            view = memoryview(view.tobytes()).cast(view.format, view.shape)
+        buffers.append(view)
+        return {MISSIVE_BUFFER_KEY: len(buffers) - 1, "dtype": view.format, "shape": list(view.shape)}
+    return value
+
+
+def get_missive_binary() -> dict | None:
     """
-    Capture matplotlib figures and return them as base64 encoded strings.
+    Get the current missive with its binary values kept out of the JSON.
+
+    NumPy arrays, bytes, bytearray and memoryview values anywhere in the
+    dictionary are replaced by placeholders (see MISSIVE_BUFFER_KEY); the
+    worker reads each buffer once and materializes typed arrays in their
+    place, so a large array never turns into decimal text.
 
     Returns:
-        list: List of base64 encoded PNG images of matplotlib figures
+        dict | None: {"skeleton": JSON string, "buffers": list of buffer
+        objects}, or None if no missive was sent
     """
-    figures = []
+    if builtins._nagini_current_missive is None:
+        return None
+    buffers = []
+    skeleton = _extract_buffers(builtins._nagini_current_missive, buffers)
+    return {"skeleton": json.dumps(skeleton), "buffers": buffers}
+
+
+# Output formats of get_figures: base64 keeps the historical PNG-as-str
+# payload, png and svg return raw bytes that the worker hands to the main
+# thread as transferable Uint8Arrays (no base64 inflation, no string copies)
+FIGURE_FORMATS = ("base64", "png", "svg")
+
+
+def _render_figure_bytes(fig, format="base64", dpi=100, tight=True) -> bytes:
+    """Draw one figure into PNG or SVG bytes"""
+    buf = io.BytesIO()
+    bbox = "tight" if tight else None
+    if format == "svg":
+        # No date in the metadata: identical plots give identical documents
+        fig.savefig(buf, format="svg", bbox_inches=bbox, metadata={"Date": None})
+    else:
+        fig.savefig(buf, format="png", dpi=dpi, bbox_inches=bbox)
+    return buf.getvalue()
+
+
+def _encode_payload(data, format):
+    """base64 str for the historical format, the bytes unchanged otherwise"""
+    if format != "base64":
+        return data
+    import base64
 
+    return base64.b64encode(data).decode("utf-8")
+
+
+def _encode_figure(fig, format="base64", dpi=100, tight=True):
+    """Render one figure: base64 str, or PNG/SVG bytes"""
+    return _encode_payload(_render_figure_bytes(fig, format, dpi, tight), format)
+
+
+def _dedup_figure(data, format, known) -> dict:
+    """Fingerprint rendered bytes against the keys the main thread holds.
+    The payload is only encoded (and later transferred) when it is new.
+    The known keys come from the manager, which records a key once the
+    result carrying its payload is delivered: a result lost to a timeout
+    or an abort never makes a later run skip the figure."""
+    key = f"{format}:{hashlib.blake2b(data, digest_size=16).hexdigest()}"
+    if key in known:
+        return {"key": key, "data": None}
+    return {"key": key, "data": _encode_payload(data, format)}
+
+
+def _figure_handle(fig) -> dict:
+    """Lightweight description of an open figure, nothing is drawn"""
+    width, height = fig.get_size_inches()
+    return {
+        "num": fig.number,
+        "width": float(width),
+        "height": float(height),
+        "dpi": float(fig.dpi),
+        "artists": sum(len(ax.get_children()) for ax in fig.axes),
+    }
+
+
+def get_figures(format="base64", dpi=100, lazy=False, dedup=False, known=()) -> list:
+    """
+    Capture matplotlib figures and close them.
+
+    Args:
+        format: "base64" (PNG as a base64 str), "png" (PNG bytes) or
+            "svg" (SVG document as UTF-8 bytes)
+        dpi: Resolution used for raster output
+        lazy: Return handles instead of rendering; the figures stay open
+            until the next reset_captures, for render_figure to draw on demand
+        dedup: Return {"key", "data"} entries, data None when the rendered
+            bytes match one of the known keys (see _dedup_figure)
+        known: Content keys whose payload the main thread already holds
+
+    Returns:
+        list: One entry per open figure, str for base64, bytes otherwise,
+        dict handles in lazy mode, dict entries in dedup mode
+    """
+    if format not in FIGURE_FORMATS:
+        raise ValueError(f"Unknown figure format {format!r}, expected one of {FIGURE_FORMATS}")
+    return collect_capture("matplotlib", format=format, dpi=dpi, lazy=lazy, dedup=dedup, known=known)
+
+
+def close_figures() -> None:
+    """Close the open matplotlib figures without rendering them (executeMany
+    results carry no figures: encoding them for every case is wasted work)"""
+    plt = sys.modules.get("matplotlib.pyplot")
+    if plt is not None:
+        plt.close("all")
+
+
+def _collect_matplotlib_figures(plt, format="base64", dpi=100, lazy=False, dedup=False, known=()) -> list:
+    """Collect step of the matplotlib hook (see get_figures for the options)"""
+    figures = []
+    known = set(known)
     try:
-        # Import matplotlib only when needed (after packages are loaded)
-        import matplotlib.pyplot as plt
-        import base64
-
-        if hasattr(plt, "get_fignums"):
-            try:
-                for fig_num in plt.get_fignums():
-                    plt.figure(fig_num)
-                    buf = io.BytesIO()
-                    plt.savefig(buf, format="png", dpi=100, bbox_inches="tight")
-                    buf.seek(0)
-                    figures.append(base64.b64encode(buf.read()).decode("utf-8"))
-                    plt.close(fig_num)
-            except Exception as e:
-                print(f"Error capturing figures: {e}")
-    except ImportError:
-        # matplotlib not available, return empty list
-        pass
+        for fig_num in plt.get_fignums():
+            fig = plt.figure(fig_num)
+            if lazy:
+                figures.append(_figure_handle(fig))
+                continue
+            if dedup:
+                figures.append(_dedup_figure(_render_figure_bytes(fig, format, dpi), format, known))
+            else:
+                figures.append(_encode_figure(fig, format, dpi))
+            plt.close(fig_num)
     except Exception as e:
-        print(f"Error importing matplotlib: {e}")
-
+        print(f"Error capturing figures: {e}")
     return figures
 
 
+# Figures left open by the previous execution are closed on reset; a worker
+# whose code never imports pyplot skips both steps
+register_capture_hook(
+    "matplotlib",
+    "matplotlib.pyplot",
+    reset=lambda plt: plt.close("all"),
+    collect=_collect_matplotlib_figures,
+)
+
+
+# Rich representations of a trailing expression value, richest first. The
+# first one that is defined, succeeds and fits under the byte cap is sent
+DISPLAY_REPRS = (
+    ("_repr_html_", "text/html"),
+    ("_repr_svg_", "image/svg+xml"),
+    ("_repr_png_", "image/png"),
+    ("_repr_latex_", "text/latex"),
+    ("_repr_markdown_", "text/markdown"),
+)
+
+
+def _rich_reprs(value):
+    """Yield (mimetype, str|bytes) for each _repr_*_ method the value offers"""
+    for method, mime in DISPLAY_REPRS:
+        render = getattr(value, method, None)
+        if not callable(render):
+            continue
+        try:
+            data = render()
+        except Exception:
+            continue
+        if isinstance(data, tuple):  # (data, metadata) form
+            data = data[0]
+        if isinstance(data, (str, bytes)):
+            yield mime, data
+
+
+def get_display(value, max_bytes=1_000_000, max_rows=60) -> dict | None:
+    """
+    Notebook-style display of the value of the trailing expression.
+
+    pandas objects are rendered with a window of max_rows rows (head and
+    tail), so a large DataFrame never produces its full table.
+
+    Args:
+        value: Value returned by the execution (None: nothing to display)
+        max_bytes: Cap on each representation, in UTF-8 bytes; larger ones
+            are skipped and the plain text is cut to fit (ellipsis included)
+        max_rows: Row window for pandas objects
+
+    Returns:
+        dict | None: {"mime", "data", "text"}, data str or bytes (PNG),
+        text the plain repr
+    """
+    if value is None:
+        return None
+
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and isinstance(value, (pandas.DataFrame, pandas.Series)):
+        options = pandas.option_context("display.max_rows", max_rows, "display.min_rows", max_rows)
+    else:
+        options = nullcontext()
+
+    with options:
+        text = repr(value)
+        encoded = text.encode("utf-8")
+        if len(encoded) > max_bytes:
+            # Cut on a character boundary; the ellipsis takes 3 bytes
+            text = encoded[:max(max_bytes - 3, 0)].decode("utf-8", errors="ignore") + "…"
+        for mime, data in _rich_reprs(value):
+            size = len(data) if isinstance(data, bytes) or data.isascii() else len(data.encode("utf-8"))
+            if size <= max_bytes:
+                return {"mime": mime, "data": data, "text": text}
+        return {"mime": "text/plain", "data": text, "text": text}
+
+
+def render_figure(num, format="png", dpi=100, width=None, tight=True):
+    """Render one figure kept open by a lazy get_figures call.
+
+    Args:
+        num: Figure number from the handle
+        format: Same formats as get_figures
+        dpi: Raster resolution, ignored when width is given
+        width: Target raster width in pixels (dpi derived from the figure size)
+        tight: Crop to the drawn area; False skips the extra layout pass
+
+    Raises:
+        LookupError: If the figure is gone (closed, or a newer execution ran)
+    """
+    if format not in FIGURE_FORMATS:
+        raise ValueError(f"Unknown figure format {format!r}, expected one of {FIGURE_FORMATS}")
+    plt = sys.modules.get("matplotlib.pyplot")
+    if plt is None or not plt.fignum_exists(num):
+        raise LookupError(f"Figure {num} is not available (figures live until the next execution)")
+    fig = plt.figure(num)
+    if width:
+        dpi = width / fig.get_figwidth()
+    return _encode_figure(fig, format, dpi, tight)
+
+
 def missive(data):
     """Send structured data back to JavaScript (once per execution)
 
@@ -159,19 +722,38 @@ def missive(data):
     builtins._nagini_missive_already_called = True
 
 
-# Make the missive function available globally: it is the one name (with
-# input) deliberately exposed to user code. Everything else in this module
-# is reached by the worker through a module reference, never by name lookup
-# in the user's namespace.
+def emit(record) -> None:
+    """Send one JSON-serializable record to JavaScript while the code runs
+
+    Unlike missive(), emit() can be called any number of times: records
+    reach the consumer in batches during the execution (progress reports,
+    intermediate results). The record is serialized immediately, so later
+    mutations do not leak into it and a bad value fails at the call site.
+    """
+    if not _emitting:
+        return
+    _emit_queue.append(json.dumps(record))
+    if (
+        len(_emit_queue) >= _emit_batch_size
+        or time.monotonic() - _emit_last_flush >= _emit_flush_interval
+    ):
+        flush_emits()
+
+
+# Make the missive and emit functions available globally: they are the
+# names (with input) deliberately exposed to user code. Everything else in
+# this module is reached by the worker through a module reference, never by
+# name lookup in the user's namespace.
 builtins.missive = missive
+builtins.emit = emit
 
 
 def detect_shadowed_names(user_globals) -> list:
     """Names rebound by user code in its globals, hiding the built-ins
-    Nagini exposes (missive, input). The worker calls this after each
+    Nagini exposes (missive, emit, input). The worker calls this after each
     default-namespace execution to emit a one-time warning."""
     shadowed = []
-    for name in ("missive", "input"):
+    for name in ("missive", "emit", "input"):
         if name in user_globals and user_globals[name] is not getattr(builtins, name, None):
             shadowed.append(name)
     return shadowed
@@ -7,9 +7,12 @@
 # au builtin input sont touchés, jamais un identifiant comme some_func__input
 # ni une méthode obj.input(). Le code est exécuté par runPythonAsync, qui
 # autorise le await de premier niveau, donc on n'enveloppe pas le code dans une
-# fonction : les variables de niveau module restent dans les globals.
+# fonction : les variables de niveau module restent dans les globals. L'AST
+# modifié est compilé directement (CodeRunner de Pyodide), sans repasser par
+# du texte.
 
 import ast
+from collections import OrderedDict
 
 
 class _AwaitInputTransformer(ast.NodeTransformer):
@@ -56,35 +59,123 @@ class _AwaitInputTransformer(ast.NodeTransformer):
         is_input_builtin = isinstance(node.func, ast.Name) and node.func.id == "input"
         if is_input_builtin and self._sync_scope_depth == 0:
             self.inserted = True
-            return ast.Await(value=node)
+            # mêmes positions que l'appel : le code compilé garde les lignes
+            return ast.copy_location(ast.Await(value=node), node)
         return node
 
 
-def _rewrite_input_calls(code):
-    """Renvoie le code réécrit (await input) si au moins un appel a été
-    transformé, sinon None. Laisse remonter SyntaxError si le code ne parse
-    pas, pour que l'erreur soit reportée telle quelle à l'exécution."""
-    tree = ast.parse(code)
-    transformer = _AwaitInputTransformer()
-    new_tree = transformer.visit(tree)
-    if not transformer.inserted:
-        return None
-    ast.fix_missing_locations(new_tree)
-    return ast.unparse(new_tree)
-
-
-def prepare_code_for_async_input(code):
-    """Réécrit les appels input() en await input(). Renvoie le code inchangé si
-    aucun vrai appel input() n'est présent ou si le code ne parse pas."""
+# Cache des CodeRunner compilés : les pages relancent des centaines de fois
+# les mêmes snippets. Clé : (source, réécriture input) ; le nom de fichier
+# n'en fait pas partie, le code est toujours compilé sous "<exec>". LRU
+# bornée par le total des sources en cache ; une source plus grosse que la
+# borne n'est jamais mise en cache.
+COMPILE_CACHE_MAX_BYTES = 4 * 1024 * 1024
+_compile_cache = OrderedDict()
+_compile_cache_bytes = 0
+cache_hits = 0
+cache_misses = 0
+
+
+def _top_level_imports(tree):
+    """Noms de premier niveau des modules importés (import a.b, from a
+    import b -> "a"), imports relatifs exclus, où qu'ils soient dans le code"""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.partition(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.partition(".")[0])
+    return tuple(sorted(names))
+
+
+def _compile(code, rewrite_input):
+    from pyodide.code import CodeRunner
+
+    runner = CodeRunner(code, flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT)
+    # relevé des imports sur l'AST déjà parsé, mis en cache avec le code :
+    # le worker charge les paquets manquants avant l'exécution
+    runner.imports = _top_level_imports(runner.ast)
+    if rewrite_input:
+        runner.ast = _AwaitInputTransformer().visit(runner.ast)
+    return runner.compile()
+
+
+def compile_for_execution(code, rewrite_input=True):
+    """Compile le code utilisateur en un CodeRunner prêt pour run_async.
+
+    Avec rewrite_input, les vrais appels input() sont réécrits en await
+    directement sur l'AST : ni unparse ni second parse, et les numéros de
+    ligne des tracebacks restent ceux de l'éditeur. Le code est compilé avec
+    PyCF_ALLOW_TOP_LEVEL_AWAIT et garde le comportement de runPythonAsync
+    (valeur de la dernière expression). Un CodeRunner compilé se réexécute
+    autant de fois qu'on veut : il est servi depuis le cache quand la même
+    source revient. Son attribut imports liste les modules de premier niveau
+    importés par le code (voir _top_level_imports).
+
+    Renvoie None si le code ne parse pas : le worker l'exécute alors tel quel
+    pour que la SyntaxError soit reportée comme d'habitude."""
     try:
-        rewritten = _rewrite_input_calls(code)
+        return _cached_compile(code, rewrite_input)
     except SyntaxError:
-        return code
-    return code if rewritten is None else rewritten
+        return None
 
 
-def transform_code_for_execution(code):
-    """Transforme le code utilisateur pour le support de input() asynchrone.
+def check_syntax(code, rewrite_input=False):
+    """Vérifie que le code parse, sans l'exécuter (éditeurs en direct).
 
-    Idempotent vis-à-vis du code sans input() : il est renvoyé inchangé."""
-    return prepare_code_for_async_input(code)
+    Une source déjà exécutée est validée par le cache de
+    compile_for_execution, sans reparse. Sinon le code est seulement parsé
+    (PyCF_ONLY_AST) : ni compilation ni mise en cache, la vérification doit
+    rester brève à chaque frappe. Les erreurs levées par le compilateur et
+    non par le parseur ('return' hors d'une fonction, 'break' hors d'une
+    boucle) n'apparaissent qu'à l'exécution. Ne touche ni à la capture ni
+    aux globals.
+
+    Renvoie None si le code est valide, sinon un dict décrivant l'erreur
+    (type, message, positions 1-based comme dans SyntaxError)."""
+    if (code, bool(rewrite_input)) in _compile_cache:
+        return None
+    try:
+        compile(code, "<exec>", "exec", flags=ast.PyCF_ONLY_AST | ast.PyCF_ALLOW_TOP_LEVEL_AWAIT)
+    except SyntaxError as error:
+        return {
+            "type": type(error).__name__,
+            "message": error.msg,
+            "line": error.lineno,
+            "column": error.offset,
+            "endLine": error.end_lineno,
+            "endColumn": error.end_offset,
+            "text": error.text,
+        }
+    return None
+
+
+def _cached_compile(code, rewrite_input):
+    """Runner depuis le cache, ou compilé puis mis en cache (lève SyntaxError)"""
+    global _compile_cache_bytes, cache_hits, cache_misses
+
+    key = (code, bool(rewrite_input))
+    runner = _compile_cache.get(key)
+    if runner is not None:
+        _compile_cache.move_to_end(key)
+        cache_hits += 1
+        return runner
+
+    cache_misses += 1
+    runner = _compile(code, rewrite_input)
+
+    size = len(code)
+    if size <= COMPILE_CACHE_MAX_BYTES:
+        _compile_cache[key] = runner
+        _compile_cache_bytes += size
+        while _compile_cache_bytes > COMPILE_CACHE_MAX_BYTES:
+            (evicted, _), _ = _compile_cache.popitem(last=False)
+            _compile_cache_bytes -= len(evicted)
+    return runner
+
+
+def clear_compile_cache():
+    """Vide le cache (les compteurs hits/misses sont conservés)"""
+    global _compile_cache_bytes
+    _compile_cache.clear()
+    _compile_cache_bytes = 0
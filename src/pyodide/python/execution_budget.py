@@ -0,0 +1,169 @@
+# =============================================================================
+# Deterministic execution budgets for Pyodide
+# =============================================================================
+# Counts the lines executed by the user code (LINE and backward JUMP events
+# of sys.monitoring, settrace before 3.12) and raises BudgetExceeded inside
+# Python once the budget is spent: an infinite loop ends as a normal error
+# result and the worker stays warm. The count does not depend on the
+# machine's speed, so the same submission always stops at the same line, and
+# both modes charge what settrace reports as "line" events. Code of the stdlib, of installed
+# packages (Pyodide's own runner included) and of Nagini is not charged.
+
+import os
+import sys
+
+from pyodide_utilities import library_roots
+
+# 0-2 and 5 are reserved (debugger, coverage, profiler, optimizer)
+_TOOL_ID = 4
+_TOOL_NAME = "nagini-budget"
+
+# Lines of Nagini's own modules are not charged
+_EXCLUDED_FILES = {
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    for name in (
+        "capture_system.py",
+        "code_transformation.py",
+        "execution_budget.py",
+        "interpreter_state.py",
+        "lazy_imports.py",
+        "pyodide_utilities.py",
+    )
+}
+
+_limit = 0
+_remaining = 0
+_mode = None  # "monitoring", "trace" or None when no budget is running
+
+# Roots of the stdlib and installed packages, read at import (worker init)
+_LIBRARY_ROOTS = library_roots()
+
+# Per code object, for one run: charged or not, line of each offset
+_charged_codes = {}
+_offset_lines = {}
+
+
+class BudgetExceeded(BaseException):
+    """Raised in user code when its line budget is spent.
+
+    A BaseException, so `except Exception` in the submission does not
+    swallow it. Under sys.monitoring every further line raises again: even
+    a bare `except:` cannot keep the code running.
+    """
+
+
+def _charge():
+    global _remaining
+    _remaining -= 1
+    if _remaining < 0:
+        raise BudgetExceeded(f"Execution budget of {_limit} lines exceeded")
+
+
+def _is_charged(code) -> bool:
+    """Whether the lines of a code object count against the budget: user
+    code (the submission and the modules it imports from its own files)"""
+    charged = _charged_codes.get(code)
+    if charged is None:
+        filename = code.co_filename
+        charged = not (
+            filename in _EXCLUDED_FILES
+            or filename.startswith("<frozen ")
+            or os.path.join(os.path.realpath(os.path.dirname(filename)), "").startswith(_LIBRARY_ROOTS)
+        )
+        _charged_codes[code] = charged
+    return charged
+
+
+def _line_of(code, offset):
+    lines = _offset_lines.get(code)
+    if lines is None:
+        lines = _offset_lines[code] = {}
+        for start, end, line in code.co_lines():
+            for instruction in range(start, end, 2):
+                lines[instruction] = line
+    return lines.get(offset)
+
+
+def _on_line(code, line_number):
+    if not _is_charged(code):
+        return sys.monitoring.DISABLE
+    _charge()
+
+
+def _on_jump(code, offset, destination):
+    # LINE does not fire when a loop jumps back to the same line
+    # (while True: pass): only that backward jump is charged, like settrace's
+    # "line" event. Towards another line, LINE already charges it
+    if not _is_charged(code):
+        return sys.monitoring.DISABLE
+    if destination <= offset and _line_of(code, offset) == _line_of(code, destination):
+        _charge()
+
+
+def _trace_calls(frame, event, arg):
+    if not _is_charged(frame.f_code):
+        return None
+    return _trace_lines
+
+
+def _trace_lines(frame, event, arg):
+    # settrace removes the trace function when it raises: the overrun is
+    # reported only once in this mode
+    if event == "line":
+        _charge()
+    return _trace_lines
+
+
+def start_budget(limit) -> None:
+    """Start counting lines, BudgetExceeded past `limit`"""
+    global _limit, _remaining, _mode
+    _limit = _remaining = limit
+    monitoring = getattr(sys, "monitoring", None)
+    if monitoring is not None and monitoring.get_tool(_TOOL_ID) in (None, _TOOL_NAME):
+        if monitoring.get_tool(_TOOL_ID) is None:
+            monitoring.use_tool_id(_TOOL_ID, _TOOL_NAME)
+        monitoring.register_callback(_TOOL_ID, monitoring.events.LINE, _on_line)
+        monitoring.register_callback(_TOOL_ID, monitoring.events.JUMP, _on_jump)
+        monitoring.set_events(_TOOL_ID, monitoring.events.LINE | monitoring.events.JUMP)
+        _mode = "monitoring"
+    else:
+        sys.settrace(_trace_calls)
+        _mode = "trace"
+
+
+def stop_budget() -> None:
+    """Stop counting (the usage stays readable until the next start)"""
+    global _mode
+    if _mode == "monitoring":
+        sys.monitoring.set_events(_TOOL_ID, 0)
+        sys.monitoring.register_callback(_TOOL_ID, sys.monitoring.events.LINE, None)
+        sys.monitoring.register_callback(_TOOL_ID, sys.monitoring.events.JUMP, None)
+    elif _mode == "trace":
+        sys.settrace(None)
+    _mode = None
+    # The run's code objects are not kept alive past it
+    _charged_codes.clear()
+    _offset_lines.clear()
+
+
+def budget_used() -> int:
+    """Lines charged to the last budgeted run, capped at its limit"""
+    return _limit - max(_remaining, 0)
+
+
+def budget_exceeded() -> bool:
+    """Whether the last budgeted run spent its whole budget"""
+    return _remaining < 0
+
+
+async def run_with_budget(runner, globals, limit):
+    """Run a compiled CodeRunner under a line budget.
+
+    The budget stops before the exception leaves Python, so formatting the
+    traceback for JavaScript is not charged (and cannot raise again).
+    """
+    start_budget(limit)
+    try:
+        return await runner.run_async(globals)
+    finally:
+        stop_budget()
@@ -0,0 +1,122 @@
+# =============================================================================
+# Interpreter state baseline and fast reset
+# =============================================================================
+# Records what the interpreter looks like once the worker is initialized
+# (globals, sys.modules, builtins, sys.path, cwd) and puts it back on demand:
+# a clean interpreter between two students or two test cases in a few
+# milliseconds, without booting a new worker.
+
+import builtins
+import gc
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+
+from pyodide_utilities import library_roots
+
+_baseline = None
+
+
+def _has_user_files(module) -> bool:
+    """Whether a module was loaded from a file (or a package directory)
+    outside the stdlib and installed packages"""
+    if getattr(module, "__name__", None) in sys.builtin_module_names:
+        return False
+    filename = getattr(module, "__file__", None)
+    locations = [filename] if isinstance(filename, str) else list(getattr(module, "__path__", None) or [])
+    return any(
+        isinstance(location, str) and not os.path.realpath(location).startswith(_baseline["library_roots"])
+        for location in locations
+    )
+
+
+def _user_modules(names) -> list:
+    """User modules among names: those loaded from user files, plus the
+    modules without a file (extension, frozen, created at run time) of a
+    user package. Any other module without a file counts as library code:
+    evicting a stdlib module frozen in the zip archive breaks the next
+    import of it"""
+    user_names = {name for name in names if _has_user_files(sys.modules[name])}
+    return [
+        name
+        for name in names
+        if name in user_names or name.partition(".")[0] in user_names
+    ]
+
+
+def record_baseline(user_globals) -> None:
+    """Remember the current state as the one reset_state() restores"""
+    global _baseline
+    _baseline = {
+        "globals": dict(user_globals),
+        "modules": set(sys.modules),
+        "builtins": dict(vars(builtins)),
+        "path": list(sys.path),
+        "cwd": os.getcwd(),
+        "library_roots": library_roots(),
+        "scratch_roots": tuple(os.path.join(os.path.realpath(root), "") for root in (os.getcwd(), tempfile.gettempdir())),
+    }
+
+
+def reset_state(user_globals, scratch_dir=None) -> dict:
+    """Restore the recorded baseline.
+
+    Globals added or rebound since the baseline are dropped or restored,
+    user modules imported since then are evicted from sys.modules, builtins
+    (input, missive, emit, anything patched) and sys.path are put back,
+    the working directory is restored and scratch_dir is emptied. Modules
+    of installed packages loaded since the baseline stay imported: loading
+    them again would cost far more than the reset saves. Returns counts for
+    the caller's metrics.
+    """
+    if _baseline is None:
+        raise RuntimeError("No baseline recorded: the worker is not initialized")
+
+    removed = [name for name in user_globals if name not in _baseline["globals"]]
+    user_globals.clear()
+    user_globals.update(_baseline["globals"])
+
+    evicted = _user_modules([name for name in list(sys.modules) if name not in _baseline["modules"]])
+    for name in evicted:
+        del sys.modules[name]
+
+    # Builtins added (or replaced) by user code go away
+    builtins_dict = vars(builtins)
+    for name in [name for name in builtins_dict if name not in _baseline["builtins"]]:
+        del builtins_dict[name]
+    builtins_dict.update(_baseline["builtins"])
+
+    sys.path[:] = _baseline["path"]
+    os.chdir(_baseline["cwd"])
+
+    # Open figures belong to the previous code
+    plt = sys.modules.get("matplotlib.pyplot")
+    if plt is not None:
+        plt.close("all")
+
+    if scratch_dir:
+        _wipe_directory(scratch_dir)
+
+    importlib.invalidate_caches()
+    gc.collect()
+    return {"globalsRemoved": len(removed), "modulesEvicted": len(evicted)}
+
+
+def _wipe_directory(path) -> None:
+    """Empty a directory, creating it when it does not exist. Only a
+    directory strictly inside the working directory or the temporary
+    directory can be wiped: a typo must not empty the stdlib or /"""
+    target = os.path.realpath(path)
+    # Roots end with a separator: the root itself is excluded
+    if target == os.path.realpath(_baseline["cwd"]) or not target.startswith(_baseline["scratch_roots"]):
+        raise ValueError(
+            f"Refusing to wipe {path!r}: it must be strictly inside the working directory or {tempfile.gettempdir()!r}"
+        )
+    os.makedirs(path, exist_ok=True)
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path)
+        else:
+            os.remove(entry.path)
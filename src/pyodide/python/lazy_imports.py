@@ -0,0 +1,82 @@
+# =============================================================================
+# Import-triggered package loading for Pyodide
+# =============================================================================
+# A sys.meta_path finder placed after the standard ones: an import that no
+# installed module satisfies, and whose name the Pyodide lockfile maps to a
+# package, loads that package (blocking through run_sync, JSPI only) and
+# resumes the import. Covers what the pre-scan of the source cannot see:
+# importlib.import_module(name), imports built at runtime, __import__ ...
+
+import sys
+import importlib
+from importlib.machinery import PathFinder
+
+# Top-level import name -> Pyodide package name (from the lockfile)
+_import_index = {}
+
+# JS callable: package name -> Promise resolved once the load is done
+_load_package = None
+
+# Called with [package] after a load (init-time setup, e.g. matplotlib)
+_after_load = None
+
+# Packages already tried: a failed load is not retried on every import
+_attempted = set()
+
+
+class LazyPackageFinder:
+    """meta_path finder that loads a lockfile package on first import.
+
+    Only top-level names reach it (submodules are found through their parent
+    package's __path__) and only after every other finder gave up, so
+    installed modules never pay for it. Outside a stack that can suspend
+    (no JSPI, or code not entered through callPromising) run_sync raises and
+    the import fails as usual with ModuleNotFoundError.
+    """
+
+    def find_spec(self, fullname, path=None, target=None):
+        if path is not None or _load_package is None:
+            return None
+        package = _import_index.get(fullname)
+        if package is None or package in _attempted:
+            return None
+        _attempted.add(package)
+
+        from pyodide.ffi import run_sync
+
+        try:
+            run_sync(_load_package(package))
+        except Exception:
+            return None
+
+        # The package landed in site-packages after the path finders
+        # cached their directory listings
+        importlib.invalidate_caches()
+        if _after_load is not None:
+            try:
+                # May import the package itself: the import machinery then
+                # picks the module up from sys.modules
+                _after_load([package])
+            except Exception:
+                pass
+        return PathFinder.find_spec(fullname)
+
+
+_finder = LazyPackageFinder()
+
+
+def install_finder(import_index, load_package, after_load=None) -> None:
+    """Install the finder at the end of sys.meta_path (idempotent).
+
+    import_index maps import names to package names, load_package is the
+    worker's loader (returns a Promise), after_load receives the list of
+    packages just loaded.
+    """
+    global _load_package, _after_load
+    _import_index.clear()
+    _import_index.update(import_index)
+    _load_package = load_package
+    _after_load = after_load
+    if _finder not in sys.meta_path:
+        sys.meta_path.append(_finder)
+
@@ -3,6 +3,11 @@
 # =============================================================================
 # This module contains utility functions for Pyodide environment setup
 
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
 
 def setup_matplotlib():
     """Set up matplotlib configuration if the package is available"""
@@ -32,4 +37,44 @@ def setup_matplotlib():
         print(f"Warning: Could not configure matplotlib: {e}")
 
 
+def configure_loaded_packages(packages):
+    """Apply the init-time setup to packages loaded during an execution
+    (autoLoadImports). Runs inside the user's capture, so the setup
+    messages are discarded instead of showing up in their output"""
+    if "matplotlib" in packages:
+        with redirect_stdout(io.StringIO()):
+            setup_matplotlib()
+
+
+def namespaces_from_columns(columns):
+    """Split a columnar table ({name: values}, one value per case) into
+    one globals dict per case (executeMany). The table crosses from
+    JavaScript in one conversion; typed arrays arrive as memoryviews.
+    Columns of different lengths raise ValueError instead of silently
+    dropping the cases past the shortest one"""
+    names = list(columns)
+    values = [
+        column.tolist() if hasattr(column, "tolist") else list(column)
+        for column in columns.values()
+    ]
+    return [dict(zip(names, case)) for case in zip(*values, strict=True)]
+
+
 # Additional utility functions can be added here as needed
+
+
+def library_roots() -> tuple:
+    """Directories and zip archives the stdlib and installed packages are
+    imported from: the sys.path entries, minus the working and home
+    directories and their parents (user files live there). Each root ends
+    with a separator, so a prefix test cannot match a sibling directory."""
+    user_dirs = [os.path.join(os.path.realpath(path), "") for path in (os.getcwd(), os.path.expanduser("~"))]
+    roots = set()
+    for entry in sys.path:
+        if not entry:
+            continue
+        root = os.path.join(os.path.realpath(entry), "")
+        if any(user_dir.startswith(root) for user_dir in user_dirs):
+            continue
+        roots.add(root)
+    return tuple(sorted(roots))
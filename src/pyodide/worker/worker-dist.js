@@ -1,7 +1,598 @@
-/******/ (() => { // webpackBootstrap
+/******/ (() => { // bundle of ./worker.js
 /******/ 	"use strict";
+var __nagini_modules__ = ({
+/***/ "./worker.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./worker.js
+__nagini_define__(__nagini_exports__, {
+
+});
+/**
+ * Pyodide Web Worker - Entry Point
+ *
+ * Pyodide WebAssembly worker that runs Python code in a separate thread.
+ * Handles initialization, code execution, and structured communication (missive + stdout + stderr)
+ * with the main thread via message passing.
+ *
+ * ⚠️ Security Note: This worker executes arbitrary Python code.
+ * Use ONLY in trusted environments or implement additional sandboxing.
+ *
+ * @example
+ * // Main thread usage:
+ * const worker = new Worker('./pyodide-worker.js');
+ * worker.postMessage({ type: 'init', packages: ['numpy'], pyodideInitPath: './init.py' });
+ * worker.postMessage({ type: 'execute', filename: 'test.py', code: 'print("Hello")' });
+ *
+ * @module PyodideWorker
+ */
+
+const { handleMessage } = __nagini_require__("./worker-handlers.js");
+
+/**
+ * Worker state object to track Pyodide instance and loaded packages
+ * @type {WorkerState}
+ */
+const workerState = {
+  /** @type {PyodideAPI|null} Pyodide instance - null until initialization complete */
+  pyodide: null,
+
+  /** @type {boolean} Tracks initialization state */
+  isInitialized: false,
+
+  /** @type {Set<string>} Tracks loaded packages to prevent duplicate loading 📦 */
+  packagesLoaded: new Set(),
+
+  /** @type {Set<string>} Tracks loaded micropip packages to prevent duplicate loading 📦 */
+  micropipPackagesLoaded: new Set(),
+
+  /** @type {Object|null} PyProxy of the capture_system module (set at init) */
+  captureSystem: null,
+
+  /** @type {Object|null} PyProxy of the code_transformation module (set at init) */
+  codeTransformation: null,
+
+  /** @type {Object|null} PyProxy of the pyodide_utilities module (set at init) */
+  pyodideUtilities: null,
+
+  /** @type {Object|null} PyProxy of the execution_budget module (set at init) */
+  executionBudget: null,
+
+  /** @type {Object|null} PyProxy of the interpreter_state module (set at init) */
+  interpreterState: null,
+
+  /** @type {Set<string>} Built-in names already reported as shadowed by user code */
+  shadowWarnedNames: new Set(),
+
+  /** @type {'jspi'|'async'|null} How input() is bridged (set at init):
+   *  native stack switching, or async handler plus AST rewrite */
+  inputMode: null,
+
+  /** @type {number|null} Id of the execution in progress: streamed
+   *  output_chunk messages carry it so the manager can route them */
+  currentRequestId: null,
+
+  /** @type {Int32Array|null} Shared counter of emit batches consumed by the
+   *  main thread (set at init when the page can share memory) */
+  emitAck: null,
+
+  /** @type {number} emit batches posted so far (compared with emitAck) */
+  emitSent: 0,
+
+  /** @type {number} Unacknowledged emit batches allowed before emit() blocks */
+  emitWindow: 8,
+
+  /** @type {RawCapture|null} Raw fd 1/2 capture (captureBackend 'raw'),
+   *  null when capture_system swaps sys.stdout/stderr */
+  rawCapture: null,
+
+  /** @type {Uint8Array|null} Pyodide interrupt buffer shared with the main
+   *  thread (SIGINT interrupts the running code), null when not isolated */
+  interruptBuffer: null,
+
+  /** @type {boolean} Load the packages a snippet imports before running it */
+  autoLoadImports: false,
+
+  /** @type {Map<string, string>|null} Import name → package name, from the
+   *  lockfile (built on the first auto-loaded execution) */
+  importIndex: null,
+
+  /** @type {Map<string, Object>} Named namespaces (globals dict PyProxies),
+   *  least recently used first */
+  namespaces: new Map(),
+
+  /** @type {number} Named namespaces kept before the oldest is dropped */
+  maxNamespaces: 32
+};
+
+/**
+ * Web Worker message handler
+ *
+ * Processes messages from the main thread using imported handlers.
+ *
+ * @param {MessageEvent<WorkerMessage>} e - Message event from main thread
+ * @returns {Promise<void>}
+ */
+self.onmessage = async function (e) {
+  try {
+    // Use the imported handleMessage function directly
+    await handleMessage(e, workerState);
+  } catch (error) {
+    // Error during message handling; echo the request id (if any) so the
+    // manager can reject the matching pending promise
+    self.postMessage({
+      type: "error",
+      id: e.data?.id,
+      message: `🔧 [Worker] Failed to handle message: ${error.message}`
+    });
+  }
+};
+
+/**
+ * @typedef {Object} WorkerState
+ * @property {PyodideAPI|null} pyodide - Pyodide instance (null until initialized)
+ * @property {boolean} isInitialized - Whether Pyodide is fully initialized
+ * @property {Set<string>} packagesLoaded - Set of loaded package names for deduplication
+ * @property {Set<string>} micropipPackagesLoaded - Set of loaded micropip package names for deduplication
+ */
+
+/**
+ * @typedef {Object} WorkerMessage
+ * @property {'init'|'execute'|'render_figure'|'check'|'fs_operation'|'input_response'} type - Message type
+ * @property {string} [filename] - Filename for execution (execute messages)
+ * @property {string} [code] - Python code to execute (execute messages)
+ * @property {Object} [namespace] - Execution namespace (execute messages)
+ * @property {string[]} [packages] - Python packages to install (init messages)
+ * @property {string[]} [micropipPackages] - Python micropip packages to install (init messages)
+ * @property {string} [pyodideInitPath] - Path to initialization script (init messages)
+ * @property {Array<FileToLoad>} [filesToLoad] - Files to load (init messages)
+ * @property {string} [operation] - Filesystem operation type (fs_operation messages)
+ * @property {string} [path] - File path (fs_operation messages)
+ * @property {string} [content] - File content (fs_operation messages)
+ * @property {string} [input] - User input (input_response messages)
+ */
+
+/**
+ * @typedef {Object} PyodideAPI
+ * @property {Function} runPython - Execute Python code synchronously
+ * @property {Function} runPythonAsync - Execute Python code asynchronously
+ * @property {Function} loadPackage - Load Python packages
+ * @property {Function} toPy - Convert JavaScript to Python objects
+ * @property {Object} FS - Virtual filesystem interface
+ * @property {Function} FS.writeFile - Write file to filesystem
+ * @property {Function} FS.readFile - Read file from filesystem
+ * @property {Function} FS.mkdir - Create directory
+ * @property {Function} FS.analyzePath - Analyze path existence
+ * @property {Function} FS.readdir - List directory contents
+ */
+
+/**
+ * @typedef {Object} FileToLoad
+ * @property {string} url - URL to fetch the file from
+ * @property {string} path - Target path in Pyodide filesystem
+ */
+
+/***/ }),
+
+/***/ "./worker-handlers.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./worker-handlers.js
+__nagini_define__(__nagini_exports__, {
+  handleMessage: () => handleMessage,
+  handleInit: () => handleInit,
+  handleExecute: () => handleExecute,
+  handleFSOperation: () => handleFSOperation,
+  handleInputResponse: () => handleInputResponse,
+  setupInputHandling: () => setupInputHandling,
+});
+/**
+ * PyodideWorker Message Handlers - Optimized
+ *
+ * Concise message handling logic for the pyodide worker
+ */
+
+const { PYODIDE_WORKER_CONFIG } = __nagini_require__("./worker-config.js");
+const { handleExecute, handleExecuteBatch, handleExecuteMany, handleRenderFigure, handleCheck, handleReset, transformCodeForExecution, captureOutputs, postEmitBatch, wasmHeapBytes } = __nagini_require__("./worker-execution.js");
+const { setupInputHandling, handleInputResponse } = __nagini_require__("./worker-input.js");
+const { handleFSOperation, executeFS, loadPackages, installLazyImports } = __nagini_require__("./worker-fs.js");
+const { handleNamespaceOperation } = __nagini_require__("./worker-namespaces.js");
+const { snapshotKey, loadSnapshot, storeSnapshot, deleteSnapshot } = __nagini_require__("./worker-snapshot.js");
+const { installRawCapture } = __nagini_require__("./worker-raw-capture.js");
+const { PyodideFileLoader } = __nagini_require__("../file-loader/file-loader.js");
+
+// Import Python modules as bundled strings
+const captureSystemPy = "# =============================================================================\n# Output Capture System for Pyodide\n# =============================================================================\n# This module handles stdout/stderr capture and the missive system\n# Uses direct sys.stdout/stderr replacement for reliable capture in WebAssembly\n\nimport gc\nimport json\nimport io\nimport sys\nimport time\nimport hashlib\nimport builtins\nfrom collections import deque\nfrom contextlib import nullcontext\n\n# Store original stdout/stderr so we can restore them if needed\n_original_stdout = sys.stdout\n_original_stderr = sys.stderr\n\n\nclass OutputBuffer:\n    \"\"\"In-memory capture buffer, optionally bounded to a head and a tail.\n\n    Unbounded by default. With a head_limit, the first head_limit characters\n    are kept, then only the last tail_limit ones: the tail is a deque of the\n    written chunks trimmed from the left (a skip offset into the oldest chunk\n    instead of slicing it), so a write past the cap is O(1) amortized and\n    never copies the text it receives. Characters falling between head and\n    tail are only counted in `dropped`.\n    \"\"\"\n\n    def __init__(self):\n        self.configure()\n\n    def configure(self, head_limit=None, tail_limit=0) -> None:\n        \"\"\"Set the bounds (None = unbounded) and clear the buffer\"\"\"\n        self.head_limit = head_limit\n        self.tail_limit = tail_limit\n        self.clear()\n\n    def clear(self) -> None:\n        self._head = []\n        self._head_size = 0  # characters ever accepted into the head\n        self._tail = deque()\n        self._tail_size = 0  # total length of the chunks in _tail\n        self._tail_skip = 0  # characters already dropped from _tail[0]\n        self.written = 0\n        self.written_bytes = 0  # UTF-8 size of everything written\n        self.dropped = 0\n\n    def write(self, text) -> None:\n        self.written += len(text)\n        self.written_bytes += len(text) if text.isascii() else len(text.encode(\"utf-8\", \"surrogatepass\"))\n        if self.head_limit is None:\n            self._head.append(text)\n            return\n\n        room = self.head_limit - self._head_size\n        if room > 0:\n            if len(text) <= room:\n                self._head.append(text)\n                self._head_size += len(text)\n                return\n            # Crossing the head limit: the only slice, once per execution\n            self._head.append(text[:room])\n            self._head_size = self.head_limit\n            text = text[room:]\n\n        self._tail.append(text)\n        self._tail_size += len(text)\n        excess = self._tail_size - self._tail_skip - self.tail_limit\n        while excess > 0:\n            oldest = len(self._tail[0]) - self._tail_skip\n            if oldest <= excess:\n                self._tail_size -= len(self._tail.popleft())\n                self._tail_skip = 0\n                self.dropped += oldest\n                excess -= oldest\n            else:\n                self._tail_skip += excess\n                self.dropped += excess\n                excess = 0\n\n    def _tail_text(self) -> str:\n        if not self._tail:\n            return \"\"\n        text = \"\".join(self._tail)\n        return text[self._tail_skip:] if self._tail_skip else text\n\n    def getvalue(self) -> str:\n        return \"\".join(self._head) + self._tail_text()\n\n    def drain(self, final=False) -> str:\n        \"\"\"Remove and return the pending head text (streaming). The tail is\n        only released with final=True, once nothing can push it out anymore.\n        Counters are kept: the limits stay per execution.\"\"\"\n        text = \"\".join(self._head)\n        self._head.clear()\n        if final:\n            text += self._tail_text()\n            self._tail.clear()\n            self._tail_size = 0\n            self._tail_skip = 0\n        return text\n\n    def flush(self) -> None:\n        pass\n\n\n# Create capture buffers\n_stdout_buffer = OutputBuffer()\n_stderr_buffer = OutputBuffer()\n\n# Storage for missive system - using builtins to ensure global availability\nif not hasattr(builtins, \"_nagini_current_missive\"):\n    builtins._nagini_current_missive = None\nif not hasattr(builtins, \"_nagini_missive_already_called\"):\n    builtins._nagini_missive_already_called = False\n\n\n# Streaming mode: the worker installs a sink once (set_output_sink) and each\n# execution opts in through reset_captures(streaming=True). Pending text is\n# handed to the sink when a size or time threshold is crossed, then dropped\n# from the buffer, so a long run never accumulates its whole output here\n_output_sink = None\n_streaming = False\n_redirect = True  # False: raw backend, the worker captures fd 1/2 itself\n_stream_chunk_size = 8192\n_stream_flush_interval = 0.05\n\n\nclass CaptureStream:\n    \"\"\"Custom stream that captures all write operations\"\"\"\n\n    def __init__(self, buffer, name=\"stdout\"):\n        self.buffer = buffer\n        self.name = name\n        self._pending = 0\n        self._last_flush = 0.0\n\n    def write(self, text):\n        self.buffer.write(text)\n        if _streaming:\n            self._pending += len(text)\n            if (\n                self._pending >= _stream_chunk_size\n                or time.monotonic() - self._last_flush >= _stream_flush_interval\n            ):\n                self.send_chunk()\n        return len(text)\n\n    def send_chunk(self, final=False):\n        \"\"\"Hand the pending text to the sink and drain the buffer\"\"\"\n        self._pending = 0\n        self._last_flush = time.monotonic()\n        text = self.buffer.drain(final)\n        if text:\n            _output_sink(self.name, text)\n\n    def flush(self):\n        self.buffer.flush()\n\n    def isatty(self):\n        return False\n\n\n# Create capture streams\n_stdout_capturer = CaptureStream(_stdout_buffer, \"stdout\")\n_stderr_capturer = CaptureStream(_stderr_buffer, \"stderr\")\n\n\n# emit() records: the worker installs a sink once (set_emit_sink) and each\n# execution opts in through reset_captures(emitting=True). Records are\n# serialized when emitted, queued, and handed to the sink as one JSON array\n# per batch_size records or flush_interval seconds. Without a listener for\n# the execution, emit() discards its record\n_emit_sink = None\n_emitting = False\n_emit_batch_size = 64\n_emit_flush_interval = 0.05\n_emit_queue = []\n_emit_last_flush = 0.0\n\n\nclass CaptureHook:\n    \"\"\"Capture support for one library (figures, images, rich output, ...)\n\n    The hook is active only while its module is in sys.modules: nothing is\n    imported on its behalf, so a worker pays per execution for the libraries\n    user code actually uses, not for the ones installed.\n\n    Attributes:\n        name: Registry key, passed to collect_capture\n        module: Module whose presence in sys.modules activates the hook\n        reset: Callable(module) run by reset_captures, or None\n        collect: Callable(module, **options) -> list returning the captured\n            items after the run, or None\n    \"\"\"\n\n    def __init__(self, name, module, reset=None, collect=None):\n        self.name = name\n        self.module = module\n        self.reset = reset\n        self.collect = collect\n\n\n_capture_hooks = {}\n\n\ndef register_capture_hook(name, module, reset=None, collect=None) -> CaptureHook:\n    \"\"\"Register (or replace) the capture hook called name, see CaptureHook\"\"\"\n    hook = CaptureHook(name, module, reset, collect)\n    _capture_hooks[name] = hook\n    return hook\n\n\ndef _reset_hooks() -> None:\n    \"\"\"Run the reset step of every hook whose module is imported. A failing\n    hook must not prevent the execution from starting\"\"\"\n    for hook in _capture_hooks.values():\n        lib = sys.modules.get(hook.module)\n        if lib is None or hook.reset is None:\n            continue\n        try:\n            hook.reset(lib)\n        except Exception:\n            pass\n\n\ndef collect_capture(name, **options) -> list:\n    \"\"\"Run the collect step of one hook; [] while its module is not imported\"\"\"\n    hook = _capture_hooks[name]\n    lib = sys.modules.get(hook.module)\n    if lib is None or hook.collect is None:\n        return []\n    return hook.collect(lib, **options)\n\n\n# Per-execution resource counters: started at the end of reset_captures,\n# read by get_metrics before the outputs are collected\n_metrics_start = {\"cpu\": 0.0, \"gc\": 0}\n_tracing_memory = False  # tracemalloc was started by reset_captures\n\n\ndef _gc_collections() -> int:\n    return sum(generation[\"collections\"] for generation in gc.get_stats())\n\n\ndef set_output_sink(sink) -> None:\n    \"\"\"Install the callable (stream_name, text) that receives streamed chunks.\n    The worker calls this once after init; it holds a JS reference, so it\n    cannot be part of the interpreter snapshot.\"\"\"\n    global _output_sink\n    _output_sink = sink\n\n\ndef set_emit_sink(sink) -> None:\n    \"\"\"Install the callable (json_array_text) that receives emit() batches.\n    Like the output sink it holds a JS reference: installed after init. The\n    sink may block (backpressure) until the main thread catches up.\"\"\"\n    global _emit_sink\n    _emit_sink = sink\n\n\ndef reset_captures(\n    streaming=False,\n    chunk_size=8192,\n    flush_interval=0.05,\n    head_limit=None,\n    tail_limit=0,\n    emitting=False,\n    emit_batch_size=64,\n    emit_flush_interval=0.05,\n    trace_memory=False,\n    redirect=True,\n) -> None:\n    \"\"\"Reset capture buffers and activate capturing by replacing sys.stdout/stderr\n\n    With streaming=True (requires an output sink), output is flushed to the\n    sink in chunks of about chunk_size characters or every flush_interval\n    seconds, whichever comes first; call flush_streams() after the run to\n    send the remainder.\n\n    head_limit/tail_limit bound each stream for this execution: past\n    head_limit characters only the last tail_limit are kept (see\n    OutputBuffer), the rest is counted as dropped.\n\n    emitting=True (requires an emit sink) delivers emit() records in\n    batches of emit_batch_size or every emit_flush_interval seconds.\n\n    trace_memory=True records the peak of Python allocations with\n    tracemalloc until get_metrics (slows allocation-heavy code down).\n\n    redirect=False selects the raw backend: sys.stdout/stderr stay the\n    interpreter's own streams, whose bytes the worker captures below the\n    Python layer (pyodide.setStdout), along with C-level writes. Streaming\n    and limits are then applied by the worker; streaming only switches the\n    streams to line buffering.\n    \"\"\"\n    global _streaming, _stream_chunk_size, _stream_flush_interval, _redirect\n    global _emitting, _emit_batch_size, _emit_flush_interval, _emit_last_flush\n    global _tracing_memory\n    _redirect = bool(redirect)\n    _streaming = bool(streaming) and _output_sink is not None and _redirect\n    _stream_chunk_size = chunk_size\n    _stream_flush_interval = flush_interval\n    now = time.monotonic()\n    for capturer in (_stdout_capturer, _stderr_capturer):\n        capturer._pending = 0\n        capturer._last_flush = now\n\n    _emitting = bool(emitting) and _emit_sink is not None\n    _emit_batch_size = emit_batch_size\n    _emit_flush_interval = emit_flush_interval\n    _emit_last_flush = now\n    _emit_queue.clear()\n\n    # Clear buffers\n    _stdout_buffer.configure(head_limit, tail_limit)\n    _stderr_buffer.configure(head_limit, tail_limit)\n\n    # Clear missive data using builtins for global access\n    builtins._nagini_current_missive = None\n    builtins._nagini_missive_already_called = False\n\n    # Per-library cleanup (matplotlib figures, ...), only for the libraries\n    # user code has already imported\n    _reset_hooks()\n\n    if trace_memory:\n        import tracemalloc\n\n        if not tracemalloc.is_tracing():\n            tracemalloc.start()\n            _tracing_memory = True\n        tracemalloc.reset_peak()\n\n    if _redirect:\n        # Activate capturing by replacing sys.stdout/stderr\n        sys.stdout = _stdout_capturer\n        sys.stderr = _stderr_capturer\n    else:\n        sys.stdout = _original_stdout\n        sys.stderr = _original_stderr\n        for stream in (_original_stdout, _original_stderr):\n            if hasattr(stream, \"reconfigure\"):\n                stream.reconfigure(line_buffering=bool(streaming))\n\n    _metrics_start[\"cpu\"] = time.process_time()\n    _metrics_start[\"gc\"] = _gc_collections()\n\n\ndef flush_streams() -> None:\n    \"\"\"Send whatever is still pending to the sink (end of a streamed run).\n    Raw backend: push the interpreter's buffered text down to the worker.\n    No-op otherwise.\"\"\"\n    if not _redirect:\n        _original_stdout.flush()\n        _original_stderr.flush()\n        return\n    if not _streaming:\n        return\n    _stdout_capturer.send_chunk(final=True)\n    _stderr_capturer.send_chunk(final=True)\n\n\ndef flush_emits() -> None:\n    \"\"\"Send the queued emit() records as one batch (end of an execution)\"\"\"\n    global _emit_last_flush\n    _emit_last_flush = time.monotonic()\n    if not _emit_queue:\n        return\n    batch = \"[\" + \",\".join(_emit_queue) + \"]\"\n    _emit_queue.clear()\n    _emit_sink(batch)\n\n\ndef get_stdout() -> str:\n    \"\"\"Get captured stdout content\"\"\"\n    return _stdout_buffer.getvalue()\n\n\ndef get_stderr() -> str:\n    \"\"\"Get captured stderr content\"\"\"\n    return _stderr_buffer.getvalue()\n\n\ndef get_capture_stats() -> dict:\n    \"\"\"Characters written to and dropped from each stream this execution\"\"\"\n    return {\n        \"stdout\": {\"written\": _stdout_buffer.written, \"dropped\": _stdout_buffer.dropped},\n        \"stderr\": {\"written\": _stderr_buffer.written, \"dropped\": _stderr_buffer.dropped},\n    }\n\n\ndef get_metrics() -> dict:\n    \"\"\"Resources used since reset_captures: CPU seconds, garbage collections,\n    UTF-8 bytes written per stream, and the peak of traced Python memory\n    (None unless reset_captures(trace_memory=True))\"\"\"\n    global _tracing_memory\n    cpu_time = time.process_time() - _metrics_start[\"cpu\"]\n    gc_collections = _gc_collections() - _metrics_start[\"gc\"]\n\n    peak_memory = None\n    tracemalloc = sys.modules.get(\"tracemalloc\")\n    if tracemalloc is not None and tracemalloc.is_tracing():\n        peak_memory = tracemalloc.get_traced_memory()[1]\n        if _tracing_memory:\n            tracemalloc.stop()\n            _tracing_memory = False\n\n    return {\n        \"cpu_time\": cpu_time,\n        \"gc_collections\": gc_collections,\n        \"peak_memory\": peak_memory,\n        \"stdout_bytes\": _stdout_buffer.written_bytes,\n        \"stderr_bytes\": _stderr_buffer.written_bytes,\n    }\n\n\ndef restore_original_streams() -> None:\n    \"\"\"Restore original stdout/stderr (for debugging if needed)\"\"\"\n    sys.stdout = _original_stdout\n    sys.stderr = _original_stderr\n\n\ndef get_missive() -> str | None:\n    \"\"\"\n    Get the current missive dictionary as a JSON string.\n\n    A \"missive\" is our term for structured data that user code wants to send\n    back to JavaScript. It's always a Python dictionary that gets converted\n    to JSON format (which JavaScript can easily understand).\n\n    Returns:\n        str | None: JSON string of the missive data, or None if no missive was sent\n\n    Example:\n        If user code did: missive({\"result\": 42, \"status\": \"success\"})\n        This would return: '{\"result\": 42, \"status\": \"success\"}'\n    \"\"\"\n    if builtins._nagini_current_missive is None:\n        return None  # No missive was stored\n    return json.dumps(builtins._nagini_current_missive)  # Convert Python dict to JSON string\n\n\n# Placeholder key of the binary missive skeleton: {\"__nagini_buffer__\": i,\n# \"dtype\", \"shape\"} stands for the i-th buffer sent out of band\nMISSIVE_BUFFER_KEY = \"__nagini_buffer__\"\n\n\ndef _extract_buffers(value, buffers: list):\n    \"\"\"Copy of a missive value with binary leaves replaced by placeholders,\n    the leaves (C-contiguous buffer objects) appended to buffers\"\"\"\n    if isinstance(value, dict):\n        return {key: _extract_buffers(item, buffers) for key, item in value.items()}\n    if isinstance(value, (list, tuple)):\n        return [_extract_buffers(item, buffers) for item in value]\n\n    # NumPy is only looked up, never imported: a missive without arrays\n    # must not pay for it\n    np = sys.modules.get(\"numpy\")\n    if np is not None and isinstance(value, np.generic):\n        return value.item()\n    if np is not None and isinstance(value, np.ndarray):\n        if value.dtype.hasobject:\n            raise TypeError(\"missive() cannot send NumPy arrays of Python objects\")\n        array = np.ascontiguousarray(value)\n        buffers.append(array)\n        return {MISSIVE_BUFFER_KEY: len(buffers) - 1, \"dtype\": array.dtype.name, \"shape\": list(array.shape)}\n\n    if isinstance(value, (bytes, bytearray, memoryview)):\n        view = memoryview(value)\n        if not view.c_contiguous:\n            view = memoryview(view.tobytes()).cast(view.format, view.shape)\n        buffers.append(view)\n        return {MISSIVE_BUFFER_KEY: len(buffers) - 1, \"dtype\": view.format, \"shape\": list(view.shape)}\n    return value\n\n\ndef get_missive_binary() -> dict | None:\n    \"\"\"\n    Get the current missive with its binary values kept out of the JSON.\n\n    NumPy arrays, bytes, bytearray and memoryview values anywhere in the\n    dictionary are replaced by placeholders (see MISSIVE_BUFFER_KEY); the\n    worker reads each buffer once and materializes typed arrays in their\n    place, so a large array never turns into decimal text.\n\n    Returns:\n        dict | None: {\"skeleton\": JSON string, \"buffers\": list of buffer\n        objects}, or None if no missive was sent\n    \"\"\"\n    if builtins._nagini_current_missive is None:\n        return None\n    buffers = []\n    skeleton = _extract_buffers(builtins._nagini_current_missive, buffers)\n    return {\"skeleton\": json.dumps(skeleton), \"buffers\": buffers}\n\n\n# Output formats of get_figures: base64 keeps the historical PNG-as-str\n# payload, png and svg return raw bytes that the worker hands to the main\n# thread as transferable Uint8Arrays (no base64 inflation, no string copies)\nFIGURE_FORMATS = (\"base64\", \"png\", \"svg\")\n\n\ndef _render_figure_bytes(fig, format=\"base64\", dpi=100, tight=True) -> bytes:\n    \"\"\"Draw one figure into PNG or SVG bytes\"\"\"\n    buf = io.BytesIO()\n    bbox = \"tight\" if tight else None\n    if format == \"svg\":\n        # No date in the metadata: identical plots give identical documents\n        fig.savefig(buf, format=\"svg\", bbox_inches=bbox, metadata={\"Date\": None})\n    else:\n        fig.savefig(buf, format=\"png\", dpi=dpi, bbox_inches=bbox)\n    return buf.getvalue()\n\n\ndef _encode_payload(data, format):\n    \"\"\"base64 str for the historical format, the bytes unchanged otherwise\"\"\"\n    if format != \"base64\":\n        return data\n    import base64\n\n    return base64.b64encode(data).decode(\"utf-8\")\n\n\ndef _encode_figure(fig, format=\"base64\", dpi=100, tight=True):\n    \"\"\"Render one figure: base64 str, or PNG/SVG bytes\"\"\"\n    return _encode_payload(_render_figure_bytes(fig, format, dpi, tight), format)\n\n\ndef _dedup_figure(data, format, known) -> dict:\n    \"\"\"Fingerprint rendered bytes against the keys the main thread holds.\n    The payload is only encoded (and later transferred) when it is new.\n    The known keys come from the manager, which records a key once the\n    result carrying its payload is delivered: a result lost to a timeout\n    or an abort never makes a later run skip the figure.\"\"\"\n    key = f\"{format}:{hashlib.blake2b(data, digest_size=16).hexdigest()}\"\n    if key in known:\n        return {\"key\": key, \"data\": None}\n    return {\"key\": key, \"data\": _encode_payload(data, format)}\n\n\ndef _figure_handle(fig) -> dict:\n    \"\"\"Lightweight description of an open figure, nothing is drawn\"\"\"\n    width, height = fig.get_size_inches()\n    return {\n        \"num\": fig.number,\n        \"width\": float(width),\n        \"height\": float(height),\n        \"dpi\": float(fig.dpi),\n        \"artists\": sum(len(ax.get_children()) for ax in fig.axes),\n    }\n\n\ndef get_figures(format=\"base64\", dpi=100, lazy=False, dedup=False, known=()) -> list:\n    \"\"\"\n    Capture matplotlib figures and close them.\n\n    Args:\n        format: \"base64\" (PNG as a base64 str), \"png\" (PNG bytes) or\n            \"svg\" (SVG document as UTF-8 bytes)\n        dpi: Resolution used for raster output\n        lazy: Return handles instead of rendering; the figures stay open\n            until the next reset_captures, for render_figure to draw on demand\n        dedup: Return {\"key\", \"data\"} entries, data None when the rendered\n            bytes match one of the known keys (see _dedup_figure)\n        known: Content keys whose payload the main thread already holds\n\n    Returns:\n        list: One entry per open figure, str for base64, bytes otherwise,\n        dict handles in lazy mode, dict entries in dedup mode\n    \"\"\"\n    if format not in FIGURE_FORMATS:\n        raise ValueError(f\"Unknown figure format {format!r}, expected one of {FIGURE_FORMATS}\")\n    return collect_capture(\"matplotlib\", format=format, dpi=dpi, lazy=lazy, dedup=dedup, known=known)\n\n\ndef close_figures() -> None:\n    \"\"\"Close the open matplotlib figures without rendering them (executeMany\n    results carry no figures: encoding them for every case is wasted work)\"\"\"\n    plt = sys.modules.get(\"matplotlib.pyplot\")\n    if plt is not None:\n        plt.close(\"all\")\n\n\ndef _collect_matplotlib_figures(plt, format=\"base64\", dpi=100, lazy=False, dedup=False, known=()) -> list:\n    \"\"\"Collect step of the matplotlib hook (see get_figures for the options)\"\"\"\n    figures = []\n    known = set(known)\n    try:\n        for fig_num in plt.get_fignums():\n            fig = plt.figure(fig_num)\n            if lazy:\n                figures.append(_figure_handle(fig))\n                continue\n            if dedup:\n                figures.append(_dedup_figure(_render_figure_bytes(fig, format, dpi), format, known))\n            else:\n                figures.append(_encode_figure(fig, format, dpi))\n            plt.close(fig_num)\n    except Exception as e:\n        print(f\"Error capturing figures: {e}\")\n    return figures\n\n\n# Figures left open by the previous execution are closed on reset; a worker\n# whose code never imports pyplot skips both steps\nregister_capture_hook(\n    \"matplotlib\",\n    \"matplotlib.pyplot\",\n    reset=lambda plt: plt.close(\"all\"),\n    collect=_collect_matplotlib_figures,\n)\n\n\n# Rich representations of a trailing expression value, richest first. The\n# first one that is defined, succeeds and fits under the byte cap is sent\nDISPLAY_REPRS = (\n    (\"_repr_html_\", \"text/html\"),\n    (\"_repr_svg_\", \"image/svg+xml\"),\n    (\"_repr_png_\", \"image/png\"),\n    (\"_repr_latex_\", \"text/latex\"),\n    (\"_repr_markdown_\", \"text/markdown\"),\n)\n\n\ndef _rich_reprs(value):\n    \"\"\"Yield (mimetype, str|bytes) for each _repr_*_ method the value offers\"\"\"\n    for method, mime in DISPLAY_REPRS:\n        render = getattr(value, method, None)\n        if not callable(render):\n            continue\n        try:\n            data = render()\n        except Exception:\n            continue\n        if isinstance(data, tuple):  # (data, metadata) form\n            data = data[0]\n        if isinstance(data, (str, bytes)):\n            yield mime, data\n\n\ndef get_display(value, max_bytes=1_000_000, max_rows=60) -> dict | None:\n    \"\"\"\n    Notebook-style display of the value of the trailing expression.\n\n    pandas objects are rendered with a window of max_rows rows (head and\n    tail), so a large DataFrame never produces its full table.\n\n    Args:\n        value: Value returned by the execution (None: nothing to display)\n        max_bytes: Cap on each representation, in UTF-8 bytes; larger ones\n            are skipped and the plain text is cut to fit (ellipsis included)\n        max_rows: Row window for pandas objects\n\n    Returns:\n        dict | None: {\"mime\", \"data\", \"text\"}, data str or bytes (PNG),\n        text the plain repr\n    \"\"\"\n    if value is None:\n        return None\n\n    pandas = sys.modules.get(\"pandas\")\n    if pandas is not None and isinstance(value, (pandas.DataFrame, pandas.Series)):\n        options = pandas.option_context(\"display.max_rows\", max_rows, \"display.min_rows\", max_rows)\n    else:\n        options = nullcontext()\n\n    with options:\n        text = repr(value)\n        encoded = text.encode(\"utf-8\")\n        if len(encoded) > max_bytes:\n            # Cut on a character boundary; the ellipsis takes 3 bytes\n            text = encoded[:max(max_bytes - 3, 0)].decode(\"utf-8\", errors=\"ignore\") + \"…\"\n        for mime, data in _rich_reprs(value):\n            size = len(data) if isinstance(data, bytes) or data.isascii() else len(data.encode(\"utf-8\"))\n            if size <= max_bytes:\n                return {\"mime\": mime, \"data\": data, \"text\": text}\n        return {\"mime\": \"text/plain\", \"data\": text, \"text\": text}\n\n\ndef render_figure(num, format=\"png\", dpi=100, width=None, tight=True):\n    \"\"\"Render one figure kept open by a lazy get_figures call.\n\n    Args:\n        num: Figure number from the handle\n        format: Same formats as get_figures\n        dpi: Raster resolution, ignored when width is given\n        width: Target raster width in pixels (dpi derived from the figure size)\n        tight: Crop to the drawn area; False skips the extra layout pass\n\n    Raises:\n        LookupError: If the figure is gone (closed, or a newer execution ran)\n    \"\"\"\n    if format not in FIGURE_FORMATS:\n        raise ValueError(f\"Unknown figure format {format!r}, expected one of {FIGURE_FORMATS}\")\n    plt = sys.modules.get(\"matplotlib.pyplot\")\n    if plt is None or not plt.fignum_exists(num):\n        raise LookupError(f\"Figure {num} is not available (figures live until the next execution)\")\n    fig = plt.figure(num)\n    if width:\n        dpi = width / fig.get_figwidth()\n    return _encode_figure(fig, format, dpi, tight)\n\n\ndef missive(data):\n    \"\"\"Send structured data back to JavaScript (once per execution)\n\n    Runs while user output is being captured, so it must not print:\n    anything written here would end up in the user's stdout.\n    \"\"\"\n    if builtins._nagini_missive_already_called:\n        raise ValueError(\n            \"missive() can only be called once per execution. \"\n            \"If you need to send multiple pieces of data, \"\n            \"put them all in one dictionary.\"\n        )\n    builtins._nagini_current_missive = data\n    builtins._nagini_missive_already_called = True\n\n\ndef emit(record) -> None:\n    \"\"\"Send one JSON-serializable record to JavaScript while the code runs\n\n    Unlike missive(), emit() can be called any number of times: records\n    reach the consumer in batches during the execution (progress reports,\n    intermediate results). The record is serialized immediately, so later\n    mutations do not leak into it and a bad value fails at the call site.\n    \"\"\"\n    if not _emitting:\n        return\n    _emit_queue.append(json.dumps(record))\n    if (\n        len(_emit_queue) >= _emit_batch_size\n        or time.monotonic() - _emit_last_flush >= _emit_flush_interval\n    ):\n        flush_emits()\n\n\n# Make the missive and emit functions available globally: they are the\n# names (with input) deliberately exposed to user code. Everything else in\n# this module is reached by the worker through a module reference, never by\n# name lookup in the user's namespace.\nbuiltins.missive = missive\nbuiltins.emit = emit\n\n\ndef detect_shadowed_names(user_globals) -> list:\n    \"\"\"Names rebound by user code in its globals, hiding the built-ins\n    Nagini exposes (missive, emit, input). The worker calls this after each\n    default-namespace execution to emit a one-time warning.\"\"\"\n    shadowed = []\n    for name in (\"missive\", \"emit\", \"input\"):\n        if name in user_globals and user_globals[name] is not getattr(builtins, name, None):\n            shadowed.append(name)\n    return shadowed\n";
+const codeTransformationPy = "# =============================================================================\n# Code transformation for async input support\n# =============================================================================\n# Le builtin input() est remplacé côté worker par une coroutine asynchrone\n# (voir worker-input.js). Il faut donc préfixer d'un await les vrais appels\n# input(). La détection et la réécriture se font sur l'AST : seuls les appels\n# au builtin input sont touchés, jamais un identifiant comme some_func__input\n# ni une méthode obj.input(). Le code est exécuté par runPythonAsync, qui\n# autorise le await de premier niveau, donc on n'enveloppe pas le code dans une\n# fonction : les variables de niveau module restent dans les globals. L'AST\n# modifié est compilé directement (CodeRunner de Pyodide), sans repasser par\n# du texte.\n\nimport ast\nfrom collections import OrderedDict\n\n\nclass _AwaitInputTransformer(ast.NodeTransformer):\n    \"\"\"Préfixe d'un await chaque appel au builtin input() exécutable au niveau\n    module ou dans une fonction async. Les appels situés dans une fonction\n    synchrone ou un lambda sont laissés tels quels : un await y serait invalide\n    et casserait tout le programme.\"\"\"\n\n    def __init__(self):\n        self.inserted = False\n        self._sync_scope_depth = 0\n\n    def visit_FunctionDef(self, node):\n        self._sync_scope_depth += 1\n        self.generic_visit(node)\n        self._sync_scope_depth -= 1\n        return node\n\n    def visit_Lambda(self, node):\n        self._sync_scope_depth += 1\n        self.generic_visit(node)\n        self._sync_scope_depth -= 1\n        return node\n\n    def visit_ClassDef(self, node):\n        # un corps de classe est un scope propre où await est toujours\n        # invalide, même au niveau module\n        self._sync_scope_depth += 1\n        self.generic_visit(node)\n        self._sync_scope_depth -= 1\n        return node\n\n    def visit_AsyncFunctionDef(self, node):\n        # await redevient valide ici, même quand la fonction async est définie\n        # à l'intérieur d'une fonction synchrone : on repart de zéro\n        saved = self._sync_scope_depth\n        self._sync_scope_depth = 0\n        self.generic_visit(node)\n        self._sync_scope_depth = saved\n        return node\n\n    def visit_Call(self, node):\n        self.generic_visit(node)\n        is_input_builtin = isinstance(node.func, ast.Name) and node.func.id == \"input\"\n        if is_input_builtin and self._sync_scope_depth == 0:\n            self.inserted = True\n            # mêmes positions que l'appel : le code compilé garde les lignes\n            return ast.copy_location(ast.Await(value=node), node)\n        return node\n\n\n# Cache des CodeRunner compilés : les pages relancent des centaines de fois\n# les mêmes snippets. Clé : (source, réécriture input) ; le nom de fichier\n# n'en fait pas partie, le code est toujours compilé sous \"<exec>\". LRU\n# bornée par le total des sources en cache ; une source plus grosse que la\n# borne n'est jamais mise en cache.\nCOMPILE_CACHE_MAX_BYTES = 4 * 1024 * 1024\n_compile_cache = OrderedDict()\n_compile_cache_bytes = 0\ncache_hits = 0\ncache_misses = 0\n\n\ndef _top_level_imports(tree):\n    \"\"\"Noms de premier niveau des modules importés (import a.b, from a\n    import b -> \"a\"), imports relatifs exclus, où qu'ils soient dans le code\"\"\"\n    names = set()\n    for node in ast.walk(tree):\n        if isinstance(node, ast.Import):\n            names.update(alias.name.partition(\".\")[0] for alias in node.names)\n        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:\n            names.add(node.module.partition(\".\")[0])\n    return tuple(sorted(names))\n\n\ndef _compile(code, rewrite_input):\n    from pyodide.code import CodeRunner\n\n    runner = CodeRunner(code, flags=ast.PyCF_ALLOW_TOP_LEVEL_AWAIT)\n    # relevé des imports sur l'AST déjà parsé, mis en cache avec le code :\n    # le worker charge les paquets manquants avant l'exécution\n    runner.imports = _top_level_imports(runner.ast)\n    if rewrite_input:\n        runner.ast = _AwaitInputTransformer().visit(runner.ast)\n    return runner.compile()\n\n\ndef compile_for_execution(code, rewrite_input=True):\n    \"\"\"Compile le code utilisateur en un CodeRunner prêt pour run_async.\n\n    Avec rewrite_input, les vrais appels input() sont réécrits en await\n    directement sur l'AST : ni unparse ni second parse, et les numéros de\n    ligne des tracebacks restent ceux de l'éditeur. Le code est compilé avec\n    PyCF_ALLOW_TOP_LEVEL_AWAIT et garde le comportement de runPythonAsync\n    (valeur de la dernière expression). Un CodeRunner compilé se réexécute\n    autant de fois qu'on veut : il est servi depuis le cache quand la même\n    source revient. Son attribut imports liste les modules de premier niveau\n    importés par le code (voir _top_level_imports).\n\n    Renvoie None si le code ne parse pas : le worker l'exécute alors tel quel\n    pour que la SyntaxError soit reportée comme d'habitude.\"\"\"\n    try:\n        return _cached_compile(code, rewrite_input)\n    except SyntaxError:\n        return None\n\n\ndef check_syntax(code, rewrite_input=False):\n    \"\"\"Vérifie que le code parse, sans l'exécuter (éditeurs en direct).\n\n    Une source déjà exécutée est validée par le cache de\n    compile_for_execution, sans reparse. Sinon le code est seulement parsé\n    (PyCF_ONLY_AST) : ni compilation ni mise en cache, la vérification doit\n    rester brève à chaque frappe. Les erreurs levées par le compilateur et\n    non par le parseur ('return' hors d'une fonction, 'break' hors d'une\n    boucle) n'apparaissent qu'à l'exécution. Ne touche ni à la capture ni\n    aux globals.\n\n    Renvoie None si le code est valide, sinon un dict décrivant l'erreur\n    (type, message, positions 1-based comme dans SyntaxError).\"\"\"\n    if (code, bool(rewrite_input)) in _compile_cache:\n        return None\n    try:\n        compile(code, \"<exec>\", \"exec\", flags=ast.PyCF_ONLY_AST | ast.PyCF_ALLOW_TOP_LEVEL_AWAIT)\n    except SyntaxError as error:\n        return {\n            \"type\": type(error).__name__,\n            \"message\": error.msg,\n            \"line\": error.lineno,\n            \"column\": error.offset,\n            \"endLine\": error.end_lineno,\n            \"endColumn\": error.end_offset,\n            \"text\": error.text,\n        }\n    return None\n\n\ndef _cached_compile(code, rewrite_input):\n    \"\"\"Runner depuis le cache, ou compilé puis mis en cache (lève SyntaxError)\"\"\"\n    global _compile_cache_bytes, cache_hits, cache_misses\n\n    key = (code, bool(rewrite_input))\n    runner = _compile_cache.get(key)\n    if runner is not None:\n        _compile_cache.move_to_end(key)\n        cache_hits += 1\n        return runner\n\n    cache_misses += 1\n    runner = _compile(code, rewrite_input)\n\n    size = len(code)\n    if size <= COMPILE_CACHE_MAX_BYTES:\n        _compile_cache[key] = runner\n        _compile_cache_bytes += size\n        while _compile_cache_bytes > COMPILE_CACHE_MAX_BYTES:\n            (evicted, _), _ = _compile_cache.popitem(last=False)\n            _compile_cache_bytes -= len(evicted)\n    return runner\n\n\ndef clear_compile_cache():\n    \"\"\"Vide le cache (les compteurs hits/misses sont conservés)\"\"\"\n    global _compile_cache_bytes\n    _compile_cache.clear()\n    _compile_cache_bytes = 0\n";
+const pyodideUtilitiesPy = "# =============================================================================\n# Pyodide Utilities\n# =============================================================================\n# This module contains utility functions for Pyodide environment setup\n\nimport io\nimport os\nimport sys\nfrom contextlib import redirect_stdout\n\n\ndef setup_matplotlib():\n    \"\"\"Set up matplotlib configuration if the package is available\"\"\"\n    try:\n        import matplotlib\n        import matplotlib.pyplot as plt\n\n        # Use the non-interactive 'agg' backend, which is required for rendering in a worker.\n        plt.switch_backend(\"agg\")\n\n        # Pyodide n'embarque que les polices DejaVu : pointer sans-serif\n        # vers Arial déclenchait un warning findfont sur chaque rendu\n        matplotlib.rcParams[\"font.family\"] = \"sans-serif\"\n        matplotlib.rcParams[\"font.sans-serif\"] = [\"DejaVu Sans\"]\n        matplotlib.rcParams[\"text.usetex\"] = False\n\n        # Override plt.show() to prevent display attempts\n        def custom_show(*args, **kwargs):\n            pass  # No-op since we capture figures manually\n\n        plt.show = custom_show\n        print(\"🎨 Matplotlib configured successfully with 'agg' backend and font caching disabled\")\n    except ImportError:\n        # matplotlib not available, skip setup\n        pass\n    except Exception as e:\n        print(f\"Warning: Could not configure matplotlib: {e}\")\n\n\ndef configure_loaded_packages(packages):\n    \"\"\"Apply the init-time setup to packages loaded during an execution\n    (autoLoadImports). Runs inside the user's capture, so the setup\n    messages are discarded instead of showing up in their output\"\"\"\n    if \"matplotlib\" in packages:\n        with redirect_stdout(io.StringIO()):\n            setup_matplotlib()\n\n\ndef namespaces_from_columns(columns):\n    \"\"\"Split a columnar table ({name: values}, one value per case) into\n    one globals dict per case (executeMany). The table crosses from\n    JavaScript in one conversion; typed arrays arrive as memoryviews.\n    Columns of different lengths raise ValueError instead of silently\n    dropping the cases past the shortest one\"\"\"\n    names = list(columns)\n    values = [\n        column.tolist() if hasattr(column, \"tolist\") else list(column)\n        for column in columns.values()\n    ]\n    return [dict(zip(names, case)) for case in zip(*values, strict=True)]\n\n\n# Additional utility functions can be added here as needed\n\n\ndef library_roots() -> tuple:\n    \"\"\"Directories and zip archives the stdlib and installed packages are\n    imported from: the sys.path entries, minus the working and home\n    directories and their parents (user files live there). Each root ends\n    with a separator, so a prefix test cannot match a sibling directory.\"\"\"\n    user_dirs = [os.path.join(os.path.realpath(path), \"\") for path in (os.getcwd(), os.path.expanduser(\"~\"))]\n    roots = set()\n    for entry in sys.path:\n        if not entry:\n            continue\n        root = os.path.join(os.path.realpath(entry), \"\")\n        if any(user_dir.startswith(root) for user_dir in user_dirs):\n            continue\n        roots.add(root)\n    return tuple(sorted(roots))\n";
+const lazyImportsPy = "# =============================================================================\n# Import-triggered package loading for Pyodide\n# =============================================================================\n# A sys.meta_path finder placed after the standard ones: an import that no\n# installed module satisfies, and whose name the Pyodide lockfile maps to a\n# package, loads that package (blocking through run_sync, JSPI only) and\n# resumes the import. Covers what the pre-scan of the source cannot see:\n# importlib.import_module(name), imports built at runtime, __import__ ...\n\nimport sys\nimport importlib\nfrom importlib.machinery import PathFinder\n\n# Top-level import name -> Pyodide package name (from the lockfile)\n_import_index = {}\n\n# JS callable: package name -> Promise resolved once the load is done\n_load_package = None\n\n# Called with [package] after a load (init-time setup, e.g. matplotlib)\n_after_load = None\n\n# Packages already tried: a failed load is not retried on every import\n_attempted = set()\n\n\nclass LazyPackageFinder:\n    \"\"\"meta_path finder that loads a lockfile package on first import.\n\n    Only top-level names reach it (submodules are found through their parent\n    package's __path__) and only after every other finder gave up, so\n    installed modules never pay for it. Outside a stack that can suspend\n    (no JSPI, or code not entered through callPromising) run_sync raises and\n    the import fails as usual with ModuleNotFoundError.\n    \"\"\"\n\n    def find_spec(self, fullname, path=None, target=None):\n        if path is not None or _load_package is None:\n            return None\n        package = _import_index.get(fullname)\n        if package is None or package in _attempted:\n            return None\n        _attempted.add(package)\n\n        from pyodide.ffi import run_sync\n\n        try:\n            run_sync(_load_package(package))\n        except Exception:\n            return None\n\n        # The package landed in site-packages after the path finders\n        # cached their directory listings\n        importlib.invalidate_caches()\n        if _after_load is not None:\n            try:\n                # May import the package itself: the import machinery then\n                # picks the module up from sys.modules\n                _after_load([package])\n            except Exception:\n                pass\n        return PathFinder.find_spec(fullname)\n\n\n_finder = LazyPackageFinder()\n\n\ndef install_finder(import_index, load_package, after_load=None) -> None:\n    \"\"\"Install the finder at the end of sys.meta_path (idempotent).\n\n    import_index maps import names to package names, load_package is the\n    worker's loader (returns a Promise), after_load receives the list of\n    packages just loaded.\n    \"\"\"\n    global _load_package, _after_load\n    _import_index.clear()\n    _import_index.update(import_index)\n    _load_package = load_package\n    _after_load = after_load\n    if _finder not in sys.meta_path:\n        sys.meta_path.append(_finder)\n\n";
+const executionBudgetPy = "# =============================================================================\n# Deterministic execution budgets for Pyodide\n# =============================================================================\n# Counts the lines executed by the user code (LINE and backward JUMP events\n# of sys.monitoring, settrace before 3.12) and raises BudgetExceeded inside\n# Python once the budget is spent: an infinite loop ends as a normal error\n# result and the worker stays warm. The count does not depend on the\n# machine's speed, so the same submission always stops at the same line, and\n# both modes charge what settrace reports as \"line\" events. Code of the stdlib, of installed\n# packages (Pyodide's own runner included) and of Nagini is not charged.\n\nimport os\nimport sys\n\nfrom pyodide_utilities import library_roots\n\n# 0-2 and 5 are reserved (debugger, coverage, profiler, optimizer)\n_TOOL_ID = 4\n_TOOL_NAME = \"nagini-budget\"\n\n# Lines of Nagini's own modules are not charged\n_EXCLUDED_FILES = {\n    os.path.join(os.path.dirname(os.path.abspath(__file__)), name)\n    for name in (\n        \"capture_system.py\",\n        \"code_transformation.py\",\n        \"execution_budget.py\",\n        \"interpreter_state.py\",\n        \"lazy_imports.py\",\n        \"pyodide_utilities.py\",\n    )\n}\n\n_limit = 0\n_remaining = 0\n_mode = None  # \"monitoring\", \"trace\" or None when no budget is running\n\n# Roots of the stdlib and installed packages, read at import (worker init)\n_LIBRARY_ROOTS = library_roots()\n\n# Per code object, for one run: charged or not, line of each offset\n_charged_codes = {}\n_offset_lines = {}\n\n\nclass BudgetExceeded(BaseException):\n    \"\"\"Raised in user code when its line budget is spent.\n\n    A BaseException, so `except Exception` in the submission does not\n    swallow it. Under sys.monitoring every further line raises again: even\n    a bare `except:` cannot keep the code running.\n    \"\"\"\n\n\ndef _charge():\n    global _remaining\n    _remaining -= 1\n    if _remaining < 0:\n        raise BudgetExceeded(f\"Execution budget of {_limit} lines exceeded\")\n\n\ndef _is_charged(code) -> bool:\n    \"\"\"Whether the lines of a code object count against the budget: user\n    code (the submission and the modules it imports from its own files)\"\"\"\n    charged = _charged_codes.get(code)\n    if charged is None:\n        filename = code.co_filename\n        charged = not (\n            filename in _EXCLUDED_FILES\n            or filename.startswith(\"<frozen \")\n            or os.path.join(os.path.realpath(os.path.dirname(filename)), \"\").startswith(_LIBRARY_ROOTS)\n        )\n        _charged_codes[code] = charged\n    return charged\n\n\ndef _line_of(code, offset):\n    lines = _offset_lines.get(code)\n    if lines is None:\n        lines = _offset_lines[code] = {}\n        for start, end, line in code.co_lines():\n            for instruction in range(start, end, 2):\n                lines[instruction] = line\n    return lines.get(offset)\n\n\ndef _on_line(code, line_number):\n    if not _is_charged(code):\n        return sys.monitoring.DISABLE\n    _charge()\n\n\ndef _on_jump(code, offset, destination):\n    # LINE does not fire when a loop jumps back to the same line\n    # (while True: pass): only that backward jump is charged, like settrace's\n    # \"line\" event. Towards another line, LINE already charges it\n    if not _is_charged(code):\n        return sys.monitoring.DISABLE\n    if destination <= offset and _line_of(code, offset) == _line_of(code, destination):\n        _charge()\n\n\ndef _trace_calls(frame, event, arg):\n    if not _is_charged(frame.f_code):\n        return None\n    return _trace_lines\n\n\ndef _trace_lines(frame, event, arg):\n    # settrace removes the trace function when it raises: the overrun is\n    # reported only once in this mode\n    if event == \"line\":\n        _charge()\n    return _trace_lines\n\n\ndef start_budget(limit) -> None:\n    \"\"\"Start counting lines, BudgetExceeded past `limit`\"\"\"\n    global _limit, _remaining, _mode\n    _limit = _remaining = limit\n    monitoring = getattr(sys, \"monitoring\", None)\n    if monitoring is not None and monitoring.get_tool(_TOOL_ID) in (None, _TOOL_NAME):\n        if monitoring.get_tool(_TOOL_ID) is None:\n            monitoring.use_tool_id(_TOOL_ID, _TOOL_NAME)\n        monitoring.register_callback(_TOOL_ID, monitoring.events.LINE, _on_line)\n        monitoring.register_callback(_TOOL_ID, monitoring.events.JUMP, _on_jump)\n        monitoring.set_events(_TOOL_ID, monitoring.events.LINE | monitoring.events.JUMP)\n        _mode = \"monitoring\"\n    else:\n        sys.settrace(_trace_calls)\n        _mode = \"trace\"\n\n\ndef stop_budget() -> None:\n    \"\"\"Stop counting (the usage stays readable until the next start)\"\"\"\n    global _mode\n    if _mode == \"monitoring\":\n        sys.monitoring.set_events(_TOOL_ID, 0)\n        sys.monitoring.register_callback(_TOOL_ID, sys.monitoring.events.LINE, None)\n        sys.monitoring.register_callback(_TOOL_ID, sys.monitoring.events.JUMP, None)\n    elif _mode == \"trace\":\n        sys.settrace(None)\n    _mode = None\n    # The run's code objects are not kept alive past it\n    _charged_codes.clear()\n    _offset_lines.clear()\n\n\ndef budget_used() -> int:\n    \"\"\"Lines charged to the last budgeted run, capped at its limit\"\"\"\n    return _limit - max(_remaining, 0)\n\n\ndef budget_exceeded() -> bool:\n    \"\"\"Whether the last budgeted run spent its whole budget\"\"\"\n    return _remaining < 0\n\n\nasync def run_with_budget(runner, globals, limit):\n    \"\"\"Run a compiled CodeRunner under a line budget.\n\n    The budget stops before the exception leaves Python, so formatting the\n    traceback for JavaScript is not charged (and cannot raise again).\n    \"\"\"\n    start_budget(limit)\n    try:\n        return await runner.run_async(globals)\n    finally:\n        stop_budget()\n";
+const interpreterStatePy = "# =============================================================================\n# Interpreter state baseline and fast reset\n# =============================================================================\n# Records what the interpreter looks like once the worker is initialized\n# (globals, sys.modules, builtins, sys.path, cwd) and puts it back on demand:\n# a clean interpreter between two students or two test cases in a few\n# milliseconds, without booting a new worker.\n\nimport builtins\nimport gc\nimport importlib\nimport os\nimport shutil\nimport sys\nimport tempfile\n\nfrom pyodide_utilities import library_roots\n\n_baseline = None\n\n\ndef _has_user_files(module) -> bool:\n    \"\"\"Whether a module was loaded from a file (or a package directory)\n    outside the stdlib and installed packages\"\"\"\n    if getattr(module, \"__name__\", None) in sys.builtin_module_names:\n        return False\n    filename = getattr(module, \"__file__\", None)\n    locations = [filename] if isinstance(filename, str) else list(getattr(module, \"__path__\", None) or [])\n    return any(\n        isinstance(location, str) and not os.path.realpath(location).startswith(_baseline[\"library_roots\"])\n        for location in locations\n    )\n\n\ndef _user_modules(names) -> list:\n    \"\"\"User modules among names: those loaded from user files, plus the\n    modules without a file (extension, frozen, created at run time) of a\n    user package. Any other module without a file counts as library code:\n    evicting a stdlib module frozen in the zip archive breaks the next\n    import of it\"\"\"\n    user_names = {name for name in names if _has_user_files(sys.modules[name])}\n    return [\n        name\n        for name in names\n        if name in user_names or name.partition(\".\")[0] in user_names\n    ]\n\n\ndef record_baseline(user_globals) -> None:\n    \"\"\"Remember the current state as the one reset_state() restores\"\"\"\n    global _baseline\n    _baseline = {\n        \"globals\": dict(user_globals),\n        \"modules\": set(sys.modules),\n        \"builtins\": dict(vars(builtins)),\n        \"path\": list(sys.path),\n        \"cwd\": os.getcwd(),\n        \"library_roots\": library_roots(),\n        \"scratch_roots\": tuple(os.path.join(os.path.realpath(root), \"\") for root in (os.getcwd(), tempfile.gettempdir())),\n    }\n\n\ndef reset_state(user_globals, scratch_dir=None) -> dict:\n    \"\"\"Restore the recorded baseline.\n\n    Globals added or rebound since the baseline are dropped or restored,\n    user modules imported since then are evicted from sys.modules, builtins\n    (input, missive, emit, anything patched) and sys.path are put back,\n    the working directory is restored and scratch_dir is emptied. Modules\n    of installed packages loaded since the baseline stay imported: loading\n    them again would cost far more than the reset saves. Returns counts for\n    the caller's metrics.\n    \"\"\"\n    if _baseline is None:\n        raise RuntimeError(\"No baseline recorded: the worker is not initialized\")\n\n    removed = [name for name in user_globals if name not in _baseline[\"globals\"]]\n    user_globals.clear()\n    user_globals.update(_baseline[\"globals\"])\n\n    evicted = _user_modules([name for name in list(sys.modules) if name not in _baseline[\"modules\"]])\n    for name in evicted:\n        del sys.modules[name]\n\n    # Builtins added (or replaced) by user code go away\n    builtins_dict = vars(builtins)\n    for name in [name for name in builtins_dict if name not in _baseline[\"builtins\"]]:\n        del builtins_dict[name]\n    builtins_dict.update(_baseline[\"builtins\"])\n\n    sys.path[:] = _baseline[\"path\"]\n    os.chdir(_baseline[\"cwd\"])\n\n    # Open figures belong to the previous code\n    plt = sys.modules.get(\"matplotlib.pyplot\")\n    if plt is not None:\n        plt.close(\"all\")\n\n    if scratch_dir:\n        _wipe_directory(scratch_dir)\n\n    importlib.invalidate_caches()\n    gc.collect()\n    return {\"globalsRemoved\": len(removed), \"modulesEvicted\": len(evicted)}\n\n\ndef _wipe_directory(path) -> None:\n    \"\"\"Empty a directory, creating it when it does not exist. Only a\n    directory strictly inside the working directory or the temporary\n    directory can be wiped: a typo must not empty the stdlib or /\"\"\"\n    target = os.path.realpath(path)\n    # Roots end with a separator: the root itself is excluded\n    if target == os.path.realpath(_baseline[\"cwd\"]) or not target.startswith(_baseline[\"scratch_roots\"]):\n        raise ValueError(\n            f\"Refusing to wipe {path!r}: it must be strictly inside the working directory or {tempfile.gettempdir()!r}\"\n        )\n    os.makedirs(path, exist_ok=True)\n    for entry in os.scandir(path):\n        if entry.is_dir(follow_symlinks=False):\n            shutil.rmtree(entry.path)\n        else:\n            os.remove(entry.path)\n";
+
+/**
+ * Post error message to main thread
+ * @param {string} message - Error message to send
+ * @returns {void}
+ */
+const postError = (message) => self.postMessage({
+  type: "error",
+  message: `🔧 [Worker] ${message}`
+});
+
+/**
+ * Post filesystem error message to main thread
+ * @param {string} error - Error message to send
+ * @returns {void}
+ */
+const postFSError = (error) => self.postMessage({ type: "fs_error", error: `🔧 [Worker] ${error}` });
+
+/**
+ * Post execution result to main thread
+ * @param {ExecutionResultData} data - Execution result data
+ * @returns {void}
+ */
+const postResult = (data) => self.postMessage({ type: "result", ...data });
+
+/**
+ * Post info message to main thread
+ * @param {string} message - Info message to send
+ * @returns {void}
+ */
+const postInfo = (message) => self.postMessage({ type: "info", message: `🔧 [Worker] ${message}` });
+
+/**
+ * Post warning message to main thread
+ * @param {string} message - Warning message to send
+ * @returns {void}
+ */
+const postWarning = (message) => self.postMessage({ type: "warning", message: `🔧 [Worker] ${message}` });
+
+/**
+ * Post input required message to main thread
+ * @param {string} prompt - Input prompt
+ * @returns {void}
+ */
+const postInputRequired = (prompt) => self.postMessage({ type: "input_required", prompt });
+
+/**
+ * Validate that worker is properly initialized
+ * @param {WorkerState} workerState - Current worker state
+ * @returns {boolean} True if initialized, false otherwise
+ */
+const validateInitialized = (workerState) => {
+  if (!workerState.isInitialized || !workerState.pyodide) {
+    postError(PYODIDE_WORKER_CONFIG.MESSAGES.NOT_INITIALIZED);
+    return false;
+  }
+  return true;
+};
+
+/**
+ * Main message dispatcher
+ * Handles incoming messages from the main thread and routes them to appropriate handlers
+ *
+ * @param {MessageEvent} e - Message event from main thread
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<void>}
+ */
+async function handleMessage(e, workerState) {
+  const { data } = e;
+
+  if (!data?.type) {
+    postError(PYODIDE_WORKER_CONFIG.MESSAGES.INVALID_MESSAGE);
+    return;
+  }
+
+  const handlers = {
+    init: handleInit,
+    execute: handleExecute,
+    execute_batch: handleExecuteBatch,
+    execute_many: handleExecuteMany,
+    render_figure: handleRenderFigure,
+    check: handleCheck,
+    reset: handleReset,
+    fs_operation: handleFSOperation,
+    namespace_operation: handleNamespaceOperation,
+    input_response: handleInputResponse
+  };
+
+  const handler = handlers[data.type];
+  if (!handler) {
+    postError(`${PYODIDE_WORKER_CONFIG.MESSAGES.UNKNOWN_TYPE}: ${data.type}`);
+    return;
+  }
+
+  await handler(data, workerState);
+}
+
+/**
+ * Handle Pyodide initialization
+ * Loads Pyodide runtime, bundled Python modules, and packages
+ *
+ * @param {InitMessage} data - Initialization message data
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<void>}
+ */
+async function handleInit(data, workerState) {
+  if (workerState.isInitialized) {
+    postError(PYODIDE_WORKER_CONFIG.MESSAGES.ALREADY_INITIALIZED);
+    return;
+  }
+
+  const { packages, micropipPackages, filesToLoad, pyodideCdnUrl, snapshotCache, emitAck, captureBackend, autoLoadImports, interruptBuffer, maxNamespaces } = data;
+
+  // Use provided CDN URL or fall back to default
+  const cdnUrl = pyodideCdnUrl || PYODIDE_WORKER_CONFIG.PYODIDE_CDN;
+
+  // Minimal init logging
+
+  try {
+    // Load the Pyodide runtime as an ES module. The worker runs as a module
+    // worker (importScripts is not available there); webpackIgnore keeps the
+    // dynamic import native so the URL is resolved at runtime
+    const { loadPyodide } = await import(/* webpackIgnore: true */ `${cdnUrl}pyodide.mjs`);
+
+    const moduleSources = [captureSystemPy, codeTransformationPy, pyodideUtilitiesPy, lazyImportsPy, executionBudgetPy, interpreterStatePy];
+    let snapshotRestored = false;
+    let snapKey = null;
+
+    // Snapshot cache: restore the interpreter (plus Nagini's Python modules)
+    // from IndexedDB when a matching snapshot exists. Every failure falls
+    // back to a fresh boot
+    if (snapshotCache) {
+      try {
+        snapKey = await snapshotKey(cdnUrl, moduleSources);
+        const cached = await loadSnapshot(snapKey);
+        if (cached) {
+          try {
+            workerState.pyodide = await loadPyodide({ indexURL: cdnUrl, _loadSnapshot: cached });
+            snapshotRestored = true;
+            postInfo('[Snapshot] Interpreter restored from cache');
+          } catch (restoreError) {
+            await deleteSnapshot(snapKey);
+            postWarning(`[Snapshot] Restore failed, booting fresh: ${restoreError.message}`);
+          }
+        }
+      } catch (cacheError) {
+        postWarning(`[Snapshot] Cache unavailable: ${cacheError.message}`);
+      }
+    }
+
+    if (!workerState.pyodide) {
+      workerState.pyodide = await loadPyodide({
+        indexURL: cdnUrl,
+        ...(snapshotCache && snapKey ? { _makeSnapshot: true } : {}),
+      });
+    }
+
+    // Write the bundled Python modules to the filesystem and import them by
+    // reference. Nothing is executed in the interpreter's global namespace:
+    // user code cannot shadow or replace the capture infrastructure by
+    // rebinding names, it only sees the two builtins deliberately exposed
+    // (missive, input). A restored snapshot already contains the files and
+    // the imported modules
+    if (!snapshotRestored) {
+      const pythonModules = [
+        { name: 'capture_system.py', content: captureSystemPy },
+        { name: 'code_transformation.py', content: codeTransformationPy },
+        { name: 'pyodide_utilities.py', content: pyodideUtilitiesPy },
+        { name: 'lazy_imports.py', content: lazyImportsPy },
+        { name: 'execution_budget.py', content: executionBudgetPy },
+        { name: 'interpreter_state.py', content: interpreterStatePy }
+      ];
+
+      for (const module of pythonModules) {
+        workerState.pyodide.FS.writeFile(module.name, module.content);
+      }
+    }
+
+    // Importing capture_system also installs builtins.missive (instant on a
+    // restored snapshot: the modules are already in sys.modules)
+    workerState.captureSystem = workerState.pyodide.pyimport('capture_system');
+    workerState.codeTransformation = workerState.pyodide.pyimport('code_transformation');
+    workerState.pyodideUtilities = workerState.pyodide.pyimport('pyodide_utilities');
+    workerState.executionBudget = workerState.pyodide.pyimport('execution_budget');
+    workerState.interpreterState = workerState.pyodide.pyimport('interpreter_state');
+
+    // Activate output capture
+    workerState.captureSystem.reset_captures();
+
+    // Snapshot point: the interpreter holds no JavaScript references yet.
+    // Everything after this line (input bridge, loaded files, packages)
+    // creates hiwire entries that Pyodide cannot serialize, so it is
+    // replayed on every boot instead of being part of the snapshot
+    if (snapshotCache && snapKey && !snapshotRestored) {
+      try {
+        const bytes = workerState.pyodide.makeMemorySnapshot();
+        if (await storeSnapshot(snapKey, bytes)) {
+          postInfo(`[Snapshot] Interpreter snapshot cached (${(bytes.byteLength / 1e6).toFixed(1)} MB)`);
+        }
+      } catch (makeError) {
+        postWarning(`[Snapshot] Could not cache interpreter: ${makeError.message}`);
+      }
+    }
+
+    // Set up input handling system (jspi mode when the browser supports
+    // stack switching, async mode with AST rewrite otherwise)
+    workerState.inputMode = await setupInputHandling(workerState.pyodide);
+
+    // Sink for streamed executions: chunks are posted as they are flushed,
+    // tagged with the id of the execution that produced them. Installed
+    // after the snapshot point, it holds a JS reference
+    const sendChunk = (stream, text) => {
+      self.postMessage({ type: "output_chunk", id: workerState.currentRequestId, stream, data: text });
+    };
+    workerState.captureSystem.set_output_sink(sendChunk);
+
+    // Raw backend: fd 1/2 bytes captured below the Python layer
+    if (captureBackend === "raw") {
+      workerState.rawCapture = installRawCapture(workerState, sendChunk);
+    }
+    workerState.emitAck = emitAck ?? null;
+
+    // SIGINT written by the manager (abort, timeout) raises KeyboardInterrupt
+    // in the running code
+    workerState.interruptBuffer = interruptBuffer ?? null;
+    if (interruptBuffer) workerState.pyodide.setInterruptBuffer(interruptBuffer);
+    workerState.captureSystem.set_emit_sink((records) => postEmitBatch(workerState, records));
+
+    // Imports the pre-scan cannot see (importlib.import_module, names built
+    // at runtime) load their package on first import, in jspi mode only
+    workerState.autoLoadImports = !!autoLoadImports;
+    workerState.maxNamespaces = maxNamespaces ?? workerState.maxNamespaces;
+    if (workerState.autoLoadImports && workerState.inputMode === "jspi") {
+      installLazyImports(workerState);
+    }
+
+    // Load custom files into filesystem if provided
+    if (filesToLoad && filesToLoad.length > 0) {
+      try {
+        const loader = new PyodideFileLoader(filesToLoad);
+        await loader.loadFiles(workerState.pyodide);
+      } catch (error) {
+        console.error(`Failed to load custom files:`, error);
+        throw error;
+      }
+    }
+
+    // Load packages if provided
+    if (packages?.length > 0) await loadPackages(packages, workerState);
+
+    // Load micropip packages if provided
+    if (micropipPackages?.length > 0) {
+      const toLoad = micropipPackages.filter(pkg => !workerState.micropipPackagesLoaded.has(pkg));
+      const loaded = micropipPackages.filter(pkg => workerState.micropipPackagesLoaded.has(pkg));
+
+      if (loaded.length > 0) {
+        postInfo(`[Micropip] Skipping ${loaded.length} already installed packages: ${loaded.join(", ")}`);
+      }
+
+      if (toLoad.length > 0) {
+        postInfo(`[Micropip] Installing ${toLoad.length} packages: ${toLoad.join(", ")}...`);
+        await workerState.pyodide.loadPackage("micropip");
+        const micropip = workerState.pyodide.pyimport("micropip");
+        await micropip.install(toLoad);
+        toLoad.forEach(pkg => workerState.micropipPackagesLoaded.add(pkg));
+        postInfo("[Micropip] Packages installed successfully.");
+      }
+    }
+
+    // Set up matplotlib if it was loaded
+    try {
+      workerState.pyodideUtilities.setup_matplotlib();
+    } catch (e) {
+      // Matplotlib setup skipped (not available)
+    }
+
+    // Baseline restored by reset messages: everything user code adds from
+    // here on (globals, modules, builtins) is what a reset takes away
+    workerState.interpreterState.record_baseline(workerState.pyodide.globals);
+
+    workerState.isInitialized = true;
+    self.postMessage({
+      type: "ready",
+      snapshotRestored,
+      inputMode: workerState.inputMode,
+      heapBytes: wasmHeapBytes(workerState),
+    });
+
+  } catch (err) {
+    workerState.pyodide = null;
+    workerState.isInitialized = false;
+    postError(`${PYODIDE_WORKER_CONFIG.MESSAGES.INIT_FAILED}: ${err.message}`);
+  }
+}
+
+
+
+/**
+ * @typedef {Object} WorkerState
+ * @property {PyodideAPI|null} pyodide - Pyodide instance
+ * @property {boolean} isInitialized - Whether Pyodide is initialized
+ * @property {Set<string>} packagesLoaded - Set of loaded package names
+ * @property {Set<string>} micropipPackagesLoaded - Set of loaded micropip package names
+ * @property {Object|null} captureSystem - PyProxy of the capture_system module
+ * @property {Object|null} codeTransformation - PyProxy of the code_transformation module
+ * @property {Object|null} pyodideUtilities - PyProxy of the pyodide_utilities module
+ * @property {Object|null} executionBudget - PyProxy of the execution_budget module
+ * @property {Object|null} interpreterState - PyProxy of the interpreter_state module
+ * @property {Set<string>} shadowWarnedNames - Built-in names already reported as shadowed
+ */
+
+/**
+ * @typedef {Object} InitMessage
+ * @property {'init'} type - Message type
+ * @property {string[]} packages - Array of package names to install
+ * @property {string[]} [micropipPackages] - Optional array of package names to install with micropip
+ * @property {Array<FileToLoad>} filesToLoad - Files to load into filesystem
+ * @property {string} [pyodideCdnUrl] - Optional custom Pyodide CDN URL (for local/offline use)
+ * @property {boolean} [snapshotCache] - Cache the bare interpreter as a memory snapshot in IndexedDB
+ * @property {Int32Array} [emitAck] - Shared counter the main thread bumps per emit batch consumed (backpressure)
+ * @property {'python'|'raw'} [captureBackend='python'] - How stdout/stderr are captured
+ * @property {boolean} [autoLoadImports] - Load the packages each snippet imports before running it
+ * @property {number} [maxNamespaces=32] - Named namespaces kept before the least recently used is dropped
+ * @property {Uint8Array} [interruptBuffer] - Shared buffer the manager writes SIGINT into to interrupt a run
+ */
+
+/**
+ * @typedef {Object} ExecuteMessage
+ * @property {'execute'} type - Message type
+ * @property {string} filename - Name for execution tracking
+ * @property {string} code - Python code to execute
+ * @property {Object} [namespace] - Optional namespace for execution
+ */
+
+/**
+ * @typedef {Object} FSOperationMessage
+ * @property {'fs_operation'} type - Message type
+ * @property {string} operation - Filesystem operation name
+ * @property {string} path - File or directory path
+ * @property {string} [content] - File content (for write operations)
+ */
+
+/**
+ * @typedef {Object} ExecutionResultData
+ * @property {string} filename - Name of executed file
+ * @property {string} stdout - Standard output
+ * @property {string} stderr - Standard error
+ * @property {Object|null} missive - Structured data from Python
+ * @property {Object|null} error - Execution error object
+ * @property {number} time - Execution time in milliseconds
+ * @property {boolean} executedWithNamespace - Whether execution used namespace
+ */
+
+/**
+ * @typedef {Object} CapturedOutputs
+ * @property {string} stdout - Standard output
+ * @property {string} stderr - Standard error
+ * @property {Object|null} missive - Structured JSON data
+ */
+
+/**
+ * @typedef {Object} FSOperationResult
+ * @property {boolean} [success] - Whether operation succeeded
+ * @property {string} [content] - File content (for readFile)
+ * @property {boolean} [exists] - Whether file exists (for exists)
+ * @property {string[]} [files] - Directory contents (for listdir)
+ */
+
+/**
+ * @typedef {Object} FileToLoad
+ * @property {string} path - Target path in filesystem
+ * @property {string} content - File content to write
+ */
+
+/**
+ * @typedef {Object} PyodideAPI
+ * @property {function} runPython - Execute Python code
+ * @property {function} loadPackage - Load Python packages
+ * @property {function} toPy - Convert JavaScript to Python
+ * @property {Object} FS - Filesystem operations
+ */
 
+/***/ }),
+
+/***/ "./worker-config.js": ((__nagini_exports__, __nagini_require__) => {
 ;// ./worker-config.js
+__nagini_define__(__nagini_exports__, {
+  PYODIDE_WORKER_CONFIG: () => PYODIDE_WORKER_CONFIG,
+});
 /**
  * PyodideWorker Configuration
  *
@@ -13,12 +604,13 @@
  * Configuration object containing all constants and messages
  * @type {WorkerConfig}
  */
-var worker_config_PYODIDE_WORKER_CONFIG = {
+const PYODIDE_WORKER_CONFIG = {
   /**
    * Pyodide CDN URL for loading runtime
    * @type {string}
    */
   PYODIDE_CDN: "https://cdn.jsdelivr.net/pyodide/v314.0.2/full/",
+
   /**
    * Centralized messages for consistent error reporting and logging
    * @type {WorkerMessages}
@@ -41,6 +633,7 @@ var worker_config_PYODIDE_WORKER_CONFIG = {
     FETCH_FAILED: "Failed to fetch initialization script",
     /** @type {string} */
     FS_NOT_INITIALIZED: "Filesystem not available - worker not initialized",
+
     // Package loading messages
     /** @type {string} */
     PACKAGE_CHECK: "Checking packages to load:",
@@ -56,16 +649,19 @@ var worker_config_PYODIDE_WORKER_CONFIG = {
     PACKAGE_WARNING: "Package loading warning:",
     /** @type {string} */
     ALL_LOADED: "All packages already loaded",
+
     // Smart loading messages
     /** @type {string} */
     SMART_LOADING: "Smart loading: Skipping",
     /** @type {string} */
     SMART_SUCCESS: "Smart loading: Successfully loaded",
+
     // Execution messages
     /** @type {string} */
     EXEC_NAMESPACE: "Executing Python code with namespace",
     /** @type {string} */
     EXEC_GLOBAL: "Executing Python code in global scope",
+
     // Output capture messages
     /** @type {string} */
     INVALID_MISSIVE: "Invalid missive JSON:",
@@ -77,6 +673,7 @@ var worker_config_PYODIDE_WORKER_CONFIG = {
 };
 
 
+
 /**
  * @typedef {Object} WorkerConfig
  * @property {string} PYODIDE_CDN - CDN URL for Pyodide runtime
@@ -108,20 +705,24 @@ var worker_config_PYODIDE_WORKER_CONFIG = {
  * @property {string} OUTPUT_FAILED - Output capture failed error
  * @property {string} OUTPUT_RETRIEVAL_FAILED - Output retrieval failed error
  */
+
+/***/ }),
+
+/***/ "./worker-execution.js": ((__nagini_exports__, __nagini_require__) => {
 ;// ./worker-execution.js
-function _typeof(o) { "@babel/helpers - typeof"; return _typeof = "function" == typeof Symbol && "symbol" == typeof Symbol.iterator ? function (o) { return typeof o; } : function (o) { return o && "function" == typeof Symbol && o.constructor === Symbol && o !== Symbol.prototype ? "symbol" : typeof o; }, _typeof(o); }
-function _regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return _regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, _regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, _regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), _regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", _regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), _regeneratorDefine2(u), _regeneratorDefine2(u, o, "Generator"), _regeneratorDefine2(u, n, function () { return this; }), _regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function _regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } _regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { _regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, _regeneratorDefine2(e, r, n, t); }
-function ownKeys(e, r) { var t = Object.keys(e); if (Object.getOwnPropertySymbols) { var o = Object.getOwnPropertySymbols(e); r && (o = o.filter(function (r) { return Object.getOwnPropertyDescriptor(e, r).enumerable; })), t.push.apply(t, o); } return t; }
-function _objectSpread(e) { for (var r = 1; r < arguments.length; r++) { var t = null != arguments[r] ? arguments[r] : {}; r % 2 ? ownKeys(Object(t), !0).forEach(function (r) { _defineProperty(e, r, t[r]); }) : Object.getOwnPropertyDescriptors ? Object.defineProperties(e, Object.getOwnPropertyDescriptors(t)) : ownKeys(Object(t)).forEach(function (r) { Object.defineProperty(e, r, Object.getOwnPropertyDescriptor(t, r)); }); } return e; }
-function _defineProperty(e, r, t) { return (r = _toPropertyKey(r)) in e ? Object.defineProperty(e, r, { value: t, enumerable: !0, configurable: !0, writable: !0 }) : e[r] = t, e; }
-function _toPropertyKey(t) { var i = _toPrimitive(t, "string"); return "symbol" == _typeof(i) ? i : i + ""; }
-function _toPrimitive(t, r) { if ("object" != _typeof(t) || !t) return t; var e = t[Symbol.toPrimitive]; if (void 0 !== e) { var i = e.call(t, r || "default"); if ("object" != _typeof(i)) return i; throw new TypeError("@@toPrimitive must return a primitive value."); } return ("string" === r ? String : Number)(t); }
-function _createForOfIteratorHelper(r, e) { var t = "undefined" != typeof Symbol && r[Symbol.iterator] || r["@@iterator"]; if (!t) { if (Array.isArray(r) || (t = _unsupportedIterableToArray(r)) || e && r && "number" == typeof r.length) { t && (r = t); var _n = 0, F = function F() {}; return { s: F, n: function n() { return _n >= r.length ? { done: !0 } : { done: !1, value: r[_n++] }; }, e: function e(r) { throw r; }, f: F }; } throw new TypeError("Invalid attempt to iterate non-iterable instance.\nIn order to be iterable, non-array objects must have a [Symbol.iterator]() method."); } var o, a = !0, u = !1; return { s: function s() { t = t.call(r); }, n: function n() { var r = t.next(); return a = r.done, r; }, e: function e(r) { u = !0, o = r; }, f: function f() { try { a || null == t.return || t.return(); } finally { if (u) throw o; } } }; }
-function _unsupportedIterableToArray(r, a) { if (r) { if ("string" == typeof r) return _arrayLikeToArray(r, a); var t = {}.toString.call(r).slice(8, -1); return "Object" === t && r.constructor && (t = r.constructor.name), "Map" === t || "Set" === t ? Array.from(r) : "Arguments" === t || /^(?:Ui|I)nt(?:8|16|32)(?:Clamped)?Array$/.test(t) ? _arrayLikeToArray(r, a) : void 0; } }
-function _arrayLikeToArray(r, a) { (null == a || a > r.length) && (a = r.length); for (var e = 0, n = Array(a); e < a; e++) n[e] = r[e]; return n; }
-function asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function _asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
+__nagini_define__(__nagini_exports__, {
+  handleExecute: () => handleExecute,
+  handleExecuteBatch: () => handleExecuteBatch,
+  handleExecuteMany: () => handleExecuteMany,
+  handleRenderFigure: () => handleRenderFigure,
+  handleCheck: () => handleCheck,
+  handleReset: () => handleReset,
+  withoutPendingInterrupt: () => withoutPendingInterrupt,
+  wasmHeapBytes: () => wasmHeapBytes,
+  postEmitBatch: () => postEmitBatch,
+  transformCodeForExecution: () => transformCodeForExecution,
+  captureOutputs: () => captureOutputs,
+});
 /**
  * PyodideWorker Execution Module
  *
@@ -129,7 +730,10 @@ function _asyncToGenerator(n) { return function () { var t = this, e = arguments
  * for the Pyodide worker environment.
  */
 
-
+const { PYODIDE_WORKER_CONFIG } = __nagini_require__("./worker-config.js");
+const { resetRawCapture, flushRawCapture } = __nagini_require__("./worker-raw-capture.js");
+const { loadImportedPackages } = __nagini_require__("./worker-fs.js");
+const { namedNamespace, clearNamespaces } = __nagini_require__("./worker-namespaces.js");
 
 /**
  * Handle Python code execution
@@ -139,186 +743,788 @@ function _asyncToGenerator(n) { return function () { var t = this, e = arguments
  * @param {WorkerState} workerState - Current worker state object
  * @returns {Promise<void>}
  */
-function handleExecute(_x, _x2) {
-  return _handleExecute.apply(this, arguments);
+async function handleExecute(data, workerState) {
+  if (!validateInitialized(workerState, data.id)) return;
+  if (data.namespaceRef !== undefined && !workerState.namespaces.has(data.namespaceRef)) {
+    postError(`Unknown namespace "${data.namespaceRef}" (never created, deleted or evicted)`, data.id);
+    return;
+  }
+
+  // An interrupt meant for a run that already finished must not hit this one
+  if (workerState.interruptBuffer) workerState.interruptBuffer[0] = 0;
+
+  const { result, transfer } = await runExecution(data, workerState);
+
+  // 🐍 POST EXECUTION RESULTS (always logged with snake emoji)
+  console.log("🐍 Worker execution result:", {
+    filename: result.filename,
+    stdout: result.stdout.length + " chars",
+    stderr: result.stderr.length + " chars",
+    missive: result.missive,
+    figures: result.figures.length + " figures",
+    error: result.error,
+    truncated: result.truncated,
+    time: result.time + "ms"
+  });
+
+  // Binary figures (png/svg) and binary missive arrays travel as
+  // transferables: their buffers move to the main thread instead of being
+  // structured-cloned
+  postResult({ id: data.id, ...result }, transfer);
 }
 
 /**
- * Transform code for execution, handling input() calls if present
- * @param {string} code - The original Python code
+ * Handle a batch of independent executions sent in one message: items run
+ * back to back, each with its own captures and error, and their results
+ * go back in batch_results messages of up to resultBatchSize items (or
+ * every flushIntervalMs), then batch_done. An item interrupted by the
+ * manager (timeout, abort) ends the batch: nobody waits for the rest
+ *
+ * @param {ExecuteBatchMessage} data - Batch request
  * @param {WorkerState} workerState - Current worker state object
- * @returns {Object} - {code: transformedCode, needsAsync: boolean}
- */
-function _handleExecute() {
-  _handleExecute = _asyncToGenerator(/*#__PURE__*/_regenerator().m(function _callee(data, workerState) {
-    var code, filename, namespace, id, start, stdout, stderr, missive, figures, error, result, pyodideNamespace, _captureOutputs, _captureOutputs2, _t;
-    return _regenerator().w(function (_context) {
-      while (1) switch (_context.n) {
-        case 0:
-          if (validateInitialized(workerState, data.id)) {
-            _context.n = 1;
-            break;
-          }
-          return _context.a(2);
-        case 1:
-          code = data.code, filename = data.filename, namespace = data.namespace, id = data.id;
-          start = Date.now();
-          stdout = "", stderr = "", missive = null, figures = [], error = null;
-          _context.p = 2;
-          // Transform code for async execution if needed
-          result = transformCodeForExecution(code, workerState);
-          workerState.captureSystem.reset_captures();
-
-          // Always execute through runPythonAsync: it handles synchronous code
-          // identically and enables top-level await in any user code (asyncio,
-          // httpx/ASGI, transformed input() calls, ...)
-          if (!(namespace !== undefined)) {
-            _context.n = 6;
-            break;
-          }
-          pyodideNamespace = workerState.pyodide.toPy(namespace);
-          _context.p = 3;
-          _context.n = 4;
-          return workerState.pyodide.runPythonAsync(result.code, {
-            globals: pyodideNamespace
-          });
-        case 4:
-          _context.p = 4;
-          pyodideNamespace.destroy();
-          return _context.f(4);
-        case 5:
-          _context.n = 7;
-          break;
-        case 6:
-          _context.n = 7;
-          return workerState.pyodide.runPythonAsync(result.code);
-        case 7:
-          _captureOutputs = captureOutputs(workerState);
-          stdout = _captureOutputs.stdout;
-          stderr = _captureOutputs.stderr;
-          missive = _captureOutputs.missive;
-          figures = _captureOutputs.figures;
-          _context.n = 9;
-          break;
-        case 8:
-          _context.p = 8;
-          _t = _context.v;
-          error = {
-            name: _t.name || "PythonError",
-            message: _t.message || "Unknown execution error"
-          };
-          _captureOutputs2 = captureOutputs(workerState, true);
-          stdout = _captureOutputs2.stdout;
-          stderr = _captureOutputs2.stderr;
-          figures = _captureOutputs2.figures;
-        case 9:
-          // Default-namespace runs persist their globals, so a rebinding of the
-          // exposed builtins (missive, input) outlives this execution: warn once
-          if (namespace === undefined) {
-            warnShadowedBuiltins(workerState, filename);
-          }
+ * @returns {Promise<void>}
+ */
+async function handleExecuteBatch(data, workerState) {
+  if (!validateInitialized(workerState, data.id)) return;
+
+  const { id, items, resultBatchSize = 32, flushIntervalMs = 50, ...shared } = data;
+  const start = Date.now();
+  let pending = [], transfer = new Set(), lastFlush = start, completed = 0;
+  const flush = () => {
+    if (pending.length === 0) return;
+    self.postMessage({ type: "batch_results", id, index: completed - pending.length, results: pending }, [...transfer]);
+    pending = [];
+    transfer = new Set();
+    lastFlush = Date.now();
+  };
 
-          // 🐍 POST EXECUTION RESULTS (always logged with snake emoji)
-          console.log("🐍 Worker execution result:", {
-            filename: filename,
-            stdout: stdout.length + " chars",
-            stderr: stderr.length + " chars",
-            missive: missive,
-            figures: figures.length + " figures",
-            error: error,
-            time: Date.now() - start + "ms"
-          });
-          postResult({
-            id: id,
-            filename: filename,
-            stdout: stdout,
-            stderr: stderr,
-            missive: missive,
-            figures: figures,
-            error: error,
-            time: Date.now() - start,
-            executedWithNamespace: namespace !== undefined
-          });
-        case 10:
-          return _context.a(2);
+  // Cleared once: a SIGINT landing between two items stops the next one
+  if (workerState.interruptBuffer) workerState.interruptBuffer[0] = 0;
+
+  for (const item of items) {
+    const run = await runExecution({ ...shared, ...item, id }, workerState);
+    pending.push(run.result);
+    run.transfer.forEach(buffer => transfer.add(buffer));
+    completed += 1;
+    if (run.interrupted) break;
+    if (pending.length >= resultBatchSize || Date.now() - lastFlush >= flushIntervalMs) flush();
+  }
+  flush();
+
+  console.log("🐍 Worker batch result:", { items: items.length, completed, time: (Date.now() - start) + "ms" });
+  self.postMessage({ type: "batch_done", id, completed, time: Date.now() - start });
+}
+
+/**
+ * Handle a test-case fan-out: compile the code once, then run it against
+ * each namespace. Row namespaces arrive as one array and cross into Python
+ * in a single toPy call; columnar ones (one array per variable) are split
+ * into per-case dicts on the Python side. Each case gets its own captures
+ * and error; the results go back as one vector in many_result
+ *
+ * @param {ExecuteManyMessage} data - Fan-out request
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<void>}
+ */
+async function handleExecuteMany(data, workerState) {
+  if (!validateInitialized(workerState, data.id)) return;
+
+  const { id, code, rows, columns, budget } = data;
+  const start = Date.now();
+  workerState.currentRequestId = id;
+  if (workerState.interruptBuffer) workerState.interruptBuffer[0] = 0;
+
+  let compiled = null, namespaces = null;
+  try {
+    compiled = transformCodeForExecution(code, workerState);
+    if (workerState.autoLoadImports && compiled.runner) {
+      await preloadImports(compiled.runner, workerState);
+    }
+    if (columns) {
+      const table = workerState.pyodide.toPy(columns);
+      try {
+        namespaces = workerState.pyodideUtilities.namespaces_from_columns(table);
+      } finally {
+        table.destroy();
+      }
+    } else {
+      namespaces = workerState.pyodide.toPy(rows);
+    }
+
+    const results = [];
+    for (let i = 0; i < namespaces.length; i++) {
+      const globals = namespaces.get(i);
+      resetCaptures(workerState, data);
+      let error = null, interrupted = false;
+      try {
+        let value;
+        if (compiled.runner && budget) {
+          value = await runBudgeted(workerState, compiled.runner, globals, budget);
+        } else if (compiled.runner) {
+          value = await runCompiled(compiled.runner, globals);
+        } else {
+          value = await workerState.pyodide.runPythonAsync(compiled.code, { globals });
+        }
+        value?.destroy?.();
+      } catch (err) {
+        const name = err.type === "BudgetExceeded" ? "BudgetExceeded" : err.name || "PythonError";
+        error = { name, message: err.message || "Unknown execution error" };
+        interrupted = err.type === "KeyboardInterrupt";
+      } finally {
+        globals.destroy();
+      }
+      const { stdout, stderr, missive, truncated } = captureOutputs(workerState, error !== null, { discard: true });
+      results.push({ stdout, stderr, missive, error, truncated });
+      // Interrupted by the manager (timeout, abort): nobody waits for the rest
+      if (interrupted) break;
+    }
+
+    console.log("🐍 Worker fan-out result:", { cases: namespaces.length, completed: results.length, time: (Date.now() - start) + "ms" });
+    self.postMessage({ type: "many_result", id, results, time: Date.now() - start });
+  } catch (err) {
+    postError(`Fan-out execution failed: ${err.message}`, id);
+  } finally {
+    namespaces?.destroy();
+    compiled?.runner?.destroy();
+    workerState.currentRequestId = null;
+  }
+}
+
+/**
+ * Run one execution (compile, run, capture) and build its result payload.
+ * Shared by single and batched executions
+ *
+ * @param {ExecuteMessage} data - Execution request
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<{result: Object, transfer: ArrayBuffer[], interrupted: boolean}>}
+ */
+async function runExecution(data, workerState) {
+  const { code, filename, namespace, namespaceRef, id, figureOptions, binaryMissive, emit, display, budget } = data;
+  const start = Date.now();
+  const heapBytesBefore = wasmHeapBytes(workerState);
+  let stdout = "", stderr = "", missive = null, missiveBuffers = [], figures = [], figureKeys, error = null;
+  let truncated = false, dropped = { stdout: 0, stderr: 0 }, metrics = null, displayEntry = null;
+  let packageLoad = { ms: 0, packages: [] }, interrupted = false, capturesReset = false;
+
+  // Streamed chunks (output_chunk, emit_batch messages) are tagged with this id
+  workerState.currentRequestId = id;
+  workerState.emitWindow = emit?.maxInFlight ?? 8;
+
+  try {
+    // Transform code for async execution if needed
+    const result = transformCodeForExecution(code, workerState);
+
+    // Packages the code imports are fetched before the run (and before the
+    // capture reset, so their loading is not charged to the code)
+    if (workerState.autoLoadImports && result.runner) {
+      packageLoad = await preloadImports(result.runner, workerState);
+    }
+
+    resetCaptures(workerState, data);
+    capturesReset = true;
+
+    // Always execute asynchronously: it handles synchronous code identically
+    // and enables top-level await in any user code (asyncio, httpx/ASGI,
+    // transformed input() calls, ...). The code arrives compiled (from the
+    // cache when the same source ran before) and is evaluated against the
+    // target globals with the semantics of runPythonAsync, which only runs
+    // sources that do not parse. Both return the value of a trailing
+    // expression, kept for the display mode
+    let value;
+    // A named namespace is used in place: no conversion, and what the code
+    // assigns stays there for the next run
+    const pyodideNamespace = namespace !== undefined ? workerState.pyodide.toPy(namespace) : undefined;
+    const globals = namespaceRef !== undefined
+      ? namedNamespace(workerState, namespaceRef)
+      : pyodideNamespace ?? workerState.pyodide.globals;
+    try {
+      if (result.runner && budget) {
+        value = await runBudgeted(workerState, result.runner, globals, budget);
+      } else if (result.runner) {
+        value = await runCompiled(result.runner, globals);
+      } else {
+        value = await workerState.pyodide.runPythonAsync(result.code, { globals });
       }
-    }, _callee, null, [[3,, 4, 5], [2, 8]]);
-  }));
-  return _handleExecute.apply(this, arguments);
+    } finally {
+      pyodideNamespace?.destroy();
+      result.runner?.destroy();
+    }
+
+    ({ stdout, stderr, missive, missiveBuffers, figures, figureKeys, truncated, dropped, metrics } =
+      captureOutputs(workerState, false, figureOptions, binaryMissive));
+
+    // Rendered after the metrics were read: repr work is not charged to the code
+    displayEntry = display ? captureDisplay(workerState, value, display) : null;
+    value?.destroy?.();
+
+  } catch (err) {
+    // A spent budget is a regular result: the worker is free for the next run
+    const name = err.type === "BudgetExceeded" ? "BudgetExceeded" : err.name || "PythonError";
+    error = { name, message: err.message || "Unknown execution error" };
+    interrupted = err.type === "KeyboardInterrupt";
+    // Before the reset (compile, package preload), the capture buffers
+    // still hold the previous execution: this one has no output yet
+    if (capturesReset) {
+      ({ stdout, stderr, figures, truncated, dropped, metrics } = captureOutputs(workerState, true));
+    }
+  }
+
+  if (metrics) {
+    metrics = {
+      ...metrics,
+      heapBytesBefore,
+      heapBytesAfter: wasmHeapBytes(workerState),
+      figureCount: figures.length,
+      compileCacheHits: workerState.codeTransformation.cache_hits,
+      compileCacheMisses: workerState.codeTransformation.cache_misses,
+      packageLoadMs: packageLoad.ms,
+      packagesAutoLoaded: packageLoad.packages,
+      budgetUsed: budget ? workerState.executionBudget.budget_used() : null,
+    };
+  }
+
+  workerState.currentRequestId = null;
+
+  // Default-namespace runs persist their globals, so a rebinding of the
+  // exposed builtins (missive, input) outlives this execution: warn once
+  if (namespace === undefined && namespaceRef === undefined) {
+    warnShadowedBuiltins(workerState, filename);
+  }
+
+  return {
+    result: {
+      filename, stdout, stderr, missive, figures, figureKeys, error, truncated, dropped, metrics,
+      display: displayEntry,
+      figureFormat: figureOptions?.lazy ? "handle" : (figureOptions?.format ?? "base64"),
+      time: Date.now() - start,
+      executedWithNamespace: namespace !== undefined || namespaceRef !== undefined
+    },
+    transfer: transferablesOf([...figures, ...missiveBuffers, displayEntry?.data]),
+    interrupted,
+  };
+}
+
+/**
+ * Render the value of the trailing expression through its richest
+ * _repr_*_ method (capture_system.get_display). A failing repr must not
+ * fail the execution: it is reported as a warning
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {any} value - runPythonAsync return value (PyProxy or converted primitive)
+ * @param {DisplayOptions} display - Byte cap and pandas row window
+ * @returns {DisplayEntry|null} Display entry, null when there is no value
+ */
+function captureDisplay(workerState, value, display) {
+  if (value === undefined) return null;
+  try {
+    const entry = workerState.captureSystem.get_display.callKwargs(value, {
+      max_bytes: display.maxBytes ?? 1_000_000,
+      max_rows: display.maxRows ?? 60,
+    });
+    if (!entry) return null;
+    const converted = entry.toJs({ dict_converter: Object.fromEntries });
+    entry.destroy();
+    return converted;
+  } catch (e) {
+    postWarning(`Could not display the last expression: ${e.message}`);
+    return null;
+  }
+}
+
+/**
+ * Collect the distinct ArrayBuffers behind binary payloads, for the
+ * postMessage transfer list
+ *
+ * @param {Array<string|Uint8Array>} payloads - Result payloads (strings are skipped)
+ * @returns {ArrayBuffer[]} Buffers to transfer
+ */
+function transferablesOf(payloads) {
+  const buffers = new Set();
+  for (const payload of payloads) {
+    if (payload && ArrayBuffer.isView(payload)) buffers.add(payload.buffer);
+  }
+  return [...buffers];
+}
+
+/**
+ * Handle an on-demand figure render (figures kept open by a lazy execution)
+ * Replies with figure_result, the payload in the transfer list when binary
+ *
+ * @param {RenderFigureMessage} data - Render request
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<void>}
+ */
+async function handleRenderFigure(data, workerState) {
+  if (!validateInitialized(workerState, data.id)) return;
+
+  const { id, num, format = "png", dpi = 100, width, tight = true } = data;
+  try {
+    const rendered = withoutPendingInterrupt(workerState,
+      () => workerState.captureSystem.render_figure.callKwargs(num, { format, dpi, width, tight }));
+    let figure = rendered;
+    if (rendered && rendered.toJs) {
+      figure = rendered.toJs();
+      rendered.destroy();
+    }
+    self.postMessage({ type: "figure_result", id, num, format, figure }, transferablesOf([figure]));
+  } catch (err) {
+    postError(`Failed to render figure ${num}: ${err.message}`, id);
+  }
+}
+
+/**
+ * Handle a syntax check (live editors): parse the code without running it.
+ * Goes through the compile cache shared with executions, leaves captures
+ * and globals alone. Synchronous, so it is served as soon as the worker's
+ * event loop is free, even while an execution awaits (input(), asyncio)
+ *
+ * @param {CheckMessage} data - Check request
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {void}
+ */
+function handleCheck(data, workerState) {
+  if (!validateInitialized(workerState, data.id)) return;
+
+  const { id, code } = data;
+  const start = performance.now();
+  try {
+    // Same rewrite decision as the execution path: the check warms the
+    // cache entry the next run of this source will use
+    const found = withoutPendingInterrupt(workerState,
+      () => workerState.codeTransformation.check_syntax(code, needsInputRewrite(code, workerState)));
+    let error = null;
+    if (found) {
+      error = found.toJs({ dict_converter: Object.fromEntries });
+      found.destroy();
+    }
+    self.postMessage({ type: "check_result", id, valid: error === null, error, time: performance.now() - start });
+  } catch (err) {
+    postError(`Syntax check failed: ${err.message}`, id);
+  }
+}
+
+/**
+ * Handle a reset: put the interpreter back in its post-init state
+ * (interpreter_state.reset_state) without restarting the worker. The
+ * manager queues it like an execution, so no code is running
+ *
+ * @param {ResetMessage} data - Reset request
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {void}
+ */
+function handleReset(data, workerState) {
+  if (!validateInitialized(workerState, data.id)) return;
+
+  const { id, scratchDir } = data;
+  const start = performance.now();
+  try {
+    const stats = withoutPendingInterrupt(workerState,
+      () => workerState.interpreterState.reset_state(workerState.pyodide.globals, scratchDir ?? null));
+    const { globalsRemoved, modulesEvicted } = stats.toJs({ dict_converter: Object.fromEntries });
+    stats.destroy();
+    // Shadowing warnings apply to the next student's code again, and named
+    // namespaces hold the previous one's variables
+    workerState.shadowWarnedNames.clear();
+    clearNamespaces(workerState);
+    self.postMessage({ type: "reset_result", id, globalsRemoved, modulesEvicted, time: performance.now() - start });
+  } catch (err) {
+    postError(`Reset failed: ${err.message}`, id);
+  }
+}
+
+/**
+ * Reset the capture layer for a new execution, in streaming mode when the
+ * request asked for it (stdout/stderr then leave as output_chunk messages
+ * while the code runs, instead of one string in the result), bounded to
+ * a head and a tail when it carries an output limit, delivering emit()
+ * records as emit_batch messages when it has an emit listener, and
+ * tracing Python allocations when it asks for the memory peak
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {ExecuteMessage} data - Execution request (stream, outputLimit, emit, traceMemory)
+ * @returns {void}
+ */
+function resetCaptures(workerState, data) {
+  const { stream, outputLimit, emit, traceMemory } = data;
+  const raw = workerState.rawCapture;
+  if (!raw && !stream && !outputLimit && !emit && !traceMemory) {
+    workerState.captureSystem.reset_captures();
+    return;
+  }
+  const kwargs = {};
+  if (raw) {
+    // Raw backend: limits and streaming are applied to the fd bytes here,
+    // the Python side only keeps the interpreter's own streams in place
+    resetRawCapture(raw, stream, outputLimit);
+    kwargs.redirect = false;
+    kwargs.streaming = !!stream;
+  } else if (stream) {
+    kwargs.streaming = true;
+    kwargs.chunk_size = stream.chunkSize ?? 8192;
+    kwargs.flush_interval = (stream.flushIntervalMs ?? 50) / 1000;
+  }
+  if (outputLimit && !raw) {
+    kwargs.head_limit = outputLimit.head;
+    kwargs.tail_limit = outputLimit.tail ?? 0;
+  }
+  if (emit) {
+    kwargs.emitting = true;
+    kwargs.emit_batch_size = emit.batchSize ?? 64;
+    kwargs.emit_flush_interval = (emit.flushIntervalMs ?? 50) / 1000;
+  }
+  if (traceMemory) {
+    kwargs.trace_memory = true;
+  }
+  workerState.captureSystem.reset_captures.callKwargs(kwargs);
+}
+
+/**
+ * Run Python outside an execution with the interrupt buffer cleared: a
+ * SIGINT left by a run that already ended (timeout or abort racing its
+ * completion) would raise KeyboardInterrupt in the wrong place. A SIGINT
+ * meant for an execution still in progress (awaiting input() or asyncio
+ * while a check or a render is served) is put back afterwards
+ *
+ * @template T
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {function(): T} fn - Synchronous Python work
+ * @returns {T} Value returned by fn
+ */
+function withoutPendingInterrupt(workerState, fn) {
+  const buffer = workerState.interruptBuffer;
+  if (!buffer) return fn();
+  const pending = workerState.currentRequestId !== null ? buffer[0] : 0;
+  buffer[0] = 0;
+  try {
+    return fn();
+  } finally {
+    if (pending) buffer[0] = pending;
+  }
+}
+
+/**
+ * Current size of the WebAssembly memory (it only ever grows)
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {number|null} Heap size in bytes, null if unavailable
+ */
+function wasmHeapBytes(workerState) {
+  return workerState.pyodide?._module?.HEAPU8?.byteLength ?? null;
+}
+
+/** Longest wait for the main thread to consume emit batches: past it the
+ *  rest of the execution posts its batches without flow control */
+const EMIT_STALL_TIMEOUT_MS = 5000;
+
+/**
+ * Post one emit() batch, then apply backpressure: with a shared ack counter
+ * (cross-origin isolated pages), block while more than emitWindow batches
+ * are unacknowledged by the main thread. Python runs synchronously here, so
+ * Atomics.wait is the only way to let the consumer catch up; without the
+ * counter batches are posted unthrottled. The wait ends on an interrupt
+ * (KeyboardInterrupt raised into the emitting code) or after
+ * EMIT_STALL_TIMEOUT_MS without progress (a manager that stopped acking)
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {string} records - JSON array of the batch records
+ * @returns {void}
+ */
+function postEmitBatch(workerState, records) {
+  self.postMessage({ type: "emit_batch", id: workerState.currentRequestId, records });
+  workerState.emitSent += 1;
+
+  const ack = workerState.emitAck;
+  if (!ack) return;
+  let acked = Atomics.load(ack, 0);
+  let deadline = Date.now() + EMIT_STALL_TIMEOUT_MS;
+  while (workerState.emitSent - acked > workerState.emitWindow) {
+    // Python is blocked in this call: the interrupt buffer is only seen if
+    // it is checked here
+    if (workerState.interruptBuffer?.[0]) {
+      workerState.pyodide.checkInterrupt();
+      return;
+    }
+    if (Date.now() > deadline) {
+      workerState.emitWindow = Infinity;
+      postWarning(`emit(): no batch consumed for ${EMIT_STALL_TIMEOUT_MS / 1000} seconds, flow control disabled for this execution`);
+      return;
+    }
+    Atomics.wait(ack, 0, acked, 100);
+    const now = Atomics.load(ack, 0);
+    if (now !== acked) deadline = Date.now() + EMIT_STALL_TIMEOUT_MS;
+    acked = now;
+  }
 }
+
+/**
+ * Transform code for execution, handling input() calls if present
+ * @param {string} code - The original Python code
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Object} - {code: originalCode, runner: compiled CodeRunner PyProxy or null, needsAsync: boolean}
+ */
 function transformCodeForExecution(code, workerState) {
+  const needsAsync = needsInputRewrite(code, workerState);
+
+  // Compiled (and rewritten when needed) in one pass on the AST, through the
+  // module reference (immune to user code rebinding the name), or served by
+  // the compile cache keyed on the source and the rewrite. Line numbers stay
+  // those of the source; a syntax error yields no runner and the source runs
+  // as-is so the error is reported unchanged
+  const runner = workerState.codeTransformation.compile_for_execution(code, needsAsync);
+  return { code, runner: runner ?? null, needsAsync };
+}
+
+/**
+ * Whether the input() calls of the code must be rewritten into await input()
+ * @param {string} code - The original Python code
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {boolean} True in async input mode when the code calls input(
+ */
+function needsInputRewrite(code, workerState) {
   // En mode jspi, input() bloque nativement via run_sync : aucun besoin de
   // réécrire le code. En mode async (pas de JSPI), le gate ne match que les
   // vrais appels input(, pas some_func__input( ni obj.input( ; la réécriture
   // réelle en await input() est faite côté Python sur l'AST.
-  var needsAsync = workerState.inputMode !== "jspi" && /(?<![\w.])input\s*\(/.test(code);
-  if (needsAsync) {
-    // Transform the code using the Python transformation, called through the
-    // module reference (immune to user code rebinding the name)
-    var transformedCode = workerState.codeTransformation.transform_code_for_execution(code);
-    return {
-      code: transformedCode,
-      needsAsync: true
-    };
-  } else {
-    // Return original code as-is
-    return {
-      code: code,
-      needsAsync: false
+  return workerState.inputMode !== "jspi" && /(?<![\w.])input\s*\(/.test(code);
+}
+
+/**
+ * Load the packages imported by compiled code (runner.imports, scanned from
+ * the AST at compile time and cached with it) that are not loaded yet
+ *
+ * @param {Object} runner - Compiled CodeRunner PyProxy
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<{ms: number, packages: string[]}>} Time spent and packages loaded
+ */
+async function preloadImports(runner, workerState) {
+  const start = performance.now();
+  const importsProxy = runner.imports;
+  const imports = importsProxy.toJs();
+  importsProxy.destroy();
+  const packages = await loadImportedPackages(imports, workerState);
+  if (packages.length > 0) {
+    // Same setup as packages listed at init (matplotlib backend, ...)
+    const loaded = workerState.pyodide.toPy(packages);
+    try {
+      workerState.pyodideUtilities.configure_loaded_packages(loaded);
+    } finally {
+      loaded.destroy();
+    }
+  }
+  return { ms: performance.now() - start, packages };
+}
+
+/**
+ * Evaluate a compiled CodeRunner against target globals. Like
+ * runPythonAsync, enter through callPromising when Pyodide provides it, so
+ * that JSPI stack switching (blocking input()) works inside the code
+ *
+ * @param {Object} runner - Compiled CodeRunner PyProxy
+ * @param {Object} globals - Globals dict PyProxy
+ * @returns {Promise<any>} Value of the trailing expression
+ */
+async function runCompiled(runner, globals) {
+  const runAsync = runner.run_async;
+  try {
+    return await (runAsync.callPromising ? runAsync.callPromising(globals) : runAsync(globals));
+  } finally {
+    runAsync.destroy();
+  }
+}
+
+/**
+ * Evaluate a compiled CodeRunner under a line budget
+ * (execution_budget.run_with_budget): past the budget, BudgetExceeded is
+ * raised inside Python and the run ends as an ordinary error. Entered like
+ * runCompiled, through callPromising when available
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {Object} runner - Compiled CodeRunner PyProxy
+ * @param {Object} globals - Globals dict PyProxy
+ * @param {number} budget - Lines the code may execute
+ * @returns {Promise<any>} Value of the trailing expression
+ */
+async function runBudgeted(workerState, runner, globals, budget) {
+  const runWithBudget = workerState.executionBudget.run_with_budget;
+  try {
+    return await (runWithBudget.callPromising
+      ? runWithBudget.callPromising(runner, globals, budget)
+      : runWithBudget(runner, globals, budget));
+  } finally {
+    runWithBudget.destroy();
+  }
+}
+
+/**
+ * Capture Python outputs (stdout, stderr, missive, figures)
+ * Retrieves execution outputs through the capture_system module reference,
+ * never by name lookup in the interpreter globals: user code rebinding
+ * get_stdout, get_missive or json cannot corrupt the capture
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {boolean} [isErrorCase=false] - Whether this is capturing after an error
+ * @param {FigureOptions} [figureOptions={}] - Figure format and resolution
+ * @param {boolean} [binaryMissive=false] - Return the missive as an object with typed arrays instead of a JSON string
+ * @returns {CapturedOutputs} Object containing stdout, stderr, missive, and figures
+ */
+function captureOutputs(workerState, isErrorCase = false, figureOptions = {}, binaryMissive = false) {
+  const capture = workerState.captureSystem;
+  let stdout = "", stderr = "", missive = null, missiveBuffers = [], figures = [], figureKeys;
+  let truncated = false, dropped = { stdout: 0, stderr: 0 }, metrics = null;
+
+  try {
+    // Read the counters first: capture work (figure rendering, missive
+    // serialization) is not charged to the user code
+    const metricsProxy = capture.get_metrics();
+    const counters = metricsProxy.toJs({ dict_converter: Object.fromEntries });
+    metricsProxy.destroy();
+    metrics = {
+      cpuTimeMs: counters.cpu_time * 1000,
+      peakMemoryBytes: counters.peak_memory ?? null,
+      gcCollections: counters.gc_collections,
+      stdoutBytes: counters.stdout_bytes,
+      stderrBytes: counters.stderr_bytes,
     };
+
+    // Streamed runs: send the tail still pending, the buffers end up empty.
+    // Queued emit() records go out before the result as well
+    capture.flush_streams();
+    capture.flush_emits();
+
+    const raw = workerState.rawCapture;
+    if (raw) {
+      flushRawCapture(raw);
+      stdout = raw.stdout.getvalue();
+      stderr = raw.stderr.getvalue();
+      dropped = { stdout: raw.stdout.dropped, stderr: raw.stderr.dropped };
+      metrics.stdoutBytes = raw.stdout.written;
+      metrics.stderrBytes = raw.stderr.written;
+    } else {
+      stdout = capture.get_stdout() || "";
+      stderr = capture.get_stderr() || "";
+
+      const statsProxy = capture.get_capture_stats();
+      const stats = statsProxy.toJs({ dict_converter: Object.fromEntries });
+      statsProxy.destroy();
+      dropped = { stdout: stats.stdout.dropped, stderr: stats.stderr.dropped };
+    }
+    truncated = dropped.stdout > 0 || dropped.stderr > 0;
+
+    if (!isErrorCase) {
+      if (binaryMissive) {
+        ({ missive, buffers: missiveBuffers } = readBinaryMissive(capture));
+      } else {
+        const missiveJson = capture.get_missive();
+        if (missiveJson) {
+          // Keep as string - get_missive() already returns JSON string via json.dumps()
+          missive = missiveJson;
+        }
+      }
+
+      // Capture matplotlib figures
+      if (!figureOptions.discard) {
+        try {
+          // bytes entries (png/svg) convert to Uint8Array, str (base64) to
+          // string, lazy handles (dicts) to plain objects
+          const figuresResult = capture.get_figures.callKwargs({
+            format: figureOptions.format ?? "base64",
+            dpi: figureOptions.dpi ?? 100,
+            lazy: !!figureOptions.lazy,
+            dedup: !!figureOptions.dedup,
+            known: figureOptions.known ?? []
+          });
+          if (figuresResult && figuresResult.toJs) {
+            figures = figuresResult.toJs({ dict_converter: Object.fromEntries });
+            figuresResult.destroy();
+          } else if (Array.isArray(figuresResult)) {
+            figures = figuresResult;
+          }
+          if (figureOptions.dedup && !figureOptions.lazy) {
+            // Dedup entries split into parallel arrays: payload (null when
+            // the consumer already has it) and content key
+            figureKeys = figures.map((entry) => entry.key);
+            figures = figures.map((entry) => entry.data ?? null);
+          }
+        } catch (e) {
+          console.warn("🐍 Failed to capture matplotlib figures:", e.message);
+        }
+      }
+    }
+
+    // Figures the result does not carry: closed without rendering
+    if (figureOptions.discard) {
+      capture.close_figures();
+    }
+  } catch (err) {
+    console.warn("🐍 " + PYODIDE_WORKER_CONFIG.MESSAGES.OUTPUT_FAILED, err.message);
+    if (isErrorCase) stderr = `${PYODIDE_WORKER_CONFIG.MESSAGES.OUTPUT_RETRIEVAL_FAILED}: ${err.message}`;
+  }
+
+  return { stdout, stderr, missive, missiveBuffers, figures, figureKeys, truncated, dropped, metrics };
+}
+
+/**
+ * Placeholder key of the binary missive skeleton (capture_system.MISSIVE_BUFFER_KEY)
+ */
+const MISSIVE_BUFFER_KEY = "__nagini_buffer__";
+
+/**
+ * Read the missive with its arrays out of band: the JSON skeleton is parsed
+ * and every placeholder replaced by a typed array copied once out of the
+ * Python buffer (Float64Array for float64, Int32Array for int32, ...)
+ *
+ * @param {Object} capture - capture_system module proxy
+ * @returns {{missive: Object|null, buffers: ArrayBufferView[]}} Materialized missive and its arrays
+ */
+function readBinaryMissive(capture) {
+  const packed = capture.get_missive_binary();
+  if (!packed) return { missive: null, buffers: [] };
+
+  try {
+    const bufferList = packed.get("buffers");
+    const buffers = [];
+    try {
+      for (let i = 0; i < bufferList.length; i++) {
+        const item = bufferList.get(i);
+        const view = item.getBuffer();
+        try {
+          // slice() copies out of the WASM heap into a transferable buffer
+          buffers.push(view.data.slice());
+        } finally {
+          view.release();
+          item.destroy();
+        }
+      }
+    } finally {
+      bufferList.destroy();
+    }
+    return { missive: materializeMissive(JSON.parse(packed.get("skeleton")), buffers), buffers };
+  } finally {
+    packed.destroy();
   }
 }
 
 /**
- * Capture Python outputs (stdout, stderr, missive, figures)
- * Retrieves execution outputs through the capture_system module reference,
- * never by name lookup in the interpreter globals: user code rebinding
- * get_stdout, get_missive or json cannot corrupt the capture
+ * Replace the placeholders of a parsed missive skeleton by their arrays
+ * One-dimensional arrays and bytes become the typed array itself, other
+ * shapes {data, dtype, shape} with data flat in C order
  *
- * @param {WorkerState} workerState - Current worker state object
- * @param {boolean} [isErrorCase=false] - Whether this is capturing after an error
- * @returns {CapturedOutputs} Object containing stdout, stderr, missive, and figures
+ * @param {*} node - Parsed skeleton value
+ * @param {ArrayBufferView[]} buffers - Arrays by placeholder index
+ * @returns {*} Value with arrays in place
  */
-function captureOutputs(workerState) {
-  var isErrorCase = arguments.length > 1 && arguments[1] !== undefined ? arguments[1] : false;
-  var capture = workerState.captureSystem;
-  var stdout = "",
-    stderr = "",
-    missive = null,
-    figures = [];
-  try {
-    stdout = capture.get_stdout() || "";
-    stderr = capture.get_stderr() || "";
-    if (!isErrorCase) {
-      var missiveJson = capture.get_missive();
-      if (missiveJson) {
-        // Keep as string - get_missive() already returns JSON string via json.dumps()
-        missive = missiveJson;
-      }
+function materializeMissive(node, buffers) {
+  if (Array.isArray(node)) return node.map((item) => materializeMissive(item, buffers));
+  if (node === null || typeof node !== "object") return node;
 
-      // Capture matplotlib figures
-      try {
-        var figuresResult = capture.get_figures();
-        if (figuresResult && figuresResult.toJs) {
-          figures = figuresResult.toJs();
-          figuresResult.destroy();
-        } else if (Array.isArray(figuresResult)) {
-          figures = figuresResult;
-        }
-      } catch (e) {
-        console.warn("🐍 Failed to capture matplotlib figures:", e.message);
-      }
-    }
-  } catch (err) {
-    console.warn("🐍 " + worker_config_PYODIDE_WORKER_CONFIG.MESSAGES.OUTPUT_FAILED, err.message);
-    if (isErrorCase) stderr = "".concat(worker_config_PYODIDE_WORKER_CONFIG.MESSAGES.OUTPUT_RETRIEVAL_FAILED, ": ").concat(err.message);
+  if (MISSIVE_BUFFER_KEY in node) {
+    const data = buffers[node[MISSIVE_BUFFER_KEY]];
+    return node.shape.length === 1 ? data : { data, dtype: node.dtype, shape: node.shape };
   }
-  return {
-    stdout: stdout,
-    stderr: stderr,
-    missive: missive,
-    figures: figures
-  };
+  for (const key of Object.keys(node)) {
+    node[key] = materializeMissive(node[key], buffers);
+  }
+  return node;
 }
 
 /**
@@ -332,22 +1538,18 @@ function captureOutputs(workerState) {
  */
 function warnShadowedBuiltins(workerState, filename) {
   try {
-    var result = workerState.captureSystem.detect_shadowed_names(workerState.pyodide.globals);
-    var shadowed = result.toJs ? result.toJs() : result;
+    const result = workerState.captureSystem.detect_shadowed_names(workerState.pyodide.globals);
+    const shadowed = result.toJs ? result.toJs() : result;
     if (result.destroy) result.destroy();
-    var _iterator = _createForOfIteratorHelper(shadowed),
-      _step;
-    try {
-      for (_iterator.s(); !(_step = _iterator.n()).done;) {
-        var name = _step.value;
-        if (workerState.shadowWarnedNames.has(name)) continue;
-        workerState.shadowWarnedNames.add(name);
-        postWarning("The global name \"".concat(name, "\" was rebound by user code (").concat(filename, ") and now shadows ") + "the built-in ".concat(name, "(). It persists across executions: later code cannot call the ") + "built-in until the shadow is removed (del ".concat(name, ")."));
-      }
-    } catch (err) {
-      _iterator.e(err);
-    } finally {
-      _iterator.f();
+
+    for (const name of shadowed) {
+      if (workerState.shadowWarnedNames.has(name)) continue;
+      workerState.shadowWarnedNames.add(name);
+      postWarning(
+        `The global name "${name}" was rebound by user code (${filename}) and now shadows ` +
+        `the built-in ${name}(). It persists across executions: later code cannot call the ` +
+        `built-in until the shadow is removed (del ${name}).`
+      );
     }
   } catch (e) {
     // Diagnostic only: never let it affect the execution result
@@ -356,24 +1558,9 @@ function warnShadowedBuiltins(workerState, filename) {
 
 // Helper functions for messaging: the request id (when present) is echoed
 // back so the manager can correlate the response with its pending promise
-var postResult = function postResult(data) {
-  return self.postMessage(_objectSpread({
-    type: "result"
-  }, data));
-};
-var postError = function postError(message, id) {
-  return self.postMessage({
-    type: "error",
-    id: id,
-    message: "\uD83D\uDC0D [Worker] ".concat(message)
-  });
-};
-var postWarning = function postWarning(message) {
-  return self.postMessage({
-    type: "warning",
-    message: "\uD83D\uDC0D [Worker] ".concat(message)
-  });
-};
+const postResult = (data, transfer = []) => self.postMessage({ type: "result", ...data }, transfer);
+const postError = (message, id) => self.postMessage({ type: "error", id, message: `🐍 [Worker] ${message}` });
+const postWarning = (message) => self.postMessage({ type: "warning", message: `🐍 [Worker] ${message}` });
 
 /**
  * Validate that worker is properly initialized
@@ -383,7 +1570,7 @@ var postWarning = function postWarning(message) {
  */
 function validateInitialized(workerState, id) {
   if (!workerState.isInitialized || !workerState.pyodide) {
-    postError(worker_config_PYODIDE_WORKER_CONFIG.MESSAGES.NOT_INITIALIZED, id);
+    postError(PYODIDE_WORKER_CONFIG.MESSAGES.NOT_INITIALIZED, id);
     return false;
   }
   return true;
@@ -395,14 +1582,143 @@ function validateInitialized(workerState, id) {
  * @property {string} filename - Name for execution tracking
  * @property {string} code - Python code to execute
  * @property {Object} [namespace] - Optional namespace for execution
+ * @property {string} [namespaceRef] - Named namespace to run in (created with a namespace_operation)
+ * @property {StreamOptions} [stream] - Stream stdout/stderr as output_chunk messages
+ * @property {OutputLimit} [outputLimit] - Keep only a head and a tail of each stream
+ * @property {FigureOptions} [figureOptions] - Format and resolution of captured figures
+ * @property {boolean} [binaryMissive] - Send the missive as an object with its arrays out of band
+ * @property {EmitOptions} [emit] - Deliver emit() records as emit_batch messages
+ * @property {boolean} [traceMemory] - Record the peak of Python allocations (tracemalloc)
+ * @property {DisplayOptions} [display] - Capture the trailing expression value like a notebook
+ * @property {number} [budget] - Lines the code may execute before BudgetExceeded is raised
+ */
+
+/**
+ * @typedef {Object} CheckMessage
+ * @property {'check'} type - Message type
+ * @property {number} id - Request id
+ * @property {string} code - Python code to parse
+ */
+
+/**
+ * @typedef {Object} ExecuteManyMessage
+ * @property {'execute_many'} type - Message type
+ * @property {number} id - Request id
+ * @property {string} code - Python code, compiled once
+ * @property {Array<Object>} [rows] - One namespace object per case
+ * @property {Object<string, Array>} [columns] - One array per variable, case i reading element i of each
+ * @property {number} [budget] - Line budget of each case
+ * @property {OutputLimit} [outputLimit] - Per-stream caps of each case
+ */
+
+/**
+ * @typedef {Object} ExecuteBatchMessage
+ * @property {'execute_batch'} type - Message type
+ * @property {number} id - Request id (tags batch_results and batch_done)
+ * @property {Array<{filename: string, code: string, namespace?: Object}>} items - Executions, run in order
+ * @property {number} [resultBatchSize=32] - Post results once this many are pending
+ * @property {number} [flushIntervalMs=50] - Post results when this long has passed since the last post
+ * @property {number} [budget] - Line budget of each item
+ * @property {OutputLimit} [outputLimit] - Per-stream caps of each item
+ */
+
+/**
+ * @typedef {Object} ResetMessage
+ * @property {'reset'} type - Message type
+ * @property {number} id - Request id
+ * @property {string} [scratchDir] - Directory emptied by the reset
+ */
+
+/**
+ * @typedef {Object} DisplayOptions
+ * @property {number} [maxBytes=1000000] - Representations larger than this are skipped (plain text is cut)
+ * @property {number} [maxRows=60] - Row window for pandas DataFrame/Series
+ */
+
+/**
+ * @typedef {Object} DisplayEntry
+ * @property {string} mime - text/html, image/svg+xml, image/png, text/latex, text/markdown or text/plain
+ * @property {string|Uint8Array} data - The representation (bytes for image/png)
+ * @property {string} text - Plain repr() of the value, as a fallback
+ */
+
+/**
+ * @typedef {Object} FigureOptions
+ * @property {'base64'|'png'|'svg'} [format='base64'] - base64 PNG strings, or raw PNG/SVG bytes as transferable Uint8Arrays
+ * @property {number} [dpi=100] - Raster resolution
+ * @property {boolean} [lazy=false] - Return figure handles and keep the figures open for render_figure
+ * @property {boolean} [dedup=false] - Send null instead of payloads whose content key is in known
+ * @property {string[]} [known] - Content keys whose payload the main thread already holds (dedup)
+ * @property {boolean} [discard=false] - Close the figures without rendering them (executeMany results carry none)
+ */
+
+/**
+ * @typedef {Object} RenderFigureMessage
+ * @property {'render_figure'} type - Message type
+ * @property {number} id - Request id
+ * @property {number} num - Figure number from a lazy handle
+ * @property {'base64'|'png'|'svg'} [format='png'] - Output format
+ * @property {number} [dpi=100] - Raster resolution (ignored when width is set)
+ * @property {number} [width] - Target raster width in pixels
+ * @property {boolean} [tight=true] - Crop to the drawn area (one extra draw pass)
+ */
+
+/**
+ * @typedef {Object} OutputLimit
+ * @property {number} head - Characters kept from the start of each stream
+ * @property {number} [tail=0] - Characters kept from the end once head is full
+ */
+
+/**
+ * @typedef {Object} EmitOptions
+ * @property {number} [batchSize=64] - Send a batch once this many records are queued
+ * @property {number} [flushIntervalMs=50] - Send a batch when this long has passed since the last one
+ * @property {number} [maxInFlight=8] - Unacknowledged batches allowed before emit() blocks (shared ack counter only)
+ */
+
+/**
+ * @typedef {Object} StreamOptions
+ * @property {number} [chunkSize=8192] - Flush once this many characters are pending
+ * @property {number} [flushIntervalMs=50] - Flush when this long has passed since the last chunk
  */
 
 /**
  * @typedef {Object} CapturedOutputs
  * @property {string} stdout - Standard output
  * @property {string} stderr - Standard error
- * @property {string|null} missive - Missive as a JSON string (parse on the consumer side)
- * @property {string[]} figures - Base64 encoded matplotlib figures
+ * @property {string|Object|null} missive - Missive as a JSON string (parse on the consumer side), an object with typed arrays when binaryMissive
+ * @property {ArrayBufferView[]} missiveBuffers - Typed arrays of a binary missive (transfer list)
+ * @property {Array<string|Uint8Array|FigureHandle|null>} figures - Matplotlib figures: base64 strings, PNG/SVG bytes, or lazy handles (null: unchanged, dedup mode)
+ * @property {string[]} [figureKeys] - Content key of each figure (dedup mode)
+ * @property {boolean} truncated - Whether an output limit dropped characters
+ * @property {{stdout: number, stderr: number}} dropped - Characters dropped per stream
+ * @property {ExecutionMetrics|null} metrics - Resource counters of the user code (heap and figure count added by handleExecute)
+ */
+
+/**
+ * @typedef {Object} ExecutionMetrics
+ * @property {number} cpuTimeMs - CPU time of the user code (time.process_time delta)
+ * @property {number|null} peakMemoryBytes - Peak of traced Python allocations, null unless traceMemory
+ * @property {number} gcCollections - Garbage collections run during the execution
+ * @property {number} stdoutBytes - UTF-8 bytes written to stdout (including dropped or streamed ones)
+ * @property {number} stderrBytes - UTF-8 bytes written to stderr
+ * @property {number|null} heapBytesBefore - WebAssembly memory size before the run
+ * @property {number|null} heapBytesAfter - WebAssembly memory size after the run
+ * @property {number} figureCount - Figures captured
+ * @property {number} compileCacheHits - Executions served by the compiled-code cache (worker lifetime)
+ * @property {number} compileCacheMisses - Executions that had to parse and compile (worker lifetime)
+ * @property {number} packageLoadMs - Time spent loading imported packages before the run (autoLoadImports)
+ * @property {string[]} packagesAutoLoaded - Packages loaded for this execution's imports
+ * @property {number|null} budgetUsed - Lines charged to the execution's budget, null without one
+ */
+
+/**
+ * @typedef {Object} FigureHandle
+ * @property {number} num - Figure number (pass to render_figure)
+ * @property {number} width - Width in inches
+ * @property {number} height - Height in inches
+ * @property {number} dpi - Figure dpi
+ * @property {number} artists - Artists across the figure's axes
  */
 
 /**
@@ -412,178 +1728,291 @@ function validateInitialized(workerState, id) {
  * @property {Set<string>} packagesLoaded - Set of loaded package names
  * @property {Object|null} captureSystem - PyProxy of the capture_system module
  * @property {Object|null} codeTransformation - PyProxy of the code_transformation module
+ * @property {Object|null} executionBudget - PyProxy of the execution_budget module
+ * @property {Object|null} interpreterState - PyProxy of the interpreter_state module
  * @property {Set<string>} shadowWarnedNames - Built-in names already reported as shadowed
+ * @property {number|null} currentRequestId - Id of the execution in progress (tags streamed chunks)
+ * @property {Int32Array|null} emitAck - Shared counter of emit batches consumed by the main thread
+ * @property {number} emitSent - emit batches posted so far
+ * @property {number} emitWindow - Unacknowledged emit batches allowed for the current execution
+ * @property {RawCapture|null} rawCapture - Raw fd 1/2 capture (captureBackend 'raw')
+ * @property {boolean} autoLoadImports - Load the packages a snippet imports before running it
+ * @property {Map<string, string>|null} importIndex - Import name → package name (lockfile)
+ * @property {Uint8Array|null} interruptBuffer - Pyodide interrupt buffer shared with the manager
+ * @property {Map<string, Object>} namespaces - Named namespaces (globals dict PyProxies), least recently used first
+ * @property {number} maxNamespaces - Named namespaces kept before the oldest is dropped
  */
-;// ./worker-input.js
-function worker_input_regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return worker_input_regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (worker_input_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, worker_input_regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, worker_input_regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), worker_input_regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", worker_input_regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), worker_input_regeneratorDefine2(u), worker_input_regeneratorDefine2(u, o, "Generator"), worker_input_regeneratorDefine2(u, n, function () { return this; }), worker_input_regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (worker_input_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function worker_input_regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } worker_input_regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { worker_input_regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, worker_input_regeneratorDefine2(e, r, n, t); }
-function worker_input_asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function worker_input_asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { worker_input_asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { worker_input_asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
+
+/***/ }),
+
+/***/ "./worker-raw-capture.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./worker-raw-capture.js
+__nagini_define__(__nagini_exports__, {
+  RawOutputBuffer: () => RawOutputBuffer,
+  installRawCapture: () => installRawCapture,
+  resetRawCapture: () => resetRawCapture,
+  flushRawCapture: () => flushRawCapture,
+});
 /**
- * PyodideWorker Input Module
+ * PyodideWorker Raw Capture Module
  *
- * Handles input requests and responses in the Pyodide worker environment.
+ * Alternative capture backend (manager option captureBackend: 'raw'). The
+ * interpreter keeps its own sys.stdout/sys.stderr and the worker receives
+ * the bytes written to file descriptors 1 and 2 through pyodide.setStdout /
+ * setStderr. Every writer is caught, including C extensions and
+ * os.write(1, ...), and a print costs no Python-level method dispatch.
+ *
+ * The bytes land in a preallocated buffer that doubles when full. Output
+ * limits and streaming follow the Python backend (capture_system
+ * OutputBuffer / CaptureStream), counted in bytes instead of characters.
  */
 
-
+/** Initial capacity of each stream buffer (grows by doubling) */
+const INITIAL_CAPACITY = 64 * 1024;
 
 /**
- * Set up input handling system in Python environment
- *
- * Two modes, picked by browser capability:
- * - "jspi": WebAssembly stack switching (JSPI) lets Pyodide block
- *   synchronously on the JS promise via pyodide.ffi.run_sync. input() then
- *   works anywhere, including inside sync functions, lambdas and class
- *   bodies, and user code runs completely unmodified.
- * - "async": no JSPI, builtins.input is an async handler and genuine
- *   input() calls are rewritten to await input() on the AST before running
- *   (see code_transformation.py).
- *
- * @param {PyodideAPI} pyodide - Pyodide instance
- * @returns {Promise<'jspi'|'async'>} The input mode installed
+ * Byte buffer bounded to a head and a tail, like capture_system.OutputBuffer:
+ * past headLimit bytes only the last tailLimit are kept, in a ring buffer
+ * allocated once per configuration; the bytes in between are counted in
+ * `dropped`
  */
-function setupInputHandling(_x) {
-  return _setupInputHandling.apply(this, arguments);
+class RawOutputBuffer {
+  constructor() {
+    /** @type {Uint8Array} Head bytes not drained yet (_length used) */
+    this._bytes = new Uint8Array(INITIAL_CAPACITY);
+    this._tail = new Uint8Array(0);
+    this.configure();
+  }
+
+  /**
+   * Set the bounds (null = unbounded) and clear the buffer
+   *
+   * @param {number|null} [headLimit=null] - Bytes kept from the start
+   * @param {number} [tailLimit=0] - Bytes kept from the end past the head
+   * @returns {void}
+   */
+  configure(headLimit = null, tailLimit = 0) {
+    this.headLimit = headLimit;
+    this.tailLimit = headLimit === null ? 0 : tailLimit;
+    if (this._tail.length !== this.tailLimit) this._tail = new Uint8Array(this.tailLimit);
+    this.clear();
+  }
+
+  /** @returns {void} */
+  clear() {
+    this._length = 0;
+    this._headSize = 0; // bytes ever accepted into the head
+    this._tailStart = 0;
+    this._tailLength = 0;
+    this._decoder = new TextDecoder();
+    this.written = 0;
+    this.dropped = 0;
+  }
+
+  /**
+   * Append bytes from the interpreter (setStdout write handler)
+   *
+   * @param {Uint8Array} bytes - Bytes written (may be a view on the wasm heap: copied)
+   * @returns {number} Bytes consumed (always all of them)
+   */
+  write(bytes) {
+    this.written += bytes.length;
+    if (this.headLimit === null) {
+      this._append(bytes);
+      return bytes.length;
+    }
+
+    let data = bytes;
+    const room = this.headLimit - this._headSize;
+    if (room > 0) {
+      const take = Math.min(room, data.length);
+      this._append(data.subarray(0, take));
+      this._headSize += take;
+      data = data.subarray(take);
+    }
+    if (data.length > 0) this._pushTail(data);
+    return bytes.length;
+  }
+
+  /** @returns {number} Head bytes waiting to be drained */
+  get pending() {
+    return this._length;
+  }
+
+  _append(data) {
+    const needed = this._length + data.length;
+    if (needed > this._bytes.length) {
+      let capacity = this._bytes.length * 2;
+      while (capacity < needed) capacity *= 2;
+      const grown = new Uint8Array(capacity);
+      grown.set(this._bytes.subarray(0, this._length));
+      this._bytes = grown;
+    }
+    this._bytes.set(data, this._length);
+    this._length = needed;
+  }
+
+  _pushTail(data) {
+    const capacity = this.tailLimit;
+    if (data.length >= capacity) {
+      this.dropped += this._tailLength + data.length - capacity;
+      this._tail.set(data.subarray(data.length - capacity));
+      this._tailStart = 0;
+      this._tailLength = capacity;
+      return;
+    }
+    const overflow = this._tailLength + data.length - capacity;
+    if (overflow > 0) {
+      this.dropped += overflow;
+      this._tailStart = (this._tailStart + overflow) % capacity;
+      this._tailLength -= overflow;
+    }
+    const end = (this._tailStart + this._tailLength) % capacity;
+    const first = Math.min(data.length, capacity - end);
+    this._tail.set(data.subarray(0, first), end);
+    this._tail.set(data.subarray(first), 0);
+    this._tailLength += data.length;
+  }
+
+  _tailText() {
+    if (this._tailLength === 0) return "";
+    const end = this._tailStart + this._tailLength;
+    let bytes = this._tail.subarray(this._tailStart, Math.min(end, this.tailLimit));
+    if (end > this.tailLimit) {
+      // Wrapped ring: unroll it once
+      const unrolled = new Uint8Array(this._tailLength);
+      unrolled.set(bytes);
+      unrolled.set(this._tail.subarray(0, end - this.tailLimit), bytes.length);
+      bytes = unrolled;
+    }
+    // A cut may split a multi-byte character: decoded as U+FFFD
+    return new TextDecoder().decode(bytes);
+  }
+
+  /** @returns {string} Captured text (head, then tail) */
+  getvalue() {
+    return this._decoder.decode(this._bytes.subarray(0, this._length)) + this._tailText();
+  }
+
+  /**
+   * Remove and return the pending head text (streaming). A multi-byte
+   * character split across writes is held back until it is complete. The
+   * tail is only released with final=true
+   *
+   * @param {boolean} [final=false] - End of the execution
+   * @returns {string} Text to stream
+   */
+  drain(final = false) {
+    let text = this._decoder.decode(this._bytes.subarray(0, this._length), { stream: !final });
+    this._length = 0;
+    if (final) {
+      text += this._tailText();
+      this._tailStart = 0;
+      this._tailLength = 0;
+    }
+    return text;
+  }
 }
 
 /**
- * Handle input response from main thread
- * Provides user input to Python code that's waiting for input
+ * Route the interpreter's fd 1/2 into raw buffers. Called once at init,
+ * after the snapshot point (the handlers are JavaScript references)
  *
- * @param {InputResponseMessage} data - Input response message data
  * @param {WorkerState} workerState - Current worker state object
- * @returns {Promise<void>}
+ * @param {function(string, string): void} sendChunk - Posts a streamed chunk (stream name, text)
+ * @returns {RawCapture} Capture state, stored as workerState.rawCapture
  */
-function _setupInputHandling() {
-  _setupInputHandling = worker_input_asyncToGenerator(/*#__PURE__*/worker_input_regenerator().m(function _callee2(pyodide) {
-    var jspi, handlerSnippet, setupNamespace;
-    return worker_input_regenerator().w(function (_context2) {
-      while (1) switch (_context2.n) {
-        case 0:
-          // Create the requestInput function in the worker's global scope
-          self.requestInput = /*#__PURE__*/worker_input_asyncToGenerator(/*#__PURE__*/worker_input_regenerator().m(function _callee() {
-            var prompt,
-              _args = arguments;
-            return worker_input_regenerator().w(function (_context) {
-              while (1) switch (_context.n) {
-                case 0:
-                  prompt = _args.length > 0 && _args[0] !== undefined ? _args[0] : "";
-                  // Send input request to main thread
-                  self.postMessage({
-                    type: "input_required",
-                    prompt: prompt
-                  });
-
-                  // Return a promise that will be resolved when input is received
-                  return _context.a(2, new Promise(function (resolve) {
-                    self.pendingInputResolver = resolve;
-                  }));
-              }
-            }, _callee);
-          }));
-          jspi = typeof WebAssembly !== "undefined" && typeof WebAssembly.Suspending === "function";
-          handlerSnippet = jspi ? "\nimport builtins\nimport sys\nfrom js import requestInput\nfrom pyodide.ffi import run_sync\n\ndef input_handler(prompt=\"\"):\n    # Always print the prompt to stdout first\n    if prompt:\n        print(prompt, end=\"\", flush=True)\n        sys.stdout.flush()\n\n    # Block on the JS promise through wasm stack switching\n    return run_sync(requestInput(prompt))\n\nbuiltins.input = input_handler\n" : "\nimport builtins\nimport sys\nfrom js import requestInput\n\nasync def input_handler(prompt=\"\"):\n    # Always print the prompt to stdout first\n    if prompt:\n        print(prompt, end=\"\", flush=True)\n        sys.stdout.flush()\n\n    # Request input from JavaScript\n    return await requestInput(prompt)\n\nbuiltins.input = input_handler\n"; // The snippet runs in a throwaway namespace: none of its names (sys,
-          // requestInput, input_handler) leak into the interpreter globals where
-          // user code runs, so they cannot be shadowed or rebound from user code.
-          // The handler keeps them alive through its own module-level closure.
-          setupNamespace = pyodide.toPy({});
-          _context2.p = 1;
-          _context2.n = 2;
-          return pyodide.runPythonAsync(handlerSnippet, {
-            globals: setupNamespace
-          });
-        case 2:
-          _context2.p = 2;
-          setupNamespace.destroy();
-          return _context2.f(2);
-        case 3:
-          return _context2.a(2, jspi ? "jspi" : "async");
-      }
-    }, _callee2, null, [[1,, 2, 3]]);
-  }));
-  return _setupInputHandling.apply(this, arguments);
-}
-function handleInputResponse(_x2, _x3) {
-  return _handleInputResponse.apply(this, arguments);
-}
+function installRawCapture(workerState, sendChunk) {
+  const capture = {
+    stdout: new RawOutputBuffer(),
+    stderr: new RawOutputBuffer(),
+    streaming: false,
+    chunkSize: 8192,
+    flushIntervalMs: 50,
+    lastFlush: 0,
+    sendChunk,
+  };
 
-// Helper functions
-function _handleInputResponse() {
-  _handleInputResponse = worker_input_asyncToGenerator(/*#__PURE__*/worker_input_regenerator().m(function _callee3(data, workerState) {
-    var input;
-    return worker_input_regenerator().w(function (_context3) {
-      while (1) switch (_context3.n) {
-        case 0:
-          if (worker_input_validateInitialized(workerState)) {
-            _context3.n = 1;
-            break;
-          }
-          return _context3.a(2);
-        case 1:
-          input = data.input;
-          try {
-            // Resolve the pending input promise if it exists
-            if (self.pendingInputResolver) {
-              self.pendingInputResolver(input);
-              self.pendingInputResolver = null;
-            } else {
-              console.warn("No pending input resolver found");
-            }
-          } catch (err) {
-            console.error("Failed to provide input:", err);
-            worker_input_postError("Failed to provide input: ".concat(err.message));
-          }
-        case 2:
-          return _context3.a(2);
+  const handler = (name) => ({
+    write: (bytes) => {
+      const buffer = capture[name];
+      const written = buffer.write(bytes);
+      if (capture.streaming && (
+        buffer.pending >= capture.chunkSize || performance.now() - capture.lastFlush >= capture.flushIntervalMs
+      )) {
+        capture.lastFlush = performance.now();
+        const text = buffer.drain();
+        if (text) sendChunk(name, text);
       }
-    }, _callee3);
-  }));
-  return _handleInputResponse.apply(this, arguments);
-}
-var worker_input_postError = function postError(message) {
-  return self.postMessage({
-    type: "error",
-    message: "\uD83D\uDC0D [Worker] ".concat(message)
+      return written;
+    },
   });
-};
+  workerState.pyodide.setStdout(handler("stdout"));
+  workerState.pyodide.setStderr(handler("stderr"));
+  return capture;
+}
 
 /**
- * Validate that worker is properly initialized
- * @param {WorkerState} workerState - Current worker state
- * @returns {boolean} True if initialized, false otherwise
+ * Reset the raw buffers for a new execution
+ *
+ * @param {RawCapture} capture - Raw capture state
+ * @param {StreamOptions} [stream] - Streaming thresholds (chunkSize counts bytes here)
+ * @param {OutputLimit} [outputLimit] - Per-stream head/tail caps in bytes
+ * @returns {void}
  */
-function worker_input_validateInitialized(workerState) {
-  if (!workerState.isInitialized || !workerState.pyodide) {
-    worker_input_postError(worker_config_PYODIDE_WORKER_CONFIG.MESSAGES.NOT_INITIALIZED);
-    return false;
+function resetRawCapture(capture, stream, outputLimit) {
+  capture.streaming = !!stream;
+  capture.chunkSize = stream?.chunkSize ?? 8192;
+  capture.flushIntervalMs = stream?.flushIntervalMs ?? 50;
+  capture.lastFlush = performance.now();
+  for (const name of ["stdout", "stderr"]) {
+    capture[name].configure(outputLimit ? outputLimit.head : null, outputLimit?.tail ?? 0);
   }
-  return true;
 }
 
 /**
- * @typedef {Object} InputResponseMessage
- * @property {'input_response'} type - Message type
- * @property {string} input - User input value
+ * End of a streamed run: send what is still pending, the buffers end up empty
+ *
+ * @param {RawCapture} capture - Raw capture state
+ * @returns {void}
  */
+function flushRawCapture(capture) {
+  if (!capture.streaming) return;
+  for (const name of ["stdout", "stderr"]) {
+    const text = capture[name].drain(true);
+    if (text) capture.sendChunk(name, text);
+  }
+}
 
 /**
- * @typedef {Object} WorkerState
- * @property {PyodideAPI|null} pyodide - Pyodide instance
- * @property {boolean} isInitialized - Whether Pyodide is initialized
- * @property {Set<string>} packagesLoaded - Set of loaded package names
+ * @typedef {Object} RawCapture
+ * @property {RawOutputBuffer} stdout - fd 1 buffer
+ * @property {RawOutputBuffer} stderr - fd 2 buffer
+ * @property {boolean} streaming - Whether chunks are posted during the run
+ * @property {number} chunkSize - Streaming: bytes pending before a chunk is sent
+ * @property {number} flushIntervalMs - Streaming: time since the last chunk before one is sent
+ * @property {number} lastFlush - performance.now() of the last chunk
+ * @property {function(string, string): void} sendChunk - Posts a streamed chunk
  */
+
+/***/ }),
+
+/***/ "./worker-fs.js": ((__nagini_exports__, __nagini_require__) => {
 ;// ./worker-fs.js
-function worker_fs_regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return worker_fs_regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (worker_fs_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, worker_fs_regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, worker_fs_regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), worker_fs_regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", worker_fs_regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), worker_fs_regeneratorDefine2(u), worker_fs_regeneratorDefine2(u, o, "Generator"), worker_fs_regeneratorDefine2(u, n, function () { return this; }), worker_fs_regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (worker_fs_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function worker_fs_regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } worker_fs_regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { worker_fs_regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, worker_fs_regeneratorDefine2(e, r, n, t); }
-function worker_fs_asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function worker_fs_asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { worker_fs_asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { worker_fs_asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
+__nagini_define__(__nagini_exports__, {
+  handleFSOperation: () => handleFSOperation,
+  executeFS: () => executeFS,
+  loadPackages: () => loadPackages,
+  loadImportedPackages: () => loadImportedPackages,
+  installLazyImports: () => installLazyImports,
+});
 /**
  * PyodideWorker Filesystem Module
  *
  * Handles filesystem operations and package loading in the Pyodide worker environment.
  */
 
-
+const { PYODIDE_WORKER_CONFIG } = __nagini_require__("./worker-config.js");
 
 /**
  * Handle filesystem operations
@@ -593,8 +2022,18 @@ function worker_fs_asyncToGenerator(n) { return function () { var t = this, e =
  * @param {WorkerState} workerState - Current worker state object
  * @returns {Promise<void>}
  */
-function handleFSOperation(_x, _x2) {
-  return _handleFSOperation.apply(this, arguments);
+async function handleFSOperation(data, workerState) {
+  if (!workerState.isInitialized || !workerState.pyodide) {
+    postFSError(PYODIDE_WORKER_CONFIG.MESSAGES.FS_NOT_INITIALIZED, data.id);
+    return;
+  }
+
+  try {
+    const result = executeFS(data, workerState.pyodide);
+    self.postMessage({ type: "fs_result", id: data.id, result });
+  } catch (error) {
+    postFSError(error.message, data.id);
+  }
 }
 
 /**
@@ -606,80 +2045,28 @@ function handleFSOperation(_x, _x2) {
  * @returns {FSOperationResult} Result of the filesystem operation
  * @throws {Error} If operation is unknown or fails
  */
-function _handleFSOperation() {
-  _handleFSOperation = worker_fs_asyncToGenerator(/*#__PURE__*/worker_fs_regenerator().m(function _callee(data, workerState) {
-    var result;
-    return worker_fs_regenerator().w(function (_context) {
-      while (1) switch (_context.n) {
-        case 0:
-          if (!(!workerState.isInitialized || !workerState.pyodide)) {
-            _context.n = 1;
-            break;
-          }
-          postFSError(worker_config_PYODIDE_WORKER_CONFIG.MESSAGES.FS_NOT_INITIALIZED, data.id);
-          return _context.a(2);
-        case 1:
-          try {
-            result = executeFS(data, workerState.pyodide);
-            self.postMessage({
-              type: "fs_result",
-              id: data.id,
-              result: result
-            });
-          } catch (error) {
-            postFSError(error.message, data.id);
-          }
-        case 2:
-          return _context.a(2);
-      }
-    }, _callee);
-  }));
-  return _handleFSOperation.apply(this, arguments);
-}
 function executeFS(data, pyodide) {
-  var operation = data.operation,
-    path = data.path,
-    content = data.content;
-  var ops = {
-    writeFile: function writeFile() {
+  const { operation, path, content } = data;
+
+  const ops = {
+    writeFile: () => {
       // Ensure directory exists
-      var dir = path.split('/').slice(0, -1).join('/');
+      const dir = path.split('/').slice(0, -1).join('/');
       if (dir && !pyodide.FS.analyzePath(dir).exists) {
-        try {
-          pyodide.FS.mkdir(dir);
-        } catch (e) {/* ignore */}
+        try { pyodide.FS.mkdir(dir); } catch (e) { /* ignore */ }
       }
       pyodide.FS.writeFile(path, content);
-      return {
-        success: true
-      };
-    },
-    readFile: function readFile() {
-      return {
-        content: pyodide.FS.readFile(path, {
-          encoding: 'utf8'
-        })
-      };
+      return { success: true };
     },
-    mkdir: function mkdir() {
-      pyodide.FS.mkdir(path);
-      return {
-        success: true
-      };
-    },
-    exists: function exists() {
-      return {
-        exists: pyodide.FS.analyzePath(path).exists
-      };
-    },
-    listdir: function listdir() {
-      return {
-        files: pyodide.FS.readdir(path)
-      };
-    }
+    readFile: () => ({ content: pyodide.FS.readFile(path, { encoding: 'utf8' }) }),
+    mkdir: () => { pyodide.FS.mkdir(path); return { success: true }; },
+    exists: () => ({ exists: pyodide.FS.analyzePath(path).exists }),
+    listdir: () => ({ files: pyodide.FS.readdir(path) })
   };
-  var op = ops[operation];
-  if (!op) throw new Error("Unknown FS operation: ".concat(operation));
+
+  const op = ops[operation];
+  if (!op) throw new Error(`Unknown FS operation: ${operation}`);
+
   return op();
 }
 
@@ -691,71 +2078,105 @@ function executeFS(data, pyodide) {
  * @param {WorkerState} workerState - Current worker state object
  * @returns {Promise<void>}
  */
-function loadPackages(_x3, _x4) {
-  return _loadPackages.apply(this, arguments);
+async function loadPackages(packages, workerState) {
+  const toLoad = packages.filter(pkg => !workerState.packagesLoaded.has(pkg));
+  const loaded = packages.filter(pkg => workerState.packagesLoaded.has(pkg));
+
+  if (loaded.length > 0) {
+    postInfo(`${PYODIDE_WORKER_CONFIG.MESSAGES.SMART_LOADING} ${loaded.length} already loaded: ${loaded.join(", ")}`);
+  }
+
+  if (toLoad.length > 0) {
+    try {
+      await workerState.pyodide.loadPackage(toLoad);
+      toLoad.forEach(pkg => workerState.packagesLoaded.add(pkg));
+      postInfo(
+        `${PYODIDE_WORKER_CONFIG.MESSAGES.SMART_SUCCESS} ${toLoad.length} new packages: ${toLoad.join(", ")}`
+      );
+    } catch (err) {
+      postWarning(`${PYODIDE_WORKER_CONFIG.MESSAGES.PACKAGE_WARNING} ${err.message}`);
+    }
+  }
+}
+
+/**
+ * Load the packages a snippet imports and that are not loaded yet, in one
+ * loadPackage batch (Pyodide fetches them and their dependencies in
+ * parallel). Import names are mapped to package names through the
+ * lockfile's import index; names it does not know (stdlib, local modules,
+ * micropip installs) are ignored
+ *
+ * @param {string[]} imports - Top-level module names imported by the code
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<string[]>} Packages loaded by this call
+ */
+async function loadImportedPackages(imports, workerState) {
+  const index = importIndexOf(workerState);
+  const alreadyLoaded = workerState.pyodide.loadedPackages ?? {};
+  const missing = new Set();
+  for (const name of imports) {
+    const pkg = index.get(name);
+    if (pkg && !workerState.packagesLoaded.has(pkg) && !(pkg in alreadyLoaded)) missing.add(pkg);
+  }
+  if (missing.size === 0) return [];
+
+  // A failed load is only a warning: the import then fails in the user code
+  await loadPackages([...missing], workerState);
+  return [...missing].filter(pkg => workerState.packagesLoaded.has(pkg));
+}
+
+/**
+ * Install the lazy_imports meta_path finder: an import no installed module
+ * satisfies loads the matching lockfile package and resumes. The finder
+ * blocks on the load through run_sync, so it needs JSPI. Holds JavaScript
+ * references: installed after the snapshot point
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {void}
+ */
+function installLazyImports(workerState) {
+  const lazyImports = workerState.pyodide.pyimport("lazy_imports");
+  const index = workerState.pyodide.toPy(Object.fromEntries(importIndexOf(workerState)));
+  const afterLoad = workerState.pyodideUtilities.configure_loaded_packages;
+  try {
+    lazyImports.install_finder(index, (pkg) => loadPackages([pkg], workerState), afterLoad);
+  } finally {
+    afterLoad.destroy();
+    index.destroy();
+    lazyImports.destroy();
+  }
+}
+
+/**
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Map<string, string>} Import name → package name, built on first use
+ */
+function importIndexOf(workerState) {
+  workerState.importIndex ??= buildImportIndex(workerState.pyodide);
+  return workerState.importIndex;
+}
+
+/**
+ * Map import names to package names from the Pyodide lockfile (each
+ * package lists the top-level modules it provides). Built once per worker
+ *
+ * @param {PyodideAPI} pyodide - Pyodide instance
+ * @returns {Map<string, string>} Import name → package name
+ */
+function buildImportIndex(pyodide) {
+  const packages = pyodide.lockfile?.packages ?? pyodide._api?.lockfile_packages ?? {};
+  const index = new Map();
+  for (const [name, info] of Object.entries(packages)) {
+    for (const importName of info.imports ?? []) index.set(importName, info.name ?? name);
+  }
+  return index;
 }
 
 // Helper functions for messaging: the request id (when present) is echoed
 // back so the manager can correlate the response with its pending promise
-function _loadPackages() {
-  _loadPackages = worker_fs_asyncToGenerator(/*#__PURE__*/worker_fs_regenerator().m(function _callee2(packages, workerState) {
-    var toLoad, loaded, _t;
-    return worker_fs_regenerator().w(function (_context2) {
-      while (1) switch (_context2.n) {
-        case 0:
-          toLoad = packages.filter(function (pkg) {
-            return !workerState.packagesLoaded.has(pkg);
-          });
-          loaded = packages.filter(function (pkg) {
-            return workerState.packagesLoaded.has(pkg);
-          });
-          if (loaded.length > 0) {
-            postInfo("".concat(worker_config_PYODIDE_WORKER_CONFIG.MESSAGES.SMART_LOADING, " ").concat(loaded.length, " already loaded: ").concat(loaded.join(", ")));
-          }
-          if (!(toLoad.length > 0)) {
-            _context2.n = 4;
-            break;
-          }
-          _context2.p = 1;
-          _context2.n = 2;
-          return workerState.pyodide.loadPackage(toLoad);
-        case 2:
-          toLoad.forEach(function (pkg) {
-            return workerState.packagesLoaded.add(pkg);
-          });
-          postInfo("".concat(worker_config_PYODIDE_WORKER_CONFIG.MESSAGES.SMART_SUCCESS, " ").concat(toLoad.length, " new packages: ").concat(toLoad.join(", ")));
-          _context2.n = 4;
-          break;
-        case 3:
-          _context2.p = 3;
-          _t = _context2.v;
-          worker_fs_postWarning("".concat(worker_config_PYODIDE_WORKER_CONFIG.MESSAGES.PACKAGE_WARNING, " ").concat(_t.message));
-        case 4:
-          return _context2.a(2);
-      }
-    }, _callee2, null, [[1, 3]]);
-  }));
-  return _loadPackages.apply(this, arguments);
-}
-var postFSError = function postFSError(error, id) {
-  return self.postMessage({
-    type: "fs_error",
-    id: id,
-    error: "\uD83D\uDD27 [Worker] ".concat(error)
-  });
-};
-var postInfo = function postInfo(message) {
-  return self.postMessage({
-    type: "info",
-    message: "\uD83D\uDD27 [Worker] ".concat(message)
-  });
-};
-var worker_fs_postWarning = function postWarning(message) {
-  return self.postMessage({
-    type: "warning",
-    message: "\uD83D\uDD27 [Worker] ".concat(message)
-  });
-};
+const postFSError = (error, id) => self.postMessage({ type: "fs_error", id, error: `🔧 [Worker] ${error}` });
+const postInfo = (message) => self.postMessage({ type: "info", message: `🔧 [Worker] ${message}` });
+const postWarning = (message) => self.postMessage({ type: "warning", message: `🔧 [Worker] ${message}` });
 
 /**
  * @typedef {Object} FSOperationMessage
@@ -778,1077 +2199,632 @@ var worker_fs_postWarning = function postWarning(message) {
  * @property {PyodideAPI|null} pyodide - Pyodide instance
  * @property {boolean} isInitialized - Whether Pyodide is initialized
  * @property {Set<string>} packagesLoaded - Set of loaded package names
+ * @property {Map<string, string>|null} importIndex - Import name → package name (built on first use)
  */
-;// ./worker-snapshot.js
-function worker_snapshot_createForOfIteratorHelper(r, e) { var t = "undefined" != typeof Symbol && r[Symbol.iterator] || r["@@iterator"]; if (!t) { if (Array.isArray(r) || (t = worker_snapshot_unsupportedIterableToArray(r)) || e && r && "number" == typeof r.length) { t && (r = t); var _n = 0, F = function F() {}; return { s: F, n: function n() { return _n >= r.length ? { done: !0 } : { done: !1, value: r[_n++] }; }, e: function e(r) { throw r; }, f: F }; } throw new TypeError("Invalid attempt to iterate non-iterable instance.\nIn order to be iterable, non-array objects must have a [Symbol.iterator]() method."); } var o, a = !0, u = !1; return { s: function s() { t = t.call(r); }, n: function n() { var r = t.next(); return a = r.done, r; }, e: function e(r) { u = !0, o = r; }, f: function f() { try { a || null == t.return || t.return(); } finally { if (u) throw o; } } }; }
-function worker_snapshot_regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return worker_snapshot_regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (worker_snapshot_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, worker_snapshot_regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, worker_snapshot_regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), worker_snapshot_regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", worker_snapshot_regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), worker_snapshot_regeneratorDefine2(u), worker_snapshot_regeneratorDefine2(u, o, "Generator"), worker_snapshot_regeneratorDefine2(u, n, function () { return this; }), worker_snapshot_regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (worker_snapshot_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function worker_snapshot_regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } worker_snapshot_regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { worker_snapshot_regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, worker_snapshot_regeneratorDefine2(e, r, n, t); }
-function _toConsumableArray(r) { return _arrayWithoutHoles(r) || _iterableToArray(r) || worker_snapshot_unsupportedIterableToArray(r) || _nonIterableSpread(); }
-function _nonIterableSpread() { throw new TypeError("Invalid attempt to spread non-iterable instance.\nIn order to be iterable, non-array objects must have a [Symbol.iterator]() method."); }
-function worker_snapshot_unsupportedIterableToArray(r, a) { if (r) { if ("string" == typeof r) return worker_snapshot_arrayLikeToArray(r, a); var t = {}.toString.call(r).slice(8, -1); return "Object" === t && r.constructor && (t = r.constructor.name), "Map" === t || "Set" === t ? Array.from(r) : "Arguments" === t || /^(?:Ui|I)nt(?:8|16|32)(?:Clamped)?Array$/.test(t) ? worker_snapshot_arrayLikeToArray(r, a) : void 0; } }
-function _iterableToArray(r) { if ("undefined" != typeof Symbol && null != r[Symbol.iterator] || null != r["@@iterator"]) return Array.from(r); }
-function _arrayWithoutHoles(r) { if (Array.isArray(r)) return worker_snapshot_arrayLikeToArray(r); }
-function worker_snapshot_arrayLikeToArray(r, a) { (null == a || a > r.length) && (a = r.length); for (var e = 0, n = Array(a); e < a; e++) n[e] = r[e]; return n; }
-function worker_snapshot_asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function worker_snapshot_asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { worker_snapshot_asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { worker_snapshot_asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
+
+/***/ }),
+
+/***/ "./worker-namespaces.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./worker-namespaces.js
+__nagini_define__(__nagini_exports__, {
+  handleNamespaceOperation: () => handleNamespaceOperation,
+  executeNamespaceOperation: () => executeNamespaceOperation,
+  namedNamespace: () => namedNamespace,
+  clearNamespaces: () => clearNamespaces,
+});
 /**
- * PyodideWorker Snapshot Cache Module
- *
- * Optional interpreter snapshot cache (manager option snapshotCache). The
- * snapshot covers the bare interpreter plus Nagini's embedded Python modules
- * and is taken BEFORE input setup, file loading and package installation:
- * those hold live JavaScript references (hiwire entries) that Pyodide cannot
- * serialize, so they are replayed on every boot instead. Packages therefore
- * still load and import after a restore; only the interpreter boot is saved.
- *
- * The cache key hashes the embedded module sources and includes the Pyodide
- * origin, so changing either invalidates the entry by construction. Every
- * failure path degrades to a fresh boot: the cache can never brick a worker.
+ * PyodideWorker Named Namespaces Module
+ *
+ * Keeps named globals dicts alive in the worker between executions, so a
+ * context is converted once and then patched instead of being rebuilt by
+ * toPy on every run. Values assigned by the code stay in the dict.
+ * Namespaces are kept in least-recently-used order and capped at
+ * workerState.maxNamespaces: the oldest one is dropped past the cap.
  */
 
-var DB_NAME = 'nagini-snapshots';
-var STORE = 'snapshots';
-var KEY_PREFIX = 'nagini-snap:v1:';
-function openDb() {
-  return new Promise(function (resolve, reject) {
-    var req = indexedDB.open(DB_NAME, 1);
-    req.onupgradeneeded = function () {
-      return req.result.createObjectStore(STORE);
-    };
-    req.onsuccess = function () {
-      return resolve(req.result);
-    };
-    req.onerror = function () {
-      return reject(req.error);
-    };
-  });
-}
+const { PYODIDE_WORKER_CONFIG } = __nagini_require__("./worker-config.js");
+const { withoutPendingInterrupt } = __nagini_require__("./worker-execution.js");
 
 /**
- * Compute the cache key for a snapshot: prefix + Pyodide origin + SHA-256 of
- * the embedded Python module sources
+ * Handle named namespace operations (create, update, read, delete)
  *
- * @param {string} cdnUrl - Resolved Pyodide base URL (part of the key)
- * @param {string[]} moduleSources - Embedded Python sources (hashed)
- * @returns {Promise<string>} Cache key
+ * @param {NamespaceOperationMessage} data - Namespace operation message data
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {void}
  */
-function snapshotKey(_x, _x2) {
-  return _snapshotKey.apply(this, arguments);
+function handleNamespaceOperation(data, workerState) {
+  if (!workerState.isInitialized || !workerState.pyodide) {
+    postNamespaceError(PYODIDE_WORKER_CONFIG.MESSAGES.NOT_INITIALIZED, data.id);
+    return;
+  }
+
+  try {
+    const result = withoutPendingInterrupt(workerState, () => executeNamespaceOperation(data, workerState));
+    self.postMessage({ type: "namespace_result", id: data.id, result });
+  } catch (error) {
+    postNamespaceError(error.message, data.id);
+  }
 }
 
 /**
- * Read a cached snapshot; any failure (no IndexedDB, quota, missing key)
- * resolves to null
+ * Execute a named namespace operation
  *
- * @param {string} key - Cache key
- * @returns {Promise<Uint8Array|null>}
+ * @param {NamespaceOperationMessage} data - Namespace operation data
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {NamespaceOperationResult} Result of the operation
+ * @throws {Error} If the operation is unknown or the namespace does not exist
  */
-function _snapshotKey() {
-  _snapshotKey = worker_snapshot_asyncToGenerator(/*#__PURE__*/worker_snapshot_regenerator().m(function _callee(cdnUrl, moduleSources) {
-    var data, digest, hex;
-    return worker_snapshot_regenerator().w(function (_context) {
-      while (1) switch (_context.n) {
-        case 0:
-          data = new TextEncoder().encode(moduleSources.join(' '));
-          _context.n = 1;
-          return crypto.subtle.digest('SHA-256', data);
-        case 1:
-          digest = _context.v;
-          hex = _toConsumableArray(new Uint8Array(digest)).map(function (b) {
-            return b.toString(16).padStart(2, '0');
-          }).join('');
-          return _context.a(2, "".concat(KEY_PREFIX).concat(cdnUrl, ":").concat(hex));
+function executeNamespaceOperation(data, workerState) {
+  const { operation, name, values, keys, remove } = data;
+  const { pyodide, namespaces } = workerState;
+
+  const ops = {
+    create: () => {
+      dropNamespace(workerState, name);
+      namespaces.set(name, pyodide.toPy(values ?? {}));
+      const evicted = [];
+      for (const oldest of namespaces.keys()) {
+        if (namespaces.size <= workerState.maxNamespaces) break;
+        dropNamespace(workerState, oldest);
+        evicted.push(oldest);
       }
-    }, _callee);
-  }));
-  return _snapshotKey.apply(this, arguments);
-}
-function loadSnapshot(_x3) {
-  return _loadSnapshot.apply(this, arguments);
+      return { evicted };
+    },
+    update: () => {
+      // Only the patch is converted: the rest of the dict stays in place
+      const globals = namedNamespace(workerState, name);
+      if (values) {
+        const patch = pyodide.toPy(values);
+        try {
+          globals.update(patch);
+        } finally {
+          patch.destroy();
+        }
+      }
+      for (const key of remove ?? []) {
+        if (globals.has(key)) globals.delete(key);
+      }
+      return { size: globals.length };
+    },
+    read: () => readValues(namedNamespace(workerState, name), keys),
+    delete: () => ({ deleted: dropNamespace(workerState, name) }),
+  };
+
+  const op = ops[operation];
+  if (!op) throw new Error(`Unknown namespace operation: ${operation}`);
+  return op();
 }
 
 /**
- * Store a snapshot and evict every other nagini-snap entry (stale runtimes
- * or module versions have no reader anymore)
+ * Globals dict of a named namespace, marked as most recently used
  *
- * @param {string} key - Cache key
- * @param {Uint8Array} bytes - Snapshot buffer
- * @returns {Promise<boolean>} True when stored
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {string} name - Namespace name
+ * @returns {Object} Dict PyProxy (owned by the registry, do not destroy)
+ * @throws {Error} If no namespace has this name (never created, deleted or evicted)
  */
-function _loadSnapshot() {
-  _loadSnapshot = worker_snapshot_asyncToGenerator(/*#__PURE__*/worker_snapshot_regenerator().m(function _callee2(key) {
-    var db, _t;
-    return worker_snapshot_regenerator().w(function (_context2) {
-      while (1) switch (_context2.n) {
-        case 0:
-          _context2.p = 0;
-          _context2.n = 1;
-          return openDb();
-        case 1:
-          db = _context2.v;
-          _context2.n = 2;
-          return new Promise(function (resolve) {
-            var req = db.transaction(STORE).objectStore(STORE).get(key);
-            req.onsuccess = function () {
-              return resolve(req.result || null);
-            };
-            req.onerror = function () {
-              return resolve(null);
-            };
-          });
-        case 2:
-          return _context2.a(2, _context2.v);
-        case 3:
-          _context2.p = 3;
-          _t = _context2.v;
-          return _context2.a(2, null);
-      }
-    }, _callee2, null, [[0, 3]]);
-  }));
-  return _loadSnapshot.apply(this, arguments);
-}
-function storeSnapshot(_x4, _x5) {
-  return _storeSnapshot.apply(this, arguments);
+function namedNamespace(workerState, name) {
+  const globals = workerState.namespaces.get(name);
+  if (!globals) {
+    throw new Error(`Unknown namespace "${name}" (never created, deleted or evicted)`);
+  }
+  workerState.namespaces.delete(name);
+  workerState.namespaces.set(name, globals);
+  return globals;
 }
 
 /**
- * Delete one snapshot entry (used after a failed restore)
+ * Drop every named namespace (interpreter reset)
  *
- * @param {string} key - Cache key
- * @returns {Promise<void>}
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {void}
  */
-function _storeSnapshot() {
-  _storeSnapshot = worker_snapshot_asyncToGenerator(/*#__PURE__*/worker_snapshot_regenerator().m(function _callee3(key, bytes) {
-    var db, _t2;
-    return worker_snapshot_regenerator().w(function (_context3) {
-      while (1) switch (_context3.n) {
-        case 0:
-          _context3.p = 0;
-          _context3.n = 1;
-          return openDb();
-        case 1:
-          db = _context3.v;
-          _context3.n = 2;
-          return new Promise(function (resolve) {
-            var tx = db.transaction(STORE, 'readwrite');
-            var store = tx.objectStore(STORE);
-            var keysReq = store.getAllKeys();
-            keysReq.onsuccess = function () {
-              var _iterator = worker_snapshot_createForOfIteratorHelper(keysReq.result),
-                _step;
-              try {
-                for (_iterator.s(); !(_step = _iterator.n()).done;) {
-                  var k = _step.value;
-                  if (typeof k === 'string' && k.startsWith(KEY_PREFIX) && k !== key) {
-                    store.delete(k);
-                  }
-                }
-              } catch (err) {
-                _iterator.e(err);
-              } finally {
-                _iterator.f();
-              }
-              store.put(bytes, key);
-            };
-            tx.oncomplete = function () {
-              return resolve(true);
-            };
-            tx.onerror = function () {
-              return resolve(false);
-            };
-          });
-        case 2:
-          return _context3.a(2, _context3.v);
-        case 3:
-          _context3.p = 3;
-          _t2 = _context3.v;
-          return _context3.a(2, false);
-      }
-    }, _callee3, null, [[0, 3]]);
-  }));
-  return _storeSnapshot.apply(this, arguments);
-}
-function deleteSnapshot(_x6) {
-  return _deleteSnapshot.apply(this, arguments);
-}
-function _deleteSnapshot() {
-  _deleteSnapshot = worker_snapshot_asyncToGenerator(/*#__PURE__*/worker_snapshot_regenerator().m(function _callee4(key) {
-    var db, _t3;
-    return worker_snapshot_regenerator().w(function (_context4) {
-      while (1) switch (_context4.n) {
-        case 0:
-          _context4.p = 0;
-          _context4.n = 1;
-          return openDb();
-        case 1:
-          db = _context4.v;
-          _context4.n = 2;
-          return new Promise(function (resolve) {
-            var tx = db.transaction(STORE, 'readwrite');
-            tx.objectStore(STORE).delete(key);
-            tx.oncomplete = resolve;
-            tx.onerror = resolve;
-          });
-        case 2:
-          _context4.n = 4;
-          break;
-        case 3:
-          _context4.p = 3;
-          _t3 = _context4.v;
-        case 4:
-          return _context4.a(2);
-      }
-    }, _callee4, null, [[0, 3]]);
-  }));
-  return _deleteSnapshot.apply(this, arguments);
+function clearNamespaces(workerState) {
+  for (const name of [...workerState.namespaces.keys()]) {
+    dropNamespace(workerState, name);
+  }
 }
-;// ../file-loader/file-loader.js
-function _regeneratorValues(e) { if (null != e) { var t = e["function" == typeof Symbol && Symbol.iterator || "@@iterator"], r = 0; if (t) return t.call(e); if ("function" == typeof e.next) return e; if (!isNaN(e.length)) return { next: function next() { return e && r >= e.length && (e = void 0), { value: e && e[r++], done: !e }; } }; } throw new TypeError(file_loader_typeof(e) + " is not iterable"); }
-function file_loader_regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return file_loader_regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (file_loader_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, file_loader_regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, file_loader_regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), file_loader_regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", file_loader_regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), file_loader_regeneratorDefine2(u), file_loader_regeneratorDefine2(u, o, "Generator"), file_loader_regeneratorDefine2(u, n, function () { return this; }), file_loader_regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (file_loader_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function file_loader_regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } file_loader_regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { file_loader_regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, file_loader_regeneratorDefine2(e, r, n, t); }
-function file_loader_asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function file_loader_asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { file_loader_asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { file_loader_asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
-function file_loader_typeof(o) { "@babel/helpers - typeof"; return file_loader_typeof = "function" == typeof Symbol && "symbol" == typeof Symbol.iterator ? function (o) { return typeof o; } : function (o) { return o && "function" == typeof Symbol && o.constructor === Symbol && o !== Symbol.prototype ? "symbol" : typeof o; }, file_loader_typeof(o); }
-function _slicedToArray(r, e) { return _arrayWithHoles(r) || _iterableToArrayLimit(r, e) || file_loader_unsupportedIterableToArray(r, e) || _nonIterableRest(); }
-function _nonIterableRest() { throw new TypeError("Invalid attempt to destructure non-iterable instance.\nIn order to be iterable, non-array objects must have a [Symbol.iterator]() method."); }
-function _iterableToArrayLimit(r, l) { var t = null == r ? null : "undefined" != typeof Symbol && r[Symbol.iterator] || r["@@iterator"]; if (null != t) { var e, n, i, u, a = [], f = !0, o = !1; try { if (i = (t = t.call(r)).next, 0 === l) { if (Object(t) !== t) return; f = !1; } else for (; !(f = (e = i.call(t)).done) && (a.push(e.value), a.length !== l); f = !0); } catch (r) { o = !0, n = r; } finally { try { if (!f && null != t.return && (u = t.return(), Object(u) !== u)) return; } finally { if (o) throw n; } } return a; } }
-function _arrayWithHoles(r) { if (Array.isArray(r)) return r; }
-function file_loader_createForOfIteratorHelper(r, e) { var t = "undefined" != typeof Symbol && r[Symbol.iterator] || r["@@iterator"]; if (!t) { if (Array.isArray(r) || (t = file_loader_unsupportedIterableToArray(r)) || e && r && "number" == typeof r.length) { t && (r = t); var _n = 0, F = function F() {}; return { s: F, n: function n() { return _n >= r.length ? { done: !0 } : { done: !1, value: r[_n++] }; }, e: function e(r) { throw r; }, f: F }; } throw new TypeError("Invalid attempt to iterate non-iterable instance.\nIn order to be iterable, non-array objects must have a [Symbol.iterator]() method."); } var o, a = !0, u = !1; return { s: function s() { t = t.call(r); }, n: function n() { var r = t.next(); return a = r.done, r; }, e: function e(r) { u = !0, o = r; }, f: function f() { try { a || null == t.return || t.return(); } finally { if (u) throw o; } } }; }
-function file_loader_unsupportedIterableToArray(r, a) { if (r) { if ("string" == typeof r) return file_loader_arrayLikeToArray(r, a); var t = {}.toString.call(r).slice(8, -1); return "Object" === t && r.constructor && (t = r.constructor.name), "Map" === t || "Set" === t ? Array.from(r) : "Arguments" === t || /^(?:Ui|I)nt(?:8|16|32)(?:Clamped)?Array$/.test(t) ? file_loader_arrayLikeToArray(r, a) : void 0; } }
-function file_loader_arrayLikeToArray(r, a) { (null == a || a > r.length) && (a = r.length); for (var e = 0, n = Array(a); e < a; e++) n[e] = r[e]; return n; }
-function _classCallCheck(a, n) { if (!(a instanceof n)) throw new TypeError("Cannot call a class as a function"); }
-function _defineProperties(e, r) { for (var t = 0; t < r.length; t++) { var o = r[t]; o.enumerable = o.enumerable || !1, o.configurable = !0, "value" in o && (o.writable = !0), Object.defineProperty(e, file_loader_toPropertyKey(o.key), o); } }
-function _createClass(e, r, t) { return r && _defineProperties(e.prototype, r), t && _defineProperties(e, t), Object.defineProperty(e, "prototype", { writable: !1 }), e; }
-function file_loader_toPropertyKey(t) { var i = file_loader_toPrimitive(t, "string"); return "symbol" == file_loader_typeof(i) ? i : i + ""; }
-function file_loader_toPrimitive(t, r) { if ("object" != file_loader_typeof(t) || !t) return t; var e = t[Symbol.toPrimitive]; if (void 0 !== e) { var i = e.call(t, r || "default"); if ("object" != file_loader_typeof(i)) return i; throw new TypeError("@@toPrimitive must return a primitive value."); } return ("string" === r ? String : Number)(t); }
+
 /**
- * PyodideFileLoader - File loading utilities for Pyodide
- *
- * Handles loading remote files (S3, URLs) into the Pyodide virtual filesystem
- * with retry mechanisms and proper error handling.
+ * Remove a namespace from the registry and release its dict
  *
- * @example
- * const filesToLoad = [
- *   { url: "https://example.com/module.py", path: "modules/module.py" },
- *   { url: "./local/file.py", path: "local_file.py" }
- * ];
- * const loader = new PyodideFileLoader(filesToLoad);
- * await loader.loadFiles(pyodide);
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {string} name - Namespace name
+ * @returns {boolean} Whether the namespace existed
  */
+function dropNamespace(workerState, name) {
+  const globals = workerState.namespaces.get(name);
+  if (!globals) return false;
+  workerState.namespaces.delete(name);
+  globals.destroy();
+  return true;
+}
+
 /**
- * PyodideFileLoader class for loading files into Pyodide filesystem
+ * Convert selected values of a namespace for the main thread. Values with
+ * no JavaScript equivalent (functions, modules, class instances) cannot be
+ * cloned to the page: they are listed in skipped instead
+ *
+ * @param {Object} globals - Dict PyProxy
+ * @param {string[]} [keys] - Names to read (default: every name not starting with "__")
+ * @returns {{values: Object, skipped: string[]}}
  */
-var PyodideFileLoader = /*#__PURE__*/function () {
-  /**
-   * Create a new PyodideFileLoader instance
-   *
-   * @param {Array<FileToLoad>} filesToLoad - Array of file objects to load
-   * @throws {Error} If filesToLoad is not an array or contains invalid objects
-   */
-  function PyodideFileLoader(filesToLoad) {
-    _classCallCheck(this, PyodideFileLoader);
-    // Validate argument - now required
-    if (!Array.isArray(filesToLoad)) {
-      throw new Error("📦 [PyodideFileLoader] filesToLoad must be an array");
-    }
-
-    // Validate each file object
-    var _iterator = file_loader_createForOfIteratorHelper(filesToLoad.entries()),
-      _step;
-    try {
-      for (_iterator.s(); !(_step = _iterator.n()).done;) {
-        var _step$value = _slicedToArray(_step.value, 2),
-          index = _step$value[0],
-          file = _step$value[1];
-        if (!file || file_loader_typeof(file) !== 'object') {
-          throw new Error("\uD83D\uDCE6 [PyodideFileLoader] filesToLoad[".concat(index, "] must be an object"));
-        }
-        if (typeof file.url !== 'string' || !file.url.trim()) {
-          throw new Error("\uD83D\uDCE6 [PyodideFileLoader] filesToLoad[".concat(index, "].url must be a non-empty string"));
-        }
-        if (typeof file.path !== 'string' || !file.path.trim()) {
-          throw new Error("\uD83D\uDCE6 [PyodideFileLoader] filesToLoad[".concat(index, "].path must be a non-empty string"));
-        }
+function readValues(globals, keys) {
+  if (!keys) {
+    const names = globals.keys();
+    keys = [...names].filter(key => !key.startsWith("__"));
+    names.destroy();
+  }
+  const values = {};
+  const skipped = [];
+  for (const key of keys) {
+    if (!globals.has(key)) continue;
+    const value = globals.get(key);
+    if (value?.toJs) {
+      try {
+        values[key] = value.toJs({ dict_converter: Object.fromEntries, create_pyproxies: false });
+      } catch (e) {
+        skipped.push(key);
+      } finally {
+        value.destroy();
       }
-    } catch (err) {
-      _iterator.e(err);
-    } finally {
-      _iterator.f();
+    } else {
+      values[key] = value;
     }
-    this.filesToLoad = filesToLoad;
   }
+  return { values, skipped };
+}
 
-  /**
-   * Load files into Pyodide filesystem with retry mechanism
-   *
-   * @param {PyodideAPI} pyodide - Pyodide instance
-   * @param {LoadOptions} [options] - Loading options
-   * @returns {Promise<void>}
-   * @throws {Error} If file loading fails after all retries
-   */
-  return _createClass(PyodideFileLoader, [{
-    key: "loadFiles",
-    value: (function () {
-      var _loadFiles = file_loader_asyncToGenerator(/*#__PURE__*/file_loader_regenerator().m(function _callee(pyodide) {
-        var options,
-          _options$maxRetries,
-          maxRetries,
-          _options$retryDelay,
-          retryDelay,
-          _iterator2,
-          _step2,
-          _loop,
-          _args2 = arguments,
-          _t2;
-        return file_loader_regenerator().w(function (_context2) {
-          while (1) switch (_context2.n) {
-            case 0:
-              options = _args2.length > 1 && _args2[1] !== undefined ? _args2[1] : {};
-              _options$maxRetries = options.maxRetries, maxRetries = _options$maxRetries === void 0 ? 3 : _options$maxRetries, _options$retryDelay = options.retryDelay, retryDelay = _options$retryDelay === void 0 ? 1000 : _options$retryDelay; // Validate pyodide instance
-              if (!(!pyodide || !pyodide.FS)) {
-                _context2.n = 1;
-                break;
-              }
-              throw new Error("📦 [PyodideFileLoader] Invalid pyodide instance - missing FS");
-            case 1:
-              _iterator2 = file_loader_createForOfIteratorHelper(this.filesToLoad);
-              _context2.p = 2;
-              _loop = /*#__PURE__*/file_loader_regenerator().m(function _loop() {
-                var file, retryCount, response, content, dir, dirExists, errorMsg, _t;
-                return file_loader_regenerator().w(function (_context) {
-                  while (1) switch (_context.n) {
-                    case 0:
-                      file = _step2.value;
-                      retryCount = 0;
-                    case 1:
-                      if (!(retryCount < maxRetries)) {
-                        _context.n = 9;
-                        break;
-                      }
-                      _context.p = 2;
-                      console.log("\uD83D\uDC0D [PyodideFileLoader] Loading: ".concat(file.url, " (attempt ").concat(retryCount + 1, "/").concat(maxRetries, ")"));
-                      _context.n = 3;
-                      return fetch(file.url);
-                    case 3:
-                      response = _context.v;
-                      if (response.ok) {
-                        _context.n = 4;
-                        break;
-                      }
-                      throw new Error("HTTP ".concat(response.status, ": ").concat(response.statusText));
-                    case 4:
-                      _context.n = 5;
-                      return response.text();
-                    case 5:
-                      content = _context.v;
-                      // Create directory if needed
-                      dir = file.path.split('/').slice(0, -1).join('/');
-                      if (dir) {
-                        dirExists = pyodide.FS.analyzePath(dir).exists;
-                        if (!dirExists) {
-                          console.log("\uD83D\uDC0D [PyodideFileLoader] Creating directory: ".concat(dir));
-                          pyodide.FS.mkdir(dir);
-                        }
-                      }
-                      pyodide.FS.writeFile(file.path, content);
-                      console.log("\uD83D\uDC0D [PyodideFileLoader] Saved: ".concat(file.path));
-                      return _context.a(3, 9);
-                    case 6:
-                      _context.p = 6;
-                      _t = _context.v;
-                      retryCount++;
-                      console.warn("\uD83D\uDC0D [PyodideFileLoader] Attempt ".concat(retryCount, " failed for ").concat(file.url, ":"), _t.message);
-                      if (!(retryCount === maxRetries)) {
-                        _context.n = 7;
-                        break;
-                      }
-                      errorMsg = "\uD83D\uDCE6 [PyodideFileLoader] Failed to load ".concat(file.url, " after ").concat(maxRetries, " attempts: ").concat(_t.message);
-                      console.error(errorMsg);
-                      throw new Error(errorMsg);
-                    case 7:
-                      _context.n = 8;
-                      return new Promise(function (resolve) {
-                        return setTimeout(resolve, retryDelay * retryCount);
-                      });
-                    case 8:
-                      _context.n = 1;
-                      break;
-                    case 9:
-                      return _context.a(2);
-                  }
-                }, _loop, null, [[2, 6]]);
-              });
-              _iterator2.s();
-            case 3:
-              if ((_step2 = _iterator2.n()).done) {
-                _context2.n = 5;
-                break;
-              }
-              return _context2.d(_regeneratorValues(_loop()), 4);
-            case 4:
-              _context2.n = 3;
-              break;
-            case 5:
-              _context2.n = 7;
-              break;
-            case 6:
-              _context2.p = 6;
-              _t2 = _context2.v;
-              _iterator2.e(_t2);
-            case 7:
-              _context2.p = 7;
-              _iterator2.f();
-              return _context2.f(7);
-            case 8:
-              return _context2.a(2);
-          }
-        }, _callee, this, [[2, 6, 7, 8]]);
-      }));
-      function loadFiles(_x) {
-        return _loadFiles.apply(this, arguments);
-      }
-      return loadFiles;
-    }())
-  }]);
-}();
-
+// Helper function for namespace error messages
+const postNamespaceError = (message, id) => self.postMessage({ type: "namespace_error", id, error: `🐍 [Worker] ${message}` });
 
 /**
- * @typedef {Object} FileToLoad
- * @property {string} url - URL to fetch the file from (supports S3, HTTP, local paths)
- * @property {string} path - Target path in Pyodide filesystem where file should be saved
+ * @typedef {Object} NamespaceOperationMessage
+ * @property {'namespace_operation'} type - Message type
+ * @property {number} id - Request id
+ * @property {'create'|'update'|'read'|'delete'} operation - Operation to perform
+ * @property {string} name - Namespace name
+ * @property {Object} [values] - Initial values (create) or patch (update)
+ * @property {string[]} [keys] - Names to read (read)
+ * @property {string[]} [remove] - Names to delete (update)
  */
 
 /**
- * @typedef {Object} LoadOptions
- * @property {number} [maxRetries=3] - Maximum number of retry attempts for failed downloads
- * @property {number} [retryDelay=1000] - Base delay in milliseconds between retries
+ * @typedef {Object} NamespaceOperationResult
+ * @property {string[]} [evicted] - Namespaces dropped by the LRU cap (create)
+ * @property {number} [size] - Names in the namespace after the patch (update)
+ * @property {Object} [values] - Converted values (read)
+ * @property {string[]} [skipped] - Names whose values cannot be sent to the page (read)
+ * @property {boolean} [deleted] - Whether the namespace existed (delete)
  */
 
+/***/ }),
+
+/***/ "./worker-input.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./worker-input.js
+__nagini_define__(__nagini_exports__, {
+  setupInputHandling: () => setupInputHandling,
+  handleInputResponse: () => handleInputResponse,
+});
 /**
- * @typedef {Object} PyodideAPI
- * @property {Object} FS - Pyodide filesystem interface
- * @property {Function} FS.writeFile - Write file to filesystem
- * @property {Function} FS.analyzePath - Analyze path existence
- * @property {Function} FS.mkdir - Create directory
- */
-;// ../python/capture_system.py
-const capture_system_namespaceObject = "# =============================================================================\n# Output Capture System for Pyodide\n# =============================================================================\n# This module handles stdout/stderr capture and the missive system\n# Uses direct sys.stdout/stderr replacement for reliable capture in WebAssembly\n\nimport json\nimport io\nimport sys\nimport builtins\n\n# Store original stdout/stderr so we can restore them if needed\n_original_stdout = sys.stdout\n_original_stderr = sys.stderr\n\n# Create capture buffers\n_stdout_buffer = io.StringIO()\n_stderr_buffer = io.StringIO()\n\n# Storage for missive system - using builtins to ensure global availability\nif not hasattr(builtins, \"_nagini_current_missive\"):\n    builtins._nagini_current_missive = None\nif not hasattr(builtins, \"_nagini_missive_already_called\"):\n    builtins._nagini_missive_already_called = False\n\n\nclass CaptureStream:\n    \"\"\"Custom stream that captures all write operations\"\"\"\n\n    def __init__(self, buffer):\n        self.buffer = buffer\n\n    def write(self, text):\n        self.buffer.write(text)\n        return len(text)\n\n    def flush(self):\n        self.buffer.flush()\n\n    def isatty(self):\n        return False\n\n\n# Create capture streams\n_stdout_capturer = CaptureStream(_stdout_buffer)\n_stderr_capturer = CaptureStream(_stderr_buffer)\n\n\ndef reset_captures() -> None:\n    \"\"\"Reset capture buffers and activate capturing by replacing sys.stdout/stderr\"\"\"\n    # Clear buffers\n    _stdout_buffer.truncate(0)\n    _stdout_buffer.seek(0)\n    _stderr_buffer.truncate(0)\n    _stderr_buffer.seek(0)\n\n    # Clear missive data using builtins for global access\n    builtins._nagini_current_missive = None\n    builtins._nagini_missive_already_called = False\n\n    # Close any existing matplotlib figures (if matplotlib is available)\n    try:\n        import matplotlib.pyplot as plt\n\n        plt.close(\"all\")\n    except ImportError:\n        pass  # matplotlib not available, skip\n    except Exception:\n        pass  # Ignore other errors\n\n    # Activate capturing by replacing sys.stdout/stderr\n    sys.stdout = _stdout_capturer\n    sys.stderr = _stderr_capturer\n\n\ndef get_stdout() -> str:\n    \"\"\"Get captured stdout content\"\"\"\n    return _stdout_buffer.getvalue()\n\n\ndef get_stderr() -> str:\n    \"\"\"Get captured stderr content\"\"\"\n    return _stderr_buffer.getvalue()\n\n\ndef restore_original_streams() -> None:\n    \"\"\"Restore original stdout/stderr (for debugging if needed)\"\"\"\n    sys.stdout = _original_stdout\n    sys.stderr = _original_stderr\n\n\ndef get_missive() -> str | None:\n    \"\"\"\n    Get the current missive dictionary as a JSON string.\n\n    A \"missive\" is our term for structured data that user code wants to send\n    back to JavaScript. It's always a Python dictionary that gets converted\n    to JSON format (which JavaScript can easily understand).\n\n    Returns:\n        str | None: JSON string of the missive data, or None if no missive was sent\n\n    Example:\n        If user code did: missive({\"result\": 42, \"status\": \"success\"})\n        This would return: '{\"result\": 42, \"status\": \"success\"}'\n    \"\"\"\n    if builtins._nagini_current_missive is None:\n        return None  # No missive was stored\n    return json.dumps(builtins._nagini_current_missive)  # Convert Python dict to JSON string\n\n\ndef get_figures() -> list:\n    \"\"\"\n    Capture matplotlib figures and return them as base64 encoded strings.\n\n    Returns:\n        list: List of base64 encoded PNG images of matplotlib figures\n    \"\"\"\n    figures = []\n\n    try:\n        # Import matplotlib only when needed (after packages are loaded)\n        import matplotlib.pyplot as plt\n        import base64\n\n        if hasattr(plt, \"get_fignums\"):\n            try:\n                for fig_num in plt.get_fignums():\n                    plt.figure(fig_num)\n                    buf = io.BytesIO()\n                    plt.savefig(buf, format=\"png\", dpi=100, bbox_inches=\"tight\")\n                    buf.seek(0)\n                    figures.append(base64.b64encode(buf.read()).decode(\"utf-8\"))\n                    plt.close(fig_num)\n            except Exception as e:\n                print(f\"Error capturing figures: {e}\")\n    except ImportError:\n        # matplotlib not available, return empty list\n        pass\n    except Exception as e:\n        print(f\"Error importing matplotlib: {e}\")\n\n    return figures\n\n\ndef missive(data):\n    \"\"\"Send structured data back to JavaScript (once per execution)\n\n    Runs while user output is being captured, so it must not print:\n    anything written here would end up in the user's stdout.\n    \"\"\"\n    if builtins._nagini_missive_already_called:\n        raise ValueError(\n            \"missive() can only be called once per execution. \"\n            \"If you need to send multiple pieces of data, \"\n            \"put them all in one dictionary.\"\n        )\n    builtins._nagini_current_missive = data\n    builtins._nagini_missive_already_called = True\n\n\n# Make the missive function available globally: it is the one name (with\n# input) deliberately exposed to user code. Everything else in this module\n# is reached by the worker through a module reference, never by name lookup\n# in the user's namespace.\nbuiltins.missive = missive\n\n\ndef detect_shadowed_names(user_globals) -> list:\n    \"\"\"Names rebound by user code in its globals, hiding the built-ins\n    Nagini exposes (missive, input). The worker calls this after each\n    default-namespace execution to emit a one-time warning.\"\"\"\n    shadowed = []\n    for name in (\"missive\", \"input\"):\n        if name in user_globals and user_globals[name] is not getattr(builtins, name, None):\n            shadowed.append(name)\n    return shadowed\n";
-;// ../python/code_transformation.py
-const code_transformation_namespaceObject = "# =============================================================================\n# Code transformation for async input support\n# =============================================================================\n# Le builtin input() est remplacé côté worker par une coroutine asynchrone\n# (voir worker-input.js). Il faut donc préfixer d'un await les vrais appels\n# input(). La détection et la réécriture se font sur l'AST : seuls les appels\n# au builtin input sont touchés, jamais un identifiant comme some_func__input\n# ni une méthode obj.input(). Le code est exécuté par runPythonAsync, qui\n# autorise le await de premier niveau, donc on n'enveloppe pas le code dans une\n# fonction : les variables de niveau module restent dans les globals.\n\nimport ast\n\n\nclass _AwaitInputTransformer(ast.NodeTransformer):\n    \"\"\"Préfixe d'un await chaque appel au builtin input() exécutable au niveau\n    module ou dans une fonction async. Les appels situés dans une fonction\n    synchrone ou un lambda sont laissés tels quels : un await y serait invalide\n    et casserait tout le programme.\"\"\"\n\n    def __init__(self):\n        self.inserted = False\n        self._sync_scope_depth = 0\n\n    def visit_FunctionDef(self, node):\n        self._sync_scope_depth += 1\n        self.generic_visit(node)\n        self._sync_scope_depth -= 1\n        return node\n\n    def visit_Lambda(self, node):\n        self._sync_scope_depth += 1\n        self.generic_visit(node)\n        self._sync_scope_depth -= 1\n        return node\n\n    def visit_ClassDef(self, node):\n        # un corps de classe est un scope propre où await est toujours\n        # invalide, même au niveau module\n        self._sync_scope_depth += 1\n        self.generic_visit(node)\n        self._sync_scope_depth -= 1\n        return node\n\n    def visit_AsyncFunctionDef(self, node):\n        # await redevient valide ici, même quand la fonction async est définie\n        # à l'intérieur d'une fonction synchrone : on repart de zéro\n        saved = self._sync_scope_depth\n        self._sync_scope_depth = 0\n        self.generic_visit(node)\n        self._sync_scope_depth = saved\n        return node\n\n    def visit_Call(self, node):\n        self.generic_visit(node)\n        is_input_builtin = isinstance(node.func, ast.Name) and node.func.id == \"input\"\n        if is_input_builtin and self._sync_scope_depth == 0:\n            self.inserted = True\n            return ast.Await(value=node)\n        return node\n\n\ndef _rewrite_input_calls(code):\n    \"\"\"Renvoie le code réécrit (await input) si au moins un appel a été\n    transformé, sinon None. Laisse remonter SyntaxError si le code ne parse\n    pas, pour que l'erreur soit reportée telle quelle à l'exécution.\"\"\"\n    tree = ast.parse(code)\n    transformer = _AwaitInputTransformer()\n    new_tree = transformer.visit(tree)\n    if not transformer.inserted:\n        return None\n    ast.fix_missing_locations(new_tree)\n    return ast.unparse(new_tree)\n\n\ndef prepare_code_for_async_input(code):\n    \"\"\"Réécrit les appels input() en await input(). Renvoie le code inchangé si\n    aucun vrai appel input() n'est présent ou si le code ne parse pas.\"\"\"\n    try:\n        rewritten = _rewrite_input_calls(code)\n    except SyntaxError:\n        return code\n    return code if rewritten is None else rewritten\n\n\ndef transform_code_for_execution(code):\n    \"\"\"Transforme le code utilisateur pour le support de input() asynchrone.\n\n    Idempotent vis-à-vis du code sans input() : il est renvoyé inchangé.\"\"\"\n    return prepare_code_for_async_input(code)\n";
-;// ../python/pyodide_utilities.py
-const pyodide_utilities_namespaceObject = "# =============================================================================\n# Pyodide Utilities\n# =============================================================================\n# This module contains utility functions for Pyodide environment setup\n\n\ndef setup_matplotlib():\n    \"\"\"Set up matplotlib configuration if the package is available\"\"\"\n    try:\n        import matplotlib\n        import matplotlib.pyplot as plt\n\n        # Use the non-interactive 'agg' backend, which is required for rendering in a worker.\n        plt.switch_backend(\"agg\")\n\n        # Pyodide n'embarque que les polices DejaVu : pointer sans-serif\n        # vers Arial déclenchait un warning findfont sur chaque rendu\n        matplotlib.rcParams[\"font.family\"] = \"sans-serif\"\n        matplotlib.rcParams[\"font.sans-serif\"] = [\"DejaVu Sans\"]\n        matplotlib.rcParams[\"text.usetex\"] = False\n\n        # Override plt.show() to prevent display attempts\n        def custom_show(*args, **kwargs):\n            pass  # No-op since we capture figures manually\n\n        plt.show = custom_show\n        print(\"🎨 Matplotlib configured successfully with 'agg' backend and font caching disabled\")\n    except ImportError:\n        # matplotlib not available, skip setup\n        pass\n    except Exception as e:\n        print(f\"Warning: Could not configure matplotlib: {e}\")\n\n\n# Additional utility functions can be added here as needed\n";
-;// ./worker-handlers.js
-function worker_handlers_regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return worker_handlers_regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (worker_handlers_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, worker_handlers_regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, worker_handlers_regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), worker_handlers_regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", worker_handlers_regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), worker_handlers_regeneratorDefine2(u), worker_handlers_regeneratorDefine2(u, o, "Generator"), worker_handlers_regeneratorDefine2(u, n, function () { return this; }), worker_handlers_regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (worker_handlers_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function worker_handlers_regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } worker_handlers_regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { worker_handlers_regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, worker_handlers_regeneratorDefine2(e, r, n, t); }
-function worker_handlers_typeof(o) { "@babel/helpers - typeof"; return worker_handlers_typeof = "function" == typeof Symbol && "symbol" == typeof Symbol.iterator ? function (o) { return typeof o; } : function (o) { return o && "function" == typeof Symbol && o.constructor === Symbol && o !== Symbol.prototype ? "symbol" : typeof o; }, worker_handlers_typeof(o); }
-function worker_handlers_asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function worker_handlers_asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { worker_handlers_asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { worker_handlers_asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
-function worker_handlers_ownKeys(e, r) { var t = Object.keys(e); if (Object.getOwnPropertySymbols) { var o = Object.getOwnPropertySymbols(e); r && (o = o.filter(function (r) { return Object.getOwnPropertyDescriptor(e, r).enumerable; })), t.push.apply(t, o); } return t; }
-function worker_handlers_objectSpread(e) { for (var r = 1; r < arguments.length; r++) { var t = null != arguments[r] ? arguments[r] : {}; r % 2 ? worker_handlers_ownKeys(Object(t), !0).forEach(function (r) { worker_handlers_defineProperty(e, r, t[r]); }) : Object.getOwnPropertyDescriptors ? Object.defineProperties(e, Object.getOwnPropertyDescriptors(t)) : worker_handlers_ownKeys(Object(t)).forEach(function (r) { Object.defineProperty(e, r, Object.getOwnPropertyDescriptor(t, r)); }); } return e; }
-function worker_handlers_defineProperty(e, r, t) { return (r = worker_handlers_toPropertyKey(r)) in e ? Object.defineProperty(e, r, { value: t, enumerable: !0, configurable: !0, writable: !0 }) : e[r] = t, e; }
-function worker_handlers_toPropertyKey(t) { var i = worker_handlers_toPrimitive(t, "string"); return "symbol" == worker_handlers_typeof(i) ? i : i + ""; }
-function worker_handlers_toPrimitive(t, r) { if ("object" != worker_handlers_typeof(t) || !t) return t; var e = t[Symbol.toPrimitive]; if (void 0 !== e) { var i = e.call(t, r || "default"); if ("object" != worker_handlers_typeof(i)) return i; throw new TypeError("@@toPrimitive must return a primitive value."); } return ("string" === r ? String : Number)(t); }
-/**
- * PyodideWorker Message Handlers - Optimized
+ * PyodideWorker Input Module
  *
- * Concise message handling logic for the pyodide worker
+ * Handles input requests and responses in the Pyodide worker environment.
  */
 
-
-
-
-
-
-
-
-// Import Python modules as bundled strings
-
-
-
+const { PYODIDE_WORKER_CONFIG } = __nagini_require__("./worker-config.js");
 
 /**
- * Post error message to main thread
- * @param {string} message - Error message to send
- * @returns {void}
+ * Set up input handling system in Python environment
+ *
+ * Two modes, picked by browser capability:
+ * - "jspi": WebAssembly stack switching (JSPI) lets Pyodide block
+ *   synchronously on the JS promise via pyodide.ffi.run_sync. input() then
+ *   works anywhere, including inside sync functions, lambdas and class
+ *   bodies, and user code runs completely unmodified.
+ * - "async": no JSPI, builtins.input is an async handler and genuine
+ *   input() calls are rewritten to await input() on the AST before running
+ *   (see code_transformation.py).
+ *
+ * @param {PyodideAPI} pyodide - Pyodide instance
+ * @returns {Promise<'jspi'|'async'>} The input mode installed
  */
-var worker_handlers_postError = function postError(message) {
-  return self.postMessage({
-    type: "error",
-    message: "\uD83D\uDD27 [Worker] ".concat(message)
-  });
-};
+async function setupInputHandling(pyodide) {
+  // Create the requestInput function in the worker's global scope
+  self.requestInput = async (prompt = "") => {
+    // Send input request to main thread
+    self.postMessage({
+      type: "input_required",
+      prompt: prompt
+    });
+
+    // Return a promise that will be resolved when input is received
+    return new Promise((resolve) => {
+      self.pendingInputResolver = resolve;
+    });
+  };
 
-/**
- * Post filesystem error message to main thread
- * @param {string} error - Error message to send
- * @returns {void}
- */
-var worker_handlers_postFSError = function postFSError(error) {
-  return self.postMessage({
-    type: "fs_error",
-    error: "\uD83D\uDD27 [Worker] ".concat(error)
-  });
-};
+  const jspi = typeof WebAssembly !== "undefined" && typeof WebAssembly.Suspending === "function";
+
+  const handlerSnippet = jspi ? `
+import builtins
+import sys
+from js import requestInput
+from pyodide.ffi import run_sync
+
+def input_handler(prompt=""):
+    # Always print the prompt to stdout first
+    if prompt:
+        print(prompt, end="", flush=True)
+        sys.stdout.flush()
+
+    # Block on the JS promise through wasm stack switching
+    return run_sync(requestInput(prompt))
+
+builtins.input = input_handler
+` : `
+import builtins
+import sys
+from js import requestInput
+
+async def input_handler(prompt=""):
+    # Always print the prompt to stdout first
+    if prompt:
+        print(prompt, end="", flush=True)
+        sys.stdout.flush()
+
+    # Request input from JavaScript
+    return await requestInput(prompt)
+
+builtins.input = input_handler
+`;
+
+  // The snippet runs in a throwaway namespace: none of its names (sys,
+  // requestInput, input_handler) leak into the interpreter globals where
+  // user code runs, so they cannot be shadowed or rebound from user code.
+  // The handler keeps them alive through its own module-level closure.
+  const setupNamespace = pyodide.toPy({});
+  try {
+    await pyodide.runPythonAsync(handlerSnippet, { globals: setupNamespace });
+  } finally {
+    setupNamespace.destroy();
+  }
 
-/**
- * Post execution result to main thread
- * @param {ExecutionResultData} data - Execution result data
- * @returns {void}
- */
-var worker_handlers_postResult = function postResult(data) {
-  return self.postMessage(worker_handlers_objectSpread({
-    type: "result"
-  }, data));
-};
+  return jspi ? "jspi" : "async";
+}
 
 /**
- * Post info message to main thread
- * @param {string} message - Info message to send
- * @returns {void}
+ * Handle input response from main thread
+ * Provides user input to Python code that's waiting for input
+ *
+ * @param {InputResponseMessage} data - Input response message data
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<void>}
  */
-var worker_handlers_postInfo = function postInfo(message) {
-  return self.postMessage({
-    type: "info",
-    message: "\uD83D\uDD27 [Worker] ".concat(message)
-  });
-};
+async function handleInputResponse(data, workerState) {
+  if (!validateInitialized(workerState)) return;
 
-/**
- * Post warning message to main thread
- * @param {string} message - Warning message to send
- * @returns {void}
- */
-var worker_handlers_postWarning = function postWarning(message) {
-  return self.postMessage({
-    type: "warning",
-    message: "\uD83D\uDD27 [Worker] ".concat(message)
-  });
-};
+  const { input } = data;
 
-/**
- * Post input required message to main thread
- * @param {string} prompt - Input prompt
- * @returns {void}
- */
-var postInputRequired = function postInputRequired(prompt) {
-  return self.postMessage({
-    type: "input_required",
-    prompt: prompt
-  });
-};
+  try {
+    // Resolve the pending input promise if it exists
+    if (self.pendingInputResolver) {
+      self.pendingInputResolver(input);
+      self.pendingInputResolver = null;
+    } else {
+      console.warn("No pending input resolver found");
+    }
+  } catch (err) {
+    console.error("Failed to provide input:", err);
+    postError(`Failed to provide input: ${err.message}`);
+  }
+}
+
+// Helper functions
+const postError = (message) => self.postMessage({ type: "error", message: `🐍 [Worker] ${message}` });
 
 /**
  * Validate that worker is properly initialized
  * @param {WorkerState} workerState - Current worker state
  * @returns {boolean} True if initialized, false otherwise
  */
-var worker_handlers_validateInitialized = function validateInitialized(workerState) {
+function validateInitialized(workerState) {
   if (!workerState.isInitialized || !workerState.pyodide) {
-    worker_handlers_postError(PYODIDE_WORKER_CONFIG.MESSAGES.NOT_INITIALIZED);
+    postError(PYODIDE_WORKER_CONFIG.MESSAGES.NOT_INITIALIZED);
     return false;
   }
   return true;
-};
-
-/**
- * Main message dispatcher
- * Handles incoming messages from the main thread and routes them to appropriate handlers
- *
- * @param {MessageEvent} e - Message event from main thread
- * @param {WorkerState} workerState - Current worker state object
- * @returns {Promise<void>}
- */
-function handleMessage(_x, _x2) {
-  return _handleMessage.apply(this, arguments);
 }
+
 /**
- * Handle Pyodide initialization
- * Loads Pyodide runtime, bundled Python modules, and packages
- *
- * @param {InitMessage} data - Initialization message data
- * @param {WorkerState} workerState - Current worker state object
- * @returns {Promise<void>}
+ * @typedef {Object} InputResponseMessage
+ * @property {'input_response'} type - Message type
+ * @property {string} input - User input value
  */
-function _handleMessage() {
-  _handleMessage = worker_handlers_asyncToGenerator(/*#__PURE__*/worker_handlers_regenerator().m(function _callee(e, workerState) {
-    var data, handlers, handler;
-    return worker_handlers_regenerator().w(function (_context) {
-      while (1) switch (_context.n) {
-        case 0:
-          data = e.data;
-          if (data !== null && data !== void 0 && data.type) {
-            _context.n = 1;
-            break;
-          }
-          worker_handlers_postError(worker_config_PYODIDE_WORKER_CONFIG.MESSAGES.INVALID_MESSAGE);
-          return _context.a(2);
-        case 1:
-          handlers = {
-            init: handleInit,
-            execute: handleExecute,
-            fs_operation: handleFSOperation,
-            input_response: handleInputResponse
-          };
-          handler = handlers[data.type];
-          if (handler) {
-            _context.n = 2;
-            break;
-          }
-          worker_handlers_postError("".concat(worker_config_PYODIDE_WORKER_CONFIG.MESSAGES.UNKNOWN_TYPE, ": ").concat(data.type));
-          return _context.a(2);
-        case 2:
-          _context.n = 3;
-          return handler(data, workerState);
-        case 3:
-          return _context.a(2);
-      }
-    }, _callee);
-  }));
-  return _handleMessage.apply(this, arguments);
-}
-function handleInit(_x3, _x4) {
-  return _handleInit.apply(this, arguments);
-}
-function _handleInit() {
-  _handleInit = worker_handlers_asyncToGenerator(/*#__PURE__*/worker_handlers_regenerator().m(function _callee2(data, workerState) {
-    var packages, micropipPackages, filesToLoad, pyodideCdnUrl, snapshotCache, cdnUrl, _yield$import, loadPyodide, moduleSources, snapshotRestored, snapKey, cached, pythonModules, _i, _pythonModules, module, bytes, loader, toLoad, loaded, micropip, _t, _t2, _t3, _t4, _t5;
-    return worker_handlers_regenerator().w(function (_context2) {
-      while (1) switch (_context2.n) {
-        case 0:
-          if (!workerState.isInitialized) {
-            _context2.n = 1;
-            break;
-          }
-          worker_handlers_postError(worker_config_PYODIDE_WORKER_CONFIG.MESSAGES.ALREADY_INITIALIZED);
-          return _context2.a(2);
-        case 1:
-          packages = data.packages, micropipPackages = data.micropipPackages, filesToLoad = data.filesToLoad, pyodideCdnUrl = data.pyodideCdnUrl, snapshotCache = data.snapshotCache; // Use provided CDN URL or fall back to default
-          cdnUrl = pyodideCdnUrl || worker_config_PYODIDE_WORKER_CONFIG.PYODIDE_CDN; // Minimal init logging
-          _context2.p = 2;
-          _context2.n = 3;
-          return import(/* webpackIgnore: true */"".concat(cdnUrl, "pyodide.mjs"));
-        case 3:
-          _yield$import = _context2.v;
-          loadPyodide = _yield$import.loadPyodide;
-          moduleSources = [capture_system_namespaceObject, code_transformation_namespaceObject, pyodide_utilities_namespaceObject];
-          snapshotRestored = false;
-          snapKey = null; // Snapshot cache: restore the interpreter (plus Nagini's Python modules)
-          // from IndexedDB when a matching snapshot exists. Every failure falls
-          // back to a fresh boot
-          if (!snapshotCache) {
-            _context2.n = 13;
-            break;
-          }
-          _context2.p = 4;
-          _context2.n = 5;
-          return snapshotKey(cdnUrl, moduleSources);
-        case 5:
-          snapKey = _context2.v;
-          _context2.n = 6;
-          return loadSnapshot(snapKey);
-        case 6:
-          cached = _context2.v;
-          if (!cached) {
-            _context2.n = 11;
-            break;
-          }
-          _context2.p = 7;
-          _context2.n = 8;
-          return loadPyodide({
-            indexURL: cdnUrl,
-            _loadSnapshot: cached
-          });
-        case 8:
-          workerState.pyodide = _context2.v;
-          snapshotRestored = true;
-          worker_handlers_postInfo('[Snapshot] Interpreter restored from cache');
-          _context2.n = 11;
-          break;
-        case 9:
-          _context2.p = 9;
-          _t = _context2.v;
-          _context2.n = 10;
-          return deleteSnapshot(snapKey);
-        case 10:
-          worker_handlers_postWarning("[Snapshot] Restore failed, booting fresh: ".concat(_t.message));
-        case 11:
-          _context2.n = 13;
-          break;
-        case 12:
-          _context2.p = 12;
-          _t2 = _context2.v;
-          worker_handlers_postWarning("[Snapshot] Cache unavailable: ".concat(_t2.message));
-        case 13:
-          if (workerState.pyodide) {
-            _context2.n = 15;
-            break;
-          }
-          _context2.n = 14;
-          return loadPyodide(worker_handlers_objectSpread({
-            indexURL: cdnUrl
-          }, snapshotCache && snapKey ? {
-            _makeSnapshot: true
-          } : {}));
-        case 14:
-          workerState.pyodide = _context2.v;
-        case 15:
-          // Write the bundled Python modules to the filesystem and import them by
-          // reference. Nothing is executed in the interpreter's global namespace:
-          // user code cannot shadow or replace the capture infrastructure by
-          // rebinding names, it only sees the two builtins deliberately exposed
-          // (missive, input). A restored snapshot already contains the files and
-          // the imported modules
-          if (!snapshotRestored) {
-            pythonModules = [{
-              name: 'capture_system.py',
-              content: capture_system_namespaceObject
-            }, {
-              name: 'code_transformation.py',
-              content: code_transformation_namespaceObject
-            }, {
-              name: 'pyodide_utilities.py',
-              content: pyodide_utilities_namespaceObject
-            }];
-            for (_i = 0, _pythonModules = pythonModules; _i < _pythonModules.length; _i++) {
-              module = _pythonModules[_i];
-              workerState.pyodide.FS.writeFile(module.name, module.content);
-            }
-          }
-
-          // Importing capture_system also installs builtins.missive (instant on a
-          // restored snapshot: the modules are already in sys.modules)
-          workerState.captureSystem = workerState.pyodide.pyimport('capture_system');
-          workerState.codeTransformation = workerState.pyodide.pyimport('code_transformation');
-          workerState.pyodideUtilities = workerState.pyodide.pyimport('pyodide_utilities');
-
-          // Activate output capture
-          workerState.captureSystem.reset_captures();
-
-          // Snapshot point: the interpreter holds no JavaScript references yet.
-          // Everything after this line (input bridge, loaded files, packages)
-          // creates hiwire entries that Pyodide cannot serialize, so it is
-          // replayed on every boot instead of being part of the snapshot
-          if (!(snapshotCache && snapKey && !snapshotRestored)) {
-            _context2.n = 20;
-            break;
-          }
-          _context2.p = 16;
-          bytes = workerState.pyodide.makeMemorySnapshot();
-          _context2.n = 17;
-          return storeSnapshot(snapKey, bytes);
-        case 17:
-          if (!_context2.v) {
-            _context2.n = 18;
-            break;
-          }
-          worker_handlers_postInfo("[Snapshot] Interpreter snapshot cached (".concat((bytes.byteLength / 1e6).toFixed(1), " MB)"));
-        case 18:
-          _context2.n = 20;
-          break;
-        case 19:
-          _context2.p = 19;
-          _t3 = _context2.v;
-          worker_handlers_postWarning("[Snapshot] Could not cache interpreter: ".concat(_t3.message));
-        case 20:
-          _context2.n = 21;
-          return setupInputHandling(workerState.pyodide);
-        case 21:
-          workerState.inputMode = _context2.v;
-          if (!(filesToLoad && filesToLoad.length > 0)) {
-            _context2.n = 25;
-            break;
-          }
-          _context2.p = 22;
-          loader = new PyodideFileLoader(filesToLoad);
-          _context2.n = 23;
-          return loader.loadFiles(workerState.pyodide);
-        case 23:
-          _context2.n = 25;
-          break;
-        case 24:
-          _context2.p = 24;
-          _t4 = _context2.v;
-          console.error("Failed to load custom files:", _t4);
-          throw _t4;
-        case 25:
-          if (!((packages === null || packages === void 0 ? void 0 : packages.length) > 0)) {
-            _context2.n = 26;
-            break;
-          }
-          _context2.n = 26;
-          return loadPackages(packages, workerState);
-        case 26:
-          if (!((micropipPackages === null || micropipPackages === void 0 ? void 0 : micropipPackages.length) > 0)) {
-            _context2.n = 29;
-            break;
-          }
-          toLoad = micropipPackages.filter(function (pkg) {
-            return !workerState.micropipPackagesLoaded.has(pkg);
-          });
-          loaded = micropipPackages.filter(function (pkg) {
-            return workerState.micropipPackagesLoaded.has(pkg);
-          });
-          if (loaded.length > 0) {
-            worker_handlers_postInfo("[Micropip] Skipping ".concat(loaded.length, " already installed packages: ").concat(loaded.join(", ")));
-          }
-          if (!(toLoad.length > 0)) {
-            _context2.n = 29;
-            break;
-          }
-          worker_handlers_postInfo("[Micropip] Installing ".concat(toLoad.length, " packages: ").concat(toLoad.join(", "), "..."));
-          _context2.n = 27;
-          return workerState.pyodide.loadPackage("micropip");
-        case 27:
-          micropip = workerState.pyodide.pyimport("micropip");
-          _context2.n = 28;
-          return micropip.install(toLoad);
-        case 28:
-          toLoad.forEach(function (pkg) {
-            return workerState.micropipPackagesLoaded.add(pkg);
-          });
-          worker_handlers_postInfo("[Micropip] Packages installed successfully.");
-        case 29:
-          // Set up matplotlib if it was loaded
-          try {
-            workerState.pyodideUtilities.setup_matplotlib();
-          } catch (e) {
-            // Matplotlib setup skipped (not available)
-          }
-          workerState.isInitialized = true;
-          self.postMessage({
-            type: "ready",
-            snapshotRestored: snapshotRestored,
-            inputMode: workerState.inputMode
-          });
-          _context2.n = 31;
-          break;
-        case 30:
-          _context2.p = 30;
-          _t5 = _context2.v;
-          workerState.pyodide = null;
-          workerState.isInitialized = false;
-          worker_handlers_postError("".concat(worker_config_PYODIDE_WORKER_CONFIG.MESSAGES.INIT_FAILED, ": ").concat(_t5.message));
-        case 31:
-          return _context2.a(2);
-      }
-    }, _callee2, null, [[22, 24], [16, 19], [7, 9], [4, 12], [2, 30]]);
-  }));
-  return _handleInit.apply(this, arguments);
-}
-
 
 /**
  * @typedef {Object} WorkerState
  * @property {PyodideAPI|null} pyodide - Pyodide instance
  * @property {boolean} isInitialized - Whether Pyodide is initialized
  * @property {Set<string>} packagesLoaded - Set of loaded package names
- * @property {Set<string>} micropipPackagesLoaded - Set of loaded micropip package names
- * @property {Object|null} captureSystem - PyProxy of the capture_system module
- * @property {Object|null} codeTransformation - PyProxy of the code_transformation module
- * @property {Object|null} pyodideUtilities - PyProxy of the pyodide_utilities module
- * @property {Set<string>} shadowWarnedNames - Built-in names already reported as shadowed
  */
 
-/**
- * @typedef {Object} InitMessage
- * @property {'init'} type - Message type
- * @property {string[]} packages - Array of package names to install
- * @property {string[]} [micropipPackages] - Optional array of package names to install with micropip
- * @property {Array<FileToLoad>} filesToLoad - Files to load into filesystem
- * @property {string} [pyodideCdnUrl] - Optional custom Pyodide CDN URL (for local/offline use)
- * @property {boolean} [snapshotCache] - Cache the bare interpreter as a memory snapshot in IndexedDB
- */
+/***/ }),
 
+/***/ "./worker-snapshot.js": ((__nagini_exports__, __nagini_require__) => {
+;// ./worker-snapshot.js
+__nagini_define__(__nagini_exports__, {
+  snapshotKey: () => snapshotKey,
+  loadSnapshot: () => loadSnapshot,
+  storeSnapshot: () => storeSnapshot,
+  deleteSnapshot: () => deleteSnapshot,
+});
 /**
- * @typedef {Object} ExecuteMessage
- * @property {'execute'} type - Message type
- * @property {string} filename - Name for execution tracking
- * @property {string} code - Python code to execute
- * @property {Object} [namespace] - Optional namespace for execution
+ * PyodideWorker Snapshot Cache Module
+ *
+ * Optional interpreter snapshot cache (manager option snapshotCache). The
+ * snapshot covers the bare interpreter plus Nagini's embedded Python modules
+ * and is taken BEFORE input setup, file loading and package installation:
+ * those hold live JavaScript references (hiwire entries) that Pyodide cannot
+ * serialize, so they are replayed on every boot instead. Packages therefore
+ * still load and import after a restore; only the interpreter boot is saved.
+ *
+ * The cache key hashes the embedded module sources and includes the Pyodide
+ * origin, so changing either invalidates the entry by construction. Every
+ * failure path degrades to a fresh boot: the cache can never brick a worker.
  */
 
-/**
- * @typedef {Object} FSOperationMessage
- * @property {'fs_operation'} type - Message type
- * @property {string} operation - Filesystem operation name
- * @property {string} path - File or directory path
- * @property {string} [content] - File content (for write operations)
- */
+const DB_NAME = 'nagini-snapshots';
+const STORE = 'snapshots';
+const KEY_PREFIX = 'nagini-snap:v1:';
 
-/**
- * @typedef {Object} ExecutionResultData
- * @property {string} filename - Name of executed file
- * @property {string} stdout - Standard output
- * @property {string} stderr - Standard error
- * @property {Object|null} missive - Structured data from Python
- * @property {Object|null} error - Execution error object
- * @property {number} time - Execution time in milliseconds
- * @property {boolean} executedWithNamespace - Whether execution used namespace
- */
+function openDb() {
+  return new Promise((resolve, reject) => {
+    const req = indexedDB.open(DB_NAME, 1);
+    req.onupgradeneeded = () => req.result.createObjectStore(STORE);
+    req.onsuccess = () => resolve(req.result);
+    req.onerror = () => reject(req.error);
+  });
+}
 
 /**
- * @typedef {Object} CapturedOutputs
- * @property {string} stdout - Standard output
- * @property {string} stderr - Standard error
- * @property {Object|null} missive - Structured JSON data
+ * Compute the cache key for a snapshot: prefix + Pyodide origin + SHA-256 of
+ * the embedded Python module sources
+ *
+ * @param {string} cdnUrl - Resolved Pyodide base URL (part of the key)
+ * @param {string[]} moduleSources - Embedded Python sources (hashed)
+ * @returns {Promise<string>} Cache key
  */
+async function snapshotKey(cdnUrl, moduleSources) {
+  const data = new TextEncoder().encode(moduleSources.join(' '));
+  const digest = await crypto.subtle.digest('SHA-256', data);
+  const hex = [...new Uint8Array(digest)].map((b) => b.toString(16).padStart(2, '0')).join('');
+  return `${KEY_PREFIX}${cdnUrl}:${hex}`;
+}
 
 /**
- * @typedef {Object} FSOperationResult
- * @property {boolean} [success] - Whether operation succeeded
- * @property {string} [content] - File content (for readFile)
- * @property {boolean} [exists] - Whether file exists (for exists)
- * @property {string[]} [files] - Directory contents (for listdir)
+ * Read a cached snapshot; any failure (no IndexedDB, quota, missing key)
+ * resolves to null
+ *
+ * @param {string} key - Cache key
+ * @returns {Promise<Uint8Array|null>}
  */
+async function loadSnapshot(key) {
+  try {
+    const db = await openDb();
+    return await new Promise((resolve) => {
+      const req = db.transaction(STORE).objectStore(STORE).get(key);
+      req.onsuccess = () => resolve(req.result || null);
+      req.onerror = () => resolve(null);
+    });
+  } catch (e) {
+    return null;
+  }
+}
 
 /**
- * @typedef {Object} FileToLoad
- * @property {string} path - Target path in filesystem
- * @property {string} content - File content to write
+ * Store a snapshot and evict every other nagini-snap entry (stale runtimes
+ * or module versions have no reader anymore)
+ *
+ * @param {string} key - Cache key
+ * @param {Uint8Array} bytes - Snapshot buffer
+ * @returns {Promise<boolean>} True when stored
  */
+async function storeSnapshot(key, bytes) {
+  try {
+    const db = await openDb();
+    return await new Promise((resolve) => {
+      const tx = db.transaction(STORE, 'readwrite');
+      const store = tx.objectStore(STORE);
+      const keysReq = store.getAllKeys();
+      keysReq.onsuccess = () => {
+        for (const k of keysReq.result) {
+          if (typeof k === 'string' && k.startsWith(KEY_PREFIX) && k !== key) {
+            store.delete(k);
+          }
+        }
+        store.put(bytes, key);
+      };
+      tx.oncomplete = () => resolve(true);
+      tx.onerror = () => resolve(false);
+    });
+  } catch (e) {
+    return false;
+  }
+}
 
 /**
- * @typedef {Object} PyodideAPI
- * @property {function} runPython - Execute Python code
- * @property {function} loadPackage - Load Python packages
- * @property {function} toPy - Convert JavaScript to Python
- * @property {Object} FS - Filesystem operations
+ * Delete one snapshot entry (used after a failed restore)
+ *
+ * @param {string} key - Cache key
+ * @returns {Promise<void>}
  */
-;// ./worker.js
-function worker_regenerator() { /*! regenerator-runtime -- Copyright (c) 2014-present, Facebook, Inc. -- license (MIT): https://github.com/babel/babel/blob/main/packages/babel-helpers/LICENSE */ var e, t, r = "function" == typeof Symbol ? Symbol : {}, n = r.iterator || "@@iterator", o = r.toStringTag || "@@toStringTag"; function i(r, n, o, i) { var c = n && n.prototype instanceof Generator ? n : Generator, u = Object.create(c.prototype); return worker_regeneratorDefine2(u, "_invoke", function (r, n, o) { var i, c, u, f = 0, p = o || [], y = !1, G = { p: 0, n: 0, v: e, a: d, f: d.bind(e, 4), d: function d(t, r) { return i = t, c = 0, u = e, G.n = r, a; } }; function d(r, n) { for (c = r, u = n, t = 0; !y && f && !o && t < p.length; t++) { var o, i = p[t], d = G.p, l = i[2]; r > 3 ? (o = l === n) && (u = i[(c = i[4]) ? 5 : (c = 3, 3)], i[4] = i[5] = e) : i[0] <= d && ((o = r < 2 && d < i[1]) ? (c = 0, G.v = n, G.n = i[1]) : d < l && (o = r < 3 || i[0] > n || n > l) && (i[4] = r, i[5] = n, G.n = l, c = 0)); } if (o || r > 1) return a; throw y = !0, n; } return function (o, p, l) { if (f > 1) throw TypeError("Generator is already running"); for (y && 1 === p && d(p, l), c = p, u = l; (t = c < 2 ? e : u) || !y;) { i || (c ? c < 3 ? (c > 1 && (G.n = -1), d(c, u)) : G.n = u : G.v = u); try { if (f = 2, i) { if (c || (o = "next"), t = i[o]) { if (!(t = t.call(i, u))) throw TypeError("iterator result is not an object"); if (!t.done) return t; u = t.value, c < 2 && (c = 0); } else 1 === c && (t = i.return) && t.call(i), c < 2 && (u = TypeError("The iterator does not provide a '" + o + "' method"), c = 1); i = e; } else if ((t = (y = G.n < 0) ? u : r.call(n, G)) !== a) break; } catch (t) { i = e, c = 1, u = t; } finally { f = 1; } } return { value: t, done: y }; }; }(r, o, i), !0), u; } var a = {}; function Generator() {} function GeneratorFunction() {} function GeneratorFunctionPrototype() {} t = Object.getPrototypeOf; var c = [][n] ? t(t([][n]())) : (worker_regeneratorDefine2(t = {}, n, function () { return this; }), t), u = GeneratorFunctionPrototype.prototype = Generator.prototype = Object.create(c); function f(e) { return Object.setPrototypeOf ? Object.setPrototypeOf(e, GeneratorFunctionPrototype) : (e.__proto__ = GeneratorFunctionPrototype, worker_regeneratorDefine2(e, o, "GeneratorFunction")), e.prototype = Object.create(u), e; } return GeneratorFunction.prototype = GeneratorFunctionPrototype, worker_regeneratorDefine2(u, "constructor", GeneratorFunctionPrototype), worker_regeneratorDefine2(GeneratorFunctionPrototype, "constructor", GeneratorFunction), GeneratorFunction.displayName = "GeneratorFunction", worker_regeneratorDefine2(GeneratorFunctionPrototype, o, "GeneratorFunction"), worker_regeneratorDefine2(u), worker_regeneratorDefine2(u, o, "Generator"), worker_regeneratorDefine2(u, n, function () { return this; }), worker_regeneratorDefine2(u, "toString", function () { return "[object Generator]"; }), (worker_regenerator = function _regenerator() { return { w: i, m: f }; })(); }
-function worker_regeneratorDefine2(e, r, n, t) { var i = Object.defineProperty; try { i({}, "", {}); } catch (e) { i = 0; } worker_regeneratorDefine2 = function _regeneratorDefine(e, r, n, t) { if (r) i ? i(e, r, { value: n, enumerable: !t, configurable: !t, writable: !t }) : e[r] = n;else { var o = function o(r, n) { worker_regeneratorDefine2(e, r, function (e) { return this._invoke(r, n, e); }); }; o("next", 0), o("throw", 1), o("return", 2); } }, worker_regeneratorDefine2(e, r, n, t); }
-function worker_asyncGeneratorStep(n, t, e, r, o, a, c) { try { var i = n[a](c), u = i.value; } catch (n) { return void e(n); } i.done ? t(u) : Promise.resolve(u).then(r, o); }
-function worker_asyncToGenerator(n) { return function () { var t = this, e = arguments; return new Promise(function (r, o) { var a = n.apply(t, e); function _next(n) { worker_asyncGeneratorStep(a, r, o, _next, _throw, "next", n); } function _throw(n) { worker_asyncGeneratorStep(a, r, o, _next, _throw, "throw", n); } _next(void 0); }); }; }
+async function deleteSnapshot(key) {
+  try {
+    const db = await openDb();
+    await new Promise((resolve) => {
+      const tx = db.transaction(STORE, 'readwrite');
+      tx.objectStore(STORE).delete(key);
+      tx.oncomplete = resolve;
+      tx.onerror = resolve;
+    });
+  } catch (e) {
+    // cache is best-effort only
+  }
+}
+
+/***/ }),
+
+/***/ "../file-loader/file-loader.js": ((__nagini_exports__, __nagini_require__) => {
+;// ../file-loader/file-loader.js
+__nagini_define__(__nagini_exports__, {
+  PyodideFileLoader: () => PyodideFileLoader,
+});
 /**
- * Pyodide Web Worker - Entry Point
- *
- * Pyodide WebAssembly worker that runs Python code in a separate thread.
- * Handles initialization, code execution, and structured communication (missive + stdout + stderr)
- * with the main thread via message passing.
+ * PyodideFileLoader - File loading utilities for Pyodide
  *
- * ⚠️ Security Note: This worker executes arbitrary Python code.
- * Use ONLY in trusted environments or implement additional sandboxing.
+ * Handles loading remote files (S3, URLs) into the Pyodide virtual filesystem
+ * with retry mechanisms and proper error handling.
  *
  * @example
- * // Main thread usage:
- * const worker = new Worker('./pyodide-worker.js');
- * worker.postMessage({ type: 'init', packages: ['numpy'], pyodideInitPath: './init.py' });
- * worker.postMessage({ type: 'execute', filename: 'test.py', code: 'print("Hello")' });
- *
- * @module PyodideWorker
+ * const filesToLoad = [
+ *   { url: "https://example.com/module.py", path: "modules/module.py" },
+ *   { url: "./local/file.py", path: "local_file.py" }
+ * ];
+ * const loader = new PyodideFileLoader(filesToLoad);
+ * await loader.loadFiles(pyodide);
  */
 
-
-
 /**
- * Worker state object to track Pyodide instance and loaded packages
- * @type {WorkerState}
+ * PyodideFileLoader class for loading files into Pyodide filesystem
  */
-var workerState = {
-  /** @type {PyodideAPI|null} Pyodide instance - null until initialization complete */
-  pyodide: null,
-  /** @type {boolean} Tracks initialization state */
-  isInitialized: false,
-  /** @type {Set<string>} Tracks loaded packages to prevent duplicate loading 📦 */
-  packagesLoaded: new Set(),
-  /** @type {Set<string>} Tracks loaded micropip packages to prevent duplicate loading 📦 */
-  micropipPackagesLoaded: new Set(),
-  /** @type {Object|null} PyProxy of the capture_system module (set at init) */
-  captureSystem: null,
-  /** @type {Object|null} PyProxy of the code_transformation module (set at init) */
-  codeTransformation: null,
-  /** @type {Object|null} PyProxy of the pyodide_utilities module (set at init) */
-  pyodideUtilities: null,
-  /** @type {Set<string>} Built-in names already reported as shadowed by user code */
-  shadowWarnedNames: new Set(),
-  /** @type {'jspi'|'async'|null} How input() is bridged (set at init):
-   *  native stack switching, or async handler plus AST rewrite */
-  inputMode: null
-};
+class PyodideFileLoader {
+  /**
+   * Create a new PyodideFileLoader instance
+   *
+   * @param {Array<FileToLoad>} filesToLoad - Array of file objects to load
+   * @throws {Error} If filesToLoad is not an array or contains invalid objects
+   */
+  constructor(filesToLoad) {
+    // Validate argument - now required
+    if (!Array.isArray(filesToLoad)) {
+      throw new Error("📦 [PyodideFileLoader] filesToLoad must be an array");
+    }
 
-/**
- * Web Worker message handler
- *
- * Processes messages from the main thread using imported handlers.
- *
- * @param {MessageEvent<WorkerMessage>} e - Message event from main thread
- * @returns {Promise<void>}
- */
-self.onmessage = /*#__PURE__*/function () {
-  var _ref = worker_asyncToGenerator(/*#__PURE__*/worker_regenerator().m(function _callee(e) {
-    var _e$data, _t;
-    return worker_regenerator().w(function (_context) {
-      while (1) switch (_context.n) {
-        case 0:
-          _context.p = 0;
-          _context.n = 1;
-          return handleMessage(e, workerState);
-        case 1:
-          _context.n = 3;
-          break;
-        case 2:
-          _context.p = 2;
-          _t = _context.v;
-          // Error during message handling; echo the request id (if any) so the
-          // manager can reject the matching pending promise
-          self.postMessage({
-            type: "error",
-            id: (_e$data = e.data) === null || _e$data === void 0 ? void 0 : _e$data.id,
-            message: "\uD83D\uDD27 [Worker] Failed to handle message: ".concat(_t.message)
-          });
-        case 3:
-          return _context.a(2);
+    // Validate each file object
+    for (const [index, file] of filesToLoad.entries()) {
+      if (!file || typeof file !== 'object') {
+        throw new Error(`📦 [PyodideFileLoader] filesToLoad[${index}] must be an object`);
       }
-    }, _callee, null, [[0, 2]]);
-  }));
-  return function (_x) {
-    return _ref.apply(this, arguments);
-  };
-}();
+      if (typeof file.url !== 'string' || !file.url.trim()) {
+        throw new Error(
+          `📦 [PyodideFileLoader] filesToLoad[${index}].url must be a non-empty string`
+        );
+      }
+      if (typeof file.path !== 'string' || !file.path.trim()) {
+        throw new Error(`📦 [PyodideFileLoader] filesToLoad[${index}].path must be a non-empty string`);
+      }
+    }
+
+    this.filesToLoad = filesToLoad;
+  }
+
+  /**
+   * Load files into Pyodide filesystem with retry mechanism
+   *
+   * @param {PyodideAPI} pyodide - Pyodide instance
+   * @param {LoadOptions} [options] - Loading options
+   * @returns {Promise<void>}
+   * @throws {Error} If file loading fails after all retries
+   */
+  async loadFiles(pyodide, options = {}) {
+    const { maxRetries = 3, retryDelay = 1000 } = options;
+
+    // Validate pyodide instance
+    if (!pyodide || !pyodide.FS) {
+      throw new Error("📦 [PyodideFileLoader] Invalid pyodide instance - missing FS");
+    }
+
+    for (const file of this.filesToLoad) {
+      let retryCount = 0;
+
+      while (retryCount < maxRetries) {
+        try {
+          console.log(`🐍 [PyodideFileLoader] Loading: ${file.url} (attempt ${retryCount + 1}/${maxRetries})`);
+
+          const response = await fetch(file.url);
+          if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+          }
+
+          const content = await response.text();
+
+          // Create directory if needed
+          const dir = file.path.split('/').slice(0, -1).join('/');
+          if (dir) {
+            const dirExists = pyodide.FS.analyzePath(dir).exists;
+            if (!dirExists) {
+              console.log(`🐍 [PyodideFileLoader] Creating directory: ${dir}`);
+              pyodide.FS.mkdir(dir);
+            }
+          }
+
+          pyodide.FS.writeFile(file.path, content);
+          console.log(`🐍 [PyodideFileLoader] Saved: ${file.path}`);
+          break; // Success, exit retry loop
+
+        } catch (error) {
+          retryCount++;
+          console.warn(`🐍 [PyodideFileLoader] Attempt ${retryCount} failed for ${file.url}:`, error.message);
+
+          if (retryCount === maxRetries) {
+            const errorMsg = `📦 [PyodideFileLoader] Failed to load ${file.url} after ${maxRetries} attempts: ${error.message}`;
+            console.error(errorMsg);
+            throw new Error(errorMsg);
+          }
+
+          // Wait before retry with exponential backoff
+          await new Promise(resolve => setTimeout(resolve, retryDelay * retryCount));
+        }
+      }
+    }
+  }
+}
+
+
 
 /**
- * @typedef {Object} WorkerState
- * @property {PyodideAPI|null} pyodide - Pyodide instance (null until initialized)
- * @property {boolean} isInitialized - Whether Pyodide is fully initialized
- * @property {Set<string>} packagesLoaded - Set of loaded package names for deduplication
- * @property {Set<string>} micropipPackagesLoaded - Set of loaded micropip package names for deduplication
+ * @typedef {Object} FileToLoad
+ * @property {string} url - URL to fetch the file from (supports S3, HTTP, local paths)
+ * @property {string} path - Target path in Pyodide filesystem where file should be saved
  */
 
 /**
- * @typedef {Object} WorkerMessage
- * @property {'init'|'execute'|'fs_operation'|'input_response'} type - Message type
- * @property {string} [filename] - Filename for execution (execute messages)
- * @property {string} [code] - Python code to execute (execute messages)
- * @property {Object} [namespace] - Execution namespace (execute messages)
- * @property {string[]} [packages] - Python packages to install (init messages)
- * @property {string[]} [micropipPackages] - Python micropip packages to install (init messages)
- * @property {string} [pyodideInitPath] - Path to initialization script (init messages)
- * @property {Array<FileToLoad>} [filesToLoad] - Files to load (init messages)
- * @property {string} [operation] - Filesystem operation type (fs_operation messages)
- * @property {string} [path] - File path (fs_operation messages)
- * @property {string} [content] - File content (fs_operation messages)
- * @property {string} [input] - User input (input_response messages)
+ * @typedef {Object} LoadOptions
+ * @property {number} [maxRetries=3] - Maximum number of retry attempts for failed downloads
+ * @property {number} [retryDelay=1000] - Base delay in milliseconds between retries
  */
 
 /**
  * @typedef {Object} PyodideAPI
- * @property {Function} runPython - Execute Python code synchronously
- * @property {Function} runPythonAsync - Execute Python code asynchronously
- * @property {Function} loadPackage - Load Python packages
- * @property {Function} toPy - Convert JavaScript to Python objects
- * @property {Object} FS - Virtual filesystem interface
+ * @property {Object} FS - Pyodide filesystem interface
  * @property {Function} FS.writeFile - Write file to filesystem
- * @property {Function} FS.readFile - Read file from filesystem
- * @property {Function} FS.mkdir - Create directory
  * @property {Function} FS.analyzePath - Analyze path existence
- * @property {Function} FS.readdir - List directory contents
+ * @property {Function} FS.mkdir - Create directory
  */
 
-/**
- * @typedef {Object} FileToLoad
- * @property {string} url - URL to fetch the file from
- * @property {string} path - Target path in Pyodide filesystem
- */
+/***/ }),
+});
+var __nagini_cache__ = {};
+function __nagini_define__(exports, getters) {
+  for (const key in getters) Object.defineProperty(exports, key, { enumerable: true, get: getters[key] });
+}
+function __nagini_require__(moduleId) {
+  if (__nagini_cache__[moduleId]) return __nagini_cache__[moduleId];
+  const exports = __nagini_cache__[moduleId] = {};
+  __nagini_modules__[moduleId](exports, __nagini_require__);
+  return exports;
+}
+__nagini_require__("./worker.js");
 /******/ })()
-;
\ No newline at end of file
+;
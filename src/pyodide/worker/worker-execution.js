@@ -6,6 +6,9 @@
  */
 
 import { PYODIDE_WORKER_CONFIG } from './worker-config.js';
+import { resetRawCapture, flushRawCapture } from './worker-raw-capture.js';
+import { loadImportedPackages } from './worker-fs.js';
+import { namedNamespace, clearNamespaces } from './worker-namespaces.js';
 
 /**
  * Handle Python code execution
@@ -17,83 +20,613 @@ import { PYODIDE_WORKER_CONFIG } from './worker-config.js';
  */
 export async function handleExecute(data, workerState) {
   if (!validateInitialized(workerState, data.id)) return;
+  if (data.namespaceRef !== undefined && !workerState.namespaces.has(data.namespaceRef)) {
+    postError(`Unknown namespace "${data.namespaceRef}" (never created, deleted or evicted)`, data.id);
+    return;
+  }
+
+  // An interrupt meant for a run that already finished must not hit this one
+  if (workerState.interruptBuffer) workerState.interruptBuffer[0] = 0;
+
+  const { result, transfer } = await runExecution(data, workerState);
+
+  // 🐍 POST EXECUTION RESULTS (always logged with snake emoji)
+  console.log("🐍 Worker execution result:", {
+    filename: result.filename,
+    stdout: result.stdout.length + " chars",
+    stderr: result.stderr.length + " chars",
+    missive: result.missive,
+    figures: result.figures.length + " figures",
+    error: result.error,
+    truncated: result.truncated,
+    time: result.time + "ms"
+  });
+
+  // Binary figures (png/svg) and binary missive arrays travel as
+  // transferables: their buffers move to the main thread instead of being
+  // structured-cloned
+  postResult({ id: data.id, ...result }, transfer);
+}
 
-  const { code, filename, namespace, id } = data;
+/**
+ * Handle a batch of independent executions sent in one message: items run
+ * back to back, each with its own captures and error, and their results
+ * go back in batch_results messages of up to resultBatchSize items (or
+ * every flushIntervalMs), then batch_done. An item interrupted by the
+ * manager (timeout, abort) ends the batch: nobody waits for the rest
+ *
+ * @param {ExecuteBatchMessage} data - Batch request
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<void>}
+ */
+export async function handleExecuteBatch(data, workerState) {
+  if (!validateInitialized(workerState, data.id)) return;
+
+  const { id, items, resultBatchSize = 32, flushIntervalMs = 50, ...shared } = data;
   const start = Date.now();
-  let stdout = "", stderr = "", missive = null, figures = [], error = null;
+  let pending = [], transfer = new Set(), lastFlush = start, completed = 0;
+  const flush = () => {
+    if (pending.length === 0) return;
+    self.postMessage({ type: "batch_results", id, index: completed - pending.length, results: pending }, [...transfer]);
+    pending = [];
+    transfer = new Set();
+    lastFlush = Date.now();
+  };
 
-  try {
-    // Transform code for async execution if needed
-    const result = transformCodeForExecution(code, workerState);
+  // Cleared once: a SIGINT landing between two items stops the next one
+  if (workerState.interruptBuffer) workerState.interruptBuffer[0] = 0;
 
-    workerState.captureSystem.reset_captures();
+  for (const item of items) {
+    const run = await runExecution({ ...shared, ...item, id }, workerState);
+    pending.push(run.result);
+    run.transfer.forEach(buffer => transfer.add(buffer));
+    completed += 1;
+    if (run.interrupted) break;
+    if (pending.length >= resultBatchSize || Date.now() - lastFlush >= flushIntervalMs) flush();
+  }
+  flush();
+
+  console.log("🐍 Worker batch result:", { items: items.length, completed, time: (Date.now() - start) + "ms" });
+  self.postMessage({ type: "batch_done", id, completed, time: Date.now() - start });
+}
+
+/**
+ * Handle a test-case fan-out: compile the code once, then run it against
+ * each namespace. Row namespaces arrive as one array and cross into Python
+ * in a single toPy call; columnar ones (one array per variable) are split
+ * into per-case dicts on the Python side. Each case gets its own captures
+ * and error; the results go back as one vector in many_result
+ *
+ * @param {ExecuteManyMessage} data - Fan-out request
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<void>}
+ */
+export async function handleExecuteMany(data, workerState) {
+  if (!validateInitialized(workerState, data.id)) return;
+
+  const { id, code, rows, columns, budget } = data;
+  const start = Date.now();
+  workerState.currentRequestId = id;
+  if (workerState.interruptBuffer) workerState.interruptBuffer[0] = 0;
 
-    // Always execute through runPythonAsync: it handles synchronous code
-    // identically and enables top-level await in any user code (asyncio,
-    // httpx/ASGI, transformed input() calls, ...)
-    if (namespace !== undefined) {
-      const pyodideNamespace = workerState.pyodide.toPy(namespace);
+  let compiled = null, namespaces = null;
+  try {
+    compiled = transformCodeForExecution(code, workerState);
+    if (workerState.autoLoadImports && compiled.runner) {
+      await preloadImports(compiled.runner, workerState);
+    }
+    if (columns) {
+      const table = workerState.pyodide.toPy(columns);
       try {
-        await workerState.pyodide.runPythonAsync(result.code, { globals: pyodideNamespace });
+        namespaces = workerState.pyodideUtilities.namespaces_from_columns(table);
       } finally {
-        pyodideNamespace.destroy();
+        table.destroy();
       }
     } else {
-      await workerState.pyodide.runPythonAsync(result.code);
+      namespaces = workerState.pyodide.toPy(rows);
+    }
+
+    const results = [];
+    for (let i = 0; i < namespaces.length; i++) {
+      const globals = namespaces.get(i);
+      resetCaptures(workerState, data);
+      let error = null, interrupted = false;
+      try {
+        let value;
+        if (compiled.runner && budget) {
+          value = await runBudgeted(workerState, compiled.runner, globals, budget);
+        } else if (compiled.runner) {
+          value = await runCompiled(compiled.runner, globals);
+        } else {
+          value = await workerState.pyodide.runPythonAsync(compiled.code, { globals });
+        }
+        value?.destroy?.();
+      } catch (err) {
+        const name = err.type === "BudgetExceeded" ? "BudgetExceeded" : err.name || "PythonError";
+        error = { name, message: err.message || "Unknown execution error" };
+        interrupted = err.type === "KeyboardInterrupt";
+      } finally {
+        globals.destroy();
+      }
+      const { stdout, stderr, missive, truncated } = captureOutputs(workerState, error !== null, { discard: true });
+      results.push({ stdout, stderr, missive, error, truncated });
+      // Interrupted by the manager (timeout, abort): nobody waits for the rest
+      if (interrupted) break;
+    }
+
+    console.log("🐍 Worker fan-out result:", { cases: namespaces.length, completed: results.length, time: (Date.now() - start) + "ms" });
+    self.postMessage({ type: "many_result", id, results, time: Date.now() - start });
+  } catch (err) {
+    postError(`Fan-out execution failed: ${err.message}`, id);
+  } finally {
+    namespaces?.destroy();
+    compiled?.runner?.destroy();
+    workerState.currentRequestId = null;
+  }
+}
+
+/**
+ * Run one execution (compile, run, capture) and build its result payload.
+ * Shared by single and batched executions
+ *
+ * @param {ExecuteMessage} data - Execution request
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<{result: Object, transfer: ArrayBuffer[], interrupted: boolean}>}
+ */
+async function runExecution(data, workerState) {
+  const { code, filename, namespace, namespaceRef, id, figureOptions, binaryMissive, emit, display, budget } = data;
+  const start = Date.now();
+  const heapBytesBefore = wasmHeapBytes(workerState);
+  let stdout = "", stderr = "", missive = null, missiveBuffers = [], figures = [], figureKeys, error = null;
+  let truncated = false, dropped = { stdout: 0, stderr: 0 }, metrics = null, displayEntry = null;
+  let packageLoad = { ms: 0, packages: [] }, interrupted = false, capturesReset = false;
+
+  // Streamed chunks (output_chunk, emit_batch messages) are tagged with this id
+  workerState.currentRequestId = id;
+  workerState.emitWindow = emit?.maxInFlight ?? 8;
+
+  try {
+    // Transform code for async execution if needed
+    const result = transformCodeForExecution(code, workerState);
+
+    // Packages the code imports are fetched before the run (and before the
+    // capture reset, so their loading is not charged to the code)
+    if (workerState.autoLoadImports && result.runner) {
+      packageLoad = await preloadImports(result.runner, workerState);
     }
 
-    ({ stdout, stderr, missive, figures } = captureOutputs(workerState));
+    resetCaptures(workerState, data);
+    capturesReset = true;
+
+    // Always execute asynchronously: it handles synchronous code identically
+    // and enables top-level await in any user code (asyncio, httpx/ASGI,
+    // transformed input() calls, ...). The code arrives compiled (from the
+    // cache when the same source ran before) and is evaluated against the
+    // target globals with the semantics of runPythonAsync, which only runs
+    // sources that do not parse. Both return the value of a trailing
+    // expression, kept for the display mode
+    let value;
+    // A named namespace is used in place: no conversion, and what the code
+    // assigns stays there for the next run
+    const pyodideNamespace = namespace !== undefined ? workerState.pyodide.toPy(namespace) : undefined;
+    const globals = namespaceRef !== undefined
+      ? namedNamespace(workerState, namespaceRef)
+      : pyodideNamespace ?? workerState.pyodide.globals;
+    try {
+      if (result.runner && budget) {
+        value = await runBudgeted(workerState, result.runner, globals, budget);
+      } else if (result.runner) {
+        value = await runCompiled(result.runner, globals);
+      } else {
+        value = await workerState.pyodide.runPythonAsync(result.code, { globals });
+      }
+    } finally {
+      pyodideNamespace?.destroy();
+      result.runner?.destroy();
+    }
+
+    ({ stdout, stderr, missive, missiveBuffers, figures, figureKeys, truncated, dropped, metrics } =
+      captureOutputs(workerState, false, figureOptions, binaryMissive));
+
+    // Rendered after the metrics were read: repr work is not charged to the code
+    displayEntry = display ? captureDisplay(workerState, value, display) : null;
+    value?.destroy?.();
 
   } catch (err) {
-    error = { name: err.name || "PythonError", message: err.message || "Unknown execution error" };
-    ({ stdout, stderr, figures } = captureOutputs(workerState, true));
+    // A spent budget is a regular result: the worker is free for the next run
+    const name = err.type === "BudgetExceeded" ? "BudgetExceeded" : err.name || "PythonError";
+    error = { name, message: err.message || "Unknown execution error" };
+    interrupted = err.type === "KeyboardInterrupt";
+    // Before the reset (compile, package preload), the capture buffers
+    // still hold the previous execution: this one has no output yet
+    if (capturesReset) {
+      ({ stdout, stderr, figures, truncated, dropped, metrics } = captureOutputs(workerState, true));
+    }
+  }
+
+  if (metrics) {
+    metrics = {
+      ...metrics,
+      heapBytesBefore,
+      heapBytesAfter: wasmHeapBytes(workerState),
+      figureCount: figures.length,
+      compileCacheHits: workerState.codeTransformation.cache_hits,
+      compileCacheMisses: workerState.codeTransformation.cache_misses,
+      packageLoadMs: packageLoad.ms,
+      packagesAutoLoaded: packageLoad.packages,
+      budgetUsed: budget ? workerState.executionBudget.budget_used() : null,
+    };
   }
 
+  workerState.currentRequestId = null;
+
   // Default-namespace runs persist their globals, so a rebinding of the
   // exposed builtins (missive, input) outlives this execution: warn once
-  if (namespace === undefined) {
+  if (namespace === undefined && namespaceRef === undefined) {
     warnShadowedBuiltins(workerState, filename);
   }
 
-  // 🐍 POST EXECUTION RESULTS (always logged with snake emoji)
-  console.log("🐍 Worker execution result:", {
-    filename,
-    stdout: stdout.length + " chars",
-    stderr: stderr.length + " chars",
-    missive,
-    figures: figures.length + " figures",
-    error,
-    time: (Date.now() - start) + "ms"
-  });
+  return {
+    result: {
+      filename, stdout, stderr, missive, figures, figureKeys, error, truncated, dropped, metrics,
+      display: displayEntry,
+      figureFormat: figureOptions?.lazy ? "handle" : (figureOptions?.format ?? "base64"),
+      time: Date.now() - start,
+      executedWithNamespace: namespace !== undefined || namespaceRef !== undefined
+    },
+    transfer: transferablesOf([...figures, ...missiveBuffers, displayEntry?.data]),
+    interrupted,
+  };
+}
 
-  postResult({
-    id, filename, stdout, stderr, missive, figures, error,
-    time: Date.now() - start,
-    executedWithNamespace: namespace !== undefined
-  });
+/**
+ * Render the value of the trailing expression through its richest
+ * _repr_*_ method (capture_system.get_display). A failing repr must not
+ * fail the execution: it is reported as a warning
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {any} value - runPythonAsync return value (PyProxy or converted primitive)
+ * @param {DisplayOptions} display - Byte cap and pandas row window
+ * @returns {DisplayEntry|null} Display entry, null when there is no value
+ */
+function captureDisplay(workerState, value, display) {
+  if (value === undefined) return null;
+  try {
+    const entry = workerState.captureSystem.get_display.callKwargs(value, {
+      max_bytes: display.maxBytes ?? 1_000_000,
+      max_rows: display.maxRows ?? 60,
+    });
+    if (!entry) return null;
+    const converted = entry.toJs({ dict_converter: Object.fromEntries });
+    entry.destroy();
+    return converted;
+  } catch (e) {
+    postWarning(`Could not display the last expression: ${e.message}`);
+    return null;
+  }
+}
+
+/**
+ * Collect the distinct ArrayBuffers behind binary payloads, for the
+ * postMessage transfer list
+ *
+ * @param {Array<string|Uint8Array>} payloads - Result payloads (strings are skipped)
+ * @returns {ArrayBuffer[]} Buffers to transfer
+ */
+function transferablesOf(payloads) {
+  const buffers = new Set();
+  for (const payload of payloads) {
+    if (payload && ArrayBuffer.isView(payload)) buffers.add(payload.buffer);
+  }
+  return [...buffers];
+}
+
+/**
+ * Handle an on-demand figure render (figures kept open by a lazy execution)
+ * Replies with figure_result, the payload in the transfer list when binary
+ *
+ * @param {RenderFigureMessage} data - Render request
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<void>}
+ */
+export async function handleRenderFigure(data, workerState) {
+  if (!validateInitialized(workerState, data.id)) return;
+
+  const { id, num, format = "png", dpi = 100, width, tight = true } = data;
+  try {
+    const rendered = withoutPendingInterrupt(workerState,
+      () => workerState.captureSystem.render_figure.callKwargs(num, { format, dpi, width, tight }));
+    let figure = rendered;
+    if (rendered && rendered.toJs) {
+      figure = rendered.toJs();
+      rendered.destroy();
+    }
+    self.postMessage({ type: "figure_result", id, num, format, figure }, transferablesOf([figure]));
+  } catch (err) {
+    postError(`Failed to render figure ${num}: ${err.message}`, id);
+  }
+}
+
+/**
+ * Handle a syntax check (live editors): parse the code without running it.
+ * Goes through the compile cache shared with executions, leaves captures
+ * and globals alone. Synchronous, so it is served as soon as the worker's
+ * event loop is free, even while an execution awaits (input(), asyncio)
+ *
+ * @param {CheckMessage} data - Check request
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {void}
+ */
+export function handleCheck(data, workerState) {
+  if (!validateInitialized(workerState, data.id)) return;
+
+  const { id, code } = data;
+  const start = performance.now();
+  try {
+    // Same rewrite decision as the execution path: the check warms the
+    // cache entry the next run of this source will use
+    const found = withoutPendingInterrupt(workerState,
+      () => workerState.codeTransformation.check_syntax(code, needsInputRewrite(code, workerState)));
+    let error = null;
+    if (found) {
+      error = found.toJs({ dict_converter: Object.fromEntries });
+      found.destroy();
+    }
+    self.postMessage({ type: "check_result", id, valid: error === null, error, time: performance.now() - start });
+  } catch (err) {
+    postError(`Syntax check failed: ${err.message}`, id);
+  }
+}
+
+/**
+ * Handle a reset: put the interpreter back in its post-init state
+ * (interpreter_state.reset_state) without restarting the worker. The
+ * manager queues it like an execution, so no code is running
+ *
+ * @param {ResetMessage} data - Reset request
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {void}
+ */
+export function handleReset(data, workerState) {
+  if (!validateInitialized(workerState, data.id)) return;
+
+  const { id, scratchDir } = data;
+  const start = performance.now();
+  try {
+    const stats = withoutPendingInterrupt(workerState,
+      () => workerState.interpreterState.reset_state(workerState.pyodide.globals, scratchDir ?? null));
+    const { globalsRemoved, modulesEvicted } = stats.toJs({ dict_converter: Object.fromEntries });
+    stats.destroy();
+    // Shadowing warnings apply to the next student's code again, and named
+    // namespaces hold the previous one's variables
+    workerState.shadowWarnedNames.clear();
+    clearNamespaces(workerState);
+    self.postMessage({ type: "reset_result", id, globalsRemoved, modulesEvicted, time: performance.now() - start });
+  } catch (err) {
+    postError(`Reset failed: ${err.message}`, id);
+  }
+}
+
+/**
+ * Reset the capture layer for a new execution, in streaming mode when the
+ * request asked for it (stdout/stderr then leave as output_chunk messages
+ * while the code runs, instead of one string in the result), bounded to
+ * a head and a tail when it carries an output limit, delivering emit()
+ * records as emit_batch messages when it has an emit listener, and
+ * tracing Python allocations when it asks for the memory peak
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {ExecuteMessage} data - Execution request (stream, outputLimit, emit, traceMemory)
+ * @returns {void}
+ */
+function resetCaptures(workerState, data) {
+  const { stream, outputLimit, emit, traceMemory } = data;
+  const raw = workerState.rawCapture;
+  if (!raw && !stream && !outputLimit && !emit && !traceMemory) {
+    workerState.captureSystem.reset_captures();
+    return;
+  }
+  const kwargs = {};
+  if (raw) {
+    // Raw backend: limits and streaming are applied to the fd bytes here,
+    // the Python side only keeps the interpreter's own streams in place
+    resetRawCapture(raw, stream, outputLimit);
+    kwargs.redirect = false;
+    kwargs.streaming = !!stream;
+  } else if (stream) {
+    kwargs.streaming = true;
+    kwargs.chunk_size = stream.chunkSize ?? 8192;
+    kwargs.flush_interval = (stream.flushIntervalMs ?? 50) / 1000;
+  }
+  if (outputLimit && !raw) {
+    kwargs.head_limit = outputLimit.head;
+    kwargs.tail_limit = outputLimit.tail ?? 0;
+  }
+  if (emit) {
+    kwargs.emitting = true;
+    kwargs.emit_batch_size = emit.batchSize ?? 64;
+    kwargs.emit_flush_interval = (emit.flushIntervalMs ?? 50) / 1000;
+  }
+  if (traceMemory) {
+    kwargs.trace_memory = true;
+  }
+  workerState.captureSystem.reset_captures.callKwargs(kwargs);
+}
+
+/**
+ * Run Python outside an execution with the interrupt buffer cleared: a
+ * SIGINT left by a run that already ended (timeout or abort racing its
+ * completion) would raise KeyboardInterrupt in the wrong place. A SIGINT
+ * meant for an execution still in progress (awaiting input() or asyncio
+ * while a check or a render is served) is put back afterwards
+ *
+ * @template T
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {function(): T} fn - Synchronous Python work
+ * @returns {T} Value returned by fn
+ */
+export function withoutPendingInterrupt(workerState, fn) {
+  const buffer = workerState.interruptBuffer;
+  if (!buffer) return fn();
+  const pending = workerState.currentRequestId !== null ? buffer[0] : 0;
+  buffer[0] = 0;
+  try {
+    return fn();
+  } finally {
+    if (pending) buffer[0] = pending;
+  }
+}
+
+/**
+ * Current size of the WebAssembly memory (it only ever grows)
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {number|null} Heap size in bytes, null if unavailable
+ */
+export function wasmHeapBytes(workerState) {
+  return workerState.pyodide?._module?.HEAPU8?.byteLength ?? null;
+}
+
+/** Longest wait for the main thread to consume emit batches: past it the
+ *  rest of the execution posts its batches without flow control */
+const EMIT_STALL_TIMEOUT_MS = 5000;
+
+/**
+ * Post one emit() batch, then apply backpressure: with a shared ack counter
+ * (cross-origin isolated pages), block while more than emitWindow batches
+ * are unacknowledged by the main thread. Python runs synchronously here, so
+ * Atomics.wait is the only way to let the consumer catch up; without the
+ * counter batches are posted unthrottled. The wait ends on an interrupt
+ * (KeyboardInterrupt raised into the emitting code) or after
+ * EMIT_STALL_TIMEOUT_MS without progress (a manager that stopped acking)
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {string} records - JSON array of the batch records
+ * @returns {void}
+ */
+export function postEmitBatch(workerState, records) {
+  self.postMessage({ type: "emit_batch", id: workerState.currentRequestId, records });
+  workerState.emitSent += 1;
+
+  const ack = workerState.emitAck;
+  if (!ack) return;
+  let acked = Atomics.load(ack, 0);
+  let deadline = Date.now() + EMIT_STALL_TIMEOUT_MS;
+  while (workerState.emitSent - acked > workerState.emitWindow) {
+    // Python is blocked in this call: the interrupt buffer is only seen if
+    // it is checked here
+    if (workerState.interruptBuffer?.[0]) {
+      workerState.pyodide.checkInterrupt();
+      return;
+    }
+    if (Date.now() > deadline) {
+      workerState.emitWindow = Infinity;
+      postWarning(`emit(): no batch consumed for ${EMIT_STALL_TIMEOUT_MS / 1000} seconds, flow control disabled for this execution`);
+      return;
+    }
+    Atomics.wait(ack, 0, acked, 100);
+    const now = Atomics.load(ack, 0);
+    if (now !== acked) deadline = Date.now() + EMIT_STALL_TIMEOUT_MS;
+    acked = now;
+  }
 }
 
 /**
  * Transform code for execution, handling input() calls if present
  * @param {string} code - The original Python code
  * @param {WorkerState} workerState - Current worker state object
- * @returns {Object} - {code: transformedCode, needsAsync: boolean}
+ * @returns {Object} - {code: originalCode, runner: compiled CodeRunner PyProxy or null, needsAsync: boolean}
  */
 export function transformCodeForExecution(code, workerState) {
+  const needsAsync = needsInputRewrite(code, workerState);
+
+  // Compiled (and rewritten when needed) in one pass on the AST, through the
+  // module reference (immune to user code rebinding the name), or served by
+  // the compile cache keyed on the source and the rewrite. Line numbers stay
+  // those of the source; a syntax error yields no runner and the source runs
+  // as-is so the error is reported unchanged
+  const runner = workerState.codeTransformation.compile_for_execution(code, needsAsync);
+  return { code, runner: runner ?? null, needsAsync };
+}
+
+/**
+ * Whether the input() calls of the code must be rewritten into await input()
+ * @param {string} code - The original Python code
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {boolean} True in async input mode when the code calls input(
+ */
+function needsInputRewrite(code, workerState) {
   // En mode jspi, input() bloque nativement via run_sync : aucun besoin de
   // réécrire le code. En mode async (pas de JSPI), le gate ne match que les
   // vrais appels input(, pas some_func__input( ni obj.input( ; la réécriture
   // réelle en await input() est faite côté Python sur l'AST.
-  const needsAsync = workerState.inputMode !== "jspi" && /(?<![\w.])input\s*\(/.test(code);
+  return workerState.inputMode !== "jspi" && /(?<![\w.])input\s*\(/.test(code);
+}
+
+/**
+ * Load the packages imported by compiled code (runner.imports, scanned from
+ * the AST at compile time and cached with it) that are not loaded yet
+ *
+ * @param {Object} runner - Compiled CodeRunner PyProxy
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<{ms: number, packages: string[]}>} Time spent and packages loaded
+ */
+async function preloadImports(runner, workerState) {
+  const start = performance.now();
+  const importsProxy = runner.imports;
+  const imports = importsProxy.toJs();
+  importsProxy.destroy();
+  const packages = await loadImportedPackages(imports, workerState);
+  if (packages.length > 0) {
+    // Same setup as packages listed at init (matplotlib backend, ...)
+    const loaded = workerState.pyodide.toPy(packages);
+    try {
+      workerState.pyodideUtilities.configure_loaded_packages(loaded);
+    } finally {
+      loaded.destroy();
+    }
+  }
+  return { ms: performance.now() - start, packages };
+}
+
+/**
+ * Evaluate a compiled CodeRunner against target globals. Like
+ * runPythonAsync, enter through callPromising when Pyodide provides it, so
+ * that JSPI stack switching (blocking input()) works inside the code
+ *
+ * @param {Object} runner - Compiled CodeRunner PyProxy
+ * @param {Object} globals - Globals dict PyProxy
+ * @returns {Promise<any>} Value of the trailing expression
+ */
+async function runCompiled(runner, globals) {
+  const runAsync = runner.run_async;
+  try {
+    return await (runAsync.callPromising ? runAsync.callPromising(globals) : runAsync(globals));
+  } finally {
+    runAsync.destroy();
+  }
+}
 
-  if (needsAsync) {
-    // Transform the code using the Python transformation, called through the
-    // module reference (immune to user code rebinding the name)
-    const transformedCode = workerState.codeTransformation.transform_code_for_execution(code);
-    return { code: transformedCode, needsAsync: true };
-  } else {
-    // Return original code as-is
-    return { code: code, needsAsync: false };
+/**
+ * Evaluate a compiled CodeRunner under a line budget
+ * (execution_budget.run_with_budget): past the budget, BudgetExceeded is
+ * raised inside Python and the run ends as an ordinary error. Entered like
+ * runCompiled, through callPromising when available
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {Object} runner - Compiled CodeRunner PyProxy
+ * @param {Object} globals - Globals dict PyProxy
+ * @param {number} budget - Lines the code may execute
+ * @returns {Promise<any>} Value of the trailing expression
+ */
+async function runBudgeted(workerState, runner, globals, budget) {
+  const runWithBudget = workerState.executionBudget.run_with_budget;
+  try {
+    return await (runWithBudget.callPromising
+      ? runWithBudget.callPromising(runner, globals, budget)
+      : runWithBudget(runner, globals, budget));
+  } finally {
+    runWithBudget.destroy();
   }
 }
 
@@ -105,42 +638,168 @@ export function transformCodeForExecution(code, workerState) {
  *
  * @param {WorkerState} workerState - Current worker state object
  * @param {boolean} [isErrorCase=false] - Whether this is capturing after an error
+ * @param {FigureOptions} [figureOptions={}] - Figure format and resolution
+ * @param {boolean} [binaryMissive=false] - Return the missive as an object with typed arrays instead of a JSON string
  * @returns {CapturedOutputs} Object containing stdout, stderr, missive, and figures
  */
-export function captureOutputs(workerState, isErrorCase = false) {
+export function captureOutputs(workerState, isErrorCase = false, figureOptions = {}, binaryMissive = false) {
   const capture = workerState.captureSystem;
-  let stdout = "", stderr = "", missive = null, figures = [];
+  let stdout = "", stderr = "", missive = null, missiveBuffers = [], figures = [], figureKeys;
+  let truncated = false, dropped = { stdout: 0, stderr: 0 }, metrics = null;
 
   try {
-    stdout = capture.get_stdout() || "";
-    stderr = capture.get_stderr() || "";
+    // Read the counters first: capture work (figure rendering, missive
+    // serialization) is not charged to the user code
+    const metricsProxy = capture.get_metrics();
+    const counters = metricsProxy.toJs({ dict_converter: Object.fromEntries });
+    metricsProxy.destroy();
+    metrics = {
+      cpuTimeMs: counters.cpu_time * 1000,
+      peakMemoryBytes: counters.peak_memory ?? null,
+      gcCollections: counters.gc_collections,
+      stdoutBytes: counters.stdout_bytes,
+      stderrBytes: counters.stderr_bytes,
+    };
+
+    // Streamed runs: send the tail still pending, the buffers end up empty.
+    // Queued emit() records go out before the result as well
+    capture.flush_streams();
+    capture.flush_emits();
+
+    const raw = workerState.rawCapture;
+    if (raw) {
+      flushRawCapture(raw);
+      stdout = raw.stdout.getvalue();
+      stderr = raw.stderr.getvalue();
+      dropped = { stdout: raw.stdout.dropped, stderr: raw.stderr.dropped };
+      metrics.stdoutBytes = raw.stdout.written;
+      metrics.stderrBytes = raw.stderr.written;
+    } else {
+      stdout = capture.get_stdout() || "";
+      stderr = capture.get_stderr() || "";
+
+      const statsProxy = capture.get_capture_stats();
+      const stats = statsProxy.toJs({ dict_converter: Object.fromEntries });
+      statsProxy.destroy();
+      dropped = { stdout: stats.stdout.dropped, stderr: stats.stderr.dropped };
+    }
+    truncated = dropped.stdout > 0 || dropped.stderr > 0;
 
     if (!isErrorCase) {
-      const missiveJson = capture.get_missive();
-      if (missiveJson) {
-        // Keep as string - get_missive() already returns JSON string via json.dumps()
-        missive = missiveJson;
+      if (binaryMissive) {
+        ({ missive, buffers: missiveBuffers } = readBinaryMissive(capture));
+      } else {
+        const missiveJson = capture.get_missive();
+        if (missiveJson) {
+          // Keep as string - get_missive() already returns JSON string via json.dumps()
+          missive = missiveJson;
+        }
       }
 
       // Capture matplotlib figures
-      try {
-        const figuresResult = capture.get_figures();
-        if (figuresResult && figuresResult.toJs) {
-          figures = figuresResult.toJs();
-          figuresResult.destroy();
-        } else if (Array.isArray(figuresResult)) {
-          figures = figuresResult;
+      if (!figureOptions.discard) {
+        try {
+          // bytes entries (png/svg) convert to Uint8Array, str (base64) to
+          // string, lazy handles (dicts) to plain objects
+          const figuresResult = capture.get_figures.callKwargs({
+            format: figureOptions.format ?? "base64",
+            dpi: figureOptions.dpi ?? 100,
+            lazy: !!figureOptions.lazy,
+            dedup: !!figureOptions.dedup,
+            known: figureOptions.known ?? []
+          });
+          if (figuresResult && figuresResult.toJs) {
+            figures = figuresResult.toJs({ dict_converter: Object.fromEntries });
+            figuresResult.destroy();
+          } else if (Array.isArray(figuresResult)) {
+            figures = figuresResult;
+          }
+          if (figureOptions.dedup && !figureOptions.lazy) {
+            // Dedup entries split into parallel arrays: payload (null when
+            // the consumer already has it) and content key
+            figureKeys = figures.map((entry) => entry.key);
+            figures = figures.map((entry) => entry.data ?? null);
+          }
+        } catch (e) {
+          console.warn("🐍 Failed to capture matplotlib figures:", e.message);
         }
-      } catch (e) {
-        console.warn("🐍 Failed to capture matplotlib figures:", e.message);
       }
     }
+
+    // Figures the result does not carry: closed without rendering
+    if (figureOptions.discard) {
+      capture.close_figures();
+    }
   } catch (err) {
     console.warn("🐍 " + PYODIDE_WORKER_CONFIG.MESSAGES.OUTPUT_FAILED, err.message);
     if (isErrorCase) stderr = `${PYODIDE_WORKER_CONFIG.MESSAGES.OUTPUT_RETRIEVAL_FAILED}: ${err.message}`;
   }
 
-  return { stdout, stderr, missive, figures };
+  return { stdout, stderr, missive, missiveBuffers, figures, figureKeys, truncated, dropped, metrics };
+}
+
+/**
+ * Placeholder key of the binary missive skeleton (capture_system.MISSIVE_BUFFER_KEY)
+ */
+const MISSIVE_BUFFER_KEY = "__nagini_buffer__";
+
+/**
+ * Read the missive with its arrays out of band: the JSON skeleton is parsed
+ * and every placeholder replaced by a typed array copied once out of the
+ * Python buffer (Float64Array for float64, Int32Array for int32, ...)
+ *
+ * @param {Object} capture - capture_system module proxy
+ * @returns {{missive: Object|null, buffers: ArrayBufferView[]}} Materialized missive and its arrays
+ */
+function readBinaryMissive(capture) {
+  const packed = capture.get_missive_binary();
+  if (!packed) return { missive: null, buffers: [] };
+
+  try {
+    const bufferList = packed.get("buffers");
+    const buffers = [];
+    try {
+      for (let i = 0; i < bufferList.length; i++) {
+        const item = bufferList.get(i);
+        const view = item.getBuffer();
+        try {
+          // slice() copies out of the WASM heap into a transferable buffer
+          buffers.push(view.data.slice());
+        } finally {
+          view.release();
+          item.destroy();
+        }
+      }
+    } finally {
+      bufferList.destroy();
+    }
+    return { missive: materializeMissive(JSON.parse(packed.get("skeleton")), buffers), buffers };
+  } finally {
+    packed.destroy();
+  }
+}
+
+/**
+ * Replace the placeholders of a parsed missive skeleton by their arrays
+ * One-dimensional arrays and bytes become the typed array itself, other
+ * shapes {data, dtype, shape} with data flat in C order
+ *
+ * @param {*} node - Parsed skeleton value
+ * @param {ArrayBufferView[]} buffers - Arrays by placeholder index
+ * @returns {*} Value with arrays in place
+ */
+function materializeMissive(node, buffers) {
+  if (Array.isArray(node)) return node.map((item) => materializeMissive(item, buffers));
+  if (node === null || typeof node !== "object") return node;
+
+  if (MISSIVE_BUFFER_KEY in node) {
+    const data = buffers[node[MISSIVE_BUFFER_KEY]];
+    return node.shape.length === 1 ? data : { data, dtype: node.dtype, shape: node.shape };
+  }
+  for (const key of Object.keys(node)) {
+    node[key] = materializeMissive(node[key], buffers);
+  }
+  return node;
 }
 
 /**
@@ -174,7 +833,7 @@ function warnShadowedBuiltins(workerState, filename) {
 
 // Helper functions for messaging: the request id (when present) is echoed
 // back so the manager can correlate the response with its pending promise
-const postResult = (data) => self.postMessage({ type: "result", ...data });
+const postResult = (data, transfer = []) => self.postMessage({ type: "result", ...data }, transfer);
 const postError = (message, id) => self.postMessage({ type: "error", id, message: `🐍 [Worker] ${message}` });
 const postWarning = (message) => self.postMessage({ type: "warning", message: `🐍 [Worker] ${message}` });
 
@@ -198,14 +857,143 @@ function validateInitialized(workerState, id) {
  * @property {string} filename - Name for execution tracking
  * @property {string} code - Python code to execute
  * @property {Object} [namespace] - Optional namespace for execution
+ * @property {string} [namespaceRef] - Named namespace to run in (created with a namespace_operation)
+ * @property {StreamOptions} [stream] - Stream stdout/stderr as output_chunk messages
+ * @property {OutputLimit} [outputLimit] - Keep only a head and a tail of each stream
+ * @property {FigureOptions} [figureOptions] - Format and resolution of captured figures
+ * @property {boolean} [binaryMissive] - Send the missive as an object with its arrays out of band
+ * @property {EmitOptions} [emit] - Deliver emit() records as emit_batch messages
+ * @property {boolean} [traceMemory] - Record the peak of Python allocations (tracemalloc)
+ * @property {DisplayOptions} [display] - Capture the trailing expression value like a notebook
+ * @property {number} [budget] - Lines the code may execute before BudgetExceeded is raised
+ */
+
+/**
+ * @typedef {Object} CheckMessage
+ * @property {'check'} type - Message type
+ * @property {number} id - Request id
+ * @property {string} code - Python code to parse
+ */
+
+/**
+ * @typedef {Object} ExecuteManyMessage
+ * @property {'execute_many'} type - Message type
+ * @property {number} id - Request id
+ * @property {string} code - Python code, compiled once
+ * @property {Array<Object>} [rows] - One namespace object per case
+ * @property {Object<string, Array>} [columns] - One array per variable, case i reading element i of each
+ * @property {number} [budget] - Line budget of each case
+ * @property {OutputLimit} [outputLimit] - Per-stream caps of each case
+ */
+
+/**
+ * @typedef {Object} ExecuteBatchMessage
+ * @property {'execute_batch'} type - Message type
+ * @property {number} id - Request id (tags batch_results and batch_done)
+ * @property {Array<{filename: string, code: string, namespace?: Object}>} items - Executions, run in order
+ * @property {number} [resultBatchSize=32] - Post results once this many are pending
+ * @property {number} [flushIntervalMs=50] - Post results when this long has passed since the last post
+ * @property {number} [budget] - Line budget of each item
+ * @property {OutputLimit} [outputLimit] - Per-stream caps of each item
+ */
+
+/**
+ * @typedef {Object} ResetMessage
+ * @property {'reset'} type - Message type
+ * @property {number} id - Request id
+ * @property {string} [scratchDir] - Directory emptied by the reset
+ */
+
+/**
+ * @typedef {Object} DisplayOptions
+ * @property {number} [maxBytes=1000000] - Representations larger than this are skipped (plain text is cut)
+ * @property {number} [maxRows=60] - Row window for pandas DataFrame/Series
+ */
+
+/**
+ * @typedef {Object} DisplayEntry
+ * @property {string} mime - text/html, image/svg+xml, image/png, text/latex, text/markdown or text/plain
+ * @property {string|Uint8Array} data - The representation (bytes for image/png)
+ * @property {string} text - Plain repr() of the value, as a fallback
+ */
+
+/**
+ * @typedef {Object} FigureOptions
+ * @property {'base64'|'png'|'svg'} [format='base64'] - base64 PNG strings, or raw PNG/SVG bytes as transferable Uint8Arrays
+ * @property {number} [dpi=100] - Raster resolution
+ * @property {boolean} [lazy=false] - Return figure handles and keep the figures open for render_figure
+ * @property {boolean} [dedup=false] - Send null instead of payloads whose content key is in known
+ * @property {string[]} [known] - Content keys whose payload the main thread already holds (dedup)
+ * @property {boolean} [discard=false] - Close the figures without rendering them (executeMany results carry none)
+ */
+
+/**
+ * @typedef {Object} RenderFigureMessage
+ * @property {'render_figure'} type - Message type
+ * @property {number} id - Request id
+ * @property {number} num - Figure number from a lazy handle
+ * @property {'base64'|'png'|'svg'} [format='png'] - Output format
+ * @property {number} [dpi=100] - Raster resolution (ignored when width is set)
+ * @property {number} [width] - Target raster width in pixels
+ * @property {boolean} [tight=true] - Crop to the drawn area (one extra draw pass)
+ */
+
+/**
+ * @typedef {Object} OutputLimit
+ * @property {number} head - Characters kept from the start of each stream
+ * @property {number} [tail=0] - Characters kept from the end once head is full
+ */
+
+/**
+ * @typedef {Object} EmitOptions
+ * @property {number} [batchSize=64] - Send a batch once this many records are queued
+ * @property {number} [flushIntervalMs=50] - Send a batch when this long has passed since the last one
+ * @property {number} [maxInFlight=8] - Unacknowledged batches allowed before emit() blocks (shared ack counter only)
+ */
+
+/**
+ * @typedef {Object} StreamOptions
+ * @property {number} [chunkSize=8192] - Flush once this many characters are pending
+ * @property {number} [flushIntervalMs=50] - Flush when this long has passed since the last chunk
  */
 
 /**
  * @typedef {Object} CapturedOutputs
  * @property {string} stdout - Standard output
  * @property {string} stderr - Standard error
- * @property {string|null} missive - Missive as a JSON string (parse on the consumer side)
- * @property {string[]} figures - Base64 encoded matplotlib figures
+ * @property {string|Object|null} missive - Missive as a JSON string (parse on the consumer side), an object with typed arrays when binaryMissive
+ * @property {ArrayBufferView[]} missiveBuffers - Typed arrays of a binary missive (transfer list)
+ * @property {Array<string|Uint8Array|FigureHandle|null>} figures - Matplotlib figures: base64 strings, PNG/SVG bytes, or lazy handles (null: unchanged, dedup mode)
+ * @property {string[]} [figureKeys] - Content key of each figure (dedup mode)
+ * @property {boolean} truncated - Whether an output limit dropped characters
+ * @property {{stdout: number, stderr: number}} dropped - Characters dropped per stream
+ * @property {ExecutionMetrics|null} metrics - Resource counters of the user code (heap and figure count added by handleExecute)
+ */
+
+/**
+ * @typedef {Object} ExecutionMetrics
+ * @property {number} cpuTimeMs - CPU time of the user code (time.process_time delta)
+ * @property {number|null} peakMemoryBytes - Peak of traced Python allocations, null unless traceMemory
+ * @property {number} gcCollections - Garbage collections run during the execution
+ * @property {number} stdoutBytes - UTF-8 bytes written to stdout (including dropped or streamed ones)
+ * @property {number} stderrBytes - UTF-8 bytes written to stderr
+ * @property {number|null} heapBytesBefore - WebAssembly memory size before the run
+ * @property {number|null} heapBytesAfter - WebAssembly memory size after the run
+ * @property {number} figureCount - Figures captured
+ * @property {number} compileCacheHits - Executions served by the compiled-code cache (worker lifetime)
+ * @property {number} compileCacheMisses - Executions that had to parse and compile (worker lifetime)
+ * @property {number} packageLoadMs - Time spent loading imported packages before the run (autoLoadImports)
+ * @property {string[]} packagesAutoLoaded - Packages loaded for this execution's imports
+ * @property {number|null} budgetUsed - Lines charged to the execution's budget, null without one
+ */
+
+/**
+ * @typedef {Object} FigureHandle
+ * @property {number} num - Figure number (pass to render_figure)
+ * @property {number} width - Width in inches
+ * @property {number} height - Height in inches
+ * @property {number} dpi - Figure dpi
+ * @property {number} artists - Artists across the figure's axes
  */
 
 /**
@@ -215,5 +1003,17 @@ function validateInitialized(workerState, id) {
  * @property {Set<string>} packagesLoaded - Set of loaded package names
  * @property {Object|null} captureSystem - PyProxy of the capture_system module
  * @property {Object|null} codeTransformation - PyProxy of the code_transformation module
+ * @property {Object|null} executionBudget - PyProxy of the execution_budget module
+ * @property {Object|null} interpreterState - PyProxy of the interpreter_state module
  * @property {Set<string>} shadowWarnedNames - Built-in names already reported as shadowed
+ * @property {number|null} currentRequestId - Id of the execution in progress (tags streamed chunks)
+ * @property {Int32Array|null} emitAck - Shared counter of emit batches consumed by the main thread
+ * @property {number} emitSent - emit batches posted so far
+ * @property {number} emitWindow - Unacknowledged emit batches allowed for the current execution
+ * @property {RawCapture|null} rawCapture - Raw fd 1/2 capture (captureBackend 'raw')
+ * @property {boolean} autoLoadImports - Load the packages a snippet imports before running it
+ * @property {Map<string, string>|null} importIndex - Import name → package name (lockfile)
+ * @property {Uint8Array|null} interruptBuffer - Pyodide interrupt buffer shared with the manager
+ * @property {Map<string, Object>} namespaces - Named namespaces (globals dict PyProxies), least recently used first
+ * @property {number} maxNamespaces - Named namespaces kept before the oldest is dropped
  */
@@ -91,6 +91,79 @@ export async function loadPackages(packages, workerState) {
   }
 }
 
+/**
+ * Load the packages a snippet imports and that are not loaded yet, in one
+ * loadPackage batch (Pyodide fetches them and their dependencies in
+ * parallel). Import names are mapped to package names through the
+ * lockfile's import index; names it does not know (stdlib, local modules,
+ * micropip installs) are ignored
+ *
+ * @param {string[]} imports - Top-level module names imported by the code
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Promise<string[]>} Packages loaded by this call
+ */
+export async function loadImportedPackages(imports, workerState) {
+  const index = importIndexOf(workerState);
+  const alreadyLoaded = workerState.pyodide.loadedPackages ?? {};
+  const missing = new Set();
+  for (const name of imports) {
+    const pkg = index.get(name);
+    if (pkg && !workerState.packagesLoaded.has(pkg) && !(pkg in alreadyLoaded)) missing.add(pkg);
+  }
+  if (missing.size === 0) return [];
+
+  // A failed load is only a warning: the import then fails in the user code
+  await loadPackages([...missing], workerState);
+  return [...missing].filter(pkg => workerState.packagesLoaded.has(pkg));
+}
+
+/**
+ * Install the lazy_imports meta_path finder: an import no installed module
+ * satisfies loads the matching lockfile package and resumes. The finder
+ * blocks on the load through run_sync, so it needs JSPI. Holds JavaScript
+ * references: installed after the snapshot point
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {void}
+ */
+export function installLazyImports(workerState) {
+  const lazyImports = workerState.pyodide.pyimport("lazy_imports");
+  const index = workerState.pyodide.toPy(Object.fromEntries(importIndexOf(workerState)));
+  const afterLoad = workerState.pyodideUtilities.configure_loaded_packages;
+  try {
+    lazyImports.install_finder(index, (pkg) => loadPackages([pkg], workerState), afterLoad);
+  } finally {
+    afterLoad.destroy();
+    index.destroy();
+    lazyImports.destroy();
+  }
+}
+
+/**
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {Map<string, string>} Import name → package name, built on first use
+ */
+function importIndexOf(workerState) {
+  workerState.importIndex ??= buildImportIndex(workerState.pyodide);
+  return workerState.importIndex;
+}
+
+/**
+ * Map import names to package names from the Pyodide lockfile (each
+ * package lists the top-level modules it provides). Built once per worker
+ *
+ * @param {PyodideAPI} pyodide - Pyodide instance
+ * @returns {Map<string, string>} Import name → package name
+ */
+function buildImportIndex(pyodide) {
+  const packages = pyodide.lockfile?.packages ?? pyodide._api?.lockfile_packages ?? {};
+  const index = new Map();
+  for (const [name, info] of Object.entries(packages)) {
+    for (const importName of info.imports ?? []) index.set(importName, info.name ?? name);
+  }
+  return index;
+}
+
 // Helper functions for messaging: the request id (when present) is echoed
 // back so the manager can correlate the response with its pending promise
 const postFSError = (error, id) => self.postMessage({ type: "fs_error", id, error: `🔧 [Worker] ${error}` });
@@ -118,4 +191,5 @@ const postWarning = (message) => self.postMessage({ type: "warning", message: `
  * @property {PyodideAPI|null} pyodide - Pyodide instance
  * @property {boolean} isInitialized - Whether Pyodide is initialized
  * @property {Set<string>} packagesLoaded - Set of loaded package names
+ * @property {Map<string, string>|null} importIndex - Import name → package name (built on first use)
  */
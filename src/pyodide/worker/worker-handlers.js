@@ -5,16 +5,21 @@
  */
 
 import { PYODIDE_WORKER_CONFIG } from './worker-config.js';
-import { handleExecute, transformCodeForExecution, captureOutputs } from './worker-execution.js';
+import { handleExecute, handleExecuteBatch, handleExecuteMany, handleRenderFigure, handleCheck, handleReset, transformCodeForExecution, captureOutputs, postEmitBatch, wasmHeapBytes } from './worker-execution.js';
 import { setupInputHandling, handleInputResponse } from './worker-input.js';
-import { handleFSOperation, executeFS, loadPackages } from './worker-fs.js';
+import { handleFSOperation, executeFS, loadPackages, installLazyImports } from './worker-fs.js';
+import { handleNamespaceOperation } from './worker-namespaces.js';
 import { snapshotKey, loadSnapshot, storeSnapshot, deleteSnapshot } from './worker-snapshot.js';
+import { installRawCapture } from './worker-raw-capture.js';
 import { PyodideFileLoader } from '../file-loader/file-loader.js';
 
 // Import Python modules as bundled strings
 import captureSystemPy from '@python/capture_system.py';
 import codeTransformationPy from '@python/code_transformation.py';
 import pyodideUtilitiesPy from '@python/pyodide_utilities.py';
+import lazyImportsPy from '@python/lazy_imports.py';
+import executionBudgetPy from '@python/execution_budget.py';
+import interpreterStatePy from '@python/interpreter_state.py';
 
 /**
  * Post error message to main thread
@@ -93,7 +98,13 @@ async function handleMessage(e, workerState) {
   const handlers = {
     init: handleInit,
     execute: handleExecute,
+    execute_batch: handleExecuteBatch,
+    execute_many: handleExecuteMany,
+    render_figure: handleRenderFigure,
+    check: handleCheck,
+    reset: handleReset,
     fs_operation: handleFSOperation,
+    namespace_operation: handleNamespaceOperation,
     input_response: handleInputResponse
   };
 
@@ -120,7 +131,7 @@ async function handleInit(data, workerState) {
     return;
   }
 
-  const { packages, micropipPackages, filesToLoad, pyodideCdnUrl, snapshotCache } = data;
+  const { packages, micropipPackages, filesToLoad, pyodideCdnUrl, snapshotCache, emitAck, captureBackend, autoLoadImports, interruptBuffer, maxNamespaces } = data;
 
   // Use provided CDN URL or fall back to default
   const cdnUrl = pyodideCdnUrl || PYODIDE_WORKER_CONFIG.PYODIDE_CDN;
@@ -133,7 +144,7 @@ async function handleInit(data, workerState) {
     // dynamic import native so the URL is resolved at runtime
     const { loadPyodide } = await import(/* webpackIgnore: true */ `${cdnUrl}pyodide.mjs`);
 
-    const moduleSources = [captureSystemPy, codeTransformationPy, pyodideUtilitiesPy];
+    const moduleSources = [captureSystemPy, codeTransformationPy, pyodideUtilitiesPy, lazyImportsPy, executionBudgetPy, interpreterStatePy];
     let snapshotRestored = false;
     let snapKey = null;
 
@@ -176,7 +187,10 @@ async function handleInit(data, workerState) {
       const pythonModules = [
         { name: 'capture_system.py', content: captureSystemPy },
         { name: 'code_transformation.py', content: codeTransformationPy },
-        { name: 'pyodide_utilities.py', content: pyodideUtilitiesPy }
+        { name: 'pyodide_utilities.py', content: pyodideUtilitiesPy },
+        { name: 'lazy_imports.py', content: lazyImportsPy },
+        { name: 'execution_budget.py', content: executionBudgetPy },
+        { name: 'interpreter_state.py', content: interpreterStatePy }
       ];
 
       for (const module of pythonModules) {
@@ -189,6 +203,8 @@ async function handleInit(data, workerState) {
     workerState.captureSystem = workerState.pyodide.pyimport('capture_system');
     workerState.codeTransformation = workerState.pyodide.pyimport('code_transformation');
     workerState.pyodideUtilities = workerState.pyodide.pyimport('pyodide_utilities');
+    workerState.executionBudget = workerState.pyodide.pyimport('execution_budget');
+    workerState.interpreterState = workerState.pyodide.pyimport('interpreter_state');
 
     // Activate output capture
     workerState.captureSystem.reset_captures();
@@ -212,6 +228,34 @@ async function handleInit(data, workerState) {
     // stack switching, async mode with AST rewrite otherwise)
     workerState.inputMode = await setupInputHandling(workerState.pyodide);
 
+    // Sink for streamed executions: chunks are posted as they are flushed,
+    // tagged with the id of the execution that produced them. Installed
+    // after the snapshot point, it holds a JS reference
+    const sendChunk = (stream, text) => {
+      self.postMessage({ type: "output_chunk", id: workerState.currentRequestId, stream, data: text });
+    };
+    workerState.captureSystem.set_output_sink(sendChunk);
+
+    // Raw backend: fd 1/2 bytes captured below the Python layer
+    if (captureBackend === "raw") {
+      workerState.rawCapture = installRawCapture(workerState, sendChunk);
+    }
+    workerState.emitAck = emitAck ?? null;
+
+    // SIGINT written by the manager (abort, timeout) raises KeyboardInterrupt
+    // in the running code
+    workerState.interruptBuffer = interruptBuffer ?? null;
+    if (interruptBuffer) workerState.pyodide.setInterruptBuffer(interruptBuffer);
+    workerState.captureSystem.set_emit_sink((records) => postEmitBatch(workerState, records));
+
+    // Imports the pre-scan cannot see (importlib.import_module, names built
+    // at runtime) load their package on first import, in jspi mode only
+    workerState.autoLoadImports = !!autoLoadImports;
+    workerState.maxNamespaces = maxNamespaces ?? workerState.maxNamespaces;
+    if (workerState.autoLoadImports && workerState.inputMode === "jspi") {
+      installLazyImports(workerState);
+    }
+
     // Load custom files into filesystem if provided
     if (filesToLoad && filesToLoad.length > 0) {
       try {
@@ -252,8 +296,17 @@ async function handleInit(data, workerState) {
       // Matplotlib setup skipped (not available)
     }
 
+    // Baseline restored by reset messages: everything user code adds from
+    // here on (globals, modules, builtins) is what a reset takes away
+    workerState.interpreterState.record_baseline(workerState.pyodide.globals);
+
     workerState.isInitialized = true;
-    self.postMessage({ type: "ready", snapshotRestored, inputMode: workerState.inputMode });
+    self.postMessage({
+      type: "ready",
+      snapshotRestored,
+      inputMode: workerState.inputMode,
+      heapBytes: wasmHeapBytes(workerState),
+    });
 
   } catch (err) {
     workerState.pyodide = null;
@@ -273,6 +326,8 @@ export { handleMessage, handleInit, handleExecute, handleFSOperation, handleInpu
  * @property {Object|null} captureSystem - PyProxy of the capture_system module
  * @property {Object|null} codeTransformation - PyProxy of the code_transformation module
  * @property {Object|null} pyodideUtilities - PyProxy of the pyodide_utilities module
+ * @property {Object|null} executionBudget - PyProxy of the execution_budget module
+ * @property {Object|null} interpreterState - PyProxy of the interpreter_state module
  * @property {Set<string>} shadowWarnedNames - Built-in names already reported as shadowed
  */
 
@@ -284,6 +339,11 @@ export { handleMessage, handleInit, handleExecute, handleFSOperation, handleInpu
  * @property {Array<FileToLoad>} filesToLoad - Files to load into filesystem
  * @property {string} [pyodideCdnUrl] - Optional custom Pyodide CDN URL (for local/offline use)
  * @property {boolean} [snapshotCache] - Cache the bare interpreter as a memory snapshot in IndexedDB
+ * @property {Int32Array} [emitAck] - Shared counter the main thread bumps per emit batch consumed (backpressure)
+ * @property {'python'|'raw'} [captureBackend='python'] - How stdout/stderr are captured
+ * @property {boolean} [autoLoadImports] - Load the packages each snippet imports before running it
+ * @property {number} [maxNamespaces=32] - Named namespaces kept before the least recently used is dropped
+ * @property {Uint8Array} [interruptBuffer] - Shared buffer the manager writes SIGINT into to interrupt a run
  */
 
 /**
@@ -0,0 +1,185 @@
+/**
+ * PyodideWorker Named Namespaces Module
+ *
+ * Keeps named globals dicts alive in the worker between executions, so a
+ * context is converted once and then patched instead of being rebuilt by
+ * toPy on every run. Values assigned by the code stay in the dict.
+ * Namespaces are kept in least-recently-used order and capped at
+ * workerState.maxNamespaces: the oldest one is dropped past the cap.
+ */
+
+import { PYODIDE_WORKER_CONFIG } from './worker-config.js';
+import { withoutPendingInterrupt } from './worker-execution.js';
+
+/**
+ * Handle named namespace operations (create, update, read, delete)
+ *
+ * @param {NamespaceOperationMessage} data - Namespace operation message data
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {void}
+ */
+export function handleNamespaceOperation(data, workerState) {
+  if (!workerState.isInitialized || !workerState.pyodide) {
+    postNamespaceError(PYODIDE_WORKER_CONFIG.MESSAGES.NOT_INITIALIZED, data.id);
+    return;
+  }
+
+  try {
+    const result = withoutPendingInterrupt(workerState, () => executeNamespaceOperation(data, workerState));
+    self.postMessage({ type: "namespace_result", id: data.id, result });
+  } catch (error) {
+    postNamespaceError(error.message, data.id);
+  }
+}
+
+/**
+ * Execute a named namespace operation
+ *
+ * @param {NamespaceOperationMessage} data - Namespace operation data
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {NamespaceOperationResult} Result of the operation
+ * @throws {Error} If the operation is unknown or the namespace does not exist
+ */
+export function executeNamespaceOperation(data, workerState) {
+  const { operation, name, values, keys, remove } = data;
+  const { pyodide, namespaces } = workerState;
+
+  const ops = {
+    create: () => {
+      dropNamespace(workerState, name);
+      namespaces.set(name, pyodide.toPy(values ?? {}));
+      const evicted = [];
+      for (const oldest of namespaces.keys()) {
+        if (namespaces.size <= workerState.maxNamespaces) break;
+        dropNamespace(workerState, oldest);
+        evicted.push(oldest);
+      }
+      return { evicted };
+    },
+    update: () => {
+      // Only the patch is converted: the rest of the dict stays in place
+      const globals = namedNamespace(workerState, name);
+      if (values) {
+        const patch = pyodide.toPy(values);
+        try {
+          globals.update(patch);
+        } finally {
+          patch.destroy();
+        }
+      }
+      for (const key of remove ?? []) {
+        if (globals.has(key)) globals.delete(key);
+      }
+      return { size: globals.length };
+    },
+    read: () => readValues(namedNamespace(workerState, name), keys),
+    delete: () => ({ deleted: dropNamespace(workerState, name) }),
+  };
+
+  const op = ops[operation];
+  if (!op) throw new Error(`Unknown namespace operation: ${operation}`);
+  return op();
+}
+
+/**
+ * Globals dict of a named namespace, marked as most recently used
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {string} name - Namespace name
+ * @returns {Object} Dict PyProxy (owned by the registry, do not destroy)
+ * @throws {Error} If no namespace has this name (never created, deleted or evicted)
+ */
+export function namedNamespace(workerState, name) {
+  const globals = workerState.namespaces.get(name);
+  if (!globals) {
+    throw new Error(`Unknown namespace "${name}" (never created, deleted or evicted)`);
+  }
+  workerState.namespaces.delete(name);
+  workerState.namespaces.set(name, globals);
+  return globals;
+}
+
+/**
+ * Drop every named namespace (interpreter reset)
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @returns {void}
+ */
+export function clearNamespaces(workerState) {
+  for (const name of [...workerState.namespaces.keys()]) {
+    dropNamespace(workerState, name);
+  }
+}
+
+/**
+ * Remove a namespace from the registry and release its dict
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {string} name - Namespace name
+ * @returns {boolean} Whether the namespace existed
+ */
+function dropNamespace(workerState, name) {
+  const globals = workerState.namespaces.get(name);
+  if (!globals) return false;
+  workerState.namespaces.delete(name);
+  globals.destroy();
+  return true;
+}
+
+/**
+ * Convert selected values of a namespace for the main thread. Values with
+ * no JavaScript equivalent (functions, modules, class instances) cannot be
+ * cloned to the page: they are listed in skipped instead
+ *
+ * @param {Object} globals - Dict PyProxy
+ * @param {string[]} [keys] - Names to read (default: every name not starting with "__")
+ * @returns {{values: Object, skipped: string[]}}
+ */
+function readValues(globals, keys) {
+  if (!keys) {
+    const names = globals.keys();
+    keys = [...names].filter(key => !key.startsWith("__"));
+    names.destroy();
+  }
+  const values = {};
+  const skipped = [];
+  for (const key of keys) {
+    if (!globals.has(key)) continue;
+    const value = globals.get(key);
+    if (value?.toJs) {
+      try {
+        values[key] = value.toJs({ dict_converter: Object.fromEntries, create_pyproxies: false });
+      } catch (e) {
+        skipped.push(key);
+      } finally {
+        value.destroy();
+      }
+    } else {
+      values[key] = value;
+    }
+  }
+  return { values, skipped };
+}
+
+// Helper function for namespace error messages
+const postNamespaceError = (message, id) => self.postMessage({ type: "namespace_error", id, error: `🐍 [Worker] ${message}` });
+
+/**
+ * @typedef {Object} NamespaceOperationMessage
+ * @property {'namespace_operation'} type - Message type
+ * @property {number} id - Request id
+ * @property {'create'|'update'|'read'|'delete'} operation - Operation to perform
+ * @property {string} name - Namespace name
+ * @property {Object} [values] - Initial values (create) or patch (update)
+ * @property {string[]} [keys] - Names to read (read)
+ * @property {string[]} [remove] - Names to delete (update)
+ */
+
+/**
+ * @typedef {Object} NamespaceOperationResult
+ * @property {string[]} [evicted] - Namespaces dropped by the LRU cap (create)
+ * @property {number} [size] - Names in the namespace after the patch (update)
+ * @property {Object} [values] - Converted values (read)
+ * @property {string[]} [skipped] - Names whose values cannot be sent to the page (read)
+ * @property {boolean} [deleted] - Whether the namespace existed (delete)
+ */
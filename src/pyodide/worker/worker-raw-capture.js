@@ -0,0 +1,241 @@
+/**
+ * PyodideWorker Raw Capture Module
+ *
+ * Alternative capture backend (manager option captureBackend: 'raw'). The
+ * interpreter keeps its own sys.stdout/sys.stderr and the worker receives
+ * the bytes written to file descriptors 1 and 2 through pyodide.setStdout /
+ * setStderr. Every writer is caught, including C extensions and
+ * os.write(1, ...), and a print costs no Python-level method dispatch.
+ *
+ * The bytes land in a preallocated buffer that doubles when full. Output
+ * limits and streaming follow the Python backend (capture_system
+ * OutputBuffer / CaptureStream), counted in bytes instead of characters.
+ */
+
+/** Initial capacity of each stream buffer (grows by doubling) */
+const INITIAL_CAPACITY = 64 * 1024;
+
+/**
+ * Byte buffer bounded to a head and a tail, like capture_system.OutputBuffer:
+ * past headLimit bytes only the last tailLimit are kept, in a ring buffer
+ * allocated once per configuration; the bytes in between are counted in
+ * `dropped`
+ */
+export class RawOutputBuffer {
+  constructor() {
+    /** @type {Uint8Array} Head bytes not drained yet (_length used) */
+    this._bytes = new Uint8Array(INITIAL_CAPACITY);
+    this._tail = new Uint8Array(0);
+    this.configure();
+  }
+
+  /**
+   * Set the bounds (null = unbounded) and clear the buffer
+   *
+   * @param {number|null} [headLimit=null] - Bytes kept from the start
+   * @param {number} [tailLimit=0] - Bytes kept from the end past the head
+   * @returns {void}
+   */
+  configure(headLimit = null, tailLimit = 0) {
+    this.headLimit = headLimit;
+    this.tailLimit = headLimit === null ? 0 : tailLimit;
+    if (this._tail.length !== this.tailLimit) this._tail = new Uint8Array(this.tailLimit);
+    this.clear();
+  }
+
+  /** @returns {void} */
+  clear() {
+    this._length = 0;
+    this._headSize = 0; // bytes ever accepted into the head
+    this._tailStart = 0;
+    this._tailLength = 0;
+    this._decoder = new TextDecoder();
+    this.written = 0;
+    this.dropped = 0;
+  }
+
+  /**
+   * Append bytes from the interpreter (setStdout write handler)
+   *
+   * @param {Uint8Array} bytes - Bytes written (may be a view on the wasm heap: copied)
+   * @returns {number} Bytes consumed (always all of them)
+   */
+  write(bytes) {
+    this.written += bytes.length;
+    if (this.headLimit === null) {
+      this._append(bytes);
+      return bytes.length;
+    }
+
+    let data = bytes;
+    const room = this.headLimit - this._headSize;
+    if (room > 0) {
+      const take = Math.min(room, data.length);
+      this._append(data.subarray(0, take));
+      this._headSize += take;
+      data = data.subarray(take);
+    }
+    if (data.length > 0) this._pushTail(data);
+    return bytes.length;
+  }
+
+  /** @returns {number} Head bytes waiting to be drained */
+  get pending() {
+    return this._length;
+  }
+
+  _append(data) {
+    const needed = this._length + data.length;
+    if (needed > this._bytes.length) {
+      let capacity = this._bytes.length * 2;
+      while (capacity < needed) capacity *= 2;
+      const grown = new Uint8Array(capacity);
+      grown.set(this._bytes.subarray(0, this._length));
+      this._bytes = grown;
+    }
+    this._bytes.set(data, this._length);
+    this._length = needed;
+  }
+
+  _pushTail(data) {
+    const capacity = this.tailLimit;
+    if (data.length >= capacity) {
+      this.dropped += this._tailLength + data.length - capacity;
+      this._tail.set(data.subarray(data.length - capacity));
+      this._tailStart = 0;
+      this._tailLength = capacity;
+      return;
+    }
+    const overflow = this._tailLength + data.length - capacity;
+    if (overflow > 0) {
+      this.dropped += overflow;
+      this._tailStart = (this._tailStart + overflow) % capacity;
+      this._tailLength -= overflow;
+    }
+    const end = (this._tailStart + this._tailLength) % capacity;
+    const first = Math.min(data.length, capacity - end);
+    this._tail.set(data.subarray(0, first), end);
+    this._tail.set(data.subarray(first), 0);
+    this._tailLength += data.length;
+  }
+
+  _tailText() {
+    if (this._tailLength === 0) return "";
+    const end = this._tailStart + this._tailLength;
+    let bytes = this._tail.subarray(this._tailStart, Math.min(end, this.tailLimit));
+    if (end > this.tailLimit) {
+      // Wrapped ring: unroll it once
+      const unrolled = new Uint8Array(this._tailLength);
+      unrolled.set(bytes);
+      unrolled.set(this._tail.subarray(0, end - this.tailLimit), bytes.length);
+      bytes = unrolled;
+    }
+    // A cut may split a multi-byte character: decoded as U+FFFD
+    return new TextDecoder().decode(bytes);
+  }
+
+  /** @returns {string} Captured text (head, then tail) */
+  getvalue() {
+    return this._decoder.decode(this._bytes.subarray(0, this._length)) + this._tailText();
+  }
+
+  /**
+   * Remove and return the pending head text (streaming). A multi-byte
+   * character split across writes is held back until it is complete. The
+   * tail is only released with final=true
+   *
+   * @param {boolean} [final=false] - End of the execution
+   * @returns {string} Text to stream
+   */
+  drain(final = false) {
+    let text = this._decoder.decode(this._bytes.subarray(0, this._length), { stream: !final });
+    this._length = 0;
+    if (final) {
+      text += this._tailText();
+      this._tailStart = 0;
+      this._tailLength = 0;
+    }
+    return text;
+  }
+}
+
+/**
+ * Route the interpreter's fd 1/2 into raw buffers. Called once at init,
+ * after the snapshot point (the handlers are JavaScript references)
+ *
+ * @param {WorkerState} workerState - Current worker state object
+ * @param {function(string, string): void} sendChunk - Posts a streamed chunk (stream name, text)
+ * @returns {RawCapture} Capture state, stored as workerState.rawCapture
+ */
+export function installRawCapture(workerState, sendChunk) {
+  const capture = {
+    stdout: new RawOutputBuffer(),
+    stderr: new RawOutputBuffer(),
+    streaming: false,
+    chunkSize: 8192,
+    flushIntervalMs: 50,
+    lastFlush: 0,
+    sendChunk,
+  };
+
+  const handler = (name) => ({
+    write: (bytes) => {
+      const buffer = capture[name];
+      const written = buffer.write(bytes);
+      if (capture.streaming && (
+        buffer.pending >= capture.chunkSize || performance.now() - capture.lastFlush >= capture.flushIntervalMs
+      )) {
+        capture.lastFlush = performance.now();
+        const text = buffer.drain();
+        if (text) sendChunk(name, text);
+      }
+      return written;
+    },
+  });
+  workerState.pyodide.setStdout(handler("stdout"));
+  workerState.pyodide.setStderr(handler("stderr"));
+  return capture;
+}
+
+/**
+ * Reset the raw buffers for a new execution
+ *
+ * @param {RawCapture} capture - Raw capture state
+ * @param {StreamOptions} [stream] - Streaming thresholds (chunkSize counts bytes here)
+ * @param {OutputLimit} [outputLimit] - Per-stream head/tail caps in bytes
+ * @returns {void}
+ */
+export function resetRawCapture(capture, stream, outputLimit) {
+  capture.streaming = !!stream;
+  capture.chunkSize = stream?.chunkSize ?? 8192;
+  capture.flushIntervalMs = stream?.flushIntervalMs ?? 50;
+  capture.lastFlush = performance.now();
+  for (const name of ["stdout", "stderr"]) {
+    capture[name].configure(outputLimit ? outputLimit.head : null, outputLimit?.tail ?? 0);
+  }
+}
+
+/**
+ * End of a streamed run: send what is still pending, the buffers end up empty
+ *
+ * @param {RawCapture} capture - Raw capture state
+ * @returns {void}
+ */
+export function flushRawCapture(capture) {
+  if (!capture.streaming) return;
+  for (const name of ["stdout", "stderr"]) {
+    const text = capture[name].drain(true);
+    if (text) capture.sendChunk(name, text);
+  }
+}
+
+/**
+ * @typedef {Object} RawCapture
+ * @property {RawOutputBuffer} stdout - fd 1 buffer
+ * @property {RawOutputBuffer} stderr - fd 2 buffer
+ * @property {boolean} streaming - Whether chunks are posted during the run
+ * @property {number} chunkSize - Streaming: bytes pending before a chunk is sent
+ * @property {number} flushIntervalMs - Streaming: time since the last chunk before one is sent
+ * @property {number} lastFlush - performance.now() of the last chunk
+ * @property {function(string, string): void} sendChunk - Posts a streamed chunk
+ */
@@ -45,12 +45,54 @@ const workerState = {
   /** @type {Object|null} PyProxy of the pyodide_utilities module (set at init) */
   pyodideUtilities: null,
 
+  /** @type {Object|null} PyProxy of the execution_budget module (set at init) */
+  executionBudget: null,
+
+  /** @type {Object|null} PyProxy of the interpreter_state module (set at init) */
+  interpreterState: null,
+
   /** @type {Set<string>} Built-in names already reported as shadowed by user code */
   shadowWarnedNames: new Set(),
 
   /** @type {'jspi'|'async'|null} How input() is bridged (set at init):
    *  native stack switching, or async handler plus AST rewrite */
-  inputMode: null
+  inputMode: null,
+
+  /** @type {number|null} Id of the execution in progress: streamed
+   *  output_chunk messages carry it so the manager can route them */
+  currentRequestId: null,
+
+  /** @type {Int32Array|null} Shared counter of emit batches consumed by the
+   *  main thread (set at init when the page can share memory) */
+  emitAck: null,
+
+  /** @type {number} emit batches posted so far (compared with emitAck) */
+  emitSent: 0,
+
+  /** @type {number} Unacknowledged emit batches allowed before emit() blocks */
+  emitWindow: 8,
+
+  /** @type {RawCapture|null} Raw fd 1/2 capture (captureBackend 'raw'),
+   *  null when capture_system swaps sys.stdout/stderr */
+  rawCapture: null,
+
+  /** @type {Uint8Array|null} Pyodide interrupt buffer shared with the main
+   *  thread (SIGINT interrupts the running code), null when not isolated */
+  interruptBuffer: null,
+
+  /** @type {boolean} Load the packages a snippet imports before running it */
+  autoLoadImports: false,
+
+  /** @type {Map<string, string>|null} Import name → package name, from the
+   *  lockfile (built on the first auto-loaded execution) */
+  importIndex: null,
+
+  /** @type {Map<string, Object>} Named namespaces (globals dict PyProxies),
+   *  least recently used first */
+  namespaces: new Map(),
+
+  /** @type {number} Named namespaces kept before the oldest is dropped */
+  maxNamespaces: 32
 };
 
 /**
@@ -86,7 +128,7 @@ self.onmessage = async function (e) {
 
 /**
  * @typedef {Object} WorkerMessage
- * @property {'init'|'execute'|'fs_operation'|'input_response'} type - Message type
+ * @property {'init'|'execute'|'render_figure'|'check'|'fs_operation'|'input_response'} type - Message type
  * @property {string} [filename] - Filename for execution (execute messages)
  * @property {string} [code] - Python code to execute (execute messages)
  * @property {Object} [namespace] - Execution namespace (execute messages)
@@ -173,6 +173,24 @@ export class ValidationUtils {
     this.validateNamespace(namespace, component);
   }
 
+  /**
+   * Validate an output limit ({head, tail} caps: characters with the
+   * 'python' capture backend, bytes with 'raw')
+   * @param {any} limit - Limit to validate
+   * @param {string} [component] - Component name for error context
+   * @throws {Error} If limit is not an object with non-negative integer head/tail
+   */
+  static validateOutputLimit(limit, component = 'Component') {
+    this.validateObject(limit, 'outputLimit', component);
+    for (const key of ['head', 'tail']) {
+      const value = limit[key];
+      if (value === undefined && key === 'tail') continue;
+      if (!Number.isInteger(value) || value < 0) {
+        throw new Error(`🔧 [${component}] outputLimit.${key} must be a non-negative integer, got ${value}`);
+      }
+    }
+  }
+
   /**
    * Check for potentially dangerous Python code patterns
    * @param {string} code - Python code to check